@@ -0,0 +1,179 @@
+"""
+Cache de resultados del análisis de código Lambda.
+
+Los resultados se indexan por SHA-256 del código fuente junto con el tipo de
+análisis y la versión del analizador, así que una función que no cambió entre
+revisiones del template no se vuelve a analizar. Tiene dos niveles: un LRU en
+memoria compartido por todo el proceso y, opcionalmente, un directorio en disco
+(un JSON por entrada) que sobrevive entre corridas de CI.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+
+# Entradas del LRU en memoria por defecto
+DEFAULT_MAX_ENTRIES = 512
+
+
+@dataclass
+class CacheStats:
+    """Contadores de uso del cache"""
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    disk_errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+
+def cache_key(kind: str, version: str, source: str) -> str:
+    """
+    Clave de una entrada: SHA-256 del tipo de análisis, la versión y el código.
+
+    Args:
+        kind: Tipo de análisis (ej: 'fields', 'report')
+        version: Versión del analizador que produce el resultado
+        source: Código fuente analizado
+
+    Returns:
+        Digest hexadecimal
+    """
+    digest = hashlib.sha256()
+    digest.update(f'{kind}\0{version}\0'.encode('utf-8'))
+    digest.update(source.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    LRU en memoria con un store opcional en disco.
+
+    Los valores tienen que ser serializables a JSON (se guardan tal cual en
+    disco) y se tratan como inmutables: quien los lee debe copiarlos antes de
+    modificarlos. Es seguro usarlo desde varios threads.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, directory: Optional[str] = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.stats = CacheStats()
+        self._entries: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f'{key}.json')
+
+    def _remember(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Any]:
+        if not self.directory:
+            return None
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)['value']
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError):
+            # Una entrada corrupta se trata como ausente y se reescribe
+            self.stats.disk_errors += 1
+            return None
+
+    def _write_disk(self, key: str, value: Any):
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='.entry-', dir=directory)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump({'key': key, 'value': value}, f, ensure_ascii=False)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
+        except OSError:
+            # El store en disco es una optimización: si falla se sigue sin él
+            self.stats.disk_errors += 1
+
+    def get_or_compute(self, kind: str, version: str, source: str, compute: Callable[[], Any]) -> Any:
+        """
+        Devuelve el resultado cacheado del análisis o lo calcula y lo guarda.
+
+        Args:
+            kind: Tipo de análisis
+            version: Versión del analizador
+            source: Código fuente analizado
+            compute: Función sin argumentos que calcula el resultado
+
+        Returns:
+            Resultado del análisis (serializable a JSON)
+        """
+        key = cache_key(kind, version, source)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return self._entries[key]
+
+        value = self._read_disk(key)
+        if value is not None:
+            self.stats.disk_hits += 1
+        else:
+            self.stats.misses += 1
+            value = compute()
+            if self.directory:
+                self._write_disk(key, value)
+
+        self._remember(key, value)
+        return value
+
+    def clear(self):
+        """Vacía el LRU en memoria (el store en disco no se toca)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_default_cache = AnalysisCache()
+
+
+def get_analysis_cache() -> AnalysisCache:
+    """Cache compartido por los analizadores del proceso."""
+    return _default_cache
+
+
+def configure_analysis_cache(directory: Optional[str] = None,
+                             max_entries: int = DEFAULT_MAX_ENTRIES) -> AnalysisCache:
+    """
+    Reemplaza el cache compartido (por ejemplo, para agregar el store en disco).
+
+    Args:
+        directory: Directorio del store en disco (None = solo memoria)
+        max_entries: Entradas del LRU en memoria
+
+    Returns:
+        El nuevo cache compartido
+    """
+    global _default_cache
+    _default_cache = AnalysisCache(max_entries=max_entries, directory=directory)
+    return _default_cache
@@ -0,0 +1,335 @@
+"""
+Diagnóstico en lote de varios stacks (un template por tenant / entorno).
+
+Toma uno o más directorios o globs de templates de CloudFormation y corre, en
+un pool de procesos, el mismo diagnóstico que full_system_diagnosis (lambdas,
+consistencia OpenAPI-Lambda y prompt del agente) sobre cada uno. El resultado
+es un único archivo JSON Lines con un registro por stack, con sus tiempos, y
+un registro final de resumen.
+
+Cada stack usa la especificación OpenAPI y el prompt por defecto, salvo que
+junto al template haya archivos `<template>.openapi.yaml` / `<template>.prompt.yaml`.
+
+Uso:
+    python batch_diagnosis.py 'stacks/**/*.yaml' --output diagnostico.jsonl --workers 8
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+import yaml
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Optional, Iterable, Callable
+
+from analysis_cache import configure_analysis_cache
+from full_system_diagnosis import DEFAULT_OPENAPI_PATH, DEFAULT_PROMPT_PATH, analyze_prompt_date_handling
+from lambda_analyzer import analyze_lambda_code, extract_fields
+from openapi_validator import sweep_openapi_consistency
+from template_index import LAMBDA_FUNCTION_TYPE, discover_api_routes, load_template_index
+
+
+TEMPLATE_EXTENSIONS = ('.yaml', '.yml', '.json', '.template')
+COMPANION_SUFFIXES = ('.openapi', '.prompt')
+
+
+@dataclass
+class StackTarget:
+    """Un stack a diagnosticar"""
+    stack_name: str
+    template_path: str
+    openapi_path: Optional[str]
+    prompt_path: Optional[str]
+
+
+def _is_template(path: str) -> bool:
+    stem, extension = os.path.splitext(path)
+    if extension.lower() not in TEMPLATE_EXTENSIONS or stem.endswith(COMPANION_SUFFIXES):
+        return False
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return LAMBDA_FUNCTION_TYPE in f.read()
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def _companion(template_path: str, suffix: str, default: Optional[str]) -> Optional[str]:
+    stem = os.path.splitext(template_path)[0]
+    for extension in ('.yaml', '.yml'):
+        candidate = f'{stem}{suffix}{extension}'
+        if os.path.exists(candidate):
+            return candidate
+    return default
+
+
+def discover_stacks(
+    patterns: Iterable[str],
+    openapi_path: Optional[str] = DEFAULT_OPENAPI_PATH,
+    prompt_path: Optional[str] = DEFAULT_PROMPT_PATH
+) -> List[StackTarget]:
+    """
+    Busca los templates de CloudFormation a diagnosticar.
+
+    Args:
+        patterns: Directorios (se recorren recursivamente) o globs de archivos
+        openapi_path: Especificación OpenAPI por defecto (None = no validar)
+        prompt_path: Prompt del agente por defecto (None = no analizar)
+
+    Returns:
+        Lista de StackTarget ordenada por ruta, sin duplicados
+    """
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, '**', '*')
+        for path in glob.glob(pattern, recursive=True):
+            if os.path.isfile(path) and _is_template(path):
+                paths.add(os.path.abspath(path))
+
+    common = os.path.commonpath(sorted(paths)) if len(paths) > 1 else None
+    targets = []
+    for path in sorted(paths):
+        if common:
+            stack_name = os.path.splitext(os.path.relpath(path, common))[0]
+        else:
+            stack_name = os.path.splitext(os.path.basename(path))[0]
+        targets.append(StackTarget(
+            stack_name=stack_name,
+            template_path=path,
+            openapi_path=_companion(path, '.openapi', openapi_path),
+            prompt_path=_companion(path, '.prompt', prompt_path)
+        ))
+    return targets
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def diagnose_stack(target: StackTarget) -> Dict[str, Any]:
+    """
+    Corre el diagnóstico completo de un stack.
+
+    Args:
+        target: Stack a diagnosticar
+
+    Returns:
+        Registro serializable a JSON con los resultados y los tiempos (ms)
+    """
+    started = time.perf_counter()
+    record: Dict[str, Any] = {
+        'type': 'stack',
+        'stack': target.stack_name,
+        'template': target.template_path,
+        'openapi': target.openapi_path,
+        'prompt': target.prompt_path,
+        'status': 'ok',
+        'error': None,
+        'worker_pid': os.getpid(),
+        'timings_ms': {},
+        'lambdas': {},
+        'consistency': [],
+        'undocumented_routes': [],
+        'unintegrated_operations': [],
+        'routes_without_permission': [],
+        'prompt_analysis': None,
+        'totals': {}
+    }
+    timings = record['timings_ms']
+
+    try:
+        step = time.perf_counter()
+        index = load_template_index(target.template_path)
+        openapi_spec = None
+        if target.openapi_path:
+            with open(target.openapi_path, 'r', encoding='utf-8') as f:
+                openapi_spec = yaml.safe_load(f)
+        timings['load'] = _elapsed_ms(step)
+
+        step = time.perf_counter()
+        routes = discover_api_routes(index)
+        for route in routes:
+            info = index.lambdas.get(route.lambda_name) if route.lambda_name else None
+            if info is None or info.inline_code is None:
+                continue
+            endpoint = f'{route.method.upper()} {route.path}'
+            if route.lambda_name in record['lambdas']:
+                record['lambdas'][route.lambda_name]['endpoints'].append(endpoint)
+                continue
+            report = analyze_lambda_code(route.lambda_name, info.inline_code)
+            processed, update_fields = extract_fields(info.inline_code)
+            record['lambdas'][route.lambda_name] = {
+                'endpoints': [endpoint],
+                'summary': report.summary,
+                'requires_code_change': report.requires_code_change,
+                'findings': [asdict(finding) for finding in report.findings],
+                'processed_fields': processed,
+                'update_fields': update_fields
+            }
+        timings['lambdas'] = _elapsed_ms(step)
+
+        step = time.perf_counter()
+        if openapi_spec is not None:
+            sweep = sweep_openapi_consistency(openapi_spec, index, routes)
+            for report in sweep.reports:
+                record['consistency'].append({
+                    'endpoint': report.endpoint,
+                    'method': report.method,
+                    'lambda_name': report.lambda_name,
+                    'is_consistent': report.is_consistent,
+                    'missing_in_lambda': sorted(report.missing_in_lambda),
+                    'missing_in_openapi': sorted(report.missing_in_openapi),
+                    'type_mismatches': report.type_mismatches,
+                    'format_warnings': report.format_warnings
+                })
+            record['undocumented_routes'] = [
+                {'path': r.path, 'method': r.method, 'lambda_name': r.lambda_name} for r in sweep.undocumented_routes
+            ]
+            record['unintegrated_operations'] = [
+                {'path': path, 'method': method} for path, method in sweep.unintegrated_operations
+            ]
+        record['routes_without_permission'] = [
+            {'path': r.path, 'method': r.method, 'lambda_name': r.lambda_name}
+            for r in routes if r.lambda_name and not r.has_permission
+        ]
+        timings['openapi'] = _elapsed_ms(step)
+
+        step = time.perf_counter()
+        if target.prompt_path:
+            record['prompt_analysis'] = analyze_prompt_date_handling(target.prompt_path)
+        timings['prompt'] = _elapsed_ms(step)
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = f'{type(e).__name__}: {e}'
+
+    findings = [finding for info in record['lambdas'].values() for finding in info['findings']]
+    record['totals'] = {
+        'lambdas': len(record['lambdas']),
+        'critical': sum(1 for f in findings if f['severity'] == 'critical'),
+        'warnings': sum(1 for f in findings if f['severity'] == 'warning'),
+        'inconsistent_endpoints': sum(1 for c in record['consistency'] if not c['is_consistent']),
+        'type_mismatches': sum(len(c['type_mismatches']) for c in record['consistency']),
+        'prompt_issues': len((record['prompt_analysis'] or {}).get('issues', []))
+    }
+    timings['total'] = _elapsed_ms(started)
+    return record
+
+
+def _init_worker(cache_dir: Optional[str]):
+    if cache_dir:
+        configure_analysis_cache(directory=cache_dir)
+
+
+def run_batch(
+    targets: List[StackTarget],
+    output_path: str,
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    on_record: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Diagnostica los stacks en paralelo y escribe el reporte JSON Lines.
+
+    Cada registro se escribe apenas termina su stack, en orden de llegada; el
+    último registro es el resumen de la corrida.
+
+    Args:
+        targets: Stacks a diagnosticar
+        output_path: Archivo .jsonl de salida ('-' = stdout)
+        workers: Procesos del pool (default: cantidad de CPUs; 1 = sin pool)
+        cache_dir: Store en disco del cache de análisis, compartido por los workers
+        on_record: Callback opcional invocado con cada registro de stack
+
+    Returns:
+        Registro de resumen
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(targets) or 1))
+    started = time.perf_counter()
+    counts = {'ok': 0, 'error': 0}
+    stack_ms = []
+
+    output = sys.stdout if output_path == '-' else open(output_path, 'w', encoding='utf-8')
+    try:
+        def emit(record: Dict[str, Any]):
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            output.flush()
+            if record['type'] == 'stack':
+                counts[record['status']] += 1
+                stack_ms.append(record['timings_ms']['total'])
+                if on_record:
+                    on_record(record)
+
+        if workers == 1:
+            _init_worker(cache_dir)
+            for target in targets:
+                emit(diagnose_stack(target))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(cache_dir,)) as executor:
+                futures = [executor.submit(diagnose_stack, target) for target in targets]
+                for future in as_completed(futures):
+                    emit(future.result())
+
+        wall_seconds = time.perf_counter() - started
+        summary = {
+            'type': 'summary',
+            'stacks': len(targets),
+            'ok': counts['ok'],
+            'errors': counts['error'],
+            'workers': workers,
+            'wall_ms': round(wall_seconds * 1000, 3),
+            'stack_ms_sum': round(sum(stack_ms), 3),
+            'stacks_per_second': round(len(targets) / wall_seconds, 3) if wall_seconds else None
+        }
+        emit(summary)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return summary
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Diagnóstico en lote de varios stacks de turnos médicos')
+    parser.add_argument('patterns', nargs='+', help='Directorios o globs de templates de CloudFormation')
+    parser.add_argument('--output', default='diagnostico-batch.jsonl', help="Reporte JSON Lines ('-' = stdout)")
+    parser.add_argument('--workers', type=int, default=None, help='Procesos del pool (default: CPUs)')
+    parser.add_argument('--openapi', default=DEFAULT_OPENAPI_PATH, help='Especificación OpenAPI por defecto')
+    parser.add_argument('--prompt', default=DEFAULT_PROMPT_PATH, help='Prompt del agente por defecto')
+    parser.add_argument('--analysis-cache', metavar='DIR', help='Store en disco del cache de análisis')
+    args = parser.parse_args()
+
+    targets = discover_stacks(args.patterns, args.openapi, args.prompt)
+    if not targets:
+        print("❌ No se encontraron templates con funciones Lambda")
+        sys.exit(1)
+
+    quiet = args.output == '-'
+    if not quiet:
+        print(f"\n🔍 Diagnosticando {len(targets)} stacks...")
+
+    def progress(record: Dict[str, Any]):
+        if quiet:
+            return
+        totals = record['totals']
+        icon = '❌' if record['status'] == 'error' else ('🔴' if totals['critical'] else '✅')
+        if record['error']:
+            detail = record['error'].splitlines()[0]
+        else:
+            detail = (f"{totals['critical']} críticos, {totals['warnings']} advertencias, "
+                      f"{totals['inconsistent_endpoints']} endpoints inconsistentes")
+        print(f"  {icon} {record['stack']}: {detail} ({record['timings_ms']['total']:.0f} ms)")
+
+    summary = run_batch(targets, args.output, args.workers, args.analysis_cache, on_record=progress)
+
+    if not quiet:
+        print(f"\n📊 {summary['ok']}/{summary['stacks']} stacks OK en {summary['wall_ms'] / 1000:.2f}s "
+              f"con {summary['workers']} workers ({summary['stacks_per_second']} stacks/s)")
+        print(f"📄 Reporte: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
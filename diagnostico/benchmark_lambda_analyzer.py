@@ -0,0 +1,124 @@
+"""
+Benchmark del extractor de campos de lambda_analyzer: AST vs regex.
+
+Genera handlers Python sintéticos con la forma de ModifyTurnoFunction y cada
+vez más campos (una cláusula SET larga, `update_expression +=` por campo y
+accesos al body) y mide el extractor basado en AST contra el set de regex
+original, separando lo que tarda solo ast.parse.
+
+El extractor AST es más lento que el regex (ast.parse solo ya lo es); lo que
+gana es completitud. Si en algún tamaño es más lento se avisa y el proceso
+termina con código 1, para que no se lea como una mejora de velocidad.
+
+Uso:
+    python benchmark_lambda_analyzer.py --fields 10 50 200
+"""
+
+import argparse
+import ast
+import sys
+import textwrap
+import time
+from typing import List
+
+import lambda_analyzer
+from lambda_analyzer import extract_fields
+
+
+def generate_handler(num_fields: int) -> str:
+    """
+    Genera un handler Python con `num_fields` campos opcionales.
+
+    Args:
+        num_fields: Cantidad de campos del body
+
+    Returns:
+        Código fuente del handler
+    """
+    names = [f'campo{i}' for i in range(num_fields)]
+    set_clause = ', '.join(f'{name} = :{name}' for name in names)
+    lines = [
+        'import json',
+        '',
+        'def handler(event, context):',
+        "    payload = json.loads(event['body'])",
+        '    body = payload',
+        "    update_expression = 'SET modifiedAt = :modifiedAt'",
+        "    expression_values = {':modifiedAt': 'now'}",
+    ]
+    for name in names:
+        lines += [
+            f"    if '{name}' in body:",
+            f"        valor = body.get('{name}') or body['{name}']",
+            f"        update_expression += ', {name} = :{name}'",
+            f"        expression_values[':{name}'] = valor",
+        ]
+    lines += [
+        f"    full_expression = 'SET {set_clause}'",
+        '    table.update_item(UpdateExpression=update_expression, ExpressionAttributeValues=expression_values)',
+        "    print('UpdateExpression', update_expression)",
+    ]
+    return '\n'.join(lines) + '\n'
+
+
+def regex_extract(code: str):
+    return (
+        lambda_analyzer._extract_processed_fields_regex(code),
+        lambda_analyzer._extract_update_expression_fields_regex(code)
+    )
+
+
+def _measure(func, code: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(code)
+    return (time.perf_counter() - start) / repeat
+
+
+def benchmark(field_counts: List[int], repeat: int) -> int:
+    """
+    Compara ambos extractores para cada tamaño de handler.
+
+    Returns:
+        Cantidad de tamaños en los que el extractor AST fue más lento que el regex
+    """
+    print(f"\n📊 Extractor AST vs regex ({repeat} repeticiones)")
+    print(f"  {'Campos':>7} {'Líneas':>7} {'Regex':>12} {'AST':>12} {'ast.parse':>12} {'Speedup':>8}  Resultado")
+    slower = 0
+    for num_fields in field_counts:
+        code = generate_handler(num_fields)
+        regex_time = _measure(regex_extract, code, repeat)
+        ast_time = _measure(lambda c: extract_fields(c, use_cache=False), code, repeat)
+        parse_time = _measure(lambda c: ast.parse(textwrap.dedent(c)), code, repeat)
+        if ast_time > regex_time:
+            slower += 1
+
+        processed, update_fields = extract_fields(code, use_cache=False)
+        _, regex_update = regex_extract(code)
+        expected = {f'campo{i}' for i in range(num_fields)} | {'modifiedAt'}
+        status = 'completo ✓' if set(update_fields) == expected else 'incompleto ⚠️'
+        regex_status = 'completo' if set(regex_update) == expected else 'incompleto'
+        print(f"  {num_fields:>7} {code.count(chr(10)):>7} {regex_time * 1000:>10.2f}ms "
+              f"{ast_time * 1000:>10.2f}ms {parse_time * 1000:>10.2f}ms {regex_time / ast_time:>7.2f}x  "
+              f"AST {status} / regex {regex_status}")
+
+    if slower:
+        print(f"\n⚠️  El extractor AST fue más lento que el regex en {slower} de {len(field_counts)} tamaños "
+              f"(speedup < 1x): gana en completitud, no en velocidad")
+    return slower
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Benchmark del extractor de campos de lambdas Python')
+    parser.add_argument('--fields', type=int, nargs='+', default=[5, 20, 100, 400],
+                        help='Cantidad de campos de los handlers generados')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if benchmark(args.fields, args.repeat):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
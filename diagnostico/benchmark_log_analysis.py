@@ -0,0 +1,333 @@
+"""
+Benchmark del analizador de logs de CloudWatch.
+
+Genera un corpus sintético con la forma de la salida de
+`aws logs tail --format short` (líneas START/END/REPORT, logs JSON de las
+lambdas con request bodies, errores) y mide líneas por segundo.
+
+Uso:
+    python benchmark_log_analysis.py --lines 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import tempfile
+import time
+from typing import List
+
+import yaml
+
+import cloudwatch_analyzer
+from cloudwatch_analyzer import (
+    parse_log_entry,
+    analyze_cloudwatch_logs,
+    analyze_cloudwatch_logs_parallel,
+    analyze_cloudwatch_log_files,
+    extract_request_bodies,
+    request_bodies_from_entry,
+    identify_patterns,
+    analyze_field_presence,
+    build_recommendations
+)
+from body_replay import BodyReplay, BodyValidator
+from cloudwatch_fetcher import format_event
+from log_cache import CachedLogs, write_log_cache
+from openapi_validator import get_schema_resolver
+
+OPENAPI_SPEC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'documentos_salud_connect_ia',
+                            'turnos-medicos-api-openapi.yaml')
+
+
+def generate_log_corpus(num_lines: int, seed: int = 42) -> List[str]:
+    """
+    Genera líneas de log sintéticas similares a las de ModifyTurnoFunction.
+
+    Args:
+        num_lines: Cantidad de líneas a generar
+        seed: Semilla del generador
+
+    Returns:
+        Lista de líneas de log
+    """
+    rng = random.Random(seed)
+    lines = []
+
+    while len(lines) < num_lines:
+        request_id = '%08x-%04x-%04x-%04x-%012x' % (
+            rng.getrandbits(32), rng.getrandbits(16), rng.getrandbits(16),
+            rng.getrandbits(16), rng.getrandbits(48)
+        )
+        ts = '2026-02-05T14:%02d:%02d' % (rng.randrange(60), rng.randrange(60))
+        fecha_key, hora_key = rng.choice([('fechaTurno', 'horaTurno'), ('fecha', 'hora')])
+        body = {
+            'turnoId': 'TURNO-%06d' % rng.randrange(10 ** 6),
+            'pacienteId': 'PAC-%05d' % rng.randrange(10 ** 5),
+            fecha_key: '2026-02-%02d' % rng.randrange(1, 29),
+            hora_key: '%02d:00' % rng.randrange(8, 20),
+        }
+
+        lines.append(f'{ts} START RequestId: {request_id} Version: $LATEST')
+        lines.append(f'{ts} ' + json.dumps({
+            'level': 'INFO',
+            'message': 'Modificar turno request received',
+            'requestId': request_id,
+            'event': {'body': json.dumps(body), 'httpMethod': 'POST', 'path': '/turnos/modificar'}
+        }))
+        if rng.random() < 0.1:
+            lines.append(f'{ts} ' + json.dumps({
+                'level': 'WARN',
+                'message': 'Missing required parameters',
+                'requestId': request_id,
+                'missingParameters': ['pacienteId']
+            }))
+        elif rng.random() < 0.05:
+            lines.append(f'{ts} ' + json.dumps({
+                'level': 'ERROR',
+                'message': 'Error modifying reservation',
+                'requestId': request_id,
+                'error': 'ConditionalCheckFailedException'
+            }))
+        else:
+            lines.append(f'{ts} ' + json.dumps({
+                'level': 'INFO',
+                'message': 'Reservation modified successfully',
+                'requestId': request_id,
+                'turnoId': body['turnoId']
+            }))
+        lines.append(f'{ts} END RequestId: {request_id}')
+        duration = rng.uniform(20, 400)
+        report = (
+            f'{ts} REPORT RequestId: {request_id}\tDuration: {duration:.2f} ms\t'
+            f'Billed Duration: {int(duration) + 1} ms\tMemory Size: 128 MB\t'
+            f'Max Memory Used: {rng.randrange(70, 100)} MB'
+        )
+        if rng.random() < 0.05:
+            report += f'\tInit Duration: {rng.uniform(150, 600):.2f} ms'
+        lines.append(report)
+
+    return lines[:num_lines]
+
+
+def generate_tail_output(num_lines: int, seed: int = 42) -> List[str]:
+    """
+    Genera salida realista de `aws logs tail --format short` para un log group
+    en formato texto: líneas START/END/REPORT largas y mensajes con el prefijo
+    'timestamp\trequestId\tLEVEL\t' de Lambda.
+    """
+    rng = random.Random(seed)
+    lines = []
+
+    for line in generate_log_corpus(num_lines, seed):
+        ts, _, message = line.partition(' ')
+        if message.startswith('{'):
+            request_id = json.loads(message).get('requestId', 'unknown')
+            level = rng.choice(['INFO', 'INFO', 'INFO', 'WARN'])
+            lines.append(f'{ts} {ts}.{rng.randrange(1000):03d}Z\t{request_id}\t{level}\t{message}')
+        else:
+            lines.append(line)
+
+    return lines
+
+
+def legacy_parse_log_entry(log_line: str):
+    """Implementación original de parse_log_entry, usada como referencia."""
+    try:
+        if log_line.strip().startswith('{'):
+            return json.loads(log_line)
+    except json.JSONDecodeError:
+        pass
+
+    json_match = re.search(r'\{.*\}', log_line)
+    if json_match:
+        try:
+            return json.loads(json_match.group())
+        except json.JSONDecodeError:
+            pass
+
+    return None
+
+
+def legacy_analyze(log_entries: List[str]) -> dict:
+    """Implementación original de tres pasadas, usada como referencia."""
+    request_bodies = extract_request_bodies(log_entries)
+    patterns = identify_patterns(log_entries)
+    field_stats = analyze_field_presence(request_bodies)
+    return {
+        'patterns': patterns,
+        'field_stats': field_stats,
+        'recommendations': build_recommendations(patterns, field_stats)
+    }
+
+
+def _measure(label: str, func, lines: List[str]):
+    start = time.perf_counter()
+    result = func(lines)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed:8.2f}s  {len(lines) / elapsed:>12,.0f} líneas/s")
+    return result, elapsed
+
+
+def benchmark_fused_scanner(lines: List[str]):
+    """Compara el escáner fusionado con las tres pasadas originales."""
+    print("\n📊 Escáner fusionado vs tres pasadas")
+    legacy, legacy_time = _measure('tres pasadas (original)', legacy_analyze, lines)
+    fused, fused_time = _measure('escáner fusionado', analyze_cloudwatch_logs, lines)
+
+    same = (
+        legacy['patterns'] == fused.patterns and
+        legacy['field_stats'] == fused.field_stats
+    )
+    print(f"  Speedup: {legacy_time / fused_time:.2f}x | Resultados idénticos: {'Sí ✓' if same else 'No ⚠️'}")
+
+
+def benchmark_parallel(lines: List[str], workers: int, shards: int):
+    """Compara la ruta serial con el modo de procesos (lista y archivos por log stream)."""
+    print(f"\n📊 Análisis paralelo ({workers} workers, {os.cpu_count()} cores disponibles)")
+    serial, serial_time = _measure('serial', analyze_cloudwatch_logs, lines)
+    parallel, parallel_time = _measure(
+        'paralelo (chunks de lista)',
+        lambda entries: analyze_cloudwatch_logs_parallel(entries, workers=workers),
+        lines
+    )
+    same = (
+        serial.patterns == parallel.patterns and
+        serial.field_stats == parallel.field_stats and
+        serial.request_bodies == parallel.request_bodies
+    )
+    print(f"  Speedup: {serial_time / parallel_time:.2f}x | Resultados idénticos: {'Sí ✓' if same else 'No ⚠️'}")
+
+    # Simular un archivo por log stream
+    shard_dir = tempfile.mkdtemp(prefix='log-shards-')
+    try:
+        paths = []
+        shard_size = -(-len(lines) // shards)
+        for i in range(shards):
+            path = os.path.join(shard_dir, f'stream-{i:03d}.log')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines[i * shard_size:(i + 1) * shard_size]))
+            paths.append(path)
+
+        _, files_serial_time = _measure(
+            'archivos, 1 worker',
+            lambda _: analyze_cloudwatch_log_files(paths, workers=1, max_sample_bodies=None),
+            lines
+        )
+        files_parallel, files_parallel_time = _measure(
+            f'archivos, {workers} workers',
+            lambda _: analyze_cloudwatch_log_files(paths, workers=workers, max_sample_bodies=None),
+            lines
+        )
+        same = files_parallel.patterns == serial.patterns and files_parallel.field_stats == serial.field_stats
+        print(f"  Speedup: {files_serial_time / files_parallel_time:.2f}x | Resultados idénticos: {'Sí ✓' if same else 'No ⚠️'}")
+    finally:
+        shutil.rmtree(shard_dir, ignore_errors=True)
+
+
+def benchmark_log_cache(lines: List[str]):
+    """Compara re-analizar el texto con escanear el cache columnar mapeado en memoria."""
+    print("\n📊 Cache columnar vs texto")
+    base_ms = 1_770_000_000_000
+    events = [
+        {'timestamp': base_ms + i, 'message': line, 'eventId': '%012d' % i}
+        for i, line in enumerate(lines)
+    ]
+    text_lines = [format_event(event) for event in events]
+
+    cache_dir = tempfile.mkdtemp(prefix='log-cache-')
+    try:
+        path = os.path.join(cache_dir, 'window.dxlc')
+        start = time.perf_counter()
+        write_log_cache(path, events, 'benchmark', base_ms, base_ms + len(events))
+        build_time = time.perf_counter() - start
+        print(f"  construcción del cache        {build_time:8.2f}s  ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+        text, text_time = _measure('texto', lambda entries: analyze_cloudwatch_logs(entries), text_lines)
+        with CachedLogs(path) as cached:
+            result, cache_time = _measure('cache (mmap)', lambda _: cached.analyze(), text_lines)
+        same = text.patterns == result.patterns and text.field_stats == result.field_stats
+        print(f"  Speedup: {text_time / cache_time:.2f}x | Resultados idénticos: {'Sí ✓' if same else 'No ⚠️'}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def benchmark_parse_log_entry(num_lines: int, seed: int):
+    """Microbenchmark de parse_log_entry sobre salida de `aws logs tail --format short`."""
+    lines = generate_tail_output(num_lines, seed)
+    print(f"\n📊 parse_log_entry sobre {len(lines):,} líneas de `aws logs tail --format short`")
+
+    def run(parse):
+        return lambda entries: [parse(line) for line in entries]
+
+    legacy, legacy_time = _measure('regex greedy (original)', run(legacy_parse_log_entry), lines)
+
+    fast_decoder = cloudwatch_analyzer.orjson
+    cloudwatch_analyzer.orjson = None
+    try:
+        fast, fast_time = _measure('extractor rápido (json)', run(parse_log_entry), lines)
+    finally:
+        cloudwatch_analyzer.orjson = fast_decoder
+    print(f"  Speedup: {legacy_time / fast_time:.2f}x | Resultados idénticos: {'Sí ✓' if legacy == fast else 'No ⚠️'}")
+
+    if fast_decoder is not None:
+        accel, accel_time = _measure('extractor rápido (orjson)', run(parse_log_entry), lines)
+        print(f"  Speedup: {legacy_time / accel_time:.2f}x | Resultados idénticos: {'Sí ✓' if legacy == accel else 'No ⚠️'}")
+    else:
+        print("  orjson no está instalado; se omite el decoder acelerado (pip install orjson)")
+
+
+def benchmark_body_replay(lines: List[str]):
+    """Compara el replay con validadores compilados una vez contra compilar el schema en cada body."""
+    print("\n📊 Replay de bodies contra OpenAPI")
+    with open(OPENAPI_SPEC, 'r', encoding='utf-8') as f:
+        spec = yaml.safe_load(f)
+
+    def per_body(entries):
+        resolver = get_schema_resolver(spec)
+        invalid = 0
+        for line in entries:
+            if 'body' not in line or '{' not in line:
+                continue
+            parsed = parse_log_entry(line)
+            if not isinstance(parsed, dict):
+                continue
+            for body in request_bodies_from_entry(parsed):
+                operation = spec['paths']['/turnos/modificar']['post']
+                schema = resolver.flatten(operation['requestBody']['content']['application/json']['schema'])
+                invalid += bool(BodyValidator('/turnos/modificar', 'post', schema).validate(body))
+        return invalid
+
+    def compiled(entries):
+        replay = BodyReplay(spec)
+        replay.add_lines(entries)
+        return sum(operation.invalid_bodies for operation in replay.report().operations)
+
+    naive, naive_time = _measure('schema compilado por body', per_body, lines)
+    fast, fast_time = _measure('validadores compilados', compiled, lines)
+    print(f"  Speedup: {naive_time / fast_time:.2f}x | Resultados idénticos: {'Sí ✓' if naive == fast else 'No ⚠️'}")
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Benchmark del analizador de logs')
+    parser.add_argument('--lines', type=int, default=1_000_000, help='Líneas del corpus sintético')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Procesos para el modo paralelo')
+    parser.add_argument('--shards', type=int, default=16, help='Archivos de log stream simulados')
+    args = parser.parse_args()
+
+    print(f"\n🔧 Generando corpus sintético de {args.lines:,} líneas...")
+    lines = generate_log_corpus(args.lines, args.seed)
+
+    benchmark_parse_log_entry(min(args.lines, 200_000), args.seed)
+    benchmark_fused_scanner(lines)
+    benchmark_parallel(lines, args.workers, args.shards)
+    benchmark_log_cache(lines)
+    benchmark_body_replay(lines)
+
+
+if __name__ == '__main__':
+    main()
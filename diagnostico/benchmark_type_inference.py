@@ -0,0 +1,209 @@
+"""
+Benchmark de la inferencia de tipos y formatos de type_inference sobre un corpus.
+
+El corpus tiene dos partes:
+- casos etiquetados: handlers Python y JavaScript armados con los patrones de
+  parseo que aparecen (o aparecieron) en las lambdas de turnos, cada uno con
+  la evidencia esperada por campo; miden precisión y recall
+- las lambdas inline de los templates indicados: el costo real por deploy
+
+Se mide cada handler sin cache y con el cache de análisis caliente. Con
+--max-ms el script termina con código 1 si algún handler supera el
+presupuesto sin cache o si el recall baja de --min-recall, así se puede correr
+en cada deploy como gate sin que CI tenga que correr la suite completa.
+
+Uso:
+    python benchmark_type_inference.py --template ../documentos_salud_connect_ia/turnos-medicos-api-final.yaml
+    python benchmark_type_inference.py --copies 20 --max-ms 50 --min-recall 1.0
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from typing import List, Dict, Set, Tuple
+
+from analysis_cache import configure_analysis_cache
+from template_index import load_template_index
+from type_inference import infer_field_types
+
+
+# (lenguaje, cuerpo del handler, campo -> {(tipo de evidencia, valor)})
+# En los cuerpos, {n} se reemplaza por el número de copia para variar los nombres
+CORPUS_CASES: List[Tuple[str, str, Dict[str, Set[Tuple[str, str]]]]] = [
+    ('python', """
+    fecha = body.get('fechaTurno{n}') or body.get('fecha{n}')
+    datetime.strptime(fecha, '%Y-%m-%d')
+""", {'fechaTurno{n}': {('strptime', '%Y-%m-%d')}, 'fecha{n}': {('strptime', '%Y-%m-%d')}}),
+    ('python', """
+    hora = body['horaTurno{n}'].strip()
+    if not HORA_RE.match(hora):
+        return {'statusCode': 400}
+""", {'horaTurno{n}': {('string', 'strip'), ('regex', r'^\d{2}:\d{2}$')}}),
+    ('python', """
+    inicio = datetime.fromisoformat(body.get('inicio{n}'))
+    dia = date.fromisoformat(body['dia{n}'])
+""", {'inicio{n}': {('fromisoformat', 'datetime')}, 'dia{n}': {('fromisoformat', 'date')}}),
+    ('python', """
+    if re.fullmatch(r'\\d{2}/\\d{2}/\\d{4}', body.get('nacimiento{n}', '')):
+        pass
+""", {'nacimiento{n}': {('regex', r'\d{2}/\d{2}/\d{4}')}}),
+    ('python', """
+    cantidad = int(body.get('cantidad{n}', 1))
+    valor = Decimal(str(body['valor{n}']))
+    urgente = body.get('urgente{n}') is True
+    if isinstance(body.get('edad{n}'), (int, float)):
+        pass
+""", {'cantidad{n}': {('integer', 'int')}, 'valor{n}': {('decimal', 'Decimal')},
+      'urgente{n}': {('boolean', 'True')}, 'edad{n}': {('isinstance', 'number')}}),
+    ('python', """
+    telefono = body.get('telefono{n}')
+    partes = telefono.split('-')
+""", {'telefono{n}': {('string', 'split')}}),
+    ('javascript', """
+  const fecha{n} = body.fechaTurno{n} || body.fecha{n};
+  const cuando{n} = new Date(fecha{n});
+""", {'fechaTurno{n}': {('js_date', 'new Date')}, 'fecha{n}': {('js_date', 'new Date')}}),
+    ('javascript', """
+  const {{ horaTurno{n}: hora{n} }} = body;
+  if (!/^\\d{{2}}:\\d{{2}}$/.test(hora{n})) return {{ statusCode: 400 }};
+""", {'horaTurno{n}': {('regex', r'^\d{2}:\d{2}$')}}),
+    ('javascript', """
+  const total{n} = parseFloat(body['total{n}']);
+  const cuotas{n} = parseInt(body.cuotas{n}, 10);
+  if (typeof body.activo{n} === 'boolean') {{}}
+""", {'total{n}': {('number', 'parseFloat')}, 'cuotas{n}': {('integer', 'parseInt')},
+      'activo{n}': {('typeof', 'boolean')}}),
+    ('javascript', """
+  const email{n} = body.emailPaciente{n}.trim().toLowerCase();
+  const dni{n} = body.dni{n}.match(/^\\d+$/);
+""", {'emailPaciente{n}': {('string', 'trim')}, 'dni{n}': {('string', 'match'), ('regex', r'^\d+$')}}),
+]
+
+_PYTHON_HEADER = """import json
+import re
+from datetime import date, datetime
+from decimal import Decimal
+
+HORA_RE = re.compile(r'^\\d{2}:\\d{2}$')
+
+
+def handler(event, context):
+    body = json.loads(event['body'])
+"""
+
+_JAVASCRIPT_HEADER = """export const handler = async (event) => {
+  const body = JSON.parse(event.body);
+"""
+
+
+def build_corpus(copies: int) -> List[Tuple[str, str, Dict[str, Set[Tuple[str, str]]]]]:
+    """
+    Arma los handlers etiquetados: cada caso repetido `copies` veces con
+    nombres de campo distintos dentro de un mismo handler por lenguaje.
+
+    Args:
+        copies: Repeticiones de cada caso
+
+    Returns:
+        Lista de (nombre, código, evidencia esperada por campo)
+    """
+    corpus = []
+    for index, (language, body, expected) in enumerate(CORPUS_CASES):
+        code = _PYTHON_HEADER if language == 'python' else _JAVASCRIPT_HEADER
+        labels: Dict[str, Set[Tuple[str, str]]] = {}
+        for n in range(copies):
+            code += body.replace('{n}', str(n)) if language == 'python' else body.format(n=n)
+            for field_name, evidence in expected.items():
+                labels[field_name.replace('{n}', str(n))] = set(evidence)
+        if language == 'javascript':
+            code += '};\n'
+        corpus.append((f'{language}-{index}', code, labels))
+    return corpus
+
+
+def score(predicted: Dict[str, Set[Tuple[str, str]]], expected: Dict[str, Set[Tuple[str, str]]]) -> Tuple[int, int, int]:
+    """Verdaderos positivos, falsos positivos y falsos negativos sobre (campo, tipo, valor)."""
+    predicted_items = {(name, *item) for name, items in predicted.items() for item in items}
+    expected_items = {(name, *item) for name, items in expected.items() for item in items}
+    return (len(predicted_items & expected_items), len(predicted_items - expected_items),
+            len(expected_items - predicted_items))
+
+
+def _measure(code: str, use_cache: bool, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        infer_field_types(code, use_cache=use_cache)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def benchmark(copies: int, templates: List[str], repeat: int) -> Tuple[float, float]:
+    """
+    Corre el benchmark e imprime los resultados.
+
+    Returns:
+        Tupla (peor tiempo sin cache en ms, recall de los casos etiquetados)
+    """
+    # Cache propio para no mezclar con el compartido del proceso
+    configure_analysis_cache()
+    handlers = build_corpus(copies)
+    for template in templates:
+        index = load_template_index(template)
+        for name, info in index.lambdas.items():
+            if info.inline_code:
+                handlers.append((name, info.inline_code, None))
+
+    print(f"\n📊 Inferencia de tipos/formatos: {len(handlers)} handlers ({repeat} repeticiones)")
+    print(f"  {'Handler':<28} {'Líneas':>7} {'Sin cache':>11} {'Con cache':>11}  Resultado")
+    true_positives = false_positives = false_negatives = 0
+    uncached_times = []
+    for name, code, labels in handlers:
+        uncached = _measure(code, False, repeat)
+        infer_field_types(code)
+        cached = _measure(code, True, repeat)
+        uncached_times.append(uncached)
+
+        inferred = infer_field_types(code, use_cache=False)
+        predicted = {field_name: {(e.kind, e.value) for e in info.evidence} for field_name, info in inferred.items()}
+        if labels is None:
+            result = f"{sum(1 for info in inferred.values() if info.evidence)} campos con evidencia"
+        else:
+            tp, fp, fn = score({k: v for k, v in predicted.items() if v}, labels)
+            true_positives, false_positives, false_negatives = \
+                true_positives + tp, false_positives + fp, false_negatives + fn
+            result = 'completo ✓' if not fp and not fn else f'{fp} FP / {fn} FN ⚠️'
+        print(f"  {name[:28]:<28} {code.count(chr(10)):>7} {uncached:>9.2f}ms {cached:>9.3f}ms  {result}")
+
+    precision = true_positives / ((true_positives + false_positives) or 1)
+    recall = true_positives / ((true_positives + false_negatives) or 1)
+    print(f"\n  Precisión: {precision:.1%}  Recall: {recall:.1%}")
+    print(f"  Sin cache: mediana {statistics.median(uncached_times):.2f}ms, máximo {max(uncached_times):.2f}ms "
+          f"por handler, total {sum(uncached_times):.1f}ms")
+    return max(uncached_times), recall
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Benchmark de la inferencia de tipos y formatos de lambdas')
+    parser.add_argument('--template', action='append', default=[],
+                        help='Template con lambdas inline a incluir en el corpus (repetible)')
+    parser.add_argument('--copies', type=int, default=5, help='Repeticiones de cada caso etiquetado')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-ms', type=float, help='Presupuesto por handler sin cache (falla si se supera)')
+    parser.add_argument('--min-recall', type=float, default=0.0, help='Recall mínimo de los casos etiquetados')
+    args = parser.parse_args()
+
+    worst, recall = benchmark(args.copies, args.template, args.repeat)
+    failed = False
+    if args.max_ms is not None and worst > args.max_ms:
+        print(f"\n❌ Un handler tardó {worst:.2f}ms (presupuesto {args.max_ms}ms)")
+        failed = True
+    if recall < args.min_recall:
+        print(f"\n❌ Recall {recall:.1%} por debajo de {args.min_recall:.1%}")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,556 @@
+"""
+Replay de los request bodies de los logs contra el schema de OpenAPI.
+
+Conecta extract_request_bodies con openapi_validator: cada body que aparece en
+los logs (en 'body' o en 'event.body') se valida contra el requestBody de la
+operación que lo recibió y las violaciones se cuentan por campo y por ventana
+de tiempo, por ejemplo cuántas veces por hora el agente mandó `fecha` en vez
+de `fechaTurno`.
+
+El schema de cada operación se compila una sola vez en un validador (un
+closure por chequeo de cada propiedad) que queda cacheado por spec, así que
+el costo por body es el de recorrer sus campos. Se procesa en streaming: la
+memoria depende de la cantidad de campos y de ventanas, no de las líneas.
+
+Chequeos soportados (el subconjunto de JSON Schema que usan los specs del
+proyecto): type (con nullable), required, enum, format de fecha/hora, email,
+pattern, layouts de la descripción como "(HH:MM)", minLength/maxLength,
+minimum/maximum, properties anidadas e items.
+"""
+
+import argparse
+import difflib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Iterable, Tuple, Callable
+
+import yaml
+
+from cloudwatch_analyzer import parse_log_entry, request_bodies_from_entry
+from openapi_validator import get_schema_resolver
+from request_correlation import extract_request_context
+from type_inference import declared_formats
+
+
+# Ventana de tiempo por defecto para las tasas de violación
+DEFAULT_BUCKET_SECONDS = 3600
+
+# Validadores compilados que se mantienen en cache
+MAX_CACHED_VALIDATORS = 64
+
+# Similitud mínima para considerar que un campo no documentado reemplaza a uno documentado
+SUBSTITUTION_SIMILARITY = 0.75
+
+# Campo usado para las violaciones del body completo (no es un objeto JSON)
+BODY_FIELD = '<body>'
+
+# Tipos de violación
+VIOLATION_KINDS = ('missing', 'undocumented', 'type', 'enum', 'format', 'length', 'range')
+
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    'string': lambda v: isinstance(v, str),
+    'integer': lambda v: (isinstance(v, int) and not isinstance(v, bool)) or (isinstance(v, float) and v.is_integer()),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+}
+
+# Un chequeo recibe el valor y devuelve el tipo de violación o None
+Check = Callable[[Any], Optional[str]]
+
+
+class BodyValidator:
+    """
+    Validador compilado del requestBody de una operación.
+
+    validate() devuelve las violaciones de un body como pares (campo, tipo);
+    los campos anidados se nombran 'padre.hijo' y los items 'lista[]'.
+    """
+
+    def __init__(self, endpoint: str, method: str, schema: Dict[str, Any]):
+        self.endpoint = endpoint
+        self.method = method
+        self.fields = tuple((schema.get('properties') or {}).keys())
+        self.required = tuple(schema.get('required', []))
+        self._validate_object = _compile_object(schema, '')
+        self._substitutes: Dict[str, Optional[str]] = {}
+
+    def validate(self, body: Any) -> List[Tuple[str, str]]:
+        if not isinstance(body, dict):
+            return [(BODY_FIELD, 'type')]
+        violations: List[Tuple[str, str]] = []
+        self._validate_object(body, violations)
+        return violations
+
+    def substitute_for(self, name: str) -> Optional[str]:
+        """Campo documentado que un campo no documentado probablemente reemplaza ('fecha' -> 'fechaTurno')."""
+        if name not in self._substitutes:
+            lowered = name.lower()
+            best, best_score = None, SUBSTITUTION_SIMILARITY
+            for candidate in self.fields:
+                candidate_lower = candidate.lower()
+                score = 1.0 if lowered in candidate_lower or candidate_lower in lowered else \
+                    difflib.SequenceMatcher(None, lowered, candidate_lower).ratio()
+                if score >= best_score and (best is None or score > best_score):
+                    best, best_score = candidate, score
+            self._substitutes[name] = best
+        return self._substitutes[name]
+
+
+def _compile_value(schema: Dict[str, Any], name: str) -> Callable[[Any, List[Tuple[str, str]]], None]:
+    """Compila los chequeos de una propiedad en un solo closure."""
+    checks: List[Check] = []
+    expected_type = schema.get('type')
+    nullable = bool(schema.get('nullable'))
+
+    type_check = _TYPE_CHECKS.get(expected_type)
+    if type_check is not None:
+        checks.append(lambda v: None if type_check(v) else 'type')
+    if 'enum' in schema:
+        allowed = list(schema['enum'])
+        checks.append(lambda v: None if v in allowed else 'enum')
+
+    patterns = [re.compile(declared.pattern) for declared in declared_formats(schema)]
+    if schema.get('format') == 'email':
+        patterns.append(_EMAIL_RE)
+    if patterns:
+        checks.append(lambda v: 'format' if isinstance(v, str) and not all(p.search(v) for p in patterns) else None)
+
+    min_length, max_length = schema.get('minLength'), schema.get('maxLength')
+    if min_length is not None or max_length is not None:
+        low, high = min_length or 0, max_length if max_length is not None else float('inf')
+        checks.append(lambda v: 'length' if isinstance(v, str) and not low <= len(v) <= high else None)
+    minimum, maximum = schema.get('minimum'), schema.get('maximum')
+    if minimum is not None or maximum is not None:
+        low = minimum if minimum is not None else float('-inf')
+        high = maximum if maximum is not None else float('inf')
+        checks.append(lambda v: 'range' if _TYPE_CHECKS['number'](v) and not low <= v <= high else None)
+
+    nested = _compile_object(schema, f'{name}.') if schema.get('properties') else None
+    items = _compile_value(schema['items'], f'{name}[]') if isinstance(schema.get('items'), dict) \
+        and schema['items'] else None
+
+    def validate(value: Any, violations: List[Tuple[str, str]]):
+        if value is None and nullable:
+            return
+        for check in checks:
+            kind = check(value)
+            if kind is not None:
+                violations.append((name, kind))
+                if kind == 'type':
+                    return
+        if nested is not None and isinstance(value, dict):
+            nested(value, violations)
+        if items is not None and isinstance(value, list):
+            for item in value:
+                items(item, violations)
+
+    return validate
+
+
+def _compile_object(schema: Dict[str, Any], prefix: str) -> Callable[[Dict[str, Any], List[Tuple[str, str]]], None]:
+    properties = {
+        name: _compile_value(property_schema, f'{prefix}{name}')
+        for name, property_schema in (schema.get('properties') or {}).items()
+    }
+    required = [(name, f'{prefix}{name}') for name in schema.get('required', [])]
+
+    def validate(body: Dict[str, Any], violations: List[Tuple[str, str]]):
+        for name, qualified in required:
+            if name not in body:
+                violations.append((qualified, 'missing'))
+        for name, value in body.items():
+            check = properties.get(name)
+            if check is None:
+                violations.append((f'{prefix}{name}', 'undocumented'))
+            else:
+                check(value, violations)
+
+    return validate
+
+
+_VALIDATORS: 'OrderedDict[Tuple[int, str, str], Tuple[dict, Optional[BodyValidator]]]' = OrderedDict()
+_VALIDATORS_LOCK = threading.Lock()
+
+
+def request_body_schema(openapi_spec: dict, endpoint: str, method: str = 'post') -> Dict[str, Any]:
+    """Schema JSON aplanado del requestBody de una operación ({} si no tiene)."""
+    resolver = get_schema_resolver(openapi_spec)
+    path_item = resolver.deref(openapi_spec.get('paths', {}).get(endpoint) or {})
+    operation = resolver.deref(path_item.get(method) or {})
+    request_body = resolver.deref(operation.get('requestBody') or {})
+    media = (request_body.get('content') or {}).get('application/json') or {}
+    return resolver.flatten(media.get('schema') or {})
+
+
+def get_body_validator(openapi_spec: dict, endpoint: str, method: str = 'post') -> Optional[BodyValidator]:
+    """
+    Devuelve el validador compilado del requestBody de una operación.
+
+    Se compila una vez por (spec, endpoint, método) y queda en un LRU.
+
+    Args:
+        openapi_spec: Especificación OpenAPI parseada
+        endpoint: Path de la operación
+        method: Método HTTP
+
+    Returns:
+        BodyValidator o None si la operación no tiene schema JSON
+    """
+    key = (id(openapi_spec), endpoint, method)
+    with _VALIDATORS_LOCK:
+        cached = _VALIDATORS.get(key)
+        if cached is not None and cached[0] is openapi_spec:
+            _VALIDATORS.move_to_end(key)
+            return cached[1]
+
+    schema = request_body_schema(openapi_spec, endpoint, method)
+    validator = BodyValidator(endpoint, method, schema) if schema else None
+
+    with _VALIDATORS_LOCK:
+        _VALIDATORS[key] = (openapi_spec, validator)
+        while len(_VALIDATORS) > MAX_CACHED_VALIDATORS:
+            _VALIDATORS.popitem(last=False)
+    return validator
+
+
+class OperationMatcher:
+    """Resuelve el path template del spec ('/turnos/{id}') a partir del evento de API Gateway."""
+
+    def __init__(self, openapi_spec: dict):
+        self.paths = set((openapi_spec.get('paths') or {}).keys())
+        self._templates = [
+            (re.compile('^' + re.sub(r'\\\{[^/]+?\\\}', '[^/]+', re.escape(path)) + '$'), path)
+            for path in sorted(self.paths) if '{' in path
+        ]
+        self._cache: Dict[str, Optional[str]] = {}
+
+    def match(self, event: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Args:
+            event: Evento de API Gateway (o lo que la Lambda logueó de él)
+
+        Returns:
+            Tupla (endpoint, método); None en lo que no se pudo resolver
+        """
+        method = event.get('httpMethod')
+        method = method.lower() if isinstance(method, str) else None
+        for key in ('resource', 'path'):
+            path = event.get(key)
+            if isinstance(path, str):
+                endpoint = self._resolve(path)
+                if endpoint is not None:
+                    return endpoint, method
+        return None, method
+
+    def _resolve(self, path: str) -> Optional[str]:
+        if path in self.paths:
+            return path
+        if path not in self._cache:
+            self._cache[path] = next((template for regex, template in self._templates if regex.match(path)), None)
+        return self._cache[path]
+
+
+@dataclass
+class ReplayBucket:
+    """Violaciones de una operación en una ventana de tiempo"""
+    start: Optional[str]  # ISO 8601 (None = líneas sin timestamp)
+    bodies: int = 0
+    invalid_bodies: int = 0
+    # campo -> tipo de violación -> bodies
+    violations: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+@dataclass
+class OperationReplay:
+    """Resultado del replay de una operación"""
+    endpoint: str
+    method: str
+    bodies: int = 0
+    invalid_bodies: int = 0
+    violations: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # 'fecha -> fechaTurno' -> bodies que mandaron el primero sin el segundo
+    substitutions: Dict[str, int] = field(default_factory=dict)
+    buckets: List[ReplayBucket] = field(default_factory=list)
+
+    def field_rates(self) -> Dict[str, float]:
+        """Tasa de bodies con alguna violación en cada campo."""
+        if not self.bodies:
+            return {}
+        return {name: sum(kinds.values()) / self.bodies for name, kinds in self.violations.items()}
+
+    def timeline(self, field_name: str, kind: Optional[str] = None) -> List[Tuple[Optional[str], int, float]]:
+        """
+        Serie temporal de la tasa de violación de un campo.
+
+        Args:
+            field_name: Campo (ej: 'fecha', 'fechaTurno')
+            kind: Tipo de violación (None = todos)
+
+        Returns:
+            Lista de (inicio de la ventana, bodies, tasa)
+        """
+        series = []
+        for bucket in self.buckets:
+            kinds = bucket.violations.get(field_name, {})
+            count = kinds.get(kind, 0) if kind else sum(kinds.values())
+            series.append((bucket.start, bucket.bodies, count / bucket.bodies if bucket.bodies else 0.0))
+        return series
+
+
+@dataclass
+class ReplayReport:
+    """Resultado del replay de los bodies de un conjunto de logs"""
+    total_lines: int
+    body_count: int
+    unmatched_bodies: int  # sin operación o sin schema para validarlos
+    bucket_seconds: int
+    operations: List[OperationReplay]
+    elapsed_seconds: float = 0.0
+
+
+def _bucket_start(timestamp: Optional[str], bucket_seconds: int) -> Optional[int]:
+    if not timestamp:
+        return None
+    try:
+        moment = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    epoch = int(moment.timestamp())
+    return epoch - epoch % bucket_seconds
+
+
+class _OperationState:
+    def __init__(self, validator: BodyValidator):
+        self.validator = validator
+        self.bodies = 0
+        self.invalid = 0
+        self.violations: Dict[str, Dict[str, int]] = {}
+        self.substitutions: Dict[str, int] = {}
+        # inicio de ventana -> [bodies, inválidos, violaciones]
+        self.buckets: Dict[Optional[int], List[Any]] = {}
+
+
+class BodyReplay:
+    """
+    Valida en streaming los bodies de los logs contra el spec.
+
+    La operación de cada body se toma del evento logueado (resource o path y
+    httpMethod); si el log no la tiene se usa default_endpoint, por ejemplo
+    la ruta de la Lambda dueña del log group.
+    """
+
+    def __init__(self, openapi_spec: dict, bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+                 default_endpoint: Optional[str] = None, default_method: str = 'post'):
+        self.spec = openapi_spec
+        self.bucket_seconds = bucket_seconds
+        self.default_endpoint = default_endpoint
+        self.default_method = default_method
+        self.matcher = OperationMatcher(openapi_spec)
+        self.total_lines = 0
+        self.body_count = 0
+        self.unmatched_bodies = 0
+        self._operations: Dict[Tuple[str, str], _OperationState] = {}
+        self._elapsed = 0.0
+
+    def _state(self, endpoint: str, method: str) -> Optional[_OperationState]:
+        key = (endpoint, method)
+        state = self._operations.get(key)
+        if state is None:
+            validator = get_body_validator(self.spec, endpoint, method)
+            if validator is None:
+                return None
+            state = self._operations[key] = _OperationState(validator)
+        return state
+
+    def add_body(self, body: Any, endpoint: Optional[str] = None, method: Optional[str] = None,
+                 timestamp: Optional[str] = None):
+        """
+        Valida un body y acumula sus violaciones.
+
+        Args:
+            body: Body ya decodificado
+            endpoint: Path del spec (None = default_endpoint)
+            method: Método HTTP (None = default_method)
+            timestamp: Timestamp ISO 8601 del log (None = ventana sin timestamp)
+        """
+        self.body_count += 1
+        state = self._state(endpoint or self.default_endpoint or '', method or self.default_method)
+        if state is None:
+            self.unmatched_bodies += 1
+            return
+
+        violations = state.validator.validate(body)
+        state.bodies += 1
+        bucket_key = _bucket_start(timestamp, self.bucket_seconds)
+        bucket = state.buckets.get(bucket_key)
+        if bucket is None:
+            bucket = state.buckets[bucket_key] = [0, 0, {}]
+        bucket[0] += 1
+        if not violations:
+            return
+
+        state.invalid += 1
+        bucket[1] += 1
+        # Un body cuenta una vez por (campo, tipo)
+        for name, kind in dict.fromkeys(violations):
+            kinds = state.violations.setdefault(name, {})
+            kinds[kind] = kinds.get(kind, 0) + 1
+            bucket_kinds = bucket[2].setdefault(name, {})
+            bucket_kinds[kind] = bucket_kinds.get(kind, 0) + 1
+
+        undocumented = [name for name, kind in violations if kind == 'undocumented']
+        if undocumented and isinstance(body, dict):
+            for name in undocumented:
+                substitute = state.validator.substitute_for(name)
+                if substitute is not None and substitute not in body:
+                    pair = f'{name} -> {substitute}'
+                    state.substitutions[pair] = state.substitutions.get(pair, 0) + 1
+
+    def add_line(self, log_line: str):
+        """Procesa una línea de log."""
+        self.add_lines((log_line,))
+
+    def add_lines(self, log_lines: Iterable[str]):
+        """
+        Procesa líneas de log; solo se parsean las que pueden tener un body.
+        """
+        started = time.perf_counter()
+        total = 0
+        try:
+            for log_line in log_lines:
+                total += 1
+                if 'body' not in log_line or '{' not in log_line:
+                    continue
+                parsed = parse_log_entry(log_line)
+                if not isinstance(parsed, dict):
+                    continue
+                bodies = request_bodies_from_entry(parsed)
+                if not bodies:
+                    continue
+                event = parsed.get('event') if isinstance(parsed.get('event'), dict) else parsed
+                endpoint, method = self.matcher.match(event)
+                timestamp = extract_request_context(log_line, parsed)['timestamp']
+                for body in bodies:
+                    self.add_body(body, endpoint, method, timestamp)
+        finally:
+            self.total_lines += total
+            self._elapsed += time.perf_counter() - started
+
+    def report(self) -> ReplayReport:
+        operations = []
+        for (endpoint, method), state in self._operations.items():
+            buckets = []
+            for start in sorted(state.buckets, key=lambda s: (s is None, s or 0)):
+                bodies, invalid, violations = state.buckets[start]
+                iso = datetime.fromtimestamp(start, tz=timezone.utc).isoformat() if start is not None else None
+                buckets.append(ReplayBucket(iso, bodies, invalid, violations))
+            operations.append(OperationReplay(
+                endpoint=endpoint,
+                method=method,
+                bodies=state.bodies,
+                invalid_bodies=state.invalid,
+                violations=state.violations,
+                substitutions=dict(sorted(state.substitutions.items(), key=lambda item: -item[1])),
+                buckets=buckets
+            ))
+        return ReplayReport(
+            total_lines=self.total_lines,
+            body_count=self.body_count,
+            unmatched_bodies=self.unmatched_bodies,
+            bucket_seconds=self.bucket_seconds,
+            operations=operations,
+            elapsed_seconds=self._elapsed
+        )
+
+
+def replay_request_bodies(log_lines: Iterable[str], openapi_spec: dict,
+                          bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+                          default_endpoint: Optional[str] = None) -> ReplayReport:
+    """
+    Valida los request bodies de un conjunto de líneas de log contra el spec.
+
+    Args:
+        log_lines: Iterable de líneas de log (se consume en streaming)
+        openapi_spec: Especificación OpenAPI parseada
+        bucket_seconds: Tamaño de las ventanas de tiempo
+        default_endpoint: Operación de los bodies cuyo log no trae path
+
+    Returns:
+        ReplayReport con las violaciones por operación, campo y ventana
+    """
+    replay = BodyReplay(openapi_spec, bucket_seconds, default_endpoint)
+    replay.add_lines(log_lines)
+    return replay.report()
+
+
+def print_replay_report(report: ReplayReport, top_fields: int = 10):
+    """Imprime el resultado del replay de forma legible."""
+    print(f"\n{'='*80}")
+    print("REPLAY DE REQUEST BODIES CONTRA OPENAPI")
+    print(f"{'='*80}")
+    print(f"\nLíneas procesadas: {report.total_lines}")
+    print(f"Bodies encontrados: {report.body_count} ({report.unmatched_bodies} sin operación en el spec)")
+    if report.elapsed_seconds > 0:
+        print(f"Throughput: {report.total_lines / report.elapsed_seconds:,.0f} líneas/s")
+
+    for operation in report.operations:
+        icon = '✅' if not operation.invalid_bodies else '⚠️'
+        rate = operation.invalid_bodies / operation.bodies if operation.bodies else 0.0
+        print(f"\n{icon} {operation.method.upper()} {operation.endpoint}: "
+              f"{operation.invalid_bodies}/{operation.bodies} bodies con violaciones ({rate:.1%})")
+
+        rates = sorted(operation.field_rates().items(), key=lambda item: -item[1])[:top_fields]
+        for name, field_rate in rates:
+            kinds = ', '.join(f'{kind}: {count}' for kind, count in operation.violations[name].items())
+            print(f"   - {name}: {field_rate:.1%} ({kinds})")
+        for pair, count in operation.substitutions.items():
+            print(f"   🔁 {pair}: {count} bodies")
+
+        if len(operation.buckets) > 1 and rates:
+            name = rates[0][0]
+            print(f"   📈 {name} por ventana de {report.bucket_seconds // 60} min:")
+            for start, bodies, field_rate in operation.timeline(name):
+                print(f"      {start or 'sin timestamp'}: {field_rate:.1%} de {bodies}")
+
+    print(f"\n{'='*80}\n")
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Valida los request bodies de logs contra la especificación OpenAPI')
+    parser.add_argument('logs', nargs='+', help='Archivos de log (salida de `aws logs tail`)')
+    parser.add_argument('--openapi', default='documentos_salud_connect_ia/turnos-medicos-api-openapi.yaml')
+    parser.add_argument('--endpoint', help='Operación de los bodies cuyo log no trae path (ej: /turnos/modificar)')
+    parser.add_argument('--bucket-minutes', type=int, default=DEFAULT_BUCKET_SECONDS // 60)
+    parser.add_argument('--json', metavar='PATH', help='Escribir el resultado como JSON')
+    args = parser.parse_args()
+
+    with open(args.openapi, 'r', encoding='utf-8') as f:
+        spec = yaml.safe_load(f)
+
+    replay = BodyReplay(spec, args.bucket_minutes * 60, args.endpoint)
+    for path in args.logs:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            replay.add_lines(line.rstrip('\n') for line in f)
+    report = replay.report()
+    print_replay_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(asdict(report), f, ensure_ascii=False, indent=2)
+        print(f"📄 Replay en JSON: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
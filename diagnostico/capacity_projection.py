@@ -0,0 +1,608 @@
+"""
+Proyección de capacidad y costo del stack a 1x/10x/100x del tráfico actual.
+
+Combina tres fuentes:
+- logs: invocaciones por segundo y duración facturada de cada función (líneas
+  REPORT), más la muestra de request bodies para estimar claves calientes
+- template: MemorySize/Timeout de cada función, rutas de API Gateway, tablas
+  y las funciones de custom resources (corren en el deploy, no por request)
+- datos de seed: tamaño de los ítems y de las particiones (dynamodb_access)
+
+Proyecta GB-segundos de Lambda, RCU/WCU de DynamoDB y requests de API
+Gateway por mes, y busca el multiplicador de tráfico en el que cada
+componente llega a su límite: concurrencia de la cuenta, throughput por
+partición y por tabla, throttling de API Gateway, la página de 1 MB de los
+Query sin paginar (las particiones crecen con las escrituras acumuladas).
+Timeout/MemorySize de las funciones de seed no dependen del tráfico: se
+proyectan contra la cantidad de ítems que cargan. Los límites y precios son
+los valores por defecto de us-east-1.
+"""
+
+import argparse
+import math
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Callable, Iterable, Tuple
+
+from cloudwatch_analyzer import LogAnalysis, analyze_cloudwatch_log_file, match_function_name, parse_log_entry
+from dynamodb_access import (
+    DEFAULT_SEED_DATA,
+    PAGE_LIMIT_BYTES,
+    READ_UNIT_BYTES,
+    WRITE_UNIT_BYTES,
+    AccessPattern,
+    analyze_dynamodb_access,
+    load_seed_data,
+    parse_seed_argument,
+    top_level_item_size,
+)
+from request_correlation import extract_request_context
+from template_index import TemplateIndex, discover_api_routes, load_template_index
+
+
+DEFAULT_MULTIPLIERS = (1, 10, 100)
+
+# Ventana en la que se acumulan las escrituras para proyectar el tamaño de las particiones
+DEFAULT_HORIZON_DAYS = 30
+
+SECONDS_PER_MONTH = 30 * 24 * 3600
+
+# Límites por defecto de la cuenta / servicio
+ACCOUNT_CONCURRENCY_LIMIT = 1000
+API_GATEWAY_RPS_LIMIT = 10000
+PARTITION_RCU_LIMIT = 3000
+PARTITION_WCU_LIMIT = 1000
+ON_DEMAND_TABLE_RCU_LIMIT = 40000
+ON_DEMAND_TABLE_WCU_LIMIT = 40000
+
+# Precios de lista (USD)
+LAMBDA_GB_SECOND_USD = 0.0000166667
+LAMBDA_REQUEST_USD = 0.20 / 1e6
+DYNAMODB_READ_UNIT_USD = 0.125 / 1e6
+DYNAMODB_WRITE_UNIT_USD = 0.625 / 1e6
+API_GATEWAY_REQUEST_USD = 3.50 / 1e6
+
+# Supuestos para tablas y funciones sin datos observados
+DEFAULT_ITEM_BYTES = 1024
+SEED_BATCH_SIZE = 25  # límite de BatchWriteItem
+SEED_BATCH_MS = 50.0
+SEED_FIXED_MS = 1000.0  # descarga de los datos e init
+RUNTIME_BASELINE_MB = 70.0
+JSON_MEMORY_FACTOR = 4.0  # memoria del objeto parseado respecto del JSON
+TIMEOUT_WARNING_RATIO = 0.8
+
+# Multiplicador máximo que se busca al calcular el punto de saturación
+MAX_MULTIPLIER = 1e6
+
+
+
+@dataclass
+class FunctionLoad:
+    """Carga observada de una función y su configuración en el template"""
+    name: str
+    memory_size_mb: int
+    timeout_seconds: int
+    invocations: int = 0
+    rate_per_second: float = 0.0
+    avg_billed_ms: float = 0.0
+    p99_duration_ms: Optional[float] = None
+    max_memory_used_mb: Optional[float] = None
+    api_routes: int = 0
+    deploy_time: bool = False  # servicio de un custom resource: corre en el deploy
+
+    @property
+    def gb_seconds_per_invocation(self) -> float:
+        return self.avg_billed_ms / 1000 * self.memory_size_mb / 1024
+
+
+@dataclass
+class Saturation:
+    """Punto en el que un componente llega a su límite"""
+    component: str
+    resource: str
+    demand: float  # con el tráfico actual
+    limit: float
+    unit: str
+    multiplier: float  # multiplicador de tráfico que lo satura (inf si no se alcanza)
+    detail: str = ''
+    driver: str = 'tráfico'  # 'tráfico' o 'ítems de seed' (crece con los datos, no con los requests)
+
+
+@dataclass
+class ScaleProjection:
+    """Consumo mensual proyectado a un multiplicador del tráfico actual"""
+    multiplier: float
+    lambda_requests: float
+    lambda_gb_seconds: float
+    read_units: float
+    write_units: float
+    api_requests: float
+    peak_concurrency: float
+    cost_usd: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def total_cost_usd(self) -> float:
+        return sum(self.cost_usd.values())
+
+
+@dataclass
+class CapacityReport:
+    """Resultado de la proyección"""
+    window_seconds: float
+    functions: List[FunctionLoad]
+    projections: List[ScaleProjection]
+    saturations: List[Saturation]
+    assumptions: List[str] = field(default_factory=list)
+
+    @property
+    def traffic_observed(self) -> bool:
+        """Hay invocaciones por request en la ventana (sin ellas no hay multiplicador que proyectar)."""
+        return any(load.rate_per_second > 0 for load in self.functions if not load.deploy_time)
+
+    @property
+    def first_saturation(self) -> Optional[Saturation]:
+        """
+        Componente que se satura primero con el tráfico (None si ninguno llega antes de
+        MAX_MULTIPLIER o si no hubo tráfico). Las funciones de seed no cuentan: escalan con los ítems.
+        """
+        if not self.traffic_observed:
+            return None
+        reachable = [s for s in self.saturations if s.driver == 'tráfico' and math.isfinite(s.multiplier)]
+        return min(reachable, key=lambda s: s.multiplier) if reachable else None
+
+
+def _event_time(line: str) -> Optional[datetime]:
+    # Solo las líneas en formato JSON traen el timestamp dentro del JSON
+    parsed = parse_log_entry(line) if line.startswith('{') else None
+    timestamp = extract_request_context(line, parsed)['timestamp']
+    if isinstance(timestamp, (int, float)):
+        return datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc)
+    if not isinstance(timestamp, str):
+        return None
+    try:
+        moment = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def log_time_span(paths: Iterable[str]) -> Optional[float]:
+    """
+    Segundos entre el primer y el último evento con timestamp de los logs.
+
+    Args:
+        paths: Archivos de log (salida de `aws logs tail`)
+
+    Returns:
+        Duración de la ventana observada o None si no hay dos eventos con
+        timestamps distintos
+    """
+    first = last = None
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                moment = _event_time(line.rstrip('\r\n'))
+                if moment is None:
+                    continue
+                first = moment if first is None or moment < first else first
+                last = moment if last is None or moment > last else last
+    if first is None or last <= first:
+        return None
+    return (last - first).total_seconds()
+
+
+def saturation_multiplier(demand: Callable[[float], float], limit: float) -> float:
+    """
+    Menor multiplicador k con demand(k) >= limit, para demandas no decrecientes.
+
+    Returns:
+        k (puede ser < 1 si ya está saturado) o inf si no se alcanza antes de MAX_MULTIPLIER
+    """
+    if demand(MAX_MULTIPLIER) < limit:
+        return math.inf
+    low, high = 0.0, MAX_MULTIPLIER
+    for _ in range(100):
+        middle = (low + high) / 2
+        if demand(middle) >= limit:
+            high = middle
+        else:
+            low = middle
+        if high - low <= high * 1e-4:
+            break
+    return high
+
+
+def _deploy_time_functions(index: TemplateIndex) -> Dict[str, Optional[str]]:
+    """Funciones de custom resources -> tabla que reciben en TableName (si la hay)."""
+    functions = {}
+    for resource in index.resources_of_type('AWS::CloudFormation::CustomResource').values():
+        properties = resource.get('Properties') or {}
+        token = properties.get('ServiceToken')
+        if isinstance(token, dict) and isinstance(token.get('Fn::GetAtt'), list):
+            table = properties.get('TableName')
+            functions[token['Fn::GetAtt'][0]] = table.get('Ref') if isinstance(table, dict) else None
+    return functions
+
+
+def function_loads(index: TemplateIndex, analyses: Dict[str, LogAnalysis], window_seconds: float) -> List[FunctionLoad]:
+    """
+    Carga de cada función del template según sus líneas REPORT.
+
+    Args:
+        index: Índice del template
+        analyses: Análisis de logs por nombre lógico de la función
+        window_seconds: Duración de la ventana de los logs
+
+    Returns:
+        Lista de FunctionLoad en el orden del template
+    """
+    routes = Counter(route.lambda_name for route in discover_api_routes(index) if route.lambda_name)
+    deploy_time = _deploy_time_functions(index)
+    loads = []
+    for name, info in index.lambdas.items():
+        load = FunctionLoad(name, info.memory_size_mb, info.timeout_seconds,
+                            api_routes=routes.get(name, 0), deploy_time=name in deploy_time)
+        analysis = analyses.get(name)
+        metrics = analysis.lambda_metrics if analysis is not None else None
+        if metrics is not None and metrics.invocations:
+            load.invocations = metrics.invocations
+            load.rate_per_second = metrics.invocations / window_seconds if not load.deploy_time else 0.0
+            load.avg_billed_ms = metrics.billed_ms_total / metrics.invocations
+            load.p99_duration_ms = metrics.duration_ms.percentile(99)
+            load.max_memory_used_mb = metrics.max_memory_used_mb.max_value
+        loads.append(load)
+    return loads
+
+
+class _TableLoad:
+    """Demanda de DynamoDB de un patrón de acceso en función del multiplicador."""
+
+    def __init__(self, pattern: AccessPattern, rate: float, item_bytes: float, items_per_key: float,
+                 growth_per_key: float, hot_share: float, consistent: bool):
+        self.pattern = pattern
+        self.rate = rate
+        self.item_bytes = item_bytes
+        self.items_per_key = items_per_key
+        # Ítems que se agregan a cada partición por unidad de multiplicador en el horizonte
+        self.growth_per_key = growth_per_key
+        self.hot_share = hot_share
+        self.read_factor = 1.0 if consistent else 0.5
+
+    @property
+    def command(self) -> str:
+        return self.pattern.command.command
+
+    def result_bytes(self, k: float) -> float:
+        """Bytes que recorre la operación completa, sin el corte de página."""
+        if self.command in ('Query', 'Scan'):
+            return (self.items_per_key + self.growth_per_key * k) * self.item_bytes
+        return self.item_bytes
+
+    def bytes_per_request(self, k: float) -> float:
+        total = self.result_bytes(k)
+        return total if self.pattern.paginated else min(total, PAGE_LIMIT_BYTES)
+
+    def units_per_request(self, k: float) -> float:
+        if self.command in ('Put', 'Update', 'Delete'):
+            return float(math.ceil(self.item_bytes / WRITE_UNIT_BYTES))
+        return max(1, math.ceil(self.bytes_per_request(k) / READ_UNIT_BYTES)) * self.read_factor
+
+    def units_per_second(self, k: float) -> float:
+        return self.rate * k * self.units_per_request(k)
+
+    @property
+    def is_write(self) -> bool:
+        return self.command in ('Put', 'Update', 'Delete')
+
+
+def _sampled_values(analysis: Optional[LogAnalysis], attribute: str) -> Counter:
+    values = Counter()
+    for body in (analysis.request_bodies if analysis is not None else []):
+        if isinstance(body, dict) and isinstance(body.get(attribute), (str, int, float)):
+            values[str(body[attribute])] += 1
+    return values
+
+
+def _table_loads(index: TemplateIndex, loads: Dict[str, FunctionLoad], analyses: Dict[str, LogAnalysis],
+                 seed_data: Dict[str, List[Dict[str, Any]]], horizon_seconds: float,
+                 assumptions: List[str]) -> List[_TableLoad]:
+    access = analyze_dynamodb_access(index, seed_data)
+
+    # Tamaño de ítem por tabla: datos de seed o bodies de las lambdas que escriben en ella
+    item_bytes: Dict[str, float] = {}
+    for table_id, items in seed_data.items():
+        if items:
+            item_bytes[table_id] = sum(top_level_item_size(item) for item in items) / len(items)
+    put_rates: Counter = Counter()
+    for pattern in access.patterns:
+        if pattern.table is None or pattern.command.command != 'Put':
+            continue
+        put_rates[pattern.table] += loads[pattern.lambda_name].rate_per_second
+        if pattern.table not in item_bytes:
+            bodies = [b for b in getattr(analyses.get(pattern.lambda_name), 'request_bodies', []) if isinstance(b, dict)]
+            if bodies:
+                item_bytes[pattern.table] = sum(top_level_item_size(b) for b in bodies) / len(bodies)
+                assumptions.append(f"Tamaño de ítem de {pattern.table} estimado con los bodies de "
+                                   f"{pattern.lambda_name} ({item_bytes[pattern.table]:.0f} bytes)")
+
+    table_loads = []
+    for pattern in access.patterns:
+        load = loads.get(pattern.lambda_name)
+        table = access.tables.get(pattern.table)
+        if load is None or table is None or load.deploy_time:
+            continue
+        size = item_bytes.get(pattern.table)
+        if size is None:
+            size = DEFAULT_ITEM_BYTES
+            assumptions.append(f"Sin datos de {pattern.table}: ítems de {DEFAULT_ITEM_BYTES} bytes")
+            item_bytes[pattern.table] = size
+
+        items_per_key, keys, hot_share = 1.0, 1, 1.0
+        items = seed_data.get(pattern.table, [])
+        schema = table.key_schema(pattern.command.index_name)
+        if pattern.command.command == 'Scan':
+            items_per_key = float(len(items)) or 1.0
+        elif pattern.command.command == 'Query' and schema is not None:
+            seeded = Counter(str(item[schema.hash_key]) for item in items if schema.hash_key in item)
+            sampled = _sampled_values(analyses.get(pattern.lambda_name), schema.hash_key)
+            keys = len(seeded) or len(sampled) or 1
+            if seeded:
+                items_per_key = sum(seeded.values()) / len(seeded)
+            hot = sampled or seeded
+            hot_share = max(hot.values()) / sum(hot.values()) if hot else 1.0
+            if not seeded and not sampled:
+                assumptions.append(f"Sin claves observadas para {schema.name or pattern.table}: "
+                                   f"todas las escrituras en una sola partición (peor caso)")
+        growth = put_rates[pattern.table] * horizon_seconds / keys if pattern.command.command in ('Query', 'Scan') \
+            else 0.0
+        consistent = pattern.estimate.consistent if pattern.estimate else False
+        table_loads.append(_TableLoad(pattern, load.rate_per_second, size, items_per_key, growth, hot_share,
+                                      consistent))
+    return table_loads
+
+
+def _saturations(loads: List[FunctionLoad], table_loads: List[_TableLoad], index: TemplateIndex,
+                 seed_data: Dict[str, List[Dict[str, Any]]]) -> List[Saturation]:
+    saturations = []
+    traffic = [load for load in loads if not load.deploy_time]
+
+    def concurrency(k: float) -> float:
+        return sum(load.rate_per_second * k * load.avg_billed_ms / 1000 for load in traffic)
+
+    saturations.append(Saturation(
+        'Lambda (cuenta)', 'ejecuciones concurrentes', concurrency(1), ACCOUNT_CONCURRENCY_LIMIT, 'ejecuciones',
+        saturation_multiplier(concurrency, ACCOUNT_CONCURRENCY_LIMIT),
+        'Suma de invocaciones/s × duración de todas las funciones'))
+
+    def api_rate(k: float) -> float:
+        return sum(load.rate_per_second * k for load in traffic if load.api_routes)
+
+    saturations.append(Saturation(
+        'API Gateway', 'requests por segundo', api_rate(1), API_GATEWAY_RPS_LIMIT, 'req/s',
+        saturation_multiplier(api_rate, API_GATEWAY_RPS_LIMIT), 'Throttling por defecto de la cuenta'))
+
+    for load in traffic:
+        if load.p99_duration_ms is not None and load.p99_duration_ms >= load.timeout_seconds * 1000 * TIMEOUT_WARNING_RATIO:
+            saturations.append(Saturation(
+                f'Lambda {load.name}', 'Timeout', load.p99_duration_ms, load.timeout_seconds * 1000, 'ms', 1.0,
+                f'p99 de {load.p99_duration_ms:.0f} ms contra un Timeout de {load.timeout_seconds}s'))
+
+    by_table: Dict[Tuple[str, bool], List[_TableLoad]] = {}
+    for table_load in table_loads:
+        by_table.setdefault((table_load.pattern.table, table_load.is_write), []).append(table_load)
+        pattern = table_load.pattern
+        component = f"DynamoDB {pattern.table}" + (f" ({pattern.command.index_name})" if pattern.command.index_name else '')
+        if table_load.command == 'Query':
+            limit = PARTITION_WCU_LIMIT if table_load.is_write else PARTITION_RCU_LIMIT
+            hot = lambda k, t=table_load: t.units_per_second(k) * t.hot_share
+            saturations.append(Saturation(
+                component, f'partición caliente ({pattern.lambda_name})', hot(1), limit, 'RCU/s',
+                saturation_multiplier(hot, limit),
+                f'{table_load.hot_share:.0%} de las consultas van a la misma clave'))
+        if table_load.command in ('Query', 'Scan') and not pattern.paginated:
+            saturations.append(Saturation(
+                component, f'página de 1 MB sin paginar ({pattern.lambda_name})', table_load.result_bytes(1),
+                PAGE_LIMIT_BYTES, 'bytes', saturation_multiplier(table_load.result_bytes, PAGE_LIMIT_BYTES),
+                'Al pasar 1 MB el resultado se corta en silencio (no recorre LastEvaluatedKey)'))
+
+    for (table_id, is_write), group in by_table.items():
+        limit = ON_DEMAND_TABLE_WCU_LIMIT if is_write else ON_DEMAND_TABLE_RCU_LIMIT
+        demand = lambda k, g=group: sum(t.units_per_second(k) for t in g)
+        saturations.append(Saturation(
+            f'DynamoDB {table_id}', 'WCU/s de la tabla' if is_write else 'RCU/s de la tabla', demand(1), limit,
+            'WCU/s' if is_write else 'RCU/s', saturation_multiplier(demand, limit), 'Cuota on-demand por tabla'))
+
+    # Funciones de seed: duración y memoria crecen con la cantidad de ítems que cargan, no con el tráfico.
+    # El multiplicador es sobre los ítems actuales y el límite se expresa en ítems.
+    for name, table_id in _deploy_time_functions(index).items():
+        load = next((l for l in loads if l.name == name), None)
+        items = seed_data.get(table_id or '', [])
+        if load is None or not items:
+            continue
+        json_bytes = sum(top_level_item_size(item) for item in items)
+        batches = math.ceil(len(items) / SEED_BATCH_SIZE)
+        per_batch = (load.avg_billed_ms - SEED_FIXED_MS) / batches if load.avg_billed_ms > SEED_FIXED_MS \
+            else SEED_BATCH_MS
+        duration = lambda k, n=len(items), b=per_batch: SEED_FIXED_MS + math.ceil(n * k / SEED_BATCH_SIZE) * b
+        growth = saturation_multiplier(duration, load.timeout_seconds * 1000)
+        saturations.append(Saturation(
+            f'Lambda {name}', f'Timeout cargando {table_id}', len(items), len(items) * growth, 'ítems', growth,
+            f'{len(items)} ítems en {batches} BatchWrite de {per_batch:.0f} ms contra un Timeout de '
+            f'{load.timeout_seconds}s', driver='ítems de seed'))
+        baseline = load.max_memory_used_mb or RUNTIME_BASELINE_MB
+        memory = lambda k, base=baseline, size=json_bytes: base + size * k * JSON_MEMORY_FACTOR / 2 ** 20
+        growth = saturation_multiplier(memory, load.memory_size_mb)
+        saturations.append(Saturation(
+            f'Lambda {name}', f'MemorySize cargando {table_id}', len(items), len(items) * growth, 'ítems', growth,
+            f'Los {json_bytes / 1024:.0f} KB de datos se cargan completos en {load.memory_size_mb} MB',
+            driver='ítems de seed'))
+
+    return sorted(saturations, key=lambda s: s.multiplier)
+
+
+def _project(multiplier: float, loads: List[FunctionLoad], table_loads: List[_TableLoad]) -> ScaleProjection:
+    traffic = [load for load in loads if not load.deploy_time]
+    lambda_requests = sum(load.rate_per_second for load in traffic) * multiplier * SECONDS_PER_MONTH
+    gb_seconds = sum(load.rate_per_second * load.gb_seconds_per_invocation for load in traffic) \
+        * multiplier * SECONDS_PER_MONTH
+    reads = sum(t.units_per_second(multiplier) for t in table_loads if not t.is_write) * SECONDS_PER_MONTH
+    writes = sum(t.units_per_second(multiplier) for t in table_loads if t.is_write) * SECONDS_PER_MONTH
+    api_requests = sum(load.rate_per_second for load in traffic if load.api_routes) * multiplier * SECONDS_PER_MONTH
+    concurrency = sum(load.rate_per_second * load.avg_billed_ms / 1000 for load in traffic) * multiplier
+    return ScaleProjection(
+        multiplier=multiplier,
+        lambda_requests=lambda_requests,
+        lambda_gb_seconds=gb_seconds,
+        read_units=reads,
+        write_units=writes,
+        api_requests=api_requests,
+        peak_concurrency=concurrency,
+        cost_usd={
+            'lambda': gb_seconds * LAMBDA_GB_SECOND_USD + lambda_requests * LAMBDA_REQUEST_USD,
+            'dynamodb': reads * DYNAMODB_READ_UNIT_USD + writes * DYNAMODB_WRITE_UNIT_USD,
+            'api_gateway': api_requests * API_GATEWAY_REQUEST_USD,
+        }
+    )
+
+
+def project_capacity(index: TemplateIndex, analyses: Dict[str, LogAnalysis], window_seconds: float,
+                     seed_data: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                     multipliers: Tuple[float, ...] = DEFAULT_MULTIPLIERS,
+                     horizon_days: float = DEFAULT_HORIZON_DAYS) -> CapacityReport:
+    """
+    Proyecta consumo, costo y saturación del stack.
+
+    Args:
+        index: Índice del template
+        analyses: Análisis de logs por nombre lógico de la función
+        window_seconds: Duración de la ventana de los logs
+        seed_data: Ítems por tabla (nombre lógico)
+        multipliers: Multiplicadores del tráfico actual a proyectar
+        horizon_days: Días de escrituras acumuladas para el tamaño de las particiones
+
+    Returns:
+        CapacityReport con proyecciones y puntos de saturación
+    """
+    seed_data = seed_data or {}
+    assumptions = [f"Escrituras acumuladas durante {horizon_days:g} días para el tamaño de las particiones",
+                   "Lecturas eventualmente consistentes salvo ConsistentRead; límites y precios por defecto de us-east-1"]
+    loads = function_loads(index, analyses, window_seconds)
+    by_name = {load.name: load for load in loads}
+    table_loads = _table_loads(index, by_name, analyses, seed_data, horizon_days * 86400, assumptions)
+    return CapacityReport(
+        window_seconds=window_seconds,
+        functions=loads,
+        projections=[_project(k, loads, table_loads) for k in multipliers],
+        saturations=_saturations(loads, table_loads, index, seed_data),
+        assumptions=list(dict.fromkeys(assumptions))
+    )
+
+
+def _format_multiplier(multiplier: float) -> str:
+    if not math.isfinite(multiplier):
+        return 'nunca'
+    if multiplier <= 1:
+        return 'ya (≤1x)'
+    return f'{multiplier:,.0f}x' if multiplier >= 10 else f'{multiplier:.1f}x'
+
+
+def print_capacity_report(report: CapacityReport, top_saturations: int = 8):
+    """Imprime la proyección de capacidad de forma legible."""
+    print(f"\n{'='*80}")
+    print("PROYECCIÓN DE CAPACIDAD Y COSTO")
+    print(f"{'='*80}")
+    print(f"\nVentana de logs: {report.window_seconds / 3600:.2f} h")
+
+    print(f"\n  {'Función':<28} {'Invoc/s':>9} {'Billed':>9} {'Mem':>6} {'Timeout':>8}")
+    for load in report.functions:
+        kind = ' (deploy)' if load.deploy_time else ''
+        print(f"  {(load.name + kind)[:28]:<28} {load.rate_per_second:>9.3f} {load.avg_billed_ms:>7.0f}ms "
+              f"{load.memory_size_mb:>4}MB {load.timeout_seconds:>7}s")
+
+    print(f"\n  {'Escala':>7} {'Req. Lambda/mes':>16} {'GB-s/mes':>12} {'RRU/mes':>14} {'WRU/mes':>12} "
+          f"{'API req/mes':>13} {'Conc.':>7} {'USD/mes':>10}")
+    for projection in report.projections:
+        print(f"  {projection.multiplier:>6g}x {projection.lambda_requests:>16,.0f} "
+              f"{projection.lambda_gb_seconds:>12,.0f} {projection.read_units:>14,.0f} "
+              f"{projection.write_units:>12,.0f} {projection.api_requests:>13,.0f} "
+              f"{projection.peak_concurrency:>7.1f} {projection.total_cost_usd:>10,.2f}")
+
+    print("\n🚧 Puntos de saturación con el tráfico:")
+    traffic = [s for s in report.saturations if s.driver == 'tráfico']
+    for saturation in traffic[:top_saturations]:
+        at = _format_multiplier(saturation.multiplier) if report.traffic_observed else 'sin tráfico'
+        print(f"   {at:>10}  {saturation.component}: {saturation.resource} "
+              f"({saturation.demand:,.1f}/{saturation.limit:,.0f} {saturation.unit})")
+        if saturation.detail:
+            print(f"               {saturation.detail}")
+
+    seeds = [s for s in report.saturations if s.driver == 'ítems de seed']
+    if seeds:
+        print("\n🌱 Funciones de seed (escalan con los ítems cargados, no con el tráfico):")
+        for saturation in seeds:
+            limit = f"{saturation.limit:,.0f} ítems" if math.isfinite(saturation.limit) else 'nunca'
+            print(f"   {limit:>14}  {saturation.component}: {saturation.resource} "
+                  f"(hoy {saturation.demand:,.0f} ítems, {_format_multiplier(saturation.multiplier)})")
+            if saturation.detail:
+                print(f"                   {saturation.detail}")
+
+    first = report.first_saturation
+    if not report.traffic_observed:
+        print("\n⚪ Primero en saturarse: sin tráfico observado en la ventana, no hay multiplicador que proyectar")
+    elif first is not None:
+        print(f"\n🔴 Primero en saturarse: {first.component} ({first.resource}) a "
+              f"{_format_multiplier(first.multiplier)} del tráfico actual")
+    else:
+        print(f"\n✅ Ningún componente se satura antes de {MAX_MULTIPLIER:,.0f}x")
+
+    print("\nSupuestos:")
+    for assumption in report.assumptions:
+        print(f"   - {assumption}")
+    print(f"\n{'='*80}\n")
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Proyección de capacidad y costo del stack')
+    parser.add_argument('logs', nargs='*', help='Archivos de log por función ([FUNCION=]archivo)')
+    parser.add_argument('--template', default='documentos_salud_connect_ia/turnos-medicos-api-final.yaml')
+    parser.add_argument('--seed', action='append', type=parse_seed_argument, default=[], metavar='TABLA=ARCHIVO')
+    parser.add_argument('--window-hours', type=float,
+                        help='Duración de la ventana de los logs (default: entre el primer y el último evento)')
+    parser.add_argument('--horizon-days', type=float, default=DEFAULT_HORIZON_DAYS)
+    parser.add_argument('--multiplier', type=float, action='append', help='Multiplicadores a proyectar (repetible)')
+    args = parser.parse_args()
+
+    index = load_template_index(args.template)
+    analyses: Dict[str, LogAnalysis] = {}
+    paths = []
+    for value in args.logs:
+        name, separator, path = value.partition('=')
+        if not separator:
+            name, path = match_function_name(os.path.basename(value), index.lambdas), value
+        if name is None:
+            print(f"⚠️  No se pudo asociar {value} a una función del template (usar FUNCION=archivo)")
+            continue
+        analyses[name] = analyze_cloudwatch_log_file(path, log_group=name)
+        paths.append(path)
+
+    if args.window_hours:
+        window = args.window_hours * 3600
+    elif paths:
+        window = log_time_span(paths)
+        if window is None:
+            parser.error('No se pudo determinar la ventana de los logs (faltan timestamps): usar --window-hours')
+    else:
+        # Sin logs no hay tráfico observado y la ventana no cambia el resultado
+        window = 1.0
+    seed_paths = dict(args.seed) if args.seed else DEFAULT_SEED_DATA
+    report = project_capacity(index, analyses, window, load_seed_data(seed_paths),
+                              tuple(args.multiplier) if args.multiplier else DEFAULT_MULTIPLIERS,
+                              args.horizon_days)
+    print_capacity_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""
+Checkpoints para el análisis incremental de logs de CloudWatch.
+
+Guarda por log group el timestamp del último evento procesado, los eventIds
+recientes (para no contar dos veces eventos del borde de la ventana; si un
+evento no trae eventId se usa timestamp + log stream + hash del mensaje) y el
+estado serializado del LogAnalysisAccumulator. Cada corrida solo descarga los
+eventos nuevos y los suma a los totales acumulados, lo que permite correr el
+análisis cada minuto desde cron sin rehacer trabajo.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Dict, Any, Optional, Tuple
+
+from cloudwatch_analyzer import LogAnalysis, LogAnalysisAccumulator, DEFAULT_MAX_SAMPLE_BODIES
+from cloudwatch_fetcher import iter_log_events, format_event, FetchStats
+
+
+# Versión del formato del archivo de checkpoints
+CHECKPOINT_VERSION = 1
+
+# Cuánto se vuelve hacia atrás desde el último evento para capturar eventos
+# que CloudWatch ingiere con demora; los duplicados se descartan por eventId
+DEFAULT_OVERLAP_MS = 60_000
+
+# Ventana de la primera corrida de un log group sin checkpoint
+DEFAULT_INITIAL_MINUTES = 60
+
+
+@dataclass
+class LogGroupCheckpoint:
+    """Estado persistido de un log group"""
+    log_group: str
+    last_event_timestamp: Optional[int] = None
+    # eventId -> timestamp de los eventos dentro de la ventana de solapamiento
+    recent_event_ids: Dict[str, int] = field(default_factory=dict)
+    accumulator: Optional[Dict[str, Any]] = None
+    runs: int = 0
+    updated_at: Optional[float] = None
+
+
+class CheckpointStore:
+    """
+    Archivo JSON con un checkpoint por log group.
+
+    Las escrituras son atómicas (archivo temporal + os.replace), así que una
+    corrida interrumpida nunca deja el archivo a medio escribir. Es seguro
+    compartirlo entre los threads que procesan distintos log groups: get y put
+    trabajan con copias, y el checkpoint guardado se reemplaza entero bajo el
+    lock, nunca se modifica en el lugar.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._checkpoints: Dict[str, LogGroupCheckpoint] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Versión de checkpoint no soportada en {self.path}: {data.get('version')}")
+        for log_group, checkpoint in data.get('log_groups', {}).items():
+            self._checkpoints[log_group] = LogGroupCheckpoint(log_group=log_group, **checkpoint)
+
+    def get(self, log_group: str) -> LogGroupCheckpoint:
+        """Devuelve una copia del checkpoint de un log group (vacío si no existe)."""
+        with self._lock:
+            checkpoint = self._checkpoints.get(log_group)
+            if checkpoint is None:
+                return LogGroupCheckpoint(log_group=log_group)
+            return replace(checkpoint, recent_event_ids=dict(checkpoint.recent_event_ids))
+
+    def put(self, checkpoint: LogGroupCheckpoint):
+        """Reemplaza el checkpoint de un log group por una copia del dado y lo persiste."""
+        with self._lock:
+            self._checkpoints[checkpoint.log_group] = replace(
+                checkpoint, recent_event_ids=dict(checkpoint.recent_event_ids), updated_at=time.time()
+            )
+            self._save()
+
+    def reset(self, log_group: str):
+        """Descarta el checkpoint de un log group."""
+        with self._lock:
+            if self._checkpoints.pop(log_group, None) is not None:
+                self._save()
+
+    def _save(self):
+        data = {
+            'version': CHECKPOINT_VERSION,
+            'log_groups': {
+                log_group: {
+                    'last_event_timestamp': checkpoint.last_event_timestamp,
+                    'recent_event_ids': checkpoint.recent_event_ids,
+                    'accumulator': checkpoint.accumulator,
+                    'runs': checkpoint.runs,
+                    'updated_at': checkpoint.updated_at
+                }
+                for log_group, checkpoint in self._checkpoints.items()
+            }
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.checkpoint-', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+
+def event_key(event: Dict[str, Any]) -> str:
+    """
+    Clave de deduplicación de un evento: su eventId, o timestamp + log stream +
+    hash del mensaje si no lo trae.
+    """
+    event_id = event.get('eventId')
+    if event_id is not None:
+        return event_id
+    digest = hashlib.sha1(event.get('message', '').encode('utf-8')).hexdigest()[:16]
+    return f"{event['timestamp']}:{event.get('logStreamName', '')}:{digest}"
+
+
+def incremental_fetch_and_analyze(
+    client,
+    log_group: str,
+    store: CheckpointStore,
+    analysis_name: Optional[str] = None,
+    now_ms: Optional[int] = None,
+    initial_minutes: int = DEFAULT_INITIAL_MINUTES,
+    overlap_ms: int = DEFAULT_OVERLAP_MS,
+    max_sample_bodies: Optional[int] = DEFAULT_MAX_SAMPLE_BODIES,
+    stats: Optional[FetchStats] = None,
+    correlator=None,
+    **kwargs
+) -> Tuple[LogAnalysis, int]:
+    """
+    Procesa solo los eventos nuevos de un log group y los suma al checkpoint.
+
+    Args:
+        client: Cliente de CloudWatch Logs
+        log_group: Nombre del log group (exacto o prefijo terminado en '*')
+        store: CheckpointStore donde se guarda el estado
+        analysis_name: Nombre para el LogAnalysis (default: log_group)
+        now_ms: Fin de la ventana en ms epoch (default: ahora)
+        initial_minutes: Ventana de la primera corrida sin checkpoint
+        overlap_ms: Solapamiento hacia atrás para eventos ingeridos con demora
+        max_sample_bodies: Tamaño del reservoir de request bodies (corrida inicial)
+        stats: FetchStats a completar (opcional)
+        correlator: RequestCorrelator que recibe las líneas nuevas (opcional)
+        **kwargs: Parámetros adicionales de iter_log_events
+
+    Returns:
+        Tupla (LogAnalysis con los totales acumulados, eventos nuevos procesados)
+    """
+    end_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    checkpoint = store.get(log_group)
+
+    if checkpoint.accumulator is not None:
+        accumulator = LogAnalysisAccumulator.from_dict(checkpoint.accumulator)
+    else:
+        accumulator = LogAnalysisAccumulator(max_sample_bodies=max_sample_bodies)
+
+    if checkpoint.last_event_timestamp is not None:
+        start_ms = checkpoint.last_event_timestamp - overlap_ms
+    else:
+        start_ms = end_ms - initial_minutes * 60 * 1000
+
+    if correlator is not None:
+        # El correlator necesita las líneas de cada request en orden de tiempo
+        kwargs.setdefault('ordered', True)
+
+    seen = dict(checkpoint.recent_event_ids)
+    last_timestamp = checkpoint.last_event_timestamp
+    new_events = 0
+
+    def new_lines():
+        nonlocal last_timestamp, new_events
+        for event in iter_log_events(client, log_group, start_ms, end_ms, stats=stats, **kwargs):
+            key = event_key(event)
+            if key in seen:
+                continue
+            seen[key] = event['timestamp']
+            new_events += 1
+            if last_timestamp is None or event['timestamp'] > last_timestamp:
+                last_timestamp = event['timestamp']
+            line = format_event(event)
+            if correlator is not None:
+                correlator.add_line(line)
+            yield line
+
+    accumulator.add_lines(new_lines())
+
+    # Solo se recuerdan los eventIds que pueden volver a aparecer en el solapamiento
+    if last_timestamp is not None:
+        horizon = last_timestamp - overlap_ms
+        seen = {event_id: ts for event_id, ts in seen.items() if ts >= horizon}
+
+    # Checkpoint nuevo: el que devolvió store.get no se modifica
+    store.put(LogGroupCheckpoint(
+        log_group=log_group,
+        last_event_timestamp=last_timestamp,
+        recent_event_ids=seen,
+        accumulator=accumulator.to_dict(),
+        runs=checkpoint.runs + 1
+    ))
+
+    return accumulator.to_analysis(analysis_name or log_group, time_range='acumulado (incremental)'), new_events
@@ -6,10 +6,214 @@ información sobre requests, errores y patrones de ejecución.
 """
 
 import json
+import math
+import os
 import re
-from typing import List, Dict, Any, Optional
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Iterable
 from datetime import datetime, timedelta
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from template_index import load_lambda_memory_sizes
+
+# Decoder JSON acelerado opcional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Cantidad máxima de valores de muestra guardados por campo de fecha/hora
+MAX_SAMPLE_VALUES = 3
+
+# Tamaño por defecto del reservoir de request bodies en modo streaming
+DEFAULT_MAX_SAMPLE_BODIES = 100
+
+# Tamaño mínimo de chunk al repartir una lista de líneas entre procesos
+MIN_PARALLEL_CHUNK_SIZE = 10_000
+
+# Error relativo de los buckets de los histogramas de latencia (1%)
+HISTOGRAM_PRECISION = 0.01
+
+
+@dataclass
+class ReportMetrics:
+    """Métricas de una línea REPORT de Lambda"""
+    request_id: str
+    duration_ms: float
+    billed_duration_ms: float
+    memory_size_mb: int
+    max_memory_used_mb: int
+    init_duration_ms: Optional[float] = None  # Solo presente en cold starts
+
+
+@dataclass
+class LatencyHistogram:
+    """
+    Histograma logarítmico de tamaño acotado y mezclable.
+    
+    Cada bucket cubre un rango de ancho relativo HISTOGRAM_PRECISION, así que
+    los percentiles tienen un error relativo de ~1% sin guardar los valores.
+    """
+    buckets: Dict[int, int] = field(default_factory=dict)
+    count: int = 0
+    total: float = 0.0
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+    
+    _LOG_BASE = math.log1p(HISTOGRAM_PRECISION)
+    
+    def add(self, value: float):
+        """Registra un valor."""
+        index = math.ceil(math.log(max(value, 0.001)) / self._LOG_BASE)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min_value = value if self.min_value is None else min(self.min_value, value)
+        self.max_value = value if self.max_value is None else max(self.max_value, value)
+    
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """Incorpora los valores de otro histograma."""
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.min_value is not None:
+            self.min_value = other.min_value if self.min_value is None else min(self.min_value, other.min_value)
+            self.max_value = other.max_value if self.max_value is None else max(self.max_value, other.max_value)
+        return self
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """Devuelve el percentil pct (0-100) o None si no hay valores."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * pct / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                upper = math.exp(index * self._LOG_BASE)
+                return min(max(upper, self.min_value), self.max_value)
+        return self.max_value
+    
+    def mean(self) -> Optional[float]:
+        """Promedio exacto de los valores registrados."""
+        return self.total / self.count if self.count else None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializa el histograma a un diccionario compatible con JSON."""
+        return {
+            'buckets': {str(index): count for index, count in self.buckets.items()},
+            'count': self.count,
+            'total': self.total,
+            'min_value': self.min_value,
+            'max_value': self.max_value
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LatencyHistogram':
+        """Reconstruye un histograma serializado con to_dict."""
+        return cls(
+            buckets={int(index): count for index, count in data.get('buckets', {}).items()},
+            count=data.get('count', 0),
+            total=data.get('total', 0.0),
+            min_value=data.get('min_value'),
+            max_value=data.get('max_value')
+        )
+
+
+@dataclass
+class LambdaMetrics:
+    """Métricas de ejecución de una función acumuladas desde las líneas REPORT"""
+    invocations: int = 0
+    cold_starts: int = 0
+    billed_ms_total: float = 0.0
+    memory_size_mb: Optional[int] = None
+    duration_ms: LatencyHistogram = field(default_factory=LatencyHistogram)
+    init_duration_ms: LatencyHistogram = field(default_factory=LatencyHistogram)
+    max_memory_used_mb: LatencyHistogram = field(default_factory=LatencyHistogram)
+    
+    def add_report(self, report: ReportMetrics):
+        """Registra una línea REPORT."""
+        self.invocations += 1
+        self.billed_ms_total += report.billed_duration_ms
+        self.memory_size_mb = report.memory_size_mb
+        self.duration_ms.add(report.duration_ms)
+        self.max_memory_used_mb.add(report.max_memory_used_mb)
+        if report.init_duration_ms is not None:
+            self.cold_starts += 1
+            self.init_duration_ms.add(report.init_duration_ms)
+    
+    def merge(self, other: 'LambdaMetrics') -> 'LambdaMetrics':
+        """Incorpora las métricas de otro parcial."""
+        self.invocations += other.invocations
+        self.cold_starts += other.cold_starts
+        self.billed_ms_total += other.billed_ms_total
+        if other.memory_size_mb is not None:
+            self.memory_size_mb = other.memory_size_mb
+        self.duration_ms.merge(other.duration_ms)
+        self.init_duration_ms.merge(other.init_duration_ms)
+        self.max_memory_used_mb.merge(other.max_memory_used_mb)
+        return self
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializa las métricas a un diccionario compatible con JSON."""
+        return {
+            'invocations': self.invocations,
+            'cold_starts': self.cold_starts,
+            'billed_ms_total': self.billed_ms_total,
+            'memory_size_mb': self.memory_size_mb,
+            'duration_ms': self.duration_ms.to_dict(),
+            'init_duration_ms': self.init_duration_ms.to_dict(),
+            'max_memory_used_mb': self.max_memory_used_mb.to_dict()
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LambdaMetrics':
+        """Reconstruye métricas serializadas con to_dict."""
+        return cls(
+            invocations=data.get('invocations', 0),
+            cold_starts=data.get('cold_starts', 0),
+            billed_ms_total=data.get('billed_ms_total', 0.0),
+            memory_size_mb=data.get('memory_size_mb'),
+            duration_ms=LatencyHistogram.from_dict(data.get('duration_ms', {})),
+            init_duration_ms=LatencyHistogram.from_dict(data.get('init_duration_ms', {})),
+            max_memory_used_mb=LatencyHistogram.from_dict(data.get('max_memory_used_mb', {}))
+        )
+    
+    def summary(self, configured_memory_mb: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Resume latencias, cold starts y margen de memoria.
+        
+        Args:
+            configured_memory_mb: MemorySize del template (default: el informado
+                en las líneas REPORT)
+            
+        Returns:
+            Diccionario con percentiles, tasa de cold start y headroom de memoria
+        """
+        memory_size = configured_memory_mb or self.memory_size_mb
+        max_used = self.max_memory_used_mb.max_value
+        headroom = None
+        if memory_size and max_used is not None:
+            headroom = 1 - max_used / memory_size
+        
+        return {
+            'invocations': self.invocations,
+            'duration_p50_ms': self.duration_ms.percentile(50),
+            'duration_p90_ms': self.duration_ms.percentile(90),
+            'duration_p99_ms': self.duration_ms.percentile(99),
+            'cold_starts': self.cold_starts,
+            'cold_start_rate': self.cold_starts / self.invocations if self.invocations else 0.0,
+            'init_p50_ms': self.init_duration_ms.percentile(50),
+            'init_p90_ms': self.init_duration_ms.percentile(90),
+            'init_p99_ms': self.init_duration_ms.percentile(99),
+            'memory_size_mb': memory_size,
+            'max_memory_used_p99_mb': self.max_memory_used_mb.percentile(99),
+            'max_memory_used_mb': max_used,
+            'memory_headroom': headroom,
+            'gb_seconds': self.billed_ms_total / 1000 * (memory_size or 0) / 1024
+        }
 
 
 @dataclass
@@ -22,6 +226,60 @@ class LogAnalysis:
     request_bodies: List[Dict[str, Any]]
     patterns: Dict[str, int]
     recommendations: List[str]
+    # Total de bodies encontrados (puede ser mayor que len(request_bodies)
+    # cuando se guarda solo una muestra en modo streaming)
+    request_body_count: int = 0
+    field_stats: Dict[str, Any] = field(default_factory=dict)
+    lambda_metrics: LambdaMetrics = field(default_factory=LambdaMetrics)
+    # CorrelationReport de request_correlation si se pidió correlacionar por requestId
+    correlation: Optional[Any] = None
+
+
+# Regex original de JSON embebido; solo se usa si la línea tiene saltos de línea
+_EMBEDDED_JSON_RE = re.compile(r'\{.*\}')
+
+
+# Línea REPORT en formato texto:
+# REPORT RequestId: id\tDuration: 12.34 ms\tBilled Duration: 13 ms\tMemory Size: 128 MB\t
+# Max Memory Used: 70 MB\tInit Duration: 150.12 ms
+_REPORT_LINE_RE = re.compile(
+    r'REPORT RequestId: (?P<request_id>\S+)\s+'
+    r'Duration: (?P<duration>[\d.]+) ms\s+'
+    r'Billed Duration: (?P<billed>[\d.]+) ms\s+'
+    r'Memory Size: (?P<memory_size>\d+) MB\s+'
+    r'Max Memory Used: (?P<max_memory>\d+) MB'
+    r'(?:\s+Init Duration: (?P<init>[\d.]+) ms)?'
+)
+
+
+def _json_loads(text: str) -> Any:
+    """
+    Decodifica JSON usando orjson si está instalado.
+    
+    orjson es más estricto que json (por ejemplo rechaza NaN o enteros de más
+    de 64 bits), así que ante un error se reintenta con json para no cambiar
+    qué líneas se consideran válidas.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(text)
+
+
+def _json_start_offset(log_line: str) -> int:
+    """
+    Devuelve la posición del primer '{' de la línea o -1.
+    
+    Las líneas de texto de Lambda tienen el formato
+    'timestamp\trequestId\tLEVEL\tmensaje': si el mensaje arranca con '{'
+    se devuelve esa posición sin recorrer el prefijo.
+    """
+    tab = log_line.rfind('\t')
+    if tab != -1 and log_line.startswith('{', tab + 1) and '{' not in log_line[:tab]:
+        return tab + 1
+    return log_line.find('{')
 
 
 def parse_log_entry(log_line: str) -> Optional[Dict[str, Any]]:
@@ -34,25 +292,124 @@ def parse_log_entry(log_line: str) -> Optional[Dict[str, Any]]:
     Returns:
         Diccionario con información parseada o None si no se puede parsear
     """
+    # La mayoría de las líneas START/END/REPORT no tienen JSON
+    start = _json_start_offset(log_line)
+    if start == -1:
+        return None
+    
     try:
         # Intentar parsear como JSON
-        if log_line.strip().startswith('{'):
-            return json.loads(log_line)
+        if not log_line[:start].strip():
+            return _json_loads(log_line)
     except json.JSONDecodeError:
         pass
     
-    # Intentar extraer JSON embebido
-    json_match = re.search(r'\{.*\}', log_line)
-    if json_match:
+    # Intentar extraer JSON embebido: desde el primer '{' hasta el último '}',
+    # igual que la regex greedy r'\{.*\}' cuando la línea no tiene '\n'
+    if '\n' in log_line:
+        json_match = _EMBEDDED_JSON_RE.search(log_line)
+        candidate = json_match.group() if json_match else None
+    else:
+        end = log_line.rfind('}')
+        candidate = log_line[start:end + 1] if end > start else None
+    
+    if candidate:
         try:
-            return json.loads(json_match.group())
+            return _json_loads(candidate)
         except json.JSONDecodeError:
             pass
     
     return None
 
 
-def extract_request_bodies(log_entries: List[str]) -> List[Dict[str, Any]]:
+def parse_report_line(log_line: str) -> Optional[ReportMetrics]:
+    """
+    Parsea la línea REPORT que Lambda emite al final de cada invocación.
+    
+    Soporta el formato texto y el formato JSON de Lambda
+    (LogFormat: JSON, evento 'platform.report').
+    
+    Args:
+        log_line: Línea de log de CloudWatch
+        
+    Returns:
+        ReportMetrics o None si la línea no es un REPORT
+    """
+    if 'REPORT RequestId' in log_line:
+        match = _REPORT_LINE_RE.search(log_line)
+        if not match:
+            return None
+        init = match.group('init')
+        return ReportMetrics(
+            request_id=match.group('request_id'),
+            duration_ms=float(match.group('duration')),
+            billed_duration_ms=float(match.group('billed')),
+            memory_size_mb=int(match.group('memory_size')),
+            max_memory_used_mb=int(match.group('max_memory')),
+            init_duration_ms=float(init) if init else None
+        )
+    
+    if 'platform.report' in log_line:
+        parsed = parse_log_entry(log_line)
+        if not isinstance(parsed, dict) or parsed.get('type') != 'platform.report':
+            return None
+        record = parsed.get('record') or {}
+        metrics = record.get('metrics') or {}
+        try:
+            return ReportMetrics(
+                request_id=record.get('requestId', 'unknown'),
+                duration_ms=float(metrics['durationMs']),
+                billed_duration_ms=float(metrics['billedDurationMs']),
+                memory_size_mb=int(metrics['memorySizeMB']),
+                max_memory_used_mb=int(metrics['maxMemoryUsedMB']),
+                init_duration_ms=(float(metrics['initDurationMs'])
+                                  if metrics.get('initDurationMs') is not None else None)
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+    
+    return None
+
+
+def request_bodies_from_entry(parsed: Dict[str, Any]) -> List[Any]:
+    """
+    Extrae los request bodies de una entrada de log ya parseada.
+    
+    Args:
+        parsed: Entrada devuelta por parse_log_entry
+        
+    Returns:
+        Lista de bodies encontrados en 'body' y 'event.body'
+    """
+    bodies = []
+    
+    # Buscar body en diferentes ubicaciones
+    if 'body' in parsed:
+        try:
+            if isinstance(parsed['body'], str):
+                body = _json_loads(parsed['body'])
+            else:
+                body = parsed['body']
+            bodies.append(body)
+        except (json.JSONDecodeError, TypeError):
+            pass
+    
+    # Buscar event.body
+    if 'event' in parsed and isinstance(parsed['event'], dict):
+        if 'body' in parsed['event']:
+            try:
+                if isinstance(parsed['event']['body'], str):
+                    body = _json_loads(parsed['event']['body'])
+                else:
+                    body = parsed['event']['body']
+                bodies.append(body)
+            except (json.JSONDecodeError, TypeError):
+                pass
+    
+    return bodies
+
+
+def extract_request_bodies(log_entries: Iterable[str]) -> List[Dict[str, Any]]:
     """
     Extrae request bodies de los logs.
     
@@ -66,34 +423,34 @@ def extract_request_bodies(log_entries: List[str]) -> List[Dict[str, Any]]:
     
     for entry in log_entries:
         parsed = parse_log_entry(entry)
-        if parsed:
-            # Buscar body en diferentes ubicaciones
-            if 'body' in parsed:
-                try:
-                    if isinstance(parsed['body'], str):
-                        body = json.loads(parsed['body'])
-                    else:
-                        body = parsed['body']
-                    request_bodies.append(body)
-                except (json.JSONDecodeError, TypeError):
-                    pass
-            
-            # Buscar event.body
-            if 'event' in parsed and isinstance(parsed['event'], dict):
-                if 'body' in parsed['event']:
-                    try:
-                        if isinstance(parsed['event']['body'], str):
-                            body = json.loads(parsed['event']['body'])
-                        else:
-                            body = parsed['event']['body']
-                        request_bodies.append(body)
-                    except (json.JSONDecodeError, TypeError):
-                        pass
+        if isinstance(parsed, dict):
+            request_bodies.extend(request_bodies_from_entry(parsed))
     
     return request_bodies
 
 
-def analyze_field_presence(request_bodies: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _update_field_stats(field_stats: Dict[str, Any], body: Any):
+    """Acumula en field_stats la presencia de campos de un request body."""
+    if not isinstance(body, dict):
+        return
+    
+    for field_name in body.keys():
+        stats = field_stats.get(field_name)
+        if stats is None:
+            stats = field_stats[field_name] = {
+                'count': 0,
+                'sample_values': []
+            }
+        stats['count'] += 1
+        
+        # Guardar valores de muestra para campos de fecha/hora
+        field_lower = field_name.lower()
+        if 'fecha' in field_lower or 'hora' in field_lower:
+            if len(stats['sample_values']) < MAX_SAMPLE_VALUES:
+                stats['sample_values'].append(body[field_name])
+
+
+def analyze_field_presence(request_bodies: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
     """
     Analiza la presencia de campos en los request bodies.
     
@@ -106,33 +463,14 @@ def analyze_field_presence(request_bodies: List[Dict[str, Any]]) -> Dict[str, An
     field_stats = {}
     
     for body in request_bodies:
-        for field in body.keys():
-            if field not in field_stats:
-                field_stats[field] = {
-                    'count': 0,
-                    'sample_values': []
-                }
-            field_stats[field]['count'] += 1
-            
-            # Guardar valores de muestra para campos de fecha/hora
-            if 'fecha' in field.lower() or 'hora' in field.lower():
-                if len(field_stats[field]['sample_values']) < 3:
-                    field_stats[field]['sample_values'].append(body[field])
+        _update_field_stats(field_stats, body)
     
     return field_stats
 
 
-def identify_patterns(log_entries: List[str]) -> Dict[str, int]:
-    """
-    Identifica patrones comunes en los logs.
-    
-    Args:
-        log_entries: Lista de líneas de log
-        
-    Returns:
-        Diccionario con patrones y sus frecuencias
-    """
-    patterns = {
+def _empty_patterns() -> Dict[str, int]:
+    """Contadores de patrones inicializados en cero."""
+    return {
         'errors': 0,
         'missing_parameters': 0,
         'successful_updates': 0,
@@ -142,58 +480,82 @@ def identify_patterns(log_entries: List[str]) -> Dict[str, int]:
         'hora_present': 0,
         'update_expression_logged': 0
     }
+
+
+def _update_patterns(patterns: Dict[str, int], entry_lower: str):
+    """Actualiza los contadores de patrones con una línea ya en minúsculas."""
+    if 'error' in entry_lower or 'exception' in entry_lower:
+        patterns['errors'] += 1
     
-    for entry in log_entries:
-        entry_lower = entry.lower()
-        
-        if 'error' in entry_lower or 'exception' in entry_lower:
-            patterns['errors'] += 1
-        
-        if 'missing' in entry_lower and 'parameter' in entry_lower:
-            patterns['missing_parameters'] += 1
-        
-        if 'successfully' in entry_lower or 'success' in entry_lower:
-            patterns['successful_updates'] += 1
-        
-        if 'fechaturno' in entry_lower:
-            patterns['fecha_turno_present'] += 1
-        
-        if 'horaturno' in entry_lower:
-            patterns['hora_turno_present'] += 1
-        
-        if '"fecha"' in entry_lower or "'fecha'" in entry_lower:
-            patterns['fecha_present'] += 1
-        
-        if '"hora"' in entry_lower or "'hora'" in entry_lower:
-            patterns['hora_present'] += 1
-        
-        if 'updateexpression' in entry_lower or 'update_expression' in entry_lower:
-            patterns['update_expression_logged'] += 1
+    if 'missing' in entry_lower and 'parameter' in entry_lower:
+        patterns['missing_parameters'] += 1
     
-    return patterns
+    if 'successfully' in entry_lower or 'success' in entry_lower:
+        patterns['successful_updates'] += 1
+    
+    if 'fechaturno' in entry_lower:
+        patterns['fecha_turno_present'] += 1
+    
+    if 'horaturno' in entry_lower:
+        patterns['hora_turno_present'] += 1
+    
+    if '"fecha"' in entry_lower or "'fecha'" in entry_lower:
+        patterns['fecha_present'] += 1
+    
+    if '"hora"' in entry_lower or "'hora'" in entry_lower:
+        patterns['hora_present'] += 1
+    
+    if 'updateexpression' in entry_lower or 'update_expression' in entry_lower:
+        patterns['update_expression_logged'] += 1
+
 
+# Orden de los bits de line_pattern_flags
+PATTERN_NAMES = tuple(_empty_patterns())
 
-def analyze_cloudwatch_logs(log_entries: List[str], log_group: str = 'unknown') -> LogAnalysis:
+
+def line_pattern_flags(entry_lower: str) -> int:
     """
-    Analiza logs de CloudWatch para identificar patrones de error.
+    Devuelve los patrones presentes en una línea como máscara de bits.
+    
+    El bit i corresponde a PATTERN_NAMES[i]; equivale a _update_patterns
+    sobre una sola línea.
+    """
+    patterns = _empty_patterns()
+    _update_patterns(patterns, entry_lower)
+    return sum(1 << bit for bit, name in enumerate(PATTERN_NAMES) if patterns[name])
+
+
+def identify_patterns(log_entries: Iterable[str]) -> Dict[str, int]:
+    """
+    Identifica patrones comunes en los logs.
     
     Args:
         log_entries: Lista de líneas de log
-        log_group: Nombre del log group
         
     Returns:
-        LogAnalysis con patrones identificados
+        Diccionario con patrones y sus frecuencias
     """
-    # Extraer request bodies
-    request_bodies = extract_request_bodies(log_entries)
+    patterns = _empty_patterns()
     
-    # Identificar patrones
-    patterns = identify_patterns(log_entries)
+    for entry in log_entries:
+        _update_patterns(patterns, entry.lower())
     
-    # Analizar presencia de campos
-    field_stats = analyze_field_presence(request_bodies)
+    return patterns
+
+
+def build_recommendations(patterns: Dict[str, int], field_stats: Dict[str, Any],
+                          lambda_metrics: Optional[LambdaMetrics] = None) -> List[str]:
+    """
+    Genera recomendaciones a partir de los patrones y la presencia de campos.
     
-    # Generar recomendaciones
+    Args:
+        patterns: Contadores devueltos por identify_patterns
+        field_stats: Estadísticas devueltas por analyze_field_presence
+        lambda_metrics: Métricas de las líneas REPORT (opcional)
+        
+    Returns:
+        Lista de recomendaciones
+    """
     recommendations = []
     
     if patterns['errors'] > 0:
@@ -240,15 +602,564 @@ def analyze_cloudwatch_logs(log_entries: List[str], log_group: str = 'unknown')
             "Agregar logging para facilitar debugging."
         )
     
-    return LogAnalysis(
-        log_group=log_group,
-        time_range='last 30 minutes',
-        total_entries=len(log_entries),
-        error_count=patterns['errors'],
-        request_bodies=request_bodies,
-        patterns=patterns,
-        recommendations=recommendations
-    )
+    if lambda_metrics is not None and lambda_metrics.invocations > 0:
+        recommendations.extend(build_performance_recommendations(lambda_metrics))
+    
+    return recommendations
+
+
+def build_performance_recommendations(lambda_metrics: LambdaMetrics,
+                                      configured_memory_mb: Optional[int] = None) -> List[str]:
+    """
+    Genera recomendaciones de right-sizing a partir de las líneas REPORT.
+    
+    Args:
+        lambda_metrics: Métricas acumuladas de la función
+        configured_memory_mb: MemorySize del template (opcional)
+        
+    Returns:
+        Lista de recomendaciones
+    """
+    recommendations = []
+    summary = lambda_metrics.summary(configured_memory_mb)
+    
+    if summary['cold_start_rate'] > 0.1:
+        recommendations.append(
+            f"El {summary['cold_start_rate']:.0%} de las invocaciones fueron cold starts "
+            f"(Init Duration p90: {summary['init_p90_ms']:.0f} ms). "
+            "Considerar Provisioned Concurrency o reducir dependencias en la inicialización."
+        )
+    
+    headroom = summary['memory_headroom']
+    if headroom is not None:
+        if headroom < 0.1:
+            recommendations.append(
+                f"La memoria máxima usada ({summary['max_memory_used_mb']} MB) está a menos del 10% "
+                f"del MemorySize configurado ({summary['memory_size_mb']} MB). Aumentar MemorySize."
+            )
+        elif headroom > 0.6 and summary['memory_size_mb'] > 128:
+            recommendations.append(
+                f"La memoria máxima usada ({summary['max_memory_used_mb']} MB) deja más del 60% libre "
+                f"de los {summary['memory_size_mb']} MB configurados. Considerar reducir MemorySize."
+            )
+    
+    return recommendations
+
+
+class LogAnalysisAccumulator:
+    """
+    Acumula el análisis de logs línea por línea en una sola pasada.
+    
+    Alimenta incrementalmente la extracción de bodies, la identificación de
+    patrones y la presencia de campos, de modo que el uso de memoria no
+    depende de la cantidad de líneas. Los request bodies se guardan en un
+    reservoir de tamaño max_sample_bodies (None guarda todos).
+    """
+    
+    def __init__(self, max_sample_bodies: Optional[int] = DEFAULT_MAX_SAMPLE_BODIES,
+                 seed: Optional[int] = None):
+        self.max_sample_bodies = max_sample_bodies
+        self.total_entries = 0
+        self.patterns = _empty_patterns()
+        self.field_stats: Dict[str, Any] = {}
+        self.request_bodies: List[Any] = []
+        self.request_body_count = 0
+        self.lambda_metrics = LambdaMetrics()
+        self._rng = random.Random(seed)
+    
+    def _add_body(self, body: Any):
+        self.request_body_count += 1
+        _update_field_stats(self.field_stats, body)
+        
+        if self.max_sample_bodies is None or len(self.request_bodies) < self.max_sample_bodies:
+            self.request_bodies.append(body)
+        else:
+            # Reservoir sampling (algoritmo R)
+            slot = self._rng.randrange(self.request_body_count)
+            if slot < self.max_sample_bodies:
+                self.request_bodies[slot] = body
+    
+    def add_line(self, log_line: str):
+        """Procesa una línea de log."""
+        self.add_lines((log_line,))
+    
+    def add_lines(self, log_lines: Iterable[str]):
+        """
+        Procesa un iterable de líneas de log con un escáner fusionado.
+        
+        Cada línea se pasa a minúsculas una sola vez; con ese texto se
+        actualizan todos los contadores de patrones (equivalente a
+        _update_patterns) y, solo si la línea puede contener un body (tiene
+        '{' y 'body'), se parsea el JSON y se actualizan los bodies y las
+        estadísticas de campos en el mismo paso.
+        """
+        errors = missing_parameters = successful_updates = 0
+        fecha_turno = hora_turno = fecha = hora = update_expression = 0
+        total = 0
+        add_body = self._add_body
+        add_report = self.lambda_metrics.add_report
+        
+        try:
+            for log_line in log_lines:
+                total += 1
+                entry_lower = log_line.lower()
+                
+                if 'error' in entry_lower or 'exception' in entry_lower:
+                    errors += 1
+                if 'missing' in entry_lower and 'parameter' in entry_lower:
+                    missing_parameters += 1
+                # 'success' también cubre 'successfully'
+                if 'success' in entry_lower:
+                    successful_updates += 1
+                if 'fechaturno' in entry_lower:
+                    fecha_turno += 1
+                if 'horaturno' in entry_lower:
+                    hora_turno += 1
+                if '"fecha"' in entry_lower or "'fecha'" in entry_lower:
+                    fecha += 1
+                if '"hora"' in entry_lower or "'hora'" in entry_lower:
+                    hora += 1
+                if 'updateexpression' in entry_lower or 'update_expression' in entry_lower:
+                    update_expression += 1
+                
+                # Líneas REPORT (texto o platform.report en formato JSON)
+                if 'report' in entry_lower:
+                    report = parse_report_line(log_line)
+                    if report is not None:
+                        add_report(report)
+                        continue
+                
+                # Sin '{' no hay JSON, y sin 'body' no hay request body que extraer
+                if '{' not in log_line or 'body' not in log_line:
+                    continue
+                
+                parsed = parse_log_entry(log_line)
+                if isinstance(parsed, dict) and ('body' in parsed or 'event' in parsed):
+                    for body in request_bodies_from_entry(parsed):
+                        add_body(body)
+        finally:
+            patterns = self.patterns
+            self.total_entries += total
+            patterns['errors'] += errors
+            patterns['missing_parameters'] += missing_parameters
+            patterns['successful_updates'] += successful_updates
+            patterns['fecha_turno_present'] += fecha_turno
+            patterns['hora_turno_present'] += hora_turno
+            patterns['fecha_present'] += fecha
+            patterns['hora_present'] += hora
+            patterns['update_expression_logged'] += update_expression
+    
+    def add_extracted(self, total_entries: int, pattern_counts: Dict[str, int],
+                      bodies: Iterable[Any], reports: Iterable[ReportMetrics]):
+        """
+        Incorpora resultados ya extraídos de las líneas (por ejemplo, desde el
+        cache columnar de log_cache) sin volver a escanear el texto.
+        
+        Args:
+            total_entries: Cantidad de líneas representadas
+            pattern_counts: Contadores de patrones de esas líneas
+            bodies: Request bodies en el orden de las líneas
+            reports: Métricas REPORT en el orden de las líneas
+        """
+        self.total_entries += total_entries
+        for pattern, count in pattern_counts.items():
+            self.patterns[pattern] = self.patterns.get(pattern, 0) + count
+        for body in bodies:
+            self._add_body(body)
+        for report in reports:
+            self.lambda_metrics.add_report(report)
+    
+    def merge(self, other: 'LogAnalysisAccumulator') -> 'LogAnalysisAccumulator':
+        """
+        Incorpora un parcial calculado sobre las líneas que siguen a las propias.
+        
+        Mezclar los parciales en el orden de los chunks da exactamente el mismo
+        resultado que procesar todas las líneas en serie: los contadores se
+        suman, los sample_values se completan hasta MAX_SAMPLE_VALUES en orden
+        y los campos nuevos se agregan en el orden en que aparecieron.
+        
+        Args:
+            other: Parcial a incorporar
+            
+        Returns:
+            El propio acumulador, para encadenar llamadas
+        """
+        self.total_entries += other.total_entries
+        for pattern, count in other.patterns.items():
+            self.patterns[pattern] = self.patterns.get(pattern, 0) + count
+        
+        for field_name, other_stats in other.field_stats.items():
+            stats = self.field_stats.get(field_name)
+            if stats is None:
+                self.field_stats[field_name] = {
+                    'count': other_stats['count'],
+                    'sample_values': list(other_stats['sample_values'])
+                }
+                continue
+            stats['count'] += other_stats['count']
+            free = MAX_SAMPLE_VALUES - len(stats['sample_values'])
+            if free > 0:
+                stats['sample_values'].extend(other_stats['sample_values'][:free])
+        
+        if self.max_sample_bodies is None:
+            self.request_bodies.extend(other.request_bodies)
+        else:
+            self.request_bodies = self._merge_reservoirs(
+                self.request_bodies, self.request_body_count,
+                other.request_bodies, other.request_body_count
+            )
+        self.request_body_count += other.request_body_count
+        self.lambda_metrics.merge(other.lambda_metrics)
+        return self
+    
+    def _merge_reservoirs(self, sample_a: List[Any], seen_a: int,
+                          sample_b: List[Any], seen_b: int) -> List[Any]:
+        """Combina dos muestras uniformes en una muestra uniforme de la unión."""
+        sample_a, sample_b = list(sample_a), list(sample_b)
+        merged = []
+        
+        while len(merged) < self.max_sample_bodies and (sample_a or sample_b):
+            # Elegir de cada muestra con probabilidad proporcional a lo que representa
+            if sample_b and (not sample_a or self._rng.randrange(seen_a + seen_b) >= seen_a):
+                merged.append(sample_b.pop(self._rng.randrange(len(sample_b))))
+                seen_b -= 1
+            else:
+                merged.append(sample_a.pop(self._rng.randrange(len(sample_a))))
+                seen_a -= 1
+        
+        return merged
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializa el estado del acumulador para poder continuarlo más tarde.
+        
+        Los request bodies deben ser serializables a JSON (lo son, porque
+        provienen de logs JSON).
+        """
+        version, internal_state, gauss_next = self._rng.getstate()
+        return {
+            'max_sample_bodies': self.max_sample_bodies,
+            'total_entries': self.total_entries,
+            'patterns': dict(self.patterns),
+            'field_stats': self.field_stats,
+            'request_bodies': self.request_bodies,
+            'request_body_count': self.request_body_count,
+            'lambda_metrics': self.lambda_metrics.to_dict(),
+            'rng_state': [version, list(internal_state), gauss_next]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'LogAnalysisAccumulator':
+        """Reconstruye un acumulador serializado con to_dict."""
+        accumulator = cls(max_sample_bodies=data.get('max_sample_bodies', DEFAULT_MAX_SAMPLE_BODIES))
+        accumulator.total_entries = data.get('total_entries', 0)
+        accumulator.patterns.update(data.get('patterns', {}))
+        accumulator.field_stats = data.get('field_stats', {})
+        accumulator.request_bodies = data.get('request_bodies', [])
+        accumulator.request_body_count = data.get('request_body_count', 0)
+        accumulator.lambda_metrics = LambdaMetrics.from_dict(data.get('lambda_metrics', {}))
+        if data.get('rng_state'):
+            version, internal_state, gauss_next = data['rng_state']
+            accumulator._rng.setstate((version, tuple(internal_state), gauss_next))
+        return accumulator
+    
+    def to_analysis(self, log_group: str = 'unknown', time_range: str = 'last 30 minutes') -> LogAnalysis:
+        """Construye el LogAnalysis con lo acumulado hasta el momento."""
+        return LogAnalysis(
+            log_group=log_group,
+            time_range=time_range,
+            total_entries=self.total_entries,
+            error_count=self.patterns['errors'],
+            request_bodies=list(self.request_bodies),
+            patterns=dict(self.patterns),
+            recommendations=build_recommendations(self.patterns, self.field_stats, self.lambda_metrics),
+            request_body_count=self.request_body_count,
+            field_stats=self.field_stats,
+            lambda_metrics=self.lambda_metrics
+        )
+
+
+def _analyze_chunk(log_entries: List[str], max_sample_bodies: Optional[int],
+                   seed: Optional[int]) -> LogAnalysisAccumulator:
+    """Worker: analiza un chunk de líneas y devuelve el parcial mezclable."""
+    accumulator = LogAnalysisAccumulator(max_sample_bodies=max_sample_bodies, seed=seed)
+    accumulator.add_lines(log_entries)
+    return accumulator
+
+
+def _analyze_file_chunk(log_path: str, max_sample_bodies: Optional[int],
+                        seed: Optional[int]) -> LogAnalysisAccumulator:
+    """Worker: analiza un archivo de log stream y devuelve el parcial mezclable."""
+    accumulator = LogAnalysisAccumulator(max_sample_bodies=max_sample_bodies, seed=seed)
+    with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+        accumulator.add_lines(line.rstrip('\r\n') for line in f)
+    return accumulator
+
+
+def _reduce_partials(partials: Iterable[LogAnalysisAccumulator],
+                     max_sample_bodies: Optional[int],
+                     seed: Optional[int]) -> LogAnalysisAccumulator:
+    """Mezcla los parciales en orden en un único acumulador."""
+    result = LogAnalysisAccumulator(max_sample_bodies=max_sample_bodies, seed=seed)
+    for partial in partials:
+        result.merge(partial)
+    return result
+
+
+def partition_seeds(seed: Optional[int], partitions: int) -> List[Optional[int]]:
+    """
+    Semilla de cada partición: la base más el índice de la partición (más uno,
+    para no repetir la del reducer). Con la misma semilla en todos los workers
+    los reservoirs de particiones parecidas elegirían las mismas posiciones.
+
+    Args:
+        seed: Semilla base (None = aleatoria en cada worker)
+        partitions: Cantidad de particiones
+
+    Returns:
+        Lista con una semilla por partición
+    """
+    if seed is None:
+        return [None] * partitions
+    return [seed + index + 1 for index in range(partitions)]
+
+
+def _resolve_workers(workers: Optional[int]) -> int:
+    return workers if workers and workers > 0 else (os.cpu_count() or 1)
+
+
+def analyze_cloudwatch_logs(log_entries: List[str], log_group: str = 'unknown',
+                            workers: int = 1) -> LogAnalysis:
+    """
+    Analiza logs de CloudWatch para identificar patrones de error.
+    
+    Args:
+        log_entries: Lista de líneas de log
+        log_group: Nombre del log group
+        workers: Cantidad de procesos (1 = serial, None/0 = todos los cores)
+        
+    Returns:
+        LogAnalysis con patrones identificados
+    """
+    workers = _resolve_workers(workers)
+    if workers > 1 and len(log_entries) >= 2 * MIN_PARALLEL_CHUNK_SIZE:
+        return analyze_cloudwatch_logs_parallel(log_entries, log_group, workers=workers)
+    
+    # Un solo escaneo fusionado: bodies, patrones y presencia de campos
+    accumulator = LogAnalysisAccumulator(max_sample_bodies=None)
+    accumulator.add_lines(log_entries)
+    return accumulator.to_analysis(log_group)
+
+
+def analyze_cloudwatch_logs_parallel(
+    log_entries: List[str],
+    log_group: str = 'unknown',
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    max_sample_bodies: Optional[int] = None,
+    seed: Optional[int] = None
+) -> LogAnalysis:
+    """
+    Analiza una lista de líneas repartiéndola en chunks entre procesos.
+    
+    Con max_sample_bodies=None el resultado es idéntico al de la ruta serial.
+    
+    Args:
+        log_entries: Lista de líneas de log
+        log_group: Nombre del log group
+        workers: Cantidad de procesos (None = todos los cores)
+        chunk_size: Líneas por chunk (default: reparto parejo entre workers)
+        max_sample_bodies: Tamaño del reservoir de request bodies (None = todos)
+        seed: Semilla para que el muestreo sea reproducible
+        
+    Returns:
+        LogAnalysis con patrones identificados
+    """
+    workers = _resolve_workers(workers)
+    if chunk_size is None:
+        chunk_size = max(MIN_PARALLEL_CHUNK_SIZE, -(-len(log_entries) // workers))
+    chunks = [log_entries[i:i + chunk_size] for i in range(0, len(log_entries), chunk_size)]
+    
+    seeds = partition_seeds(seed, len(chunks))
+    if workers == 1 or len(chunks) <= 1:
+        partials = [_analyze_chunk(chunk, max_sample_bodies, chunk_seed) for chunk, chunk_seed in zip(chunks, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            partials = list(executor.map(
+                _analyze_chunk,
+                chunks,
+                [max_sample_bodies] * len(chunks),
+                seeds
+            ))
+    
+    return _reduce_partials(partials, max_sample_bodies, seed).to_analysis(log_group)
+
+
+def analyze_cloudwatch_log_files(
+    log_paths: List[str],
+    log_group: str = 'unknown',
+    workers: Optional[int] = None,
+    max_sample_bodies: Optional[int] = DEFAULT_MAX_SAMPLE_BODIES,
+    seed: Optional[int] = None
+) -> LogAnalysis:
+    """
+    Analiza archivos de log (uno por log stream) en paralelo.
+    
+    Cada worker lee su archivo en streaming y devuelve un parcial; los
+    parciales se mezclan en el orden de log_paths.
+    
+    Args:
+        log_paths: Rutas a los archivos de log
+        log_group: Nombre del log group
+        workers: Cantidad de procesos (None = todos los cores)
+        max_sample_bodies: Tamaño del reservoir de request bodies (None = todos)
+        seed: Semilla para que el muestreo sea reproducible
+        
+    Returns:
+        LogAnalysis con patrones identificados
+    """
+    workers = min(_resolve_workers(workers), max(len(log_paths), 1))
+    
+    seeds = partition_seeds(seed, len(log_paths))
+    if workers == 1:
+        partials = [_analyze_file_chunk(path, max_sample_bodies, path_seed) for path, path_seed in zip(log_paths, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(
+                _analyze_file_chunk,
+                log_paths,
+                [max_sample_bodies] * len(log_paths),
+                seeds
+            ))
+    
+    return _reduce_partials(partials, max_sample_bodies, seed).to_analysis(log_group)
+
+
+def analyze_cloudwatch_log_stream(
+    log_lines: Iterable[str],
+    log_group: str = 'unknown',
+    max_sample_bodies: Optional[int] = DEFAULT_MAX_SAMPLE_BODIES,
+    seed: Optional[int] = None
+) -> LogAnalysis:
+    """
+    Analiza logs de CloudWatch en una sola pasada con memoria acotada.
+    
+    A diferencia de analyze_cloudwatch_logs, acepta cualquier iterable
+    (generador, file handle) y solo conserva una muestra de los request bodies.
+    
+    Args:
+        log_lines: Iterable de líneas de log
+        log_group: Nombre del log group
+        max_sample_bodies: Tamaño del reservoir de request bodies
+        seed: Semilla para que el muestreo sea reproducible
+        
+    Returns:
+        LogAnalysis con patrones identificados
+    """
+    accumulator = LogAnalysisAccumulator(max_sample_bodies=max_sample_bodies, seed=seed)
+    accumulator.add_lines(log_lines)
+    return accumulator.to_analysis(log_group)
+
+
+def analyze_cloudwatch_log_file(
+    log_path: str,
+    log_group: Optional[str] = None,
+    max_sample_bodies: Optional[int] = DEFAULT_MAX_SAMPLE_BODIES,
+    seed: Optional[int] = None
+) -> LogAnalysis:
+    """
+    Analiza un archivo de logs exportado sin cargarlo completo en memoria.
+    
+    Args:
+        log_path: Ruta al archivo (una línea de log por línea)
+        log_group: Nombre del log group (default: la ruta del archivo)
+        max_sample_bodies: Tamaño del reservoir de request bodies
+        seed: Semilla para que el muestreo sea reproducible
+        
+    Returns:
+        LogAnalysis con patrones identificados
+    """
+    with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+        lines = (line.rstrip('\r\n') for line in f)
+        return analyze_cloudwatch_log_stream(
+            lines,
+            log_group or log_path,
+            max_sample_bodies=max_sample_bodies,
+            seed=seed
+        )
+
+
+def match_function_name(log_group: str, function_names: Iterable[str]) -> Optional[str]:
+    """
+    Encuentra el nombre lógico de la función que corresponde a un log group.
+    
+    Args:
+        log_group: Nombre del log group (ej: /aws/lambda/salud-api-stack-ModifyTurnoFunction-X)
+        function_names: Nombres lógicos del template
+        
+    Returns:
+        El nombre lógico más largo contenido en el log group, o None
+    """
+    candidates = [name for name in function_names if name in log_group]
+    return max(candidates, key=len) if candidates else None
+
+
+def print_lambda_metrics(analysis: LogAnalysis, configured_memory_mb: Optional[int] = None):
+    """Imprime latencias, cold starts y margen de memoria de las líneas REPORT."""
+    metrics = analysis.lambda_metrics
+    if not metrics.invocations:
+        return
+    
+    summary = metrics.summary(configured_memory_mb)
+    print(f"\n{'─'*80}")
+    print(f"RENDIMIENTO (líneas REPORT): {summary['invocations']} invocaciones")
+    print(f"{'─'*80}")
+    print(f"  Duración p50/p90/p99: {summary['duration_p50_ms']:.1f} / "
+          f"{summary['duration_p90_ms']:.1f} / {summary['duration_p99_ms']:.1f} ms")
+    print(f"  Cold starts: {summary['cold_starts']} ({summary['cold_start_rate']:.1%})")
+    if summary['cold_starts']:
+        print(f"  Init Duration p50/p90/p99: {summary['init_p50_ms']:.1f} / "
+              f"{summary['init_p90_ms']:.1f} / {summary['init_p99_ms']:.1f} ms")
+    print(f"  Memoria usada p99/máx: {summary['max_memory_used_p99_mb']:.0f} / "
+          f"{summary['max_memory_used_mb']} MB de {summary['memory_size_mb']} MB")
+    if summary['memory_headroom'] is not None:
+        print(f"  Headroom de memoria: {summary['memory_headroom']:.0%}")
+
+
+def print_performance_summary(analyses: List[LogAnalysis], template_path: Optional[str] = None):
+    """
+    Imprime una tabla por función con latencias, cold starts y headroom de memoria
+    contra el MemorySize configurado en el template.
+    
+    Args:
+        analyses: Análisis de logs (uno por función)
+        template_path: Ruta al template de CloudFormation (opcional)
+    """
+    memory_sizes = load_lambda_memory_sizes(template_path) if template_path else {}
+    
+    print(f"\n{'='*80}")
+    print("RIGHT-SIZING DE FUNCIONES LAMBDA")
+    print(f"{'='*80}")
+    print(f"\n  {'Función':<30} {'Invoc.':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'Cold':>6} {'Mem':>11} {'Headroom':>9}")
+    
+    for analysis in analyses:
+        metrics = analysis.lambda_metrics
+        if not metrics.invocations:
+            continue
+        function_name = match_function_name(analysis.log_group, memory_sizes) or analysis.log_group
+        summary = metrics.summary(memory_sizes.get(function_name))
+        headroom = summary['memory_headroom']
+        print(
+            f"  {function_name[:30]:<30} {summary['invocations']:>7} "
+            f"{summary['duration_p50_ms']:>8.1f} {summary['duration_p90_ms']:>8.1f} "
+            f"{summary['duration_p99_ms']:>8.1f} {summary['cold_start_rate']:>6.1%} "
+            f"{summary['max_memory_used_mb']:>4}/{summary['memory_size_mb']:<6} "
+            f"{(f'{headroom:.0%}' if headroom is not None else '-'):>9}"
+        )
+        for rec in build_performance_recommendations(metrics, memory_sizes.get(function_name)):
+            print(f"    💡 {rec}")
+    
+    print(f"\n{'='*80}\n")
 
 
 def print_log_analysis(analysis: LogAnalysis):
@@ -268,14 +1179,19 @@ def print_log_analysis(analysis: LogAnalysis):
         print(f"  {icon} {pattern}: {count}")
     
     print(f"\n{'─'*80}")
-    print(f"REQUEST BODIES ENCONTRADOS: {len(analysis.request_bodies)}")
+    body_count = max(analysis.request_body_count, len(analysis.request_bodies))
+    print(f"REQUEST BODIES ENCONTRADOS: {body_count}")
     print(f"{'─'*80}")
     
+    if body_count > len(analysis.request_bodies):
+        print(f"(Se conserva una muestra de {len(analysis.request_bodies)} bodies)")
+    
     if analysis.request_bodies:
         # Mostrar campos únicos encontrados
-        all_fields = set()
+        all_fields = set(analysis.field_stats.keys())
         for body in analysis.request_bodies:
-            all_fields.update(body.keys())
+            if isinstance(body, dict):
+                all_fields.update(body.keys())
         
         print(f"\nCampos únicos encontrados: {sorted(all_fields)}")
         
@@ -284,6 +1200,8 @@ def print_log_analysis(analysis: LogAnalysis):
             print(f"\nEjemplo de request body:")
             print(json.dumps(analysis.request_bodies[0], indent=2))
     
+    print_lambda_metrics(analysis)
+    
     if analysis.recommendations:
         print(f"\n{'─'*80}")
         print("RECOMENDACIONES:")
@@ -302,11 +1220,17 @@ def analyze_sample_logs():
         '{"level": "INFO", "message": "Modifying reservation", "requestId": "abc123", "turnoId": "TURNO-123"}',
         '{"level": "ERROR", "message": "Missing required parameters", "requestId": "def456", "missingParameters": ["fechaTurno"]}',
         '{"level": "INFO", "message": "Reservation modified successfully", "requestId": "abc123"}',
+        'REPORT RequestId: abc123\tDuration: 215.43 ms\tBilled Duration: 216 ms\tMemory Size: 128 MB\tMax Memory Used: 89 MB\tInit Duration: 412.08 ms',
+        'REPORT RequestId: def456\tDuration: 12.07 ms\tBilled Duration: 13 ms\tMemory Size: 128 MB\tMax Memory Used: 90 MB',
     ]
     
     analysis = analyze_cloudwatch_logs(sample_logs, 'ModifyTurnoFunction')
     print_log_analysis(analysis)
 
+    # request_correlation importa este módulo: se importa acá para no crear un ciclo
+    from request_correlation import correlate_requests, print_correlation_report
+    print_correlation_report(correlate_requests(sample_logs))
+
 
 if __name__ == '__main__':
     print("Analizador de logs de CloudWatch inicializado")
@@ -0,0 +1,351 @@
+"""
+Cliente nativo para obtener logs de CloudWatch Logs con FilterLogEvents.
+
+Reemplaza la invocación de `aws logs tail` por llamadas paginadas y
+concurrentes: la ventana de tiempo se divide en slices y los log streams en
+lotes, cada combinación se pagina en un thread, y los eventos se entregan en
+streaming a medida que llegan (sin truncar ventanas grandes).
+
+El cliente es intercambiable: cualquier objeto con los métodos
+filter_log_events / describe_log_groups de boto3 sirve, lo que permite
+probar contra un backend en memoria sin acceso a AWS.
+"""
+
+import heapq
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+from cloudwatch_analyzer import LogAnalysis, LogAnalysisAccumulator, DEFAULT_MAX_SAMPLE_BODIES
+
+
+# Slices de tiempo en que se divide la ventana por defecto
+DEFAULT_TIME_SLICES = 4
+
+# Threads concurrentes de FilterLogEvents por defecto
+DEFAULT_MAX_WORKERS = 4
+
+# FilterLogEvents acepta hasta 100 nombres de log stream por llamada
+MAX_STREAMS_PER_CALL = 100
+
+# Páginas en vuelo entre los threads y el consumidor
+MAX_BUFFERED_PAGES = 64
+
+# Espera máxima por la próxima página (el mismo límite que tenía `aws logs tail`)
+DEFAULT_PAGE_TIMEOUT_SECONDS = 30
+
+
+@dataclass
+class FetchStats:
+    """Estadísticas de una descarga de logs"""
+    log_group: str
+    events: int = 0
+    pages: int = 0
+    tasks: int = 0
+    elapsed_seconds: float = 0.0
+
+
+def create_boto3_logs_client(region_name: Optional[str] = None):
+    """
+    Crea un cliente de CloudWatch Logs con boto3.
+
+    Args:
+        region_name: Región de AWS (default: la configurada en el entorno)
+
+    Returns:
+        Cliente boto3 'logs'
+    """
+    try:
+        import boto3
+    except ImportError:
+        raise RuntimeError("boto3 no está instalado. Para instalar: pip install boto3")
+    return boto3.client('logs', region_name=region_name)
+
+
+def resolve_log_groups(client, log_group: str) -> List[str]:
+    """
+    Expande un nombre de log group terminado en '*' a los log groups existentes.
+
+    Args:
+        client: Cliente de CloudWatch Logs
+        log_group: Nombre exacto o prefijo terminado en '*'
+
+    Returns:
+        Lista de nombres de log groups
+    """
+    if not log_group.endswith('*'):
+        return [log_group]
+
+    names = []
+    kwargs = {'logGroupNamePrefix': log_group[:-1]}
+    while True:
+        response = client.describe_log_groups(**kwargs)
+        names.extend(group['logGroupName'] for group in response.get('logGroups', []))
+        token = response.get('nextToken')
+        if not token:
+            return names
+        kwargs['nextToken'] = token
+
+
+def split_time_range(start_ms: int, end_ms: int, slices: int) -> List[Tuple[int, int]]:
+    """
+    Divide [start_ms, end_ms] en slices disjuntos (endTime es inclusivo en la API).
+
+    Args:
+        start_ms: Inicio de la ventana en ms epoch
+        end_ms: Fin de la ventana en ms epoch
+        slices: Cantidad de slices
+
+    Returns:
+        Lista de tuplas (inicio, fin) inclusivas
+    """
+    slices = max(1, min(slices, end_ms - start_ms + 1))
+    step = (end_ms - start_ms + 1) / slices
+    bounds = [start_ms + round(i * step) for i in range(slices)] + [end_ms + 1]
+    return [(bounds[i], bounds[i + 1] - 1) for i in range(slices) if bounds[i] < bounds[i + 1]]
+
+
+def _put(pages: 'queue.Queue', item: Tuple[str, Any], stop: threading.Event):
+    """Encola sin bloquear para siempre si el consumidor dejó de leer."""
+    while not stop.is_set():
+        try:
+            pages.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _paginate(client, request: Dict[str, Any], pages: 'queue.Queue', stop: threading.Event, index: int = 0):
+    """Worker: pagina una llamada FilterLogEvents y encola cada página con el índice del request."""
+    kwargs = dict(request)
+    previous_token = None
+    while not stop.is_set():
+        response = client.filter_log_events(**kwargs)
+        _put(pages, ('page', (index, response.get('events', []))), stop)
+        token = response.get('nextToken')
+        if not token or token == previous_token:
+            return
+        previous_token = token
+        kwargs['nextToken'] = token
+
+
+def iter_log_events(
+    client,
+    log_group: str,
+    start_time_ms: int,
+    end_time_ms: int,
+    time_slices: int = DEFAULT_TIME_SLICES,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    log_stream_names: Optional[List[str]] = None,
+    filter_pattern: Optional[str] = None,
+    stats: Optional[FetchStats] = None,
+    page_timeout: float = DEFAULT_PAGE_TIMEOUT_SECONDS,
+    ordered: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    Itera los eventos de un log group con FilterLogEvents paginado y concurrente.
+
+    Los eventos se entregan a medida que llegan las páginas, por lo que el
+    orden entre slices no está garantizado. Con ordered=True los slices se
+    siguen descargando en paralelo, pero se entregan en orden de tiempo: las
+    páginas de un slice posterior quedan en memoria hasta que terminan los
+    anteriores, y los lotes de streams de un mismo slice se mezclan por
+    timestamp.
+
+    Args:
+        client: Cliente de CloudWatch Logs (boto3 o un backend en memoria)
+        log_group: Nombre del log group (exacto o prefijo terminado en '*')
+        start_time_ms: Inicio de la ventana en ms epoch
+        end_time_ms: Fin de la ventana en ms epoch
+        time_slices: Slices de tiempo en que se divide la ventana
+        max_workers: Threads concurrentes
+        log_stream_names: Log streams a consultar (default: todos)
+        filter_pattern: filterPattern de CloudWatch (opcional)
+        stats: FetchStats a completar (opcional)
+        page_timeout: Segundos máximos de espera por la próxima página
+        ordered: Entregar los eventos en orden de timestamp por log group
+
+    Yields:
+        Eventos con logStreamName, timestamp y message
+
+    Raises:
+        TimeoutError: Si ningún worker entrega una página en page_timeout segundos
+    """
+    started = time.perf_counter()
+    requests = []
+    # Índices de requests de cada (log group, slice), en orden de tiempo
+    buckets: List[List[int]] = []
+    for group in resolve_log_groups(client, log_group):
+        stream_batches: List[Optional[List[str]]] = [None]
+        if log_stream_names:
+            stream_batches = [
+                log_stream_names[i:i + MAX_STREAMS_PER_CALL]
+                for i in range(0, len(log_stream_names), MAX_STREAMS_PER_CALL)
+            ]
+        for slice_start, slice_end in split_time_range(start_time_ms, end_time_ms, time_slices):
+            buckets.append([])
+            for batch in stream_batches:
+                buckets[-1].append(len(requests))
+                request = {'logGroupName': group, 'startTime': slice_start, 'endTime': slice_end}
+                if batch:
+                    request['logStreamNames'] = batch
+                if filter_pattern:
+                    request['filterPattern'] = filter_pattern
+                requests.append(request)
+
+    if stats is not None:
+        stats.tasks += len(requests)
+    if not requests:
+        return
+
+    pages: 'queue.Queue' = queue.Queue(maxsize=MAX_BUFFERED_PAGES)
+    stop = threading.Event()
+
+    def run(index, request):
+        try:
+            _paginate(client, request, pages, stop, index)
+        except Exception as e:
+            _put(pages, ('error', (index, e)), stop)
+        finally:
+            _put(pages, ('done', (index, None)), stop)
+
+    bucket_of = {index: bucket for bucket, indexes in enumerate(buckets) for index in indexes}
+    remaining = [len(indexes) for indexes in buckets]
+    buffered: Dict[int, List[Dict[str, Any]]] = {index: [] for index in range(len(requests))}
+    current = 0
+
+    def streams_directly(index: int) -> bool:
+        return not ordered or (bucket_of[index] == current and len(buckets[current]) == 1)
+
+    def advance() -> Iterator[Dict[str, Any]]:
+        # Entrega los slices ya completos y lo acumulado del slice que se empieza a transmitir
+        nonlocal current
+        while current < len(buckets):
+            indexes = buckets[current]
+            if remaining[current]:
+                if len(indexes) == 1:
+                    yield from buffered[indexes[0]]
+                    buffered[indexes[0]] = []
+                return
+            yield from heapq.merge(*(buffered.pop(index) for index in indexes), key=lambda e: e['timestamp'])
+            current += 1
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(requests))))
+    try:
+        for index, request in enumerate(requests):
+            executor.submit(run, index, request)
+
+        pending = len(requests)
+        while pending:
+            try:
+                kind, (index, payload) = pages.get(timeout=page_timeout)
+            except queue.Empty:
+                raise TimeoutError(
+                    f"FilterLogEvents de {log_group}: sin respuesta en {page_timeout:g}s "
+                    f"({pending} de {len(requests)} tareas sin terminar)"
+                ) from None
+            if kind == 'done':
+                pending -= 1
+                if ordered:
+                    remaining[bucket_of[index]] -= 1
+                    yield from advance()
+            elif kind == 'error':
+                raise payload
+            else:
+                if stats is not None:
+                    stats.pages += 1
+                    stats.events += len(payload)
+                if streams_directly(index):
+                    yield from payload
+                else:
+                    buffered[index].extend(payload)
+    finally:
+        # Los workers dejan de paginar y de encolar al ver stop
+        stop.set()
+        executor.shutdown(wait=False)
+        if stats is not None:
+            stats.elapsed_seconds += time.perf_counter() - started
+
+
+def format_event(event: Dict[str, Any]) -> str:
+    """Formatea un evento como `aws logs tail --format short`: 'timestamp mensaje'."""
+    timestamp = datetime.fromtimestamp(event['timestamp'] / 1000, tz=timezone.utc)
+    return f"{timestamp.strftime('%Y-%m-%dT%H:%M:%S')} {event['message'].rstrip()}"
+
+
+def time_window(minutes: int, now_ms: Optional[int] = None) -> Tuple[int, int]:
+    """Devuelve (inicio, fin) en ms epoch para los últimos `minutes` minutos."""
+    end_ms = now_ms if now_ms is not None else int(time.time() * 1000)
+    return end_ms - minutes * 60 * 1000, end_ms
+
+
+def iter_log_lines(client, log_group: str, minutes: int = 30, now_ms: Optional[int] = None,
+                   **kwargs) -> Iterator[str]:
+    """
+    Itera las líneas de log de los últimos `minutes` minutos en formato short.
+
+    Args:
+        client: Cliente de CloudWatch Logs
+        log_group: Nombre del log group (exacto o prefijo terminado en '*')
+        minutes: Minutos hacia atrás para buscar logs
+        now_ms: Fin de la ventana en ms epoch (default: ahora)
+        **kwargs: Parámetros adicionales de iter_log_events
+
+    Yields:
+        Líneas de log
+    """
+    start_ms, end_ms = time_window(minutes, now_ms)
+    for event in iter_log_events(client, log_group, start_ms, end_ms, **kwargs):
+        yield format_event(event)
+
+
+def correlated_lines(lines: Iterator[str], correlator) -> Iterator[str]:
+    """Pasa cada línea al correlator (RequestCorrelator) a medida que se consume."""
+    for line in lines:
+        correlator.add_line(line)
+        yield line
+
+
+def fetch_and_analyze(
+    client,
+    log_group: str,
+    minutes: int = 30,
+    analysis_name: Optional[str] = None,
+    max_sample_bodies: Optional[int] = DEFAULT_MAX_SAMPLE_BODIES,
+    stats: Optional[FetchStats] = None,
+    now_ms: Optional[int] = None,
+    correlator=None,
+    **kwargs
+) -> LogAnalysis:
+    """
+    Descarga los logs de un log group y los analiza en streaming.
+
+    Los eventos van directo al LogAnalysisAccumulator sin materializar la
+    lista de líneas; si hay correlator, cada línea también se le pasa en la
+    misma pasada, y los eventos se piden en orden de timestamp (ordered) para
+    que ningún request quede partido entre dos slices.
+
+    Args:
+        client: Cliente de CloudWatch Logs
+        log_group: Nombre del log group (exacto o prefijo terminado en '*')
+        minutes: Minutos hacia atrás para buscar logs
+        analysis_name: Nombre para el LogAnalysis (default: log_group)
+        max_sample_bodies: Tamaño del reservoir de request bodies
+        stats: FetchStats a completar (opcional)
+        now_ms: Fin de la ventana en ms epoch (default: ahora)
+        correlator: RequestCorrelator que recibe las mismas líneas (opcional)
+        **kwargs: Parámetros adicionales de iter_log_events
+
+    Returns:
+        LogAnalysis del log group
+    """
+    accumulator = LogAnalysisAccumulator(max_sample_bodies=max_sample_bodies)
+    if correlator is not None:
+        kwargs.setdefault('ordered', True)
+    lines = iter_log_lines(client, log_group, minutes, now_ms=now_ms, stats=stats, **kwargs)
+    accumulator.add_lines(lines if correlator is None else correlated_lines(lines, correlator))
+    return accumulator.to_analysis(analysis_name or log_group, time_range=f'last {minutes} minutes')
@@ -0,0 +1,614 @@
+"""
+Patrones de acceso a DynamoDB de las lambdas del template y su costo de lectura.
+
+Cruza las llamadas a DynamoDB que extrae lambda_analyzer (Get/Put/Update/
+Delete/Query/Scan, en Python y JavaScript) con los key schemas de las tablas
+y GSIs declarados en el template, y marca:
+- Scans (leen la tabla completa)
+- Queries con FilterExpression (el filtro se aplica después de leer: se pagan
+  todos los ítems de la partición aunque se devuelvan pocos)
+- Queries/Scans sin paginar (sin loop sobre LastEvaluatedKey los resultados
+  se cortan en 1 MB sin error)
+- Keys, índices y condiciones que no coinciden con el key schema
+
+Las RCUs por request se estiman con el tamaño real de los ítems de los datos
+de seed (medicos_seed_data_converted.json para MedicosTable), con las reglas
+de DynamoDB: 4 KB por unidad de lectura sobre el total leído (0.5 RCU si es
+eventualmente consistente) y 1 KB por unidad de escritura por ítem.
+"""
+
+import argparse
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
+
+from js_analyzer import DynamoCommand
+from lambda_analyzer import Finding, extract_dynamo_commands
+from template_index import LambdaFunctionInfo, TemplateIndex, load_template_index
+
+
+DYNAMODB_TABLE_TYPE = 'AWS::DynamoDB::Table'
+
+# Datos de seed por tabla (nombre lógico -> archivo JSON con la lista de ítems)
+DEFAULT_SEED_DATA = {'MedicosTable': 'documentos_salud_connect_ia/medicos_seed_data_converted.json'}
+
+READ_UNIT_BYTES = 4096
+WRITE_UNIT_BYTES = 1024
+
+# Tamaño máximo que devuelve una página de Query/Scan
+PAGE_LIMIT_BYTES = 1024 * 1024
+
+READ_COMMANDS = ('Get', 'Query', 'Scan')
+WRITE_COMMANDS = ('Put', 'Update', 'Delete')
+
+# Referencias a una variable de entorno: process.env.X, os.environ['X'], os.environ.get('X')
+_ENV_RE = re.compile(r"""(?:process\.env\.|environ(?:\.get\(|\[)\s*['"])(\w+)""")
+
+_EXPRESSION_NAME_RE = re.compile(r'(?<![:\w])#?[A-Za-z_]\w*')
+
+_EXPRESSION_KEYWORDS = {
+    'and', 'or', 'not', 'between', 'in', 'begins_with', 'contains', 'attribute_exists',
+    'attribute_not_exists', 'attribute_type', 'size', 'set', 'remove', 'add', 'delete',
+    'if_not_exists', 'list_append',
+}
+
+
+@dataclass
+class KeySchema:
+    """Key schema de una tabla (name=None) o de un GSI/LSI"""
+    name: Optional[str]
+    hash_key: str
+    range_key: Optional[str] = None
+    projection: str = 'ALL'  # 'ALL', 'KEYS_ONLY', 'INCLUDE'
+    non_key_attributes: List[str] = field(default_factory=list)
+
+    @property
+    def keys(self) -> List[str]:
+        return [self.hash_key] + ([self.range_key] if self.range_key else [])
+
+
+@dataclass
+class TableSchema:
+    """Tabla DynamoDB declarada en el template"""
+    logical_id: str
+    table_name: Optional[str]
+    billing_mode: str
+    primary: KeySchema
+    indexes: Dict[str, KeySchema] = field(default_factory=dict)
+
+    def key_schema(self, index_name: Optional[str]) -> Optional[KeySchema]:
+        """Key schema de la tabla o del índice (None si el índice no existe)."""
+        if not index_name:
+            return self.primary
+        return self.indexes.get(index_name)
+
+
+@dataclass
+class CapacityEstimate:
+    """Costo estimado de una llamada por request"""
+    unit: str  # 'RCU' o 'WCU'
+    average: float
+    maximum: float
+    items_read: float  # promedio de ítems leídos
+    items_returned: float  # promedio de ítems devueltos (menor si hay FilterExpression)
+    bytes_read: float  # promedio de bytes leídos
+    consistent: bool = False
+
+
+@dataclass
+class AccessPattern:
+    """Una llamada a DynamoDB resuelta contra el key schema de su tabla"""
+    lambda_name: str
+    command: DynamoCommand
+    table: Optional[str]  # nombre lógico de la tabla
+    key_attributes: List[str] = field(default_factory=list)
+    filter_attributes: List[str] = field(default_factory=list)
+    paginated: bool = False
+    estimate: Optional[CapacityEstimate] = None
+    findings: List[Finding] = field(default_factory=list)
+
+
+@dataclass
+class DynamoAccessReport:
+    """Resultado del análisis de acceso a DynamoDB de un template"""
+    template_path: str
+    tables: Dict[str, TableSchema]
+    patterns: List[AccessPattern]
+    seed_items: Dict[str, int] = field(default_factory=dict)
+    # Hallazgos de los datos de seed (ítems sin las claves de la tabla o de sus índices)
+    data_findings: List[Finding] = field(default_factory=list)
+
+    @property
+    def findings(self) -> List[Finding]:
+        return [finding for pattern in self.patterns for finding in pattern.findings] + self.data_findings
+
+
+def _key_schema(name: Optional[str], definition: Dict[str, Any]) -> Optional[KeySchema]:
+    hash_key = range_key = None
+    for element in definition.get('KeySchema') or []:
+        if element.get('KeyType') == 'HASH':
+            hash_key = element.get('AttributeName')
+        elif element.get('KeyType') == 'RANGE':
+            range_key = element.get('AttributeName')
+    if hash_key is None:
+        return None
+    projection = definition.get('Projection') or {}
+    return KeySchema(
+        name=name,
+        hash_key=hash_key,
+        range_key=range_key,
+        projection=projection.get('ProjectionType', 'ALL' if name is None else 'KEYS_ONLY'),
+        non_key_attributes=list(projection.get('NonKeyAttributes') or [])
+    )
+
+
+def parse_table_schemas(index: TemplateIndex) -> Dict[str, TableSchema]:
+    """
+    Lee las tablas DynamoDB del template con sus GSIs y LSIs.
+
+    Args:
+        index: Índice del template
+
+    Returns:
+        Diccionario nombre lógico -> TableSchema
+    """
+    tables = {}
+    for logical_id, resource in index.resources_of_type(DYNAMODB_TABLE_TYPE).items():
+        properties = resource.get('Properties') or {}
+        primary = _key_schema(None, properties)
+        if primary is None:
+            continue
+        indexes = {}
+        for definition in (properties.get('GlobalSecondaryIndexes') or []) + \
+                (properties.get('LocalSecondaryIndexes') or []):
+            schema = _key_schema(definition.get('IndexName'), definition)
+            if schema is not None:
+                indexes[schema.name] = schema
+        table_name = properties.get('TableName')
+        tables[logical_id] = TableSchema(
+            logical_id=logical_id,
+            table_name=table_name if isinstance(table_name, str) else None,
+            billing_mode=properties.get('BillingMode', 'PROVISIONED'),
+            primary=primary,
+            indexes=indexes
+        )
+    return tables
+
+
+def resolve_table(command: DynamoCommand, info: LambdaFunctionInfo, tables: Dict[str, TableSchema]) -> Optional[str]:
+    """
+    Resuelve la tabla de una llamada: variable de entorno de la lambda con
+    !Ref a la tabla, nombre físico declarado o nombre lógico.
+
+    Returns:
+        Nombre lógico de la tabla o None si no se pudo resolver
+    """
+    if not command.table:
+        return None
+    match = _ENV_RE.search(command.table)
+    if match:
+        value = info.environment.get(match.group(1))
+        if isinstance(value, dict):
+            value = value.get('Ref')
+        if value in tables:
+            return value
+        command_table = value if isinstance(value, str) else None
+    else:
+        command_table = command.table
+    for logical_id, table in tables.items():
+        if command_table in (logical_id, table.table_name):
+            return logical_id
+    return None
+
+
+def expression_attributes(expression: str, attribute_names: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    Atributos que usa una expresión de DynamoDB ('#a = :a AND contains(b, :b)' -> ['a', 'b']).
+
+    Args:
+        expression: KeyConditionExpression, FilterExpression, etc.
+        attribute_names: ExpressionAttributeNames de la llamada
+
+    Returns:
+        Nombres de atributos en orden de aparición
+    """
+    attribute_names = attribute_names or {}
+    names = []
+    for token in _EXPRESSION_NAME_RE.findall(expression or ''):
+        if token.lower() in _EXPRESSION_KEYWORDS:
+            continue
+        names.append(attribute_names.get(token, token.lstrip('#')))
+    return list(dict.fromkeys(names))
+
+
+def _number_size(value: Any) -> int:
+    digits = re.sub(r'[^0-9]', '', repr(value)).strip('0') or '0'
+    return (len(digits) + 1) // 2 + 1
+
+
+def dynamodb_item_size(value: Any) -> int:
+    """
+    Tamaño en bytes de un valor según las reglas de DynamoDB: nombres y strings
+    en UTF-8, números por dígitos significativos, 1 byte para bool/null y 3
+    bytes más 1 por elemento para listas y mapas.
+
+    Args:
+        value: Ítem (dict) o valor de un atributo
+
+    Returns:
+        Tamaño en bytes
+    """
+    if isinstance(value, dict):
+        return 3 + sum(len(str(name).encode('utf-8')) + dynamodb_item_size(item) + 1 for name, item in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return 3 + sum(dynamodb_item_size(item) + 1 for item in value)
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    if isinstance(value, bytes):
+        return len(value)
+    if value is None or isinstance(value, bool):
+        return 1
+    return _number_size(value)
+
+
+def top_level_item_size(item: Dict[str, Any]) -> int:
+    """Tamaño de un ítem en bytes: nombres y valores de sus atributos, sin el overhead de mapa."""
+    return sum(len(name.encode('utf-8')) + dynamodb_item_size(value) for name, value in item.items())
+
+
+def _projected_size(item: Dict[str, Any], table: TableSchema, schema: KeySchema) -> int:
+    if schema.name is None or schema.projection == 'ALL':
+        return top_level_item_size(item)
+    attributes = set(schema.keys) | set(table.primary.keys)
+    if schema.projection == 'INCLUDE':
+        attributes |= set(schema.non_key_attributes)
+    return top_level_item_size({name: value for name, value in item.items() if name in attributes})
+
+
+def _filter_selectivity(partition: List[Dict[str, Any]], attributes: List[str]) -> float:
+    """
+    Fracción esperada de ítems que pasan un filtro por igualdad sobre los
+    atributos: promedio, sobre los ítems de la partición, de la fracción que
+    comparte su valor.
+    """
+    if not partition or not attributes:
+        return 1.0
+    values = [tuple(json.dumps(item.get(name), sort_keys=True, default=str) for name in attributes)
+              for item in partition]
+    counts = Counter(values)
+    return sum(counts[value] for value in values) / len(values) ** 2
+
+
+def estimate_capacity(pattern: AccessPattern, table: TableSchema, items: List[Dict[str, Any]]) -> Optional[CapacityEstimate]:
+    """
+    Estima las unidades de capacidad por request de una llamada.
+
+    Args:
+        pattern: Llamada ya resuelta contra su tabla
+        table: Tabla de la llamada
+        items: Ítems de la tabla (datos de seed)
+
+    Returns:
+        CapacityEstimate o None si no hay ítems para estimar
+    """
+    command = pattern.command
+    schema = table.key_schema(command.index_name)
+    if not items or schema is None:
+        return None
+    # Los GSIs solo admiten lecturas eventualmente consistentes
+    consistent = command.consistent_read and schema.name is None
+    read_factor = 1.0 if consistent else 0.5
+
+    if command.command in WRITE_COMMANDS:
+        units = [math.ceil(top_level_item_size(item) / WRITE_UNIT_BYTES) for item in items]
+        return CapacityEstimate('WCU', sum(units) / len(units), max(units), 1, 1,
+                                sum(top_level_item_size(item) for item in items) / len(items), True)
+
+    if command.command == 'Get':
+        sizes = [top_level_item_size(item) for item in items]
+        units = [math.ceil(size / READ_UNIT_BYTES) * read_factor for size in sizes]
+        return CapacityEstimate('RCU', sum(units) / len(units), max(units), 1, 1, sum(sizes) / len(sizes), consistent)
+
+    if command.command == 'Scan':
+        partitions = [[item for item in items if all(key in item for key in schema.keys)]]
+    else:
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for item in items:
+            if schema.hash_key in item:
+                grouped.setdefault(json.dumps(item[schema.hash_key], default=str), []).append(item)
+        partitions = list(grouped.values())
+    if not partitions or not any(partitions):
+        return None
+
+    units, read_bytes, returned = [], [], []
+    for partition in partitions:
+        total = sum(_projected_size(item, table, schema) for item in partition)
+        # Una página no pasa de 1 MB: sin paginar se lee (y se devuelve) solo la primera
+        if not pattern.paginated:
+            total = min(total, PAGE_LIMIT_BYTES)
+        units.append(max(1, math.ceil(total / READ_UNIT_BYTES)) * read_factor)
+        read_bytes.append(total)
+        returned.append(len(partition) * _filter_selectivity(partition, pattern.filter_attributes))
+
+    return CapacityEstimate(
+        unit='RCU',
+        average=sum(units) / len(units),
+        maximum=max(units),
+        items_read=sum(len(partition) for partition in partitions) / len(partitions),
+        items_returned=sum(returned) / len(returned),
+        bytes_read=sum(read_bytes) / len(read_bytes),
+        consistent=consistent
+    )
+
+
+def _check_pattern(pattern: AccessPattern, table: Optional[TableSchema]) -> List[Finding]:
+    command = pattern.command
+    location = f'{pattern.lambda_name}: {command.command} (línea {command.line})'
+    findings = []
+
+    if table is None:
+        findings.append(Finding(
+            severity='info',
+            category='configuration',
+            description=f"No se pudo resolver la tabla de la llamada ({command.table or 'sin TableName'})",
+            location=location,
+            recommendation='Pasar el nombre de la tabla por una variable de entorno con !Ref a la tabla del template'
+        ))
+        return findings
+
+    schema = table.key_schema(command.index_name)
+    if schema is None:
+        findings.append(Finding(
+            severity='critical',
+            category='configuration',
+            description=f"El índice {command.index_name} no existe en {table.logical_id}",
+            location=location,
+            recommendation=f"Usar uno de los índices declarados: {sorted(table.indexes) or 'ninguno'}"
+        ))
+        return findings
+
+    if command.command == 'Scan':
+        findings.append(Finding(
+            severity='warning',
+            category='code',
+            description=f"Scan sobre {table.logical_id}{f' ({schema.name})' if schema.name else ''}: "
+                        f"lee y cobra la tabla completa en cada request",
+            location=location,
+            recommendation='Reemplazar por un Query sobre un índice cuya clave de partición sea el atributo filtrado'
+        ))
+
+    if command.command == 'Query':
+        if schema.hash_key not in pattern.key_attributes:
+            findings.append(Finding(
+                severity='critical',
+                category='code',
+                description=f"KeyConditionExpression no usa la clave de partición {schema.hash_key} "
+                            f"de {schema.name or table.logical_id} (usa {pattern.key_attributes})",
+                location=location,
+                recommendation=f"La condición de clave debe ser '{schema.hash_key} = :valor'"
+            ))
+        extra = [name for name in pattern.key_attributes if name not in schema.keys]
+        if extra:
+            findings.append(Finding(
+                severity='critical',
+                category='code',
+                description=f"KeyConditionExpression usa atributos que no son clave: {extra}",
+                location=location,
+                recommendation='Mover esas condiciones a un índice que las tenga como clave de ordenamiento'
+            ))
+
+    if command.command in ('Query', 'Scan'):
+        if pattern.filter_attributes:
+            detail = ''
+            if pattern.estimate and pattern.estimate.items_read:
+                detail = (f" (se leen ~{pattern.estimate.items_read:.1f} ítems por request y "
+                          f"se devuelven ~{pattern.estimate.items_returned:.1f})")
+            findings.append(Finding(
+                severity='warning',
+                category='code',
+                description=f"FilterExpression sobre {pattern.filter_attributes}: el filtro se aplica después "
+                            f"de leer y se pagan todos los ítems de la partición{detail}",
+                location=location,
+                recommendation=f"Agregar un GSI con {schema.hash_key} como clave de partición y "
+                               f"{pattern.filter_attributes[0]} como clave de ordenamiento, o una clave compuesta"
+            ))
+        if not pattern.paginated:
+            findings.append(Finding(
+                severity='warning',
+                category='code',
+                description=f"{command.command} sin paginar: no recorre LastEvaluatedKey, así que los resultados "
+                            f"se cortan en silencio al pasar 1 MB",
+                location=location,
+                recommendation='Repetir la llamada con ExclusiveStartKey mientras la respuesta traiga LastEvaluatedKey'
+            ))
+
+    if command.command in ('Get', 'Update', 'Delete') and command.key_fields and \
+            sorted(command.key_fields) != sorted(table.primary.keys):
+        findings.append(Finding(
+            severity='critical',
+            category='code',
+            description=f"Key {command.key_fields} no coincide con la clave primaria {table.primary.keys} "
+                        f"de {table.logical_id}",
+            location=location,
+            recommendation=f"Pasar exactamente {table.primary.keys} en Key"
+        ))
+    if command.command == 'Put' and command.item_fields:
+        missing = [key for key in table.primary.keys if key not in command.item_fields]
+        if missing:
+            findings.append(Finding(
+                severity='critical',
+                category='code',
+                description=f"El Item no incluye la clave primaria {missing} de {table.logical_id}",
+                location=location,
+                recommendation='Agregar la clave primaria al Item'
+            ))
+    return findings
+
+
+def _check_seed_items(table: TableSchema, items: List[Dict[str, Any]]) -> List[Finding]:
+    findings = []
+    location = f'datos de seed de {table.logical_id}'
+    for key in table.primary.keys:
+        missing = sum(1 for item in items if key not in item)
+        if missing:
+            findings.append(Finding(
+                severity='critical',
+                category='data',
+                description=f"{missing}/{len(items)} ítems no tienen la clave primaria {key}: "
+                            f"DynamoDB rechaza la escritura con ValidationException",
+                location=location,
+                recommendation=f"Renombrar el identificador de los ítems a {key}"
+            ))
+    for schema in table.indexes.values():
+        missing = sum(1 for item in items if any(key not in item for key in schema.keys))
+        if missing:
+            findings.append(Finding(
+                severity='warning',
+                category='data',
+                description=f"{missing}/{len(items)} ítems no tienen las claves de {schema.name} {schema.keys} "
+                            f"y no aparecen en sus Queries",
+                location=location,
+                recommendation=f"Completar {schema.keys} en los ítems o confirmar que el índice es sparse a propósito"
+            ))
+    return findings
+
+
+def load_seed_data(seed_paths: Dict[str, str]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Carga los ítems de seed de cada tabla.
+
+    Args:
+        seed_paths: Nombre lógico de la tabla -> archivo JSON (lista de ítems
+            o {'Items': [...]})
+
+    Returns:
+        Nombre lógico -> ítems; los archivos que no existen se omiten
+    """
+    seed_data = {}
+    for table, path in seed_paths.items():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            continue
+        items = data.get('Items', []) if isinstance(data, dict) else data
+        seed_data[table] = [item for item in items if isinstance(item, dict)]
+    return seed_data
+
+
+def analyze_dynamodb_access(index: TemplateIndex,
+                            seed_data: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> DynamoAccessReport:
+    """
+    Analiza las llamadas a DynamoDB de todas las lambdas inline del template.
+
+    Args:
+        index: Índice del template
+        seed_data: Ítems por tabla (nombre lógico) para estimar capacidad
+
+    Returns:
+        DynamoAccessReport con los patrones de acceso, hallazgos y estimaciones
+    """
+    seed_data = seed_data or {}
+    tables = parse_table_schemas(index)
+    patterns = []
+    for lambda_name, info in index.lambdas.items():
+        if not info.inline_code:
+            continue
+        for command in extract_dynamo_commands(info.inline_code):
+            table_id = resolve_table(command, info, tables)
+            pattern = AccessPattern(
+                lambda_name=lambda_name,
+                command=command,
+                table=table_id,
+                key_attributes=expression_attributes(
+                    command.expressions.get('KeyConditionExpression', ''), command.attribute_names),
+                filter_attributes=expression_attributes(
+                    command.expressions.get('FilterExpression', ''), command.attribute_names),
+                paginated=command.paginated
+            )
+            table = tables.get(table_id)
+            if table is not None:
+                pattern.estimate = estimate_capacity(pattern, table, seed_data.get(table_id, []))
+            pattern.findings = _check_pattern(pattern, table)
+            patterns.append(pattern)
+
+    data_findings = []
+    for table_id, items in seed_data.items():
+        if table_id in tables:
+            data_findings.extend(_check_seed_items(tables[table_id], items))
+
+    return DynamoAccessReport(
+        template_path=index.path,
+        tables=tables,
+        patterns=patterns,
+        seed_items={table_id: len(items) for table_id, items in seed_data.items()},
+        data_findings=data_findings
+    )
+
+
+def print_dynamodb_access_report(report: DynamoAccessReport):
+    """Imprime el análisis de acceso a DynamoDB de forma legible."""
+    print(f"\n{'='*80}")
+    print("PATRONES DE ACCESO A DYNAMODB")
+    print(f"{'='*80}")
+
+    for table in report.tables.values():
+        indexes = ', '.join(f"{name} {schema.keys}" for name, schema in table.indexes.items()) or 'sin índices'
+        seed = report.seed_items.get(table.logical_id)
+        print(f"\n🗄️  {table.logical_id}: clave {table.primary.keys}, {indexes}, {table.billing_mode}"
+              f"{f', {seed} ítems de seed' if seed is not None else ''}")
+
+    icons = {'critical': '🔴', 'warning': '⚠️', 'info': 'ℹ️'}
+    for pattern in report.patterns:
+        command = pattern.command
+        target = pattern.table or command.table or '?'
+        if command.index_name:
+            target += f' ({command.index_name})'
+        print(f"\n📌 {pattern.lambda_name}: {command.command} sobre {target}")
+        if pattern.key_attributes:
+            print(f"   Clave: {pattern.key_attributes}")
+        if pattern.filter_attributes:
+            print(f"   Filtro: {pattern.filter_attributes}")
+        estimate = pattern.estimate
+        if estimate is not None:
+            consistency = 'fuerte' if estimate.consistent or estimate.unit == 'WCU' else 'eventual'
+            print(f"   💰 {estimate.average:.1f} {estimate.unit} por request (máx {estimate.maximum:.1f}, "
+                  f"{consistency}), ~{estimate.bytes_read / 1024:.1f} KB y {estimate.items_read:.1f} ítems leídos, "
+                  f"{estimate.items_returned:.1f} devueltos")
+        for finding in pattern.findings:
+            print(f"   {icons.get(finding.severity, '•')} {finding.description}")
+            print(f"      → {finding.recommendation}")
+
+    for finding in report.data_findings:
+        print(f"\n{icons.get(finding.severity, '•')} {finding.location}: {finding.description}")
+        print(f"   → {finding.recommendation}")
+
+    print(f"\n{'='*80}\n")
+
+
+def parse_seed_argument(value: str) -> Tuple[str, str]:
+    """Tipo de argparse para --seed TABLA=archivo.json."""
+    table, separator, path = value.partition('=')
+    if not separator:
+        raise argparse.ArgumentTypeError('Formato esperado: TABLA=archivo.json')
+    return table, path
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Patrones de acceso y costo de lectura de DynamoDB por lambda')
+    parser.add_argument('--template', default='documentos_salud_connect_ia/turnos-medicos-api-final.yaml')
+    parser.add_argument('--seed', action='append', type=parse_seed_argument, default=[],
+                        metavar='TABLA=ARCHIVO', help='Ítems de una tabla para estimar capacidad (repetible)')
+    args = parser.parse_args()
+
+    seed_paths = dict(args.seed) if args.seed else DEFAULT_SEED_DATA
+    report = analyze_dynamodb_access(load_template_index(args.template), load_seed_data(seed_paths))
+    print_dynamodb_access_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,75 +5,244 @@ Este script obtiene logs recientes de las funciones Lambda y los analiza
 para identificar problemas.
 """
 
-import subprocess
-import json
-from cloudwatch_analyzer import analyze_cloudwatch_logs, print_log_analysis
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from cloudwatch_analyzer import print_log_analysis, print_performance_summary
+from cloudwatch_fetcher import (
+    create_boto3_logs_client,
+    iter_log_events,
+    fetch_and_analyze,
+    format_event,
+    time_window,
+    FetchStats
+)
+from checkpoint_store import CheckpointStore, incremental_fetch_and_analyze
+from log_cache import LogCache, fetch_and_analyze_cached
+from report_serializers import write_jsonl
+from request_correlation import RequestCorrelator, print_correlation_report
 
 
-def get_cloudwatch_logs(log_group: str, minutes: int = 30) -> list:
+# Relativo al script para que funcione desde cualquier directorio
+TEMPLATE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..',
+    'documentos_salud_connect_ia', 'turnos-medicos-api-final.yaml'
+)
+
+# (nombre del reporte, log group) de las cinco lambdas del template y el gateway del agente
+LOG_GROUPS = [
+    ('SearchMedicosFunction', '/aws/lambda/salud-api-stack-SearchMedicosFunction*'),
+    ('CreateTurnoFunction', '/aws/lambda/salud-api-stack-CreateTurnoFunction*'),
+    ('GetTurnosPacienteFunction', '/aws/lambda/salud-api-stack-GetTurnosPacienteFunction*'),
+    ('CancelTurnoFunction', '/aws/lambda/salud-api-stack-CancelTurnoFunction*'),
+    ('ModifyTurnoFunction', '/aws/lambda/salud-api-stack-ModifyTurnoFunction*'),
+    ('AgentGateway', '/aws/lambda/gateway_salud-mcp-server'),
+]
+
+# Log groups que se descargan y analizan al mismo tiempo
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+def get_cloudwatch_logs(log_group: str, minutes: int = 30, client=None) -> list:
     """
-    Obtiene logs de CloudWatch usando AWS CLI.
+    Obtiene logs de CloudWatch con FilterLogEvents paginado y concurrente.
     
     Args:
-        log_group: Nombre del log group
+        log_group: Nombre del log group (exacto o prefijo terminado en '*')
         minutes: Minutos hacia atrás para buscar logs
+        client: Cliente de CloudWatch Logs (default: boto3)
         
     Returns:
-        Lista de líneas de log
+        Lista de líneas de log ordenadas por timestamp
     """
     try:
-        # Comando para obtener logs
-        cmd = f'aws logs tail {log_group} --since {minutes}m --format short'
-        
-        result = subprocess.run(
-            cmd,
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if result.returncode == 0:
-            return result.stdout.split('\n')
-        else:
-            print(f"Error obteniendo logs: {result.stderr}")
-            return []
+        client = client or create_boto3_logs_client()
+        start_ms, end_ms = time_window(minutes)
+        events = list(iter_log_events(client, log_group, start_ms, end_ms))
+        events.sort(key=lambda e: (e['timestamp'], e.get('eventId', '')))
+        return [format_event(event) for event in events]
     
-    except subprocess.TimeoutExpired:
-        print("Timeout al obtener logs de CloudWatch")
-        return []
     except Exception as e:
-        print(f"Error: {str(e)}")
+        print(f"Error obteniendo logs: {str(e)}")
         return []
 
 
-def main():
-    """Función principal."""
-    print("\n🔍 OBTENIENDO LOGS DE CLOUDWATCH")
-    print("="*80)
+def analyze_log_group(log_group: str, analysis_name: str, minutes: int = 30, client=None,
+                      store: CheckpointStore = None, cache: LogCache = None, correlate: bool = False):
+    """
+    Descarga y analiza un log group en streaming, sin materializar las líneas.
     
-    # Obtener logs de ModifyTurnoFunction
-    print("\n📋 Obteniendo logs de ModifyTurnoFunction...")
-    modify_logs = get_cloudwatch_logs('/aws/lambda/salud-api-stack-ModifyTurnoFunction*', 60)
+    Args:
+        log_group: Nombre del log group (exacto o prefijo terminado en '*')
+        analysis_name: Nombre para el reporte
+        minutes: Minutos hacia atrás para buscar logs (ventana inicial si hay store)
+        client: Cliente de CloudWatch Logs (default: boto3)
+        store: CheckpointStore para procesar solo eventos nuevos (opcional)
+        cache: LogCache para reutilizar ventanas ya descargadas (opcional)
+        correlate: Agrupar además las líneas por requestId (analysis.correlation)
+        
+    Returns:
+        Tupla (LogAnalysis, FetchStats), o (None, FetchStats) si hubo un error
+    """
+    stats = FetchStats(log_group=log_group)
+    correlator = RequestCorrelator() if correlate else None
+    try:
+        client = client or create_boto3_logs_client()
+        if store is not None:
+            analysis, _ = incremental_fetch_and_analyze(
+                client, log_group, store, analysis_name=analysis_name, initial_minutes=minutes, stats=stats,
+                correlator=correlator
+            )
+        elif cache is not None:
+            analysis = fetch_and_analyze_cached(client, cache, log_group, minutes, analysis_name=analysis_name,
+                                                stats=stats, correlator=correlator)
+        else:
+            analysis = fetch_and_analyze(client, log_group, minutes, analysis_name=analysis_name, stats=stats,
+                                         correlator=correlator)
+        if correlator is not None:
+            analysis.correlation = correlator.report()
+        return analysis, stats
+    except Exception as e:
+        print(f"Error obteniendo logs de {log_group}: {str(e)}")
+        return None, stats
+
+
+def analyze_log_groups(log_groups: list, minutes: int = 60, client=None,
+                       max_concurrency: int = DEFAULT_MAX_CONCURRENCY, on_result=None,
+                       store: CheckpointStore = None, cache: LogCache = None, correlate: bool = False) -> list:
+    """
+    Descarga y analiza varios log groups en paralelo con un límite de concurrencia.
     
-    if modify_logs:
-        print(f"✓ Se obtuvieron {len(modify_logs)} líneas de log")
-        analysis = analyze_cloudwatch_logs(modify_logs, 'ModifyTurnoFunction')
+    Args:
+        log_groups: Lista de tuplas (nombre del reporte, log group)
+        minutes: Minutos hacia atrás para buscar logs
+        client: Cliente de CloudWatch Logs (default: boto3)
+        max_concurrency: Log groups procesados al mismo tiempo (1 = secuencial)
+        on_result: Callback(nombre, analysis, stats) llamado a medida que termina cada uno
+        store: CheckpointStore para el modo incremental (opcional)
+        cache: LogCache para reutilizar ventanas ya descargadas (opcional)
+        correlate: Correlacionar por requestId cada log group
+        
+    Returns:
+        Lista de tuplas (nombre, LogAnalysis o None, FetchStats) en orden de finalización
+    """
+    client = client or create_boto3_logs_client()
+    results = []
+    
+    def finish(name, analysis, stats):
+        results.append((name, analysis, stats))
+        if on_result:
+            on_result(name, analysis, stats)
+    
+    if max_concurrency <= 1:
+        for name, log_group in log_groups:
+            finish(name, *analyze_log_group(log_group, name, minutes, client, store, cache, correlate))
+        return results
+    
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = {
+            executor.submit(analyze_log_group, log_group, name, minutes, client, store, cache, correlate): name
+            for name, log_group in log_groups
+        }
+        # Los reportes se emiten en el thread principal a medida que terminan
+        for future in as_completed(futures):
+            finish(futures[future], *future.result())
+    
+    return results
+
+
+def print_fetch_result(name: str, analysis, stats):
+    """Imprime el resultado de un log group apenas termina."""
+    print(f"\n📋 {name} ({stats.log_group})")
+    if analysis and analysis.total_entries:
+        print(f"✓ Se obtuvieron {stats.events} eventos en {stats.pages} páginas ({stats.elapsed_seconds:.1f}s)")
         print_log_analysis(analysis)
+        if analysis.correlation is not None:
+            print_correlation_report(analysis.correlation)
     else:
         print("⚠️  No se pudieron obtener logs o no hay logs recientes")
         print("   Esto puede ser normal si no ha habido actividad reciente")
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Obtiene y analiza logs de CloudWatch de las lambdas')
+    parser.add_argument('--minutes', type=int, default=60, help='Minutos hacia atrás para buscar logs')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help='Log groups procesados al mismo tiempo')
+    parser.add_argument('--compare-sequential', action='store_true',
+                        help='Repetir la corrida en forma secuencial y comparar el tiempo total '
+                             '(ambas sin checkpoints ni cache)')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--checkpoint', metavar='PATH',
+                      help='Archivo de checkpoints: solo procesa eventos nuevos y acumula los totales')
+    mode.add_argument('--cache', metavar='DIR',
+                      help='Cache local columnar: reutiliza las ventanas descargadas en los últimos minutos')
+    parser.add_argument('--correlate', action='store_true',
+                        help='Agrupar las líneas por requestId: requests más lentos y latencia de los errores')
+    parser.add_argument('--jsonl', metavar='PATH',
+                        help='Escribir cada análisis como JSON Lines apenas termina su log group')
+    args = parser.parse_args()
+    
+    print("\n🔍 OBTENIENDO LOGS DE CLOUDWATCH")
+    print("="*80)
+    print(f"\n📋 {len(LOG_GROUPS)} log groups, hasta {args.max_concurrency} en paralelo...")
     
-    # Obtener logs de CreateTurnoFunction
-    print("\n📋 Obteniendo logs de CreateTurnoFunction...")
-    create_logs = get_cloudwatch_logs('/aws/lambda/salud-api-stack-CreateTurnoFunction*', 60)
+    try:
+        client = create_boto3_logs_client()
+    except RuntimeError as e:
+        print(f"❌ {str(e)}")
+        return
     
-    if create_logs:
-        print(f"✓ Se obtuvieron {len(create_logs)} líneas de log")
-        analysis = analyze_cloudwatch_logs(create_logs, 'CreateTurnoFunction')
-        print_log_analysis(analysis)
-    else:
-        print("⚠️  No se pudieron obtener logs o no hay logs recientes")
+    if args.compare_sequential and (args.checkpoint or args.cache):
+        # Con checkpoints o cache la segunda corrida haría otro trabajo (nada nuevo, o todo cacheado)
+        print("⚠️  --compare-sequential mide descargas completas: se ignoran --checkpoint y --cache en ambas corridas")
+        args.checkpoint = args.cache = None
+    
+    store = CheckpointStore(args.checkpoint) if args.checkpoint else None
+    if store:
+        print(f"📌 Modo incremental con checkpoints en {args.checkpoint}")
+    cache = LogCache(args.cache) if args.cache else None
+    if cache:
+        print(f"📦 Usando cache local en {args.cache}")
+    
+    jsonl_file = open(args.jsonl, 'w', encoding='utf-8') if args.jsonl else None
+    
+    def on_result(name, analysis, stats):
+        print_fetch_result(name, analysis, stats)
+        if jsonl_file and analysis:
+            write_jsonl([analysis], jsonl_file)
+    
+    start = time.perf_counter()
+    try:
+        results = analyze_log_groups(LOG_GROUPS, args.minutes, client, args.max_concurrency, on_result, store, cache,
+                                     args.correlate)
+    finally:
+        if jsonl_file:
+            jsonl_file.close()
+    concurrent_time = time.perf_counter() - start
+    if args.jsonl:
+        print(f"\n📄 Análisis en JSON Lines: {args.jsonl}")
+    
+    analyses = [analysis for _, analysis, _ in results if analysis and analysis.total_entries]
+    if any(analysis.lambda_metrics.invocations for analysis in analyses):
+        try:
+            print_performance_summary(analyses, TEMPLATE_PATH)
+        except Exception as e:
+            # El resumen es opcional: sin template no se pierde lo ya descargado
+            print(f"⚠️  No se pudo leer el template ({str(e)}); resumen sin MemorySize configurado")
+            print_performance_summary(analyses)
+    
+    print(f"\n⏱️  Tiempo total (concurrencia {args.max_concurrency}): {concurrent_time:.1f}s")
+    
+    if args.compare_sequential:
+        start = time.perf_counter()
+        analyze_log_groups(LOG_GROUPS, args.minutes, client, max_concurrency=1, correlate=args.correlate)
+        sequential_time = time.perf_counter() - start
+        print(f"⏱️  Tiempo total (secuencial): {sequential_time:.1f}s")
+        if concurrent_time > 0:
+            print(f"   Speedup: {sequential_time / concurrent_time:.2f}x")
     
     print("\n💡 NOTA: Si no hay logs recientes, puedes:")
     print("   1. Hacer una llamada de prueba al sistema")
@@ -6,30 +6,27 @@ Este script analiza:
 2. La especificación OpenAPI
 3. El prompt del agente Luna
 4. La consistencia entre todos los componentes
+5. Los patrones de acceso a DynamoDB de las lambdas
 """
 
+import argparse
 import yaml
 import re
+from analysis_cache import configure_analysis_cache, get_analysis_cache
+from dynamodb_access import DEFAULT_SEED_DATA, analyze_dynamodb_access, load_seed_data, print_dynamodb_access_report
 from lambda_analyzer import analyze_lambda_code, compare_field_handling, extract_processed_fields
+from report_serializers import write_json, write_jsonl, write_sarif
 from openapi_validator import (
     extract_request_fields,
-    validate_openapi_lambda_consistency,
+    sweep_openapi_consistency,
     print_consistency_report
 )
+from template_index import discover_api_routes, extract_lambda_code_from_cloudformation, load_template_index
 
 
-def extract_lambda_code_from_cloudformation(template_path: str, lambda_name: str) -> str:
-    """Extrae el código de una función Lambda del template de CloudFormation."""
-    with open(template_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    pattern = rf'{lambda_name}:.*?ZipFile:\s*\|(.+?)(?=\n\s{{0,2}}\w+:|\Z)'
-    match = re.search(pattern, content, re.DOTALL)
-    
-    if match:
-        return match.group(1)
-    else:
-        raise ValueError(f"No se encontró la función Lambda {lambda_name} en el template")
+DEFAULT_TEMPLATE_PATH = 'documentos_salud_connect_ia/turnos-medicos-api-final.yaml'
+DEFAULT_OPENAPI_PATH = 'documentos_salud_connect_ia/turnos-medicos-api-openapi.yaml'
+DEFAULT_PROMPT_PATH = 'documentos_salud_connect_ia/luna-agent-prompt-mejorado.yaml'
 
 
 def analyze_prompt_date_handling(prompt_path: str) -> dict:
@@ -150,15 +147,43 @@ def print_prompt_analysis(analysis: dict):
     print(f"\n{'='*80}\n")
 
 
+def write_machine_reports(args, lambda_reports, consistency_reports, template_path, openapi_path):
+    """Escribe los reportes en los formatos pedidos por línea de comandos."""
+    reports = lambda_reports + consistency_reports
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            write_json(reports, f)
+        print(f"\n📄 Reporte JSON: {args.json}")
+    if args.jsonl:
+        with open(args.jsonl, 'w', encoding='utf-8') as f:
+            write_jsonl(reports, f)
+        print(f"📄 Reporte JSON Lines: {args.jsonl}")
+    if args.sarif:
+        with open(args.sarif, 'w', encoding='utf-8') as f:
+            write_sarif(lambda_reports, consistency_reports, f, template_path, openapi_path)
+        print(f"📄 Reporte SARIF: {args.sarif}")
+
+
 def main():
     """Función principal que ejecuta el diagnóstico completo del sistema."""
+    parser = argparse.ArgumentParser(description='Diagnóstico completo del sistema de turnos médicos')
+    parser.add_argument('--analysis-cache', metavar='DIR',
+                        help='Directorio donde persistir el análisis de las lambdas entre corridas')
+    parser.add_argument('--json', metavar='PATH', help='Escribir los reportes como JSON')
+    parser.add_argument('--jsonl', metavar='PATH', help='Escribir los reportes como JSON Lines')
+    parser.add_argument('--sarif', metavar='PATH', help='Escribir los hallazgos en formato SARIF 2.1.0')
+    args = parser.parse_args()
+    
+    if args.analysis_cache:
+        configure_analysis_cache(directory=args.analysis_cache)
+    
     print("\n" + "="*80)
     print("🔍 DIAGNÓSTICO COMPLETO DEL SISTEMA DE TURNOS MÉDICOS")
     print("="*80)
     
-    template_path = 'documentos_salud_connect_ia/turnos-medicos-api-final.yaml'
-    openapi_path = 'documentos_salud_connect_ia/turnos-medicos-api-openapi.yaml'
-    prompt_path = 'documentos_salud_connect_ia/luna-agent-prompt-mejorado.yaml'
+    template_path = DEFAULT_TEMPLATE_PATH
+    openapi_path = DEFAULT_OPENAPI_PATH
+    prompt_path = DEFAULT_PROMPT_PATH
     
     # Cargar OpenAPI
     print("\n📂 Cargando especificación OpenAPI...")
@@ -170,14 +195,20 @@ def main():
         print(f"❌ Error cargando OpenAPI: {str(e)}")
         return
     
-    # Definir lambdas y sus endpoints correspondientes
-    lambdas_to_check = [
-        ('CreateTurnoFunction', '/turnos', 'Crear turno'),
-        ('ModifyTurnoFunction', '/turnos/modificar', 'Modificar turno'),
-        ('CancelTurnoFunction', '/turnos/cancelar', 'Cancelar turno'),
-        ('GetTurnosPacienteFunction', '/turnos/paciente', 'Obtener turnos'),
-        ('SearchMedicosFunction', '/medicos/buscar', 'Buscar médicos')
-    ]
+    # Descubrir el mapa endpoint -> Lambda desde el RestApi del template
+    print("\n📂 Descubriendo endpoints del template...")
+    try:
+        template_index = load_template_index(template_path)
+        routes = discover_api_routes(template_index)
+        print(f"✓ {len(routes)} endpoints integrados con Lambda")
+    except Exception as e:
+        print(f"❌ Error cargando template: {str(e)}")
+        return
+    
+    lambda_endpoints = {}
+    for route in routes:
+        if route.lambda_name:
+            lambda_endpoints.setdefault(route.lambda_name, []).append(f"{route.method.upper()} {route.path}")
     
     print(f"\n{'='*80}")
     print("PARTE 1: ANÁLISIS DE LAMBDAS")
@@ -186,8 +217,8 @@ def main():
     lambda_codes = {}
     lambda_reports = {}
     
-    for lambda_name, endpoint, description in lambdas_to_check:
-        print(f"\n🔬 Analizando {lambda_name} ({description})...")
+    for lambda_name, endpoints in lambda_endpoints.items():
+        print(f"\n🔬 Analizando {lambda_name} ({', '.join(endpoints)})...")
         
         try:
             code = extract_lambda_code_from_cloudformation(template_path, lambda_name)
@@ -225,33 +256,35 @@ def main():
     print("PARTE 2: VALIDACIÓN DE CONSISTENCIA OPENAPI-LAMBDA")
     print(f"{'='*80}")
     
-    consistency_reports = []
+    sweep = sweep_openapi_consistency(openapi_spec, template_index, routes)
+    consistency_reports = sweep.reports
     
-    for lambda_name, endpoint, description in lambdas_to_check:
-        if lambda_name in lambda_codes:
-            print(f"\n🔄 Validando consistencia: {endpoint} <-> {lambda_name}")
-            
-            try:
-                report = validate_openapi_lambda_consistency(
-                    openapi_spec,
-                    lambda_codes[lambda_name],
-                    endpoint,
-                    lambda_name
-                )
-                consistency_reports.append(report)
-                
-                # Mostrar resumen
-                if report.is_consistent:
-                    print(f"   ✅ Consistente")
-                else:
-                    print(f"   ⚠️  Inconsistente")
-                    if report.missing_in_lambda:
-                        print(f"      Faltan en lambda: {report.missing_in_lambda}")
-                    if report.missing_in_openapi:
-                        print(f"      Faltan en OpenAPI: {report.missing_in_openapi}")
-            
-            except Exception as e:
-                print(f"   ❌ Error: {str(e)}")
+    for report in consistency_reports:
+        print(f"\n🔄 Validando consistencia: {report.method.upper()} {report.endpoint} <-> {report.lambda_name}")
+        
+        # Mostrar resumen
+        if report.is_consistent:
+            print(f"   ✅ Consistente")
+        else:
+            print(f"   ⚠️  Inconsistente")
+            if report.missing_in_lambda:
+                print(f"      Faltan en lambda: {report.missing_in_lambda}")
+            if report.missing_in_openapi:
+                print(f"      Faltan en OpenAPI: {report.missing_in_openapi}")
+            if report.type_mismatches:
+                print(f"      Tipo/formato incompatible: {report.type_mismatches}")
+        if report.format_warnings:
+            print(f"   ⚠️  Formato sin validar o sin documentar: {report.format_warnings}")
+        for disc in report.discrepancies:
+            if disc.issue != 'missing':
+                print(f"      - {disc.field_name}: {disc.detail}")
+    
+    for route in sweep.undocumented_routes:
+        print(f"\n⚠️  {route.method.upper()} {route.path} ({route.lambda_name}) no está documentado en OpenAPI")
+    for path, method in sweep.unintegrated_operations:
+        print(f"\n⚠️  {method.upper()} {path} está en OpenAPI pero no tiene integración en el template")
+    for route in sweep.routes_without_permission:
+        print(f"\n🔴 {route.lambda_name} no tiene AWS::Lambda::Permission para {route.method.upper()} {route.path}")
     
     print(f"\n{'='*80}")
     print("PARTE 3: ANÁLISIS DEL PROMPT DEL AGENTE")
@@ -264,7 +297,7 @@ def main():
     print("PARTE 4: ANÁLISIS DE CAMPOS EN OPENAPI")
     print(f"{'='*80}")
     
-    for lambda_name, endpoint, description in lambdas_to_check:
+    for endpoint in dict.fromkeys(route.path for route in routes):
         print(f"\n📋 Endpoint: {endpoint}")
         fields_info = extract_request_fields(openapi_spec, endpoint)
         
@@ -283,6 +316,14 @@ def main():
         if hora_fields:
             print(f"   🕐 Campos de hora en OpenAPI: {hora_fields}")
     
+    print(f"\n{'='*80}")
+    print("PARTE 5: PATRONES DE ACCESO A DYNAMODB")
+    print(f"{'='*80}")
+    
+    dynamo_report = analyze_dynamodb_access(template_index, load_seed_data(DEFAULT_SEED_DATA))
+    print_dynamodb_access_report(dynamo_report)
+    dynamo_critical = sum(1 for f in dynamo_report.findings if f.severity == 'critical')
+    
     print(f"\n{'='*80}")
     print("📊 RESUMEN EJECUTIVO")
     print(f"{'='*80}")
@@ -301,6 +342,7 @@ def main():
     print(f"\n🔴 Problemas críticos en lambdas: {total_critical}")
     print(f"⚠️  Advertencias en lambdas: {total_warnings}")
     print(f"⚠️  Endpoints inconsistentes: {total_inconsistent}/{len(consistency_reports)}")
+    print(f"🔴 Problemas críticos de acceso a DynamoDB: {dynamo_critical}")
     
     # Análisis del prompt
     prompt_issues = len(prompt_analysis.get('issues', []))
@@ -314,7 +356,7 @@ def main():
     print("🎯 CONCLUSIONES:")
     print(f"{'─'*80}")
     
-    if total_critical == 0 and total_inconsistent == 0 and prompt_issues == 0:
+    if total_critical == 0 and total_inconsistent == 0 and prompt_issues == 0 and dynamo_critical == 0:
         print("\n✅ El sistema está correctamente configurado.")
         print("   Si hay problemas, verificar:")
         print("   1. Caché del MCP Server (Unpublish/Publish)")
@@ -330,10 +372,19 @@ def main():
             print(f"\n   ⚠️  {total_inconsistent} endpoints con inconsistencias OpenAPI-Lambda")
             print("      Revisar reportes detallados arriba")
         
+        if dynamo_critical > 0:
+            print(f"\n   🔴 {dynamo_critical} problemas críticos de acceso a DynamoDB (ver PARTE 5)")
+        
         if prompt_issues > 0:
             print(f"\n   ⚠️  {prompt_issues} problemas en el prompt del agente")
             print("      El agente puede no estar calculando fechas correctamente")
     
+    write_machine_reports(args, list(lambda_reports.values()), consistency_reports, template_path, openapi_path)
+    
+    stats = get_analysis_cache().stats
+    print(f"\n💾 Cache de análisis: {stats.hits} hits en memoria, {stats.disk_hits} en disco, "
+          f"{stats.misses} análisis nuevos")
+    
     print(f"\n{'='*80}\n")
     
     # Generar reporte detallado si hay problemas
@@ -0,0 +1,533 @@
+"""
+Recomendación de GSIs a partir de los filtros que mandan los clientes.
+
+Agrupa los request bodies de los logs por la lambda que los recibió, se queda
+con los campos que corresponden a atributos de la tabla que consulta esa
+lambda (según dynamodb_access) y cuenta las combinaciones reales, por ejemplo
+especialidad+ciudad o pacienteId+status.
+
+Para cada combinación que el acceso actual no resuelve con la clave (lee la
+partición y filtra, o hace Scan) propone un GSI: la clave de partición actual
+(o el atributo más selectivo) y como sort key el siguiente atributo, o una
+sort key compuesta ('ciudad_obraSocial') si hay más de uno. La mejora se
+proyecta reproduciendo las consultas observadas, con sus valores, contra un
+modelo en memoria de los datos de seed: ítems leídos, RCUs y amplificación
+de lectura (ítems leídos por ítem que el cliente pidió) antes y después.
+Ambos planes aplican los mismos filtros (igualdad, o contains() donde la
+lambda lo usa), así que devuelven los mismos ítems. Un atributo que la
+lambda filtra con contains() solo puede ir en la clave si pasa a compararse
+por igualdad: la propuesta lo indica y el replay cuenta los ítems que hoy
+devuelve contains() y el índice ya no. Las combinaciones que ningún índice
+resuelve (filtros sobre listas o mapas) se listan con el motivo.
+"""
+
+import argparse
+import difflib
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+from cloudwatch_analyzer import parse_log_entry, request_bodies_from_entry
+from dynamodb_access import (
+    DEFAULT_SEED_DATA,
+    READ_UNIT_BYTES,
+    WRITE_UNIT_BYTES,
+    AccessPattern,
+    TableSchema,
+    analyze_dynamodb_access,
+    load_seed_data,
+    parse_seed_argument,
+    top_level_item_size,
+)
+from template_index import TemplateIndex, discover_api_routes, load_template_index
+
+
+# Distintas combinaciones de valores que se guardan por combinación de campos para el replay
+MAX_REPLAY_SAMPLES = 1000
+
+# Similitud mínima entre un campo del body y un atributo de la tabla ('obraSocial' -> 'obrasSociales')
+FIELD_SIMILARITY = 0.85
+
+# Separador de los valores de una sort key compuesta
+COMPOSITE_SEPARATOR = '#'
+
+_CONTAINS_RE = re.compile(r'contains\s*\(\s*(#?[A-Za-z_]\w*)', re.IGNORECASE)
+
+
+@dataclass
+class FilterCombination:
+    """Combinación de atributos que mandan los clientes para una consulta"""
+    table: str
+    lambda_name: str
+    attributes: Tuple[str, ...]
+    requests: int = 0
+    # valores (JSON) -> cantidad de requests, hasta MAX_REPLAY_SAMPLES distintos
+    samples: Counter = field(default_factory=Counter)
+
+
+@dataclass
+class GsiProposal:
+    """GSI propuesto y su efecto proyectado sobre las consultas observadas"""
+    table: str
+    index_name: str
+    hash_key: str
+    range_key: Optional[str]
+    composite_attributes: List[str]  # atributos que forman la sort key compuesta (vacío si es simple)
+    remaining_filters: List[str]  # atributos que siguen en FilterExpression (listas, mapas)
+    combinations: List[Tuple[str, ...]]
+    requests: int
+    current_access: str
+    replayed: int = 0  # requests reproducidos contra los datos de seed
+    current_items_read: float = 0.0
+    proposed_items_read: float = 0.0
+    items_wanted: float = 0.0
+    items_lost: float = 0.0  # ítems que devuelve el plan actual y no el propuesto (0 salvo por equality_changes)
+    current_rcu: float = 0.0
+    proposed_rcu: float = 0.0
+    write_overhead_wcu: Optional[float] = None  # WCU extra por escritura para mantener el índice
+    equality_changes: List[str] = field(default_factory=list)  # atributos que pasan de contains() a igualdad
+
+    @property
+    def current_amplification(self) -> float:
+        return self.current_items_read / max(self.items_wanted, 1.0)
+
+    @property
+    def proposed_amplification(self) -> float:
+        return self.proposed_items_read / max(self.items_wanted, 1.0)
+
+    @property
+    def rcu_reduction(self) -> float:
+        """Fracción de RCUs que se ahorran (0 si no hubo replay)."""
+        return 1 - self.proposed_rcu / self.current_rcu if self.current_rcu else 0.0
+
+
+@dataclass
+class UnresolvedCombination:
+    """Combinación que el acceso actual no resuelve con la clave y para la que no se propone índice"""
+    combination: FilterCombination
+    reason: str
+
+
+@dataclass
+class GsiRecommendationReport:
+    """Combinaciones observadas y GSIs propuestos"""
+    total_bodies: int
+    unmatched_bodies: int  # sin lambda, sin tabla o sin la clave que la lambda exige
+    combinations: List[FilterCombination]
+    proposals: List[GsiProposal]
+    unresolved: List[UnresolvedCombination] = field(default_factory=list)
+
+
+class SeedTableModel:
+    """Modelo en memoria de una tabla: ítems agrupados por los atributos de cada clave consultada."""
+
+    def __init__(self, items: List[Dict[str, Any]]):
+        self.items = items
+        self._groups: Dict[Tuple[str, ...], Dict[str, List[Dict[str, Any]]]] = {}
+        self._sizes = {id(item): top_level_item_size(item) for item in items}
+
+    def read(self, keys: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Ítems que lee una consulta por igualdad sobre los atributos clave (Scan si no hay claves)."""
+        if not keys:
+            return self.items
+        attributes = tuple(sorted(keys))
+        groups = self._groups.get(attributes)
+        if groups is None:
+            groups = self._groups[attributes] = {}
+            for item in self.items:
+                if all(name in item for name in attributes):
+                    groups.setdefault(_value_key([item[name] for name in attributes]), []).append(item)
+        return groups.get(_value_key([keys[name] for name in attributes]), [])
+
+    def read_units(self, items: List[Dict[str, Any]]) -> float:
+        """RCUs eventualmente consistentes de leer esos ítems en una consulta."""
+        total = sum(self._sizes[id(item)] for item in items)
+        return max(1, math.ceil(total / READ_UNIT_BYTES)) * 0.5
+
+
+def _value_key(values: List[Any]) -> str:
+    return json.dumps(values, sort_keys=True, default=str, ensure_ascii=False)
+
+
+def value_matches(stored: Any, wanted: Any) -> bool:
+    """
+    Si un valor guardado satisface el filtro del cliente: igualdad, substring
+    (como contains() sobre strings) o elemento de una lista o mapa.
+    """
+    if stored == wanted:
+        return True
+    if isinstance(stored, str) and isinstance(wanted, str):
+        return wanted.lower() in stored.lower()
+    if isinstance(stored, list):
+        return any(value_matches(element, wanted) for element in stored)
+    if isinstance(stored, dict):
+        return any(value_matches(element, wanted) for element in stored.values())
+    return False
+
+
+def contains_filters(pattern: AccessPattern) -> List[str]:
+    """Atributos que la FilterExpression de la llamada compara con contains() (no servibles por clave)."""
+    expression = pattern.command.expressions.get('FilterExpression', '')
+    names = pattern.command.attribute_names or {}
+    return list(dict.fromkeys(names.get(token, token.lstrip('#')) for token in _CONTAINS_RE.findall(expression)))
+
+
+def plan_results(model: SeedTableModel, values: Dict[str, Any], key_names: List[str],
+                 loose: Iterable[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Ítems que lee y que devuelve un plan: lee por igualdad sobre key_names y
+    filtra el resto de los valores del cliente.
+
+    Args:
+        model: Tabla en memoria
+        values: Atributo -> valor que mandó el cliente
+        key_names: Atributos de la condición de clave del plan
+        loose: Atributos que se comparan como contains() (value_matches); el resto por igualdad
+
+    Returns:
+        Tupla (ítems leídos, ítems devueltos)
+    """
+    loose = set(loose)
+    read = model.read({name: values[name] for name in key_names})
+    returned = [item for item in read if all(
+        name in item and (value_matches(item[name], value) if name in loose else item[name] == value)
+        for name, value in values.items())]
+    return read, returned
+
+
+def _is_scalar(values: Iterable[Any]) -> bool:
+    return all(isinstance(value, (str, int, float)) and not isinstance(value, bool) for value in values)
+
+
+class _TableAttributes:
+    """Atributos conocidos de una tabla y el mapeo campo del body -> atributo."""
+
+    def __init__(self, table: TableSchema, patterns: List[AccessPattern], items: List[Dict[str, Any]]):
+        names = set(table.primary.keys)
+        for schema in table.indexes.values():
+            names.update(schema.keys)
+        for pattern in patterns:
+            names.update(pattern.key_attributes + pattern.filter_attributes + pattern.command.item_fields +
+                         pattern.command.update_fields)
+        for item in items:
+            names.update(item)
+        self.names = names
+        self.scalar = {
+            name for name in names
+            if _is_scalar(item[name] for item in items if name in item)
+        }
+        self.distinct = {
+            name: len({_value_key([item[name]]) for item in items if name in item}) for name in names
+        }
+        self._mapping: Dict[str, Optional[str]] = {}
+
+    def attribute_for(self, field_name: str) -> Optional[str]:
+        if field_name not in self._mapping:
+            if field_name in self.names:
+                self._mapping[field_name] = field_name
+            else:
+                lowered = field_name.lower()
+                scored = [(difflib.SequenceMatcher(None, lowered, name.lower()).ratio(), name) for name in self.names]
+                score, name = max(scored, default=(0.0, None))
+                self._mapping[field_name] = name if score >= FIELD_SIMILARITY else None
+        return self._mapping[field_name]
+
+
+def group_request_bodies(log_lines: Iterable[str], index: TemplateIndex,
+                         default_lambda: Optional[str] = None) -> Tuple[Dict[str, List[Any]], int]:
+    """
+    Agrupa los request bodies de los logs por la lambda que los recibió.
+
+    La lambda sale de la ruta del evento logueado (path o resource y
+    httpMethod) según las integraciones del template; si el log no la trae
+    se usa default_lambda (ej: el dueño del log group).
+
+    Args:
+        log_lines: Líneas de log
+        index: Índice del template
+        default_lambda: Lambda de los bodies sin ruta
+
+    Returns:
+        Tupla (lambda -> bodies, bodies sin lambda)
+    """
+    routes = {(route.path, route.method): route.lambda_name for route in discover_api_routes(index)}
+    grouped: Dict[str, List[Any]] = {}
+    unmatched = 0
+    for line in log_lines:
+        if 'body' not in line or '{' not in line:
+            continue
+        parsed = parse_log_entry(line)
+        if not isinstance(parsed, dict):
+            continue
+        bodies = request_bodies_from_entry(parsed)
+        if not bodies:
+            continue
+        event = parsed.get('event') if isinstance(parsed.get('event'), dict) else parsed
+        method = str(event.get('httpMethod') or '').lower()
+        lambda_name = routes.get((event.get('resource') or event.get('path'), method)) or default_lambda
+        if lambda_name is None:
+            unmatched += len(bodies)
+            continue
+        grouped.setdefault(lambda_name, []).extend(bodies)
+    return grouped, unmatched
+
+
+def _query_patterns(patterns: List[AccessPattern], tables: Dict[str, TableSchema]) -> Dict[str, AccessPattern]:
+    """Primer Query/Scan resuelto de cada lambda."""
+    queries: Dict[str, AccessPattern] = {}
+    for pattern in patterns:
+        if pattern.command.command in ('Query', 'Scan') and pattern.table in tables:
+            queries.setdefault(pattern.lambda_name, pattern)
+    return queries
+
+
+def _table_attributes(patterns: List[AccessPattern], tables: Dict[str, TableSchema],
+                      seed_data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, _TableAttributes]:
+    return {
+        table_id: _TableAttributes(table, [p for p in patterns if p.table == table_id], seed_data.get(table_id, []))
+        for table_id, table in tables.items()
+    }
+
+
+def mine_filter_combinations(bodies_by_lambda: Dict[str, List[Any]], patterns: List[AccessPattern],
+                             tables: Dict[str, TableSchema],
+                             seed_data: Dict[str, List[Dict[str, Any]]]) -> Tuple[List[FilterCombination], int]:
+    """
+    Cuenta las combinaciones de atributos que mandan los clientes a cada consulta.
+
+    Solo se consideran las lambdas con un Query o Scan resuelto contra una
+    tabla del template; los bodies sin la clave de partición que la lambda
+    exige no se cuentan (la lambda responde 400 sin leer).
+
+    Returns:
+        Tupla (combinaciones ordenadas por requests, bodies no usados)
+    """
+    queries = _query_patterns(patterns, tables)
+    attributes_by_table = _table_attributes(patterns, tables, seed_data)
+
+    combinations: Dict[Tuple[str, str, Tuple[str, ...]], FilterCombination] = {}
+    unused = 0
+    for lambda_name, bodies in bodies_by_lambda.items():
+        query = queries.get(lambda_name)
+        for body in bodies:
+            if query is None or not isinstance(body, dict):
+                unused += 1
+                continue
+            known = attributes_by_table[query.table]
+            values = {}
+            for name, value in body.items():
+                attribute = known.attribute_for(name)
+                if attribute is not None and value not in (None, '', [], {}):
+                    values[attribute] = value
+            schema = tables[query.table].key_schema(query.command.index_name)
+            if not values or (query.command.command == 'Query' and schema.hash_key not in values):
+                unused += 1
+                continue
+            attributes = tuple(sorted(values))
+            key = (query.table, lambda_name, attributes)
+            combination = combinations.get(key)
+            if combination is None:
+                combination = combinations[key] = FilterCombination(query.table, lambda_name, attributes)
+            combination.requests += 1
+            sample = _value_key([values[name] for name in attributes])
+            if sample in combination.samples or len(combination.samples) < MAX_REPLAY_SAMPLES:
+                combination.samples[sample] += 1
+    return sorted(combinations.values(), key=lambda c: -c.requests), unused
+
+
+def _index_name(hash_key: str, range_key: Optional[str]) -> str:
+    parts = [hash_key] + (range_key.split('_') if range_key else [])
+    return ''.join(part[:1].upper() + part[1:] for part in parts) + 'Index'
+
+
+def _replay(proposal: GsiProposal, combination: FilterCombination, model: SeedTableModel,
+            current_keys: List[str], current_loose: List[str], proposed_keys: List[str], proposed_loose: List[str]):
+    for sample, count in combination.samples.items():
+        values = dict(zip(combination.attributes, json.loads(sample)))
+        current, wanted = plan_results(model, values, current_keys, current_loose)
+        proposed, returned = plan_results(model, values, proposed_keys, proposed_loose)
+        proposal.replayed += count
+        proposal.current_items_read += len(current) * count
+        proposal.proposed_items_read += len(proposed) * count
+        proposal.items_wanted += len(wanted) * count
+        proposal.items_lost += len({id(item) for item in wanted} - {id(item) for item in returned}) * count
+        proposal.current_rcu += model.read_units(current) * count
+        proposal.proposed_rcu += model.read_units(proposed) * count
+
+
+def recommend_gsis(bodies_by_lambda: Dict[str, List[Any]], index: TemplateIndex,
+                   seed_data: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                   min_requests: int = 1) -> GsiRecommendationReport:
+    """
+    Propone GSIs para las combinaciones de filtros observadas.
+
+    Args:
+        bodies_by_lambda: Request bodies por lambda (ver group_request_bodies)
+        index: Índice del template
+        seed_data: Ítems por tabla para proyectar la mejora
+        min_requests: Requests mínimos de una combinación para proponer un índice
+
+    Returns:
+        GsiRecommendationReport con las propuestas ordenadas por RCUs ahorradas
+    """
+    seed_data = seed_data or {}
+    access = analyze_dynamodb_access(index, seed_data)
+    combinations, unused = mine_filter_combinations(bodies_by_lambda, access.patterns, access.tables, seed_data)
+    total = sum(len(bodies) for bodies in bodies_by_lambda.values())
+
+    queries = _query_patterns(access.patterns, access.tables)
+    attributes_by_table = _table_attributes(access.patterns, access.tables, seed_data)
+    models = {table_id: SeedTableModel(items) for table_id, items in seed_data.items() if items}
+    proposals: Dict[Tuple[str, str, Optional[str]], GsiProposal] = {}
+    unresolved: List[UnresolvedCombination] = []
+
+    for combination in combinations:
+        if combination.requests < min_requests:
+            continue
+        table = access.tables[combination.table]
+        query = queries[combination.lambda_name]
+        schema = table.key_schema(query.command.index_name)
+        known = attributes_by_table[combination.table]
+        key_eligible = [name for name in combination.attributes if name in known.scalar]
+        substring = [name for name in contains_filters(query) if name in key_eligible]
+        # Listas y mapas quedan siempre en FilterExpression; contains() solo en el plan actual
+        loose = [name for name in combination.attributes if name not in key_eligible]
+        current_keys = [name for name in schema.keys if name in combination.attributes] \
+            if query.command.command == 'Query' else []
+        if all(name in current_keys for name in combination.attributes):
+            continue
+        if all(name in current_keys for name in key_eligible):
+            unresolved.append(UnresolvedCombination(
+                combination, f"{query.command.command} + FilterExpression sobre {loose}: listas o mapas "
+                             "no pueden ir en una clave"))
+            continue
+
+        # Partición: la actual si el cliente la manda; si no, el atributo más selectivo
+        by_selectivity = sorted(key_eligible, key=lambda name: (-known.distinct.get(name, 0), name))
+        hash_key = schema.hash_key if schema.hash_key in key_eligible else by_selectivity[0]
+        sort_attributes = [name for name in by_selectivity if name != hash_key]
+        range_key = '_'.join(sort_attributes) if sort_attributes else None
+        key = (combination.table, hash_key, range_key)
+        proposal = proposals.get(key)
+        if proposal is None:
+            current = f"{query.command.command} {schema.name or combination.table}"
+            if query.filter_attributes:
+                current += f" + FilterExpression {query.filter_attributes}"
+            items = seed_data.get(combination.table, [])
+            proposal = proposals[key] = GsiProposal(
+                table=combination.table,
+                index_name=_index_name(hash_key, range_key),
+                hash_key=hash_key,
+                range_key=range_key,
+                composite_attributes=sort_attributes if len(sort_attributes) > 1 else [],
+                remaining_filters=[],
+                combinations=[],
+                requests=0,
+                current_access=current,
+                write_overhead_wcu=sum(math.ceil(top_level_item_size(item) / WRITE_UNIT_BYTES) for item in items)
+                / len(items) if items else None
+            )
+        proposal.combinations.append(combination.attributes)
+        for name in substring:
+            if name not in current_keys and name not in proposal.equality_changes:
+                proposal.equality_changes.append(name)
+        for name in combination.attributes:
+            if name not in key_eligible and name not in proposal.remaining_filters:
+                proposal.remaining_filters.append(name)
+        proposal.requests += combination.requests
+        model = models.get(combination.table)
+        if model is not None:
+            _replay(proposal, combination, model, current_keys, loose + substring, [hash_key] + sort_attributes, loose)
+
+    ranked = sorted(proposals.values(), key=lambda p: (-(p.current_rcu - p.proposed_rcu), -p.requests))
+    return GsiRecommendationReport(
+        total_bodies=total,
+        unmatched_bodies=unused,
+        combinations=combinations,
+        proposals=ranked,
+        unresolved=unresolved
+    )
+
+
+def print_gsi_recommendations(report: GsiRecommendationReport):
+    """Imprime las combinaciones observadas y los GSIs propuestos."""
+    print(f"\n{'='*80}")
+    print("RECOMENDACIÓN DE GSIs POR FILTROS OBSERVADOS")
+    print(f"{'='*80}")
+    print(f"\nBodies analizados: {report.total_bodies} ({report.unmatched_bodies} sin consulta asociada)")
+
+    print("\n🔎 Combinaciones de filtros:")
+    for combination in report.combinations:
+        print(f"   {combination.requests:>7} × {' + '.join(combination.attributes)} "
+              f"({combination.lambda_name} -> {combination.table})")
+
+    if not report.proposals and not report.unresolved:
+        print("\n✅ El acceso actual resuelve todas las combinaciones con la clave")
+    for item in report.unresolved:
+        combination = item.combination
+        print(f"\n⚪ {' + '.join(combination.attributes)} ({combination.lambda_name}, {combination.requests} requests): "
+              f"sin índice posible, {item.reason}")
+    for proposal in report.proposals:
+        sort_key = proposal.range_key or 'sin sort key'
+        print(f"\n💡 {proposal.table}: {proposal.index_name} (HASH {proposal.hash_key}, RANGE {sort_key})")
+        print(f"   Reemplaza: {proposal.current_access} para {proposal.requests} requests")
+        if proposal.composite_attributes:
+            separator = COMPOSITE_SEPARATOR
+            print(f"   Sort key compuesta: escribir {proposal.range_key} = "
+                  f"{separator.join('<' + name + '>' for name in proposal.composite_attributes)} en cada ítem")
+        if proposal.remaining_filters:
+            print(f"   Sigue en FilterExpression (listas o mapas): {proposal.remaining_filters}")
+        if proposal.equality_changes:
+            print(f"   ⚠️  Cambia el significado: contains() sobre {proposal.equality_changes} pasa a igualdad "
+                  f"en la clave (el cliente debe mandar el valor exacto)")
+        if proposal.replayed:
+            print(f"   📉 Replay de {proposal.replayed} requests: ítems leídos "
+                  f"{proposal.current_items_read / proposal.replayed:.1f} -> "
+                  f"{proposal.proposed_items_read / proposal.replayed:.1f} por request, amplificación "
+                  f"{proposal.current_amplification:.1f}x -> {proposal.proposed_amplification:.1f}x, "
+                  f"RCUs -{proposal.rcu_reduction:.0%}")
+            if proposal.items_lost:
+                print(f"   ⚠️  El índice propuesto pierde {proposal.items_lost:.0f} ítems que hoy se devuelven"
+                      + (" por coincidencia parcial" if proposal.equality_changes else ""))
+        else:
+            print("   ⚠️  Sin datos de seed para proyectar la mejora (--seed TABLA=archivo.json)")
+        if proposal.write_overhead_wcu is not None:
+            print(f"   ✍️  Costo: +{proposal.write_overhead_wcu:.1f} WCU por escritura en {proposal.table}")
+
+    print(f"\n{'='*80}\n")
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Propone GSIs a partir de los request bodies de los logs')
+    parser.add_argument('logs', nargs='+', help='Archivos de log (salida de `aws logs tail`)')
+    parser.add_argument('--template', default='documentos_salud_connect_ia/turnos-medicos-api-final.yaml')
+    parser.add_argument('--seed', action='append', type=parse_seed_argument, default=[], metavar='TABLA=ARCHIVO',
+                        help='Ítems de una tabla para el replay (repetible)')
+    parser.add_argument('--lambda', dest='lambda_name', help='Lambda de los bodies cuyo log no trae la ruta')
+    parser.add_argument('--min-requests', type=int, default=1)
+    args = parser.parse_args()
+
+    index = load_template_index(args.template)
+    seed_paths = dict(args.seed) if args.seed else DEFAULT_SEED_DATA
+
+    bodies: Dict[str, List[Any]] = {}
+    unmatched = 0
+    for path in args.logs:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            grouped, skipped = group_request_bodies(f, index, args.lambda_name)
+        unmatched += skipped
+        for lambda_name, items in grouped.items():
+            bodies.setdefault(lambda_name, []).extend(items)
+
+    report = recommend_gsis(bodies, index, load_seed_data(seed_paths), args.min_requests)
+    report.total_bodies += unmatched
+    report.unmatched_bodies += unmatched
+    print_gsi_recommendations(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,666 @@
+"""
+Analizador de handlers JavaScript (nodejs22.x) de las lambdas del sistema.
+
+Tokeniza el código en una sola pasada lineal (strings, template literals,
+comentarios y regex literals incluidos) y sobre los tokens hace un parseo
+parcial suficiente para diagnosticar el manejo de campos:
+
+- alias del body: `const body = JSON.parse(event.body)`, `const b = body`, ...
+- destructuring con defaults y renombres: `const { fecha: f = null } = body`
+- acceso a miembros: `body.fechaTurno`, `body?.hora`, `body['motivo']`
+- `'campo' in body`, `body.hasOwnProperty('campo')`, `Object.hasOwn(body, 'campo')`,
+  `body.get('campo')`
+- comandos de DynamoDB (PutCommand, UpdateCommand, QueryCommand, ...) con sus
+  parámetros resueltos aunque estén en una variable y se modifiquen después
+  (`params.ExpressionAttributeNames['#ciudad'] = 'ciudad'`)
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple, Set
+
+
+@dataclass
+class Token:
+    """Token de JavaScript"""
+    kind: str  # 'name', 'string', 'number', 'template', 'regex', 'punct'
+    value: str
+    line: int
+    # Partes estáticas y tokens de cada ${...} de un template literal
+    parts: List[str] = field(default_factory=list)
+    inner: List[List['Token']] = field(default_factory=list)
+
+
+@dataclass
+class DynamoCommand:
+    """Llamada a DynamoDB encontrada en el handler"""
+    command: str  # 'Put', 'Update', 'Get', 'Query', 'Scan', 'Delete'
+    line: int
+    table: Optional[str] = None
+    index_name: Optional[str] = None
+    item_fields: List[str] = field(default_factory=list)
+    key_fields: List[str] = field(default_factory=list)
+    update_fields: List[str] = field(default_factory=list)
+    attribute_names: Dict[str, str] = field(default_factory=dict)
+    expressions: Dict[str, str] = field(default_factory=dict)
+    parameters: List[str] = field(default_factory=list)
+    # ConsistentRead con el literal true/True (False o una variable no cuentan)
+    consistent_read: bool = False
+    # La llamada recorre páginas: pasa ExclusiveStartKey o está en un loop que lee LastEvaluatedKey
+    paginated: bool = False
+
+
+@dataclass
+class JavaScriptFieldAnalysis:
+    """Resultado del análisis de un handler JavaScript"""
+    processed_fields: List[str] = field(default_factory=list)
+    update_fields: List[str] = field(default_factory=list)
+    put_item_fields: List[str] = field(default_factory=list)
+    body_aliases: List[str] = field(default_factory=list)
+    dynamo_commands: List[DynamoCommand] = field(default_factory=list)
+
+
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*(?:[^*]|\*(?!/))*(?:\*/)?)
+  | (?P<name>(?:[^\W\d]|\$)[\w$]*)
+  | (?P<number>\d[\w.]*)
+  | (?P<string>'(?:[^'\\\n]|\\.)*'?|"(?:[^"\\\n]|\\.)*"?)
+  | (?P<punct>\?\.|\.\.\.|=>|===|!==|\*\*=|==|!=|<=|>=|&&=|\|\|=|\?\?=|&&|\|\||\?\?|\+\+|--|\+=|-=|\*=|/=|%=|\*\*|[{}()\[\];,.:?=+\-*/%<>!&|^~@#])
+  | (?P<other>.)
+""", re.VERBOSE | re.DOTALL)
+
+# Después de estos tokens un '/' inicia un regex literal y no una división
+_REGEX_PRECEDING_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                             'throw', 'case', 'do', 'else', 'yield', 'await'}
+
+_OPENERS = {'(': ')', '[': ']', '{': '}'}
+
+# Tokens después de los cuales la expresión continúa en la línea siguiente
+_CONTINUATION = {'=', '+', '-', '*', '/', '%', '||', '&&', '??', '?', ':', ',', '.', '?.', '=>',
+                 '===', '!==', '==', '!=', '<', '>', '<=', '>=', '+=', '-=', '!', '...', '**',
+                 '&', '|', '^', '~', 'new', 'return', 'typeof', 'await', 'in', 'of', 'instanceof'}
+
+_DECLARATIONS = {'const', 'let', 'var'}
+
+# Comandos del SDK v3 (lib-dynamodb y client-dynamodb) -> operación
+_DYNAMO_COMMANDS = {
+    'PutCommand': 'Put', 'PutItemCommand': 'Put',
+    'UpdateCommand': 'Update', 'UpdateItemCommand': 'Update',
+    'GetCommand': 'Get', 'GetItemCommand': 'Get',
+    'QueryCommand': 'Query', 'ScanCommand': 'Scan',
+    'DeleteCommand': 'Delete', 'DeleteItemCommand': 'Delete',
+}
+
+# Claves con las que un loop recorre las páginas de un Query/Scan
+_PAGINATION_KEYS = {'LastEvaluatedKey', 'ExclusiveStartKey'}
+
+_EXPRESSION_KEYS = ('UpdateExpression', 'KeyConditionExpression', 'FilterExpression',
+                    'ConditionExpression', 'ProjectionExpression')
+
+# Targets de una cláusula SET ('SET a = :a, b = :b') o de una parte suelta ('a = :a');
+# la regex es lineal, sin backtracking
+SET_TARGET_RE = re.compile(r'(?:^|\bSET\b|,)\s*(#?\w+)\s*=', re.IGNORECASE)
+
+
+def parse_set_targets(fragments: List[str], attribute_names: Optional[Dict[str, str]] = None) -> List[str]:
+    """
+    Extrae los atributos asignados por las cláusulas SET de un UpdateExpression.
+
+    Args:
+        fragments: Partes de texto que forman el UpdateExpression
+        attribute_names: ExpressionAttributeNames para resolver '#alias'
+
+    Returns:
+        Atributos en orden de aparición, sin duplicados
+    """
+    attribute_names = attribute_names or {}
+    targets = []
+    for fragment in fragments:
+        for target in SET_TARGET_RE.findall(fragment):
+            targets.append(attribute_names.get(target, target.lstrip('#')))
+    return list(dict.fromkeys(targets))
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '\'"':
+        value = value[1:-1]
+    elif value[:1] in '\'"':
+        value = value[1:]
+    return re.sub(r'\\(.)', r'\1', value)
+
+
+def _regex_allowed(tokens: List[Token]) -> bool:
+    if not tokens:
+        return True
+    previous = tokens[-1]
+    if previous.kind == 'punct':
+        return previous.value not in (')', ']', '}', '++', '--')
+    return previous.kind == 'name' and previous.value in _REGEX_PRECEDING_KEYWORDS
+
+
+def _scan_regex(code: str, pos: int) -> int:
+    """Devuelve la posición después de un regex literal que empieza en pos."""
+    i, in_class, n = pos + 1, False, len(code)
+    while i < n and code[i] != '\n':
+        char = code[i]
+        if char == '\\':
+            i += 2
+            continue
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            i += 1
+            while i < n and (code[i].isalnum() or code[i] == '_'):
+                i += 1
+            return i
+        i += 1
+    return i
+
+
+def _scan_template(code: str, pos: int, line: int) -> Tuple[Token, int, int]:
+    """Tokeniza un template literal que empieza en pos (el '`')."""
+    parts, inner, current = [], [], []
+    i, n = pos + 1, len(code)
+    while i < n:
+        char = code[i]
+        if char == '\\':
+            current.append(code[i:i + 2])
+            i += 2
+            continue
+        if char == '`':
+            i += 1
+            break
+        if char == '$' and code.startswith('${', i):
+            parts.append(''.join(current))
+            current = []
+            tokens, i = _tokenize(code, i + 2, line + code.count('\n', pos, i), stop_at_brace=True)
+            inner.append(tokens)
+            continue
+        current.append(char)
+        i += 1
+    parts.append(''.join(current))
+    text = code[pos:i]
+    token = Token('template', text, line, parts=parts, inner=inner)
+    return token, i, line + text.count('\n')
+
+
+def _tokenize(code: str, pos: int, line: int, stop_at_brace: bool = False) -> Tuple[List[Token], int]:
+    tokens: List[Token] = []
+    depth, n = 0, len(code)
+    while pos < n:
+        char = code[pos]
+        if char == '`':
+            token, pos, line = _scan_template(code, pos, line)
+            tokens.append(token)
+            continue
+        if char == '/' and not code.startswith(('//', '/*'), pos) and _regex_allowed(tokens):
+            end = _scan_regex(code, pos)
+            tokens.append(Token('regex', code[pos:end], line))
+            pos = end
+            continue
+
+        match = _TOKEN_RE.match(code, pos)
+        kind, value = match.lastgroup, match.group()
+        pos = match.end()
+        if kind in ('ws', 'comment'):
+            line += value.count('\n')
+            continue
+        if kind == 'other':
+            kind = 'punct'
+        if stop_at_brace and kind == 'punct':
+            if value == '{':
+                depth += 1
+            elif value == '}':
+                if depth == 0:
+                    return tokens, pos
+                depth -= 1
+        tokens.append(Token(kind, value, line))
+    return tokens, pos
+
+
+def tokenize(code: str) -> List[Token]:
+    """
+    Tokeniza código JavaScript en una sola pasada.
+
+    Args:
+        code: Código fuente
+
+    Returns:
+        Lista de tokens significativos (sin espacios ni comentarios)
+    """
+    return _tokenize(code, 0, 1)[0]
+
+
+class _JavaScriptFieldExtractor:
+    """Parseo parcial sobre los tokens de un handler JavaScript."""
+
+    def __init__(self, tokens: List[Token], source: str = 'body'):
+        self.tokens = tokens
+        self.source = source
+        self.matching = self._match_brackets(tokens)
+        self.aliases: Set[str] = {'body'} if source == 'body' else set()
+        # nombre -> (inicio, fin) del valor asignado
+        self.declarations: Dict[str, List[Tuple[int, int]]] = {}
+        # nombre -> [(ruta, (inicio, fin))] de asignaciones a miembros
+        self.mutations: Dict[str, List[Tuple[Tuple[str, ...], Tuple[int, int]]]] = {}
+        # nombre -> slices agregados con += o push()
+        self.appends: Dict[str, List[Tuple[int, int]]] = {}
+        self.destructurings: List[Tuple[int, Tuple[int, int]]] = []
+        self.commands: List[Tuple[str, int, Tuple[int, int]]] = []
+        self.fields: List[str] = []
+
+    @staticmethod
+    def _match_brackets(tokens: List[Token]) -> Dict[int, int]:
+        matching, stack = {}, []
+        for index, token in enumerate(tokens):
+            if token.kind != 'punct':
+                continue
+            if token.value in _OPENERS:
+                stack.append(index)
+            elif token.value in (')', ']', '}'):
+                while stack:
+                    opener = stack.pop()
+                    if _OPENERS[tokens[opener].value] == token.value:
+                        matching[opener] = index
+                        break
+        return matching
+
+    def _is(self, index: int, *values: str) -> bool:
+        return 0 <= index < len(self.tokens) and self.tokens[index].value in values and \
+            self.tokens[index].kind in ('punct', 'name')
+
+    def _expression_end(self, start: int) -> int:
+        """Fin (exclusivo) de la expresión que empieza en start."""
+        tokens, n = self.tokens, len(self.tokens)
+        i = start
+        while i < n:
+            token = tokens[i]
+            if i > start and token.line > tokens[i - 1].line:
+                previous = tokens[i - 1]
+                continues = previous.kind in ('punct', 'name') and previous.value in _CONTINUATION
+                if not continues and token.value not in _CONTINUATION:
+                    return i
+            if token.kind == 'punct':
+                if token.value in _OPENERS:
+                    closing = self.matching.get(i)
+                    if closing is None:
+                        return n
+                    i = closing + 1
+                    continue
+                if token.value in (';', ')', ']', '}', ','):
+                    return i
+            i += 1
+        return n
+
+    # --- primera pasada: declaraciones, mutaciones y comandos --------------
+
+    def collect(self):
+        tokens, n = self.tokens, len(self.tokens)
+        for i, token in enumerate(tokens):
+            if token.kind != 'name':
+                continue
+            previous_is_member = self._is(i - 1, '.', '?.')
+
+            if token.value in _DECLARATIONS:
+                if self._is(i + 1, '{') and (i + 1) in self.matching:
+                    closing = self.matching[i + 1]
+                    if self._is(closing + 1, '='):
+                        value_start = closing + 2
+                        self.destructurings.append((i + 1, (value_start, self._expression_end(value_start))))
+                continue
+
+            if previous_is_member:
+                continue
+
+            if token.value == 'new' and i + 1 < n and tokens[i + 1].value in _DYNAMO_COMMANDS and self._is(i + 2, '('):
+                closing = self.matching.get(i + 2, i + 2)
+                self.commands.append((_DYNAMO_COMMANDS[tokens[i + 1].value], token.line, (i + 3, closing)))
+                continue
+
+            # nombre = valor / nombre += valor
+            if self._is(i + 1, '=') and not self._is(i - 1, '.'):
+                value_start = i + 2
+                self.declarations.setdefault(token.value, []).append(
+                    (value_start, self._expression_end(value_start)))
+                continue
+            if self._is(i + 1, '+='):
+                value_start = i + 2
+                self.appends.setdefault(token.value, []).append((value_start, self._expression_end(value_start)))
+                continue
+
+            # nombre.push(...) / nombre.a.b = valor / nombre['a'] = valor
+            path, j = [], i + 1
+            while j < n:
+                if self._is(j, '.', '?.') and j + 1 < n and tokens[j + 1].kind == 'name':
+                    path.append(tokens[j + 1].value)
+                    j += 2
+                elif self._is(j, '[') and j + 2 < n and tokens[j + 1].kind == 'string' and self._is(j + 2, ']'):
+                    path.append(_unquote(tokens[j + 1].value))
+                    j += 3
+                else:
+                    break
+            if not path:
+                continue
+            if path[-1] in ('push', 'unshift') and self._is(j, '('):
+                closing = self.matching.get(j, j)
+                self.appends.setdefault(token.value, []).append((j + 1, closing))
+            elif self._is(j, '='):
+                self.mutations.setdefault(token.value, []).append(
+                    (tuple(path), (j + 1, self._expression_end(j + 1))))
+
+    # --- flujo del body -----------------------------------------------------
+
+    def _is_body_source(self, start: int, end: int) -> bool:
+        tokens = self.tokens
+        for i in range(start, end):
+            token = tokens[i]
+            # event.body / event?.body / event['body']
+            if token.kind == 'name' and token.value == 'event' and not self._is(i - 1, '.', '?.'):
+                if self._is(i + 1, '.', '?.') and i + 2 < end and tokens[i + 2].value == self.source:
+                    return True
+                if self._is(i + 1, '[') and i + 2 < end and _unquote(tokens[i + 2].value) == self.source \
+                        and tokens[i + 2].kind == 'string':
+                    return True
+            if token.kind == 'name' and token.value in self.aliases and not self._is(i - 1, '.', '?.'):
+                whole = i == start and (i + 1 == end or self._is(i + 1, '||', '??'))
+                spread = self._is(i - 1, '...')
+                argument = self._is(i - 1, '(', ',') and self._is(i + 1, ')', ',') and \
+                    any(tokens[k].value in ('parse', 'assign', 'structuredClone') for k in range(start, i))
+                if whole or spread or argument:
+                    return True
+        return False
+
+    def resolve_aliases(self):
+        changed = True
+        while changed:
+            changed = False
+            for name, values in self.declarations.items():
+                if name not in self.aliases and any(self._is_body_source(s, e) for s, e in values):
+                    self.aliases.add(name)
+                    changed = True
+
+    # --- segunda pasada: campos del body ------------------------------------
+
+    def _split_commas(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Divide [start, end) en los elementos separados por comas de primer nivel."""
+        items, tokens = [], self.tokens
+        item_start = i = start
+        while i < end:
+            token = tokens[i]
+            if token.kind == 'punct':
+                if token.value in _OPENERS:
+                    i = self.matching.get(i, end - 1) + 1
+                    continue
+                if token.value == ',':
+                    if i > item_start:
+                        items.append((item_start, i))
+                    item_start = i + 1
+            i += 1
+        if end > item_start:
+            items.append((item_start, end))
+        return items
+
+    def _property_key(self, start: int, end: int) -> Optional[str]:
+        """Clave de una propiedad (o de un elemento de destructuring); None si es spread o calculada."""
+        token = self.tokens[start]
+        if token.value == '...' or token.value == '[':
+            return None
+        if token.kind == 'string':
+            return _unquote(token.value)
+        if token.kind in ('name', 'number'):
+            return token.value
+        return None
+
+    def _pattern_keys(self, opener: int) -> List[str]:
+        """Claves de primer nivel de un patrón de destructuring { a, b: c = 1, 'd': e, ...f }."""
+        closing = self.matching.get(opener, opener)
+        keys = (self._property_key(start, end) for start, end in self._split_commas(opener + 1, closing))
+        return [key for key in keys if key is not None]
+
+    def _scan_fields(self, tokens: List[Token], offset: Optional[int]):
+        """Accesos a campos del body; offset es None para los tokens de templates."""
+        for i, token in enumerate(tokens):
+            if token.kind == 'template':
+                for inner in token.inner:
+                    self._scan_fields(inner, None)
+                continue
+            if token.kind != 'name':
+                continue
+            before = tokens[i - 1].value if i > 0 else None
+            after = tokens[i + 1].value if i + 1 < len(tokens) else None
+            if token.value == 'hasOwn' and before == '.' and after == '(' and i + 4 < len(tokens):
+                # Object.hasOwn(body, 'campo')
+                if tokens[i + 2].value in self.aliases and tokens[i + 3].value == ',' and tokens[i + 4].kind == 'string':
+                    self.fields.append(_unquote(tokens[i + 4].value))
+                continue
+            if before in ('.', '?.'):
+                continue
+            if token.value in self.aliases:
+                k = i
+            elif self.source != 'body' and token.value == 'event' and after in ('.', '?.') and \
+                    i + 2 < len(tokens) and tokens[i + 2].value == self.source:
+                # event.queryStringParameters.campo (los parámetros no llegan serializados)
+                k = i + 2
+            else:
+                continue
+            after = tokens[k + 1].value if k + 1 < len(tokens) else None
+            if after in ('.', '?.') and k + 2 < len(tokens) and tokens[k + 2].kind == 'name':
+                member = tokens[k + 2].value
+                called = k + 3 < len(tokens) and tokens[k + 3].value == '('
+                if not called:
+                    self.fields.append(member)
+                elif member in ('hasOwnProperty', 'get') and k + 4 < len(tokens) and tokens[k + 4].kind == 'string':
+                    self.fields.append(_unquote(tokens[k + 4].value))
+            elif after in ('[', '?.') and k + 3 < len(tokens):
+                bracket = k + 1 if after == '[' else k + 2
+                if bracket + 2 < len(tokens) and tokens[bracket].value == '[' and \
+                        tokens[bracket + 1].kind == 'string' and tokens[bracket + 2].value == ']':
+                    self.fields.append(_unquote(tokens[bracket + 1].value))
+            elif before == 'in' and k == i and i >= 2 and tokens[i - 2].kind == 'string':
+                self.fields.append(_unquote(tokens[i - 2].value))
+
+    def scan_fields(self):
+        # Los destructurings se intercalan con los accesos en orden de aparición
+        destructured = {}
+        for opener, (start, end) in self.destructurings:
+            if self._is_body_source(start, end):
+                destructured[opener] = self._pattern_keys(opener)
+        if not destructured:
+            self._scan_fields(self.tokens, 0)
+            return
+        previous = 0
+        for opener in sorted(destructured):
+            self._scan_fields(self.tokens[previous:opener], previous)
+            self.fields.extend(destructured[opener])
+            previous = self.matching.get(opener, opener) + 1
+        self._scan_fields(self.tokens[previous:], previous)
+
+    # --- resolución de objetos y strings -----------------------------------
+
+    def _object_entries(self, opener: int) -> Dict[str, Tuple[int, int]]:
+        """Propiedades de un object literal: clave -> slice del valor ('...' para spreads)."""
+        entries = {}
+        closing = self.matching.get(opener, opener)
+        for start, end in self._split_commas(opener + 1, closing):
+            if self.tokens[start].value == '...':
+                entries['...'] = (start + 1, end)
+                continue
+            key = self._property_key(start, end)
+            if key is None:
+                continue
+            if start + 1 < end and self._is(start + 1, ':'):
+                entries[key] = (start + 2, end)
+            else:
+                # Shorthand { turnoId } o método { f() {...} }
+                entries[key] = (start, start + 1)
+        return entries
+
+    def resolve_object(self, start: int, end: int, seen: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Resuelve un slice a un diccionario de propiedades, siguiendo variables
+        y mutaciones posteriores (params.X = ..., params.X['#a'] = ...).
+        """
+        seen = seen or set()
+        tokens = self.tokens
+        if start >= end:
+            return {}
+        if self._is(start, '{') and self.matching.get(start) == end - 1:
+            result = {}
+            for key, (value_start, value_end) in self._object_entries(start).items():
+                if key == '...':
+                    result.update(self.resolve_object(value_start, value_end, seen))
+                else:
+                    result[key] = (value_start, value_end)
+            return result
+        if end - start == 1 and tokens[start].kind == 'name' and tokens[start].value not in seen:
+            name = tokens[start].value
+            seen = seen | {name}
+            result = {}
+            for value_start, value_end in self.declarations.get(name, []):
+                result.update(self.resolve_object(value_start, value_end, seen))
+            for path, value in self.mutations.get(name, []):
+                if len(path) == 1:
+                    result[path[0]] = value
+                else:
+                    nested = result.get(path[0])
+                    nested = self.resolve_object(*nested, seen) if isinstance(nested, tuple) else (nested or {})
+                    nested[path[1]] = value
+                    result[path[0]] = nested
+            return result
+        return {}
+
+    def _as_object(self, value: Any) -> Dict[str, Any]:
+        if isinstance(value, tuple):
+            return self.resolve_object(*value)
+        return value or {}
+
+    def string_fragments(self, start: int, end: int, seen: Optional[Set[str]] = None) -> List[str]:
+        """Textos que pueden formar el string de un slice (literales, templates y variables)."""
+        seen = seen or set()
+        fragments, tokens = [], self.tokens
+        for i in range(start, end):
+            token = tokens[i]
+            if token.kind == 'string':
+                fragments.append(_unquote(token.value))
+            elif token.kind == 'template':
+                # Un ${'literal'} se inserta tal cual; el resto de los ${...} se
+                # reemplaza por un separador que no es \w
+                text = token.parts[0]
+                for inner, part in zip(token.inner, token.parts[1:]):
+                    if len(inner) == 1 and inner[0].kind == 'string':
+                        text += _unquote(inner[0].value) + part
+                        continue
+                    text += '\0' + part
+                    for inner_token in inner:
+                        if inner_token.kind == 'name':
+                            fragments.extend(self._name_fragments(inner_token.value, seen))
+                fragments.append(text)
+            elif token.kind == 'name' and not self._is(i - 1, '.', '?.'):
+                fragments.extend(self._name_fragments(token.value, seen))
+        return fragments
+
+    def _name_fragments(self, name: str, seen: Set[str]) -> List[str]:
+        if name in seen:
+            return []
+        seen.add(name)
+        fragments = []
+        for value_start, value_end in self.declarations.get(name, []) + self.appends.get(name, []):
+            fragments.extend(self.string_fragments(value_start, value_end, seen))
+        return fragments
+
+    def _text(self, value: Any) -> str:
+        if isinstance(value, tuple):
+            return ' '.join(self.string_fragments(*value)) or \
+                ''.join(token.value for token in self.tokens[value[0]:value[1]])
+        return ''
+
+    def _string_map(self, value: Any) -> Dict[str, str]:
+        mapping = {}
+        for key, item in self._as_object(value).items():
+            if isinstance(item, tuple):
+                fragments = self.string_fragments(*item)
+                if fragments:
+                    mapping[key] = fragments[0]
+        return mapping
+
+    def _pagination_loops(self) -> List[Tuple[int, int]]:
+        """Slices de los for/while/do...while cuyo cuerpo o condición menciona las claves de paginación."""
+        tokens, loops = self.tokens, []
+        for i, token in enumerate(tokens):
+            if token.kind != 'name' or self._is(i - 1, '.', '?.'):
+                continue
+            end = None
+            if token.value in ('for', 'while') and self._is(i + 1, '(') and (i + 1) in self.matching:
+                end = self.matching[i + 1]
+                if self._is(end + 1, '{'):
+                    end = self.matching.get(end + 1, end)
+            elif token.value == 'do' and self._is(i + 1, '{') and (i + 1) in self.matching:
+                end = self.matching[i + 1]
+                if self._is(end + 1, 'while') and self._is(end + 2, '('):
+                    end = self.matching.get(end + 2, end)
+            if end is None:
+                continue
+            if any((_unquote(t.value) if t.kind == 'string' else t.value) in _PAGINATION_KEYS
+                   for t in tokens[i:end + 1]):
+                loops.append((i, end))
+        return loops
+
+    def dynamo_commands(self) -> List[DynamoCommand]:
+        commands = []
+        loops = self._pagination_loops()
+        for operation, line, (start, end) in self.commands:
+            params = self.resolve_object(start, end)
+            command = DynamoCommand(command=operation, line=line, parameters=sorted(params))
+            consistent = params.get('ConsistentRead')
+            command.consistent_read = isinstance(consistent, tuple) and consistent[1] - consistent[0] == 1 and \
+                self.tokens[consistent[0]].kind == 'name' and self.tokens[consistent[0]].value == 'true'
+            command.paginated = 'ExclusiveStartKey' in params or \
+                any(loop_start < start <= loop_end for loop_start, loop_end in loops)
+            command.table = self._text(params.get('TableName')) or None
+            command.index_name = self._text(params.get('IndexName')) or None
+            command.attribute_names = self._string_map(params.get('ExpressionAttributeNames'))
+            command.item_fields = list(self._as_object(params.get('Item')))
+            command.key_fields = list(self._as_object(params.get('Key')))
+            for key in _EXPRESSION_KEYS:
+                if key in params:
+                    command.expressions[key] = ' '.join(self.string_fragments(*params[key]))
+            if 'UpdateExpression' in params:
+                command.update_fields = parse_set_targets(
+                    self.string_fragments(*params['UpdateExpression']), command.attribute_names)
+            commands.append(command)
+        return commands
+
+
+def analyze_javascript_fields(lambda_code: str, source: str = 'body') -> JavaScriptFieldAnalysis:
+    """
+    Analiza un handler JavaScript: campos del body y llamadas a DynamoDB.
+
+    Args:
+        lambda_code: Código fuente JavaScript
+        source: Parte del evento cuyos campos se buscan ('body',
+            'queryStringParameters' o 'pathParameters')
+
+    Returns:
+        JavaScriptFieldAnalysis con los campos encontrados
+    """
+    extractor = _JavaScriptFieldExtractor(tokenize(lambda_code), source)
+    extractor.collect()
+    extractor.resolve_aliases()
+    extractor.scan_fields()
+    commands = extractor.dynamo_commands()
+
+    update_fields, put_item_fields = [], []
+    for command in commands:
+        update_fields.extend(command.update_fields)
+        put_item_fields.extend(command.item_fields)
+
+    return JavaScriptFieldAnalysis(
+        processed_fields=list(dict.fromkeys(extractor.fields)),
+        update_fields=list(dict.fromkeys(update_fields)),
+        put_item_fields=list(dict.fromkeys(put_item_fields)),
+        body_aliases=sorted(extractor.aliases),
+        dynamo_commands=commands
+    )
@@ -5,9 +5,14 @@ Este módulo proporciona herramientas para analizar el código de funciones Lamb
 y extraer información sobre cómo procesan campos, especialmente fechaTurno y horaTurno.
 """
 
+import ast
+import itertools
 import re
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import textwrap
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from dataclasses import dataclass, field, asdict
+from analysis_cache import get_analysis_cache
+from js_analyzer import DynamoCommand, analyze_javascript_fields, parse_set_targets
 
 
 @dataclass
@@ -30,16 +35,451 @@ class DiagnosticReport:
     requires_config_change: bool
 
 
-def extract_update_expression_fields(lambda_code: str) -> List[str]:
+@dataclass
+class PythonFieldAnalysis:
+    """Campos del request body y targets del SET encontrados con el AST"""
+    processed_fields: List[str] = field(default_factory=list)
+    update_fields: List[str] = field(default_factory=list)
+    body_aliases: List[str] = field(default_factory=list)
+    dynamo_commands: List[DynamoCommand] = field(default_factory=list)
+
+
+# Versión de los extractores: forma parte de la clave del cache de análisis, así
+# que hay que incrementarla cuando un cambio altera sus resultados
+ANALYZER_VERSION = '4'
+
+# Ubicación de los parámetros en OpenAPI ('in') -> clave del evento de API Gateway
+PARAMETER_SOURCES = {'query': 'queryStringParameters', 'path': 'pathParameters'}
+
+# Máximo de combinaciones al expandir f-strings con variables de valor conocido
+MAX_FSTRING_EXPANSIONS = 64
+
+# Métodos de dict que reciben el nombre del campo como primer argumento
+_DICT_FIELD_METHODS = {'get', 'pop', 'setdefault'}
+
+# Métodos de boto3 (Table y client) -> operación, con los mismos nombres que js_analyzer
+_DYNAMO_METHODS = {
+    'put_item': 'Put', 'update_item': 'Update', 'get_item': 'Get',
+    'query': 'Query', 'scan': 'Scan', 'delete_item': 'Delete',
+}
+
+# Claves con las que un loop recorre las páginas de un Query/Scan
+_PAGINATION_KEYS = {'LastEvaluatedKey', 'ExclusiveStartKey'}
+
+_DYNAMO_EXPRESSION_KEYS = ('UpdateExpression', 'KeyConditionExpression', 'FilterExpression',
+                           'ConditionExpression', 'ProjectionExpression')
+
+# Condiciones de boto3.dynamodb.conditions -> operador de la expresión equivalente
+_CONDITION_OPERATORS = {
+    'eq': '=', 'ne': '<>', 'lt': '<', 'lte': '<=', 'gt': '>', 'gte': '>=',
+    'between': 'BETWEEN', 'begins_with': 'begins_with', 'contains': 'contains',
+    'is_in': 'IN', 'exists': 'attribute_exists', 'not_exists': 'attribute_not_exists',
+}
+
+
+# Campos del AST que nunca tienen nodos que interesen: contextos, operadores y nombres
+_LEAF_FIELDS = {'ctx', 'op', 'ops', 'id', 'attr', 'arg', 'kind', 'type_comment', 'level', 'module',
+                'is_async', 'conversion', 'simple', 'name', 'names', 'kwd_attrs'}
+
+# Clase de nodo -> campos que pueden tener hijos (Constant y Name no tienen)
+_CHILD_FIELDS: Dict[type, Tuple[str, ...]] = {ast.Constant: (), ast.Name: ()}
+
+
+def _child_fields(node: ast.AST) -> Tuple[str, ...]:
+    fields = _CHILD_FIELDS.get(type(node))
+    if fields is None:
+        fields = _CHILD_FIELDS[type(node)] = tuple(f for f in node._fields if f not in _LEAF_FIELDS)
+    return fields
+
+
+def _child_nodes(node: ast.AST) -> List[ast.AST]:
     """
-    Extrae los campos que están siendo incluidos en UpdateExpression de DynamoDB.
+    Como ast.iter_child_nodes pero sin contextos (Load/Store), operadores ni
+    campos de texto: en handlers grandes son un tercio de los nodos y
+    ast.iter_child_nodes revisa cada campo de cada uno.
+    """
+    children = []
+    for name in _child_fields(node):
+        value = getattr(node, name, None)
+        if type(value) is list:
+            children.extend(item for item in value if isinstance(item, ast.AST))
+        elif isinstance(value, ast.AST):
+            children.append(value)
+    return children
+
+
+def _walk(tree: ast.AST) -> List[ast.AST]:
+    """Nodos en el mismo orden BFS que ast.walk, salteando las hojas de _child_nodes."""
+    nodes = [tree]
+    # La lista crece mientras se recorre: cada nodo agrega sus hijos al final
+    for node in nodes:
+        for name in _child_fields(node):
+            value = getattr(node, name, None)
+            if type(value) is list:
+                nodes.extend(item for item in value if isinstance(item, ast.AST))
+            elif isinstance(value, ast.AST):
+                nodes.append(value)
+    return nodes
+
+
+def _unique(values: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(values))
+
+
+def _is_update_expression_name(name: str) -> bool:
+    normalized = name.lower().replace('_', '')
+    return 'update' in normalized and 'expression' in normalized
+
+
+class _PythonFieldExtractor:
+    """
+    Extrae campos del body y targets del SET con un único recorrido del AST.
+    
+    El recorrido agrupa los nodos por tipo; después se resuelve un
+    dataflow-lite que no depende del orden: una variable es alias del body si
+    se llama `body` o si se le asigna json.loads(event['body']),
+    event['body'], event.get('body') u otro alias (también dentro de `or`,
+    if/else, dict(...) y {**alias}). Las cadenas asignadas a variables se
+    guardan con las variables que referencian para resolver al final qué
+    llega a UpdateExpression.
+    """
+    
+    def __init__(self, source: str = 'body'):
+        self.source = source
+        self.aliases = {'body'} if source == 'body' else set()
+        self.fields: List[str] = []
+        # Valores constantes conocidos de cada variable (asignaciones y for sobre literales)
+        self.constants: Dict[str, List[str]] = {}
+        # Fragmentos de string y variables referenciadas por cada variable
+        self.fragments: Dict[str, List[str]] = {}
+        self.references: Dict[str, set] = {}
+        self.update_fragments: List[str] = []
+        self.update_names = set()
+        self.attribute_names: Dict[str, str] = {}
+        # Variables asignadas a dynamodb.Table(...) -> expresión del nombre de la tabla
+        self.tables: Dict[str, str] = {}
+        # Variables asignadas a un dict literal (parámetros armados antes de la llamada)
+        self.dicts: Dict[str, ast.Dict] = {}
+        self.dynamo_commands: List[DynamoCommand] = []
+        # (primera, última línea) de los loops que recorren páginas con LastEvaluatedKey
+        self.pagination_loops: List[Tuple[int, int]] = []
+    
+    def run(self, tree: ast.AST):
+        assignments, augmented, loops, whiles, lookups = [], [], [], [], []
+        buckets = {
+            ast.Assign: assignments, ast.AnnAssign: assignments, ast.AugAssign: augmented,
+            ast.For: loops, ast.While: whiles, ast.Subscript: lookups, ast.Compare: lookups,
+            ast.Call: lookups, ast.Match: lookups
+        }
+        for node in _walk(tree):
+            bucket = buckets.get(type(node))
+            if bucket is not None:
+                bucket.append(node)
+        
+        targets = []
+        for node in assignments:
+            if node.value is None:
+                continue
+            names = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in names:
+                if isinstance(target, ast.Name):
+                    targets.append((target.id, node.value))
+                    if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                        self.constants.setdefault(target.id, []).append(node.value.value)
+                    elif isinstance(node.value, ast.Dict):
+                        self.dicts[target.id] = node.value
+                    elif isinstance(node.value, ast.Call) and isinstance(node.value.func, ast.Attribute) \
+                            and node.value.func.attr == 'Table' and node.value.args:
+                        self.tables[target.id] = ast.unparse(node.value.args[0])
+        for node in loops:
+            if isinstance(node.target, ast.Name) and isinstance(node.iter, (ast.Tuple, ast.List, ast.Set)):
+                values = [v for element in node.iter.elts for v in self._string_values(element)]
+                if values:
+                    self.constants.setdefault(node.target.id, []).extend(values)
+        for node in loops + whiles:
+            if any(isinstance(child, ast.Constant) and child.value in _PAGINATION_KEYS for child in _walk(node)):
+                self.pagination_loops.append((node.lineno, node.end_lineno))
+        
+        # Alias hasta punto fijo (b = body; c = b; ...)
+        changed = True
+        while changed:
+            changed = False
+            for name, value in targets:
+                if name not in self.aliases and self._is_body_source(value):
+                    self.aliases.add(name)
+                    changed = True
+        
+        for name, value in targets:
+            self._record_string(name, value)
+        for node in augmented:
+            if isinstance(node.target, ast.Name) and isinstance(node.op, ast.Add):
+                self._record_string(node.target.id, node.value)
+        # _walk es BFS: se ordena por posición para reportar los campos en orden de aparición
+        lookups.sort(key=lambda n: (n.lineno, n.col_offset))
+        for node in lookups:
+            self._lookup(node)
+    
+    # --- flujo del body ---------------------------------------------------
+    
+    def _is_body_key(self, node: ast.AST) -> bool:
+        return isinstance(node, ast.Constant) and node.value == self.source
+    
+    def _is_body_source(self, node: Optional[ast.AST]) -> bool:
+        if node is None:
+            return False
+        if isinstance(node, ast.Name):
+            return node.id in self.aliases
+        if isinstance(node, ast.Subscript):
+            return self._is_body_key(node.slice)
+        if isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Attribute):
+                # event.get('body'), json.loads(...), alias.copy()
+                if func.attr == 'get' and node.args and self._is_body_key(node.args[0]):
+                    return True
+                if func.attr == 'loads' and node.args:
+                    return self._is_body_source(node.args[0])
+                if func.attr == 'copy':
+                    return self._is_body_source(func.value)
+            if isinstance(func, ast.Name) and func.id == 'dict' and node.args:
+                return self._is_body_source(node.args[0])
+            return False
+        if isinstance(node, ast.BoolOp):
+            return any(self._is_body_source(value) for value in node.values)
+        if isinstance(node, ast.IfExp):
+            return self._is_body_source(node.body) or self._is_body_source(node.orelse)
+        if isinstance(node, ast.Dict):
+            return any(key is None and self._is_body_source(value) for key, value in zip(node.keys, node.values))
+        return False
+    
+    def _is_alias(self, node: ast.AST) -> bool:
+        if isinstance(node, ast.Name):
+            return node.id in self.aliases
+        # Los parámetros no llegan serializados: event['queryStringParameters']['campo']
+        return self.source != 'body' and self._is_body_source(node)
+    
+    def _string_values(self, node: ast.AST) -> List[str]:
+        """Valores posibles de un nombre de campo: literal o variable con constantes conocidas."""
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return [node.value]
+        if isinstance(node, ast.Name):
+            return self.constants.get(node.id, [])
+        return []
+    
+    def _lookup(self, node: ast.AST):
+        if isinstance(node, ast.Subscript):
+            # alias['campo']
+            if self._is_alias(node.value):
+                self.fields.extend(self._string_values(node.slice))
+        elif isinstance(node, ast.Compare):
+            # 'campo' in alias / 'campo' not in alias
+            left = node.left
+            for op, comparator in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)) and self._is_alias(comparator):
+                    self.fields.extend(self._string_values(left))
+                left = comparator
+        elif isinstance(node, ast.Call):
+            self._call(node)
+        elif self._is_alias(node.subject):
+            # match alias: case {'campo': ...}
+            for case in node.cases:
+                for pattern in ast.walk(case.pattern):
+                    if isinstance(pattern, ast.MatchMapping):
+                        for key in pattern.keys:
+                            self.fields.extend(self._string_values(key))
+    
+    def _call(self, node: ast.Call):
+        func = node.func
+        if isinstance(func, ast.Attribute):
+            # alias.get('campo'), alias.pop('campo'), alias.setdefault('campo')
+            if func.attr in _DICT_FIELD_METHODS and self._is_alias(func.value) and node.args:
+                self.fields.extend(self._string_values(node.args[0]))
+            # partes.append('campo = :campo')
+            if func.attr in ('append', 'extend', 'insert') and isinstance(func.value, ast.Name) and node.args:
+                self._record_string(func.value.id, node.args[-1])
+            if func.attr in _DYNAMO_METHODS:
+                self._dynamo_call(node, _DYNAMO_METHODS[func.attr])
+        
+        for keyword in node.keywords:
+            if keyword.arg == 'UpdateExpression':
+                fragments, names = self._string_fragments(keyword.value)
+                self.update_fragments.extend(fragments)
+                self.update_names |= names
+            elif keyword.arg == 'ExpressionAttributeNames' and isinstance(keyword.value, ast.Dict):
+                for key, value in zip(keyword.value.keys, keyword.value.values):
+                    if isinstance(key, ast.Constant) and isinstance(value, ast.Constant):
+                        self.attribute_names[str(key.value)] = str(value.value)
+    
+    # --- llamadas a DynamoDB ----------------------------------------------
+    
+    def _dynamo_call(self, node: ast.Call, operation: str):
+        """table.query(...), client.get_item(...): solo se registran si hay parámetros de DynamoDB."""
+        params: Dict[str, ast.AST] = {}
+        for keyword in node.keywords:
+            if keyword.arg is not None:
+                params[keyword.arg] = keyword.value
+            elif isinstance(keyword.value, ast.Name) and keyword.value.id in self.dicts:
+                # table.query(**params)
+                params.update(self._dict_entries(self.dicts[keyword.value.id]))
+        table = self.tables.get(node.func.value.id) if isinstance(node.func.value, ast.Name) else None
+        if table is None and 'TableName' in params:
+            table = self._text(params['TableName'])
+        if table is None and not params:
+            return
+        
+        command = DynamoCommand(command=operation, line=node.lineno, table=table, parameters=sorted(params))
+        consistent = params.get('ConsistentRead')
+        command.consistent_read = isinstance(consistent, ast.Constant) and consistent.value is True
+        command.paginated = 'ExclusiveStartKey' in params or \
+            any(first <= node.lineno <= last for first, last in self.pagination_loops)
+        if 'IndexName' in params:
+            command.index_name = self._text(params['IndexName'])
+        names = params.get('ExpressionAttributeNames')
+        if isinstance(names, ast.Name):
+            names = self.dicts.get(names.id)
+        if isinstance(names, ast.Dict):
+            command.attribute_names = {
+                key: value for key, value in ((self._text(k), self._text(v)) for k, v in zip(names.keys, names.values))
+                if key and value
+            }
+        command.item_fields = self._dict_keys(params.get('Item'))
+        command.key_fields = self._dict_keys(params.get('Key'))
+        for key in _DYNAMO_EXPRESSION_KEYS:
+            if key in params:
+                command.expressions[key] = self._expression_text(params[key])
+        if 'UpdateExpression' in params:
+            fragments, names_used = self._string_fragments(params['UpdateExpression'])
+            for name in names_used:
+                fragments.extend(self.fragments.get(name, []))
+            command.update_fields = parse_set_targets(fragments, command.attribute_names)
+        self.dynamo_commands.append(command)
+    
+    def _dict_entries(self, node: ast.Dict) -> Dict[str, ast.AST]:
+        entries = {}
+        for key, value in zip(node.keys, node.values):
+            if key is None and isinstance(value, ast.Name) and value.id in self.dicts:
+                entries.update(self._dict_entries(self.dicts[value.id]))
+            elif isinstance(key, ast.Constant) and isinstance(key.value, str):
+                entries[key.value] = value
+        return entries
+    
+    def _dict_keys(self, node: Optional[ast.AST]) -> List[str]:
+        if isinstance(node, ast.Name):
+            node = self.dicts.get(node.id)
+        return list(self._dict_entries(node)) if isinstance(node, ast.Dict) else []
+    
+    def _text(self, node: ast.AST) -> Optional[str]:
+        values = self._string_values(node)
+        if values:
+            return values[0]
+        return ast.unparse(node) if not isinstance(node, ast.Constant) else None
+    
+    def _expression_text(self, node: ast.AST) -> str:
+        """Texto de una expresión: strings (también por variable) o condiciones Key('x').eq(...) de boto3."""
+        conditions = []
+        for call in ast.walk(node):
+            # Key('campo').eq(valor) / Attr('campo').contains(valor)
+            if isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute) \
+                    and call.func.attr in _CONDITION_OPERATORS and isinstance(call.func.value, ast.Call) \
+                    and isinstance(call.func.value.func, ast.Name) and call.func.value.func.id in ('Key', 'Attr') \
+                    and call.func.value.args:
+                name = self._text(call.func.value.args[0]) or '\0'
+                operator = _CONDITION_OPERATORS[call.func.attr]
+                conditions.append(f'{name} {operator} :{name}' if not operator[0].isalpha() or operator in
+                                  ('BETWEEN', 'IN') else f'{operator}({name}, :{name})')
+        if conditions:
+            return ' AND '.join(conditions)
+        fragments, names = self._string_fragments(node)
+        for name in names:
+            fragments.extend(self.fragments.get(name, []))
+        return ' '.join(fragments)
+    
+    # --- cadenas y expresiones de update ----------------------------------
+    
+    def _string_fragments(self, node: ast.AST) -> Tuple[List[str], set]:
+        """Fragmentos de texto y variables referenciadas por una expresión."""
+        fragments, names = [], set()
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, str):
+                fragments.append(node.value)
+        elif isinstance(node, ast.JoinedStr):
+            fragments.extend(self._expand_fstring(node))
+            names.update(n.id for n in _walk(node) if isinstance(n, ast.Name))
+        elif isinstance(node, ast.Name):
+            names.add(node.id)
+        else:
+            for child in _child_nodes(node):
+                sub_fragments, sub_names = self._string_fragments(child)
+                fragments.extend(sub_fragments)
+                names |= sub_names
+        return fragments, names
+    
+    def _expand_fstring(self, node: ast.JoinedStr) -> List[str]:
+        parts = []
+        for value in node.values:
+            if isinstance(value, ast.Constant):
+                parts.append([str(value.value)])
+            else:
+                # Valores desconocidos se reemplazan por un separador que no es \w
+                known = self._string_values(value.value) if isinstance(value, ast.FormattedValue) else []
+                parts.append(known or ['\0'])
+        expansions = itertools.islice(itertools.product(*parts), MAX_FSTRING_EXPANSIONS)
+        return [''.join(combination) for combination in expansions]
+    
+    def _record_string(self, name: str, value: ast.AST):
+        fragments, names = self._string_fragments(value)
+        if fragments:
+            self.fragments.setdefault(name, []).extend(fragments)
+        names.discard(name)
+        if names:
+            self.references.setdefault(name, set()).update(names)
+    
+    # --- resultado --------------------------------------------------------
+    
+    def update_fields(self) -> List[str]:
+        """Resuelve las variables que llegan a UpdateExpression y parsea sus SET."""
+        pending = list(self.update_names) + [name for name in self.fragments if _is_update_expression_name(name)]
+        fragments = list(self.update_fragments)
+        visited = set()
+        while pending:
+            name = pending.pop()
+            if name in visited:
+                continue
+            visited.add(name)
+            fragments.extend(self.fragments.get(name, []))
+            pending.extend(self.references.get(name, ()))
+        
+        return parse_set_targets(fragments, self.attribute_names)
+
+
+def analyze_python_fields(lambda_code: str, source: str = 'body') -> PythonFieldAnalysis:
+    """
+    Extrae con el AST los campos del body y los targets del SET de un handler Python.
     
     Args:
-        lambda_code: Código fuente de la función Lambda
+        lambda_code: Código fuente Python (se le quita la indentación común)
+        source: Parte del evento cuyos campos se buscan ('body',
+            'queryStringParameters' o 'pathParameters')
         
     Returns:
-        Lista de nombres de campos encontrados en UpdateExpression
+        PythonFieldAnalysis con los campos encontrados
+        
+    Raises:
+        SyntaxError: Si el código no es Python válido (por ejemplo, JavaScript)
     """
+    tree = ast.parse(textwrap.dedent(lambda_code))
+    extractor = _PythonFieldExtractor(source)
+    extractor.run(tree)
+    return PythonFieldAnalysis(
+        processed_fields=_unique(extractor.fields),
+        update_fields=extractor.update_fields(),
+        body_aliases=sorted(extractor.aliases),
+        dynamo_commands=extractor.dynamo_commands
+    )
+
+
+def _extract_update_expression_fields_regex(lambda_code: str) -> List[str]:
+    """Extractor por regex original de los campos de UpdateExpression (referencia del benchmark)."""
     fields = []
     
     # Buscar patrones de UpdateExpression
@@ -61,16 +501,8 @@ def extract_update_expression_fields(lambda_code: str) -> List[str]:
     return list(set(fields))  # Eliminar duplicados
 
 
-def extract_processed_fields(lambda_code: str) -> List[str]:
-    """
-    Extrae los campos que la lambda procesa del request body.
-    
-    Args:
-        lambda_code: Código fuente de la función Lambda
-        
-    Returns:
-        Lista de nombres de campos procesados
-    """
+def _extract_processed_fields_regex(lambda_code: str) -> List[str]:
+    """Extractor por regex original de los campos del body (referencia del benchmark)."""
     fields = []
     
     # Patrón 1: body.get('campo') o body['campo']
@@ -95,6 +527,123 @@ def extract_processed_fields(lambda_code: str) -> List[str]:
     return list(set(fields))  # Eliminar duplicados
 
 
+def _extract_fields_uncached(lambda_code: str) -> Tuple[List[str], List[str]]:
+    try:
+        analysis = analyze_python_fields(lambda_code)
+    except (SyntaxError, ValueError):
+        analysis = analyze_javascript_fields(lambda_code)
+    return analysis.processed_fields, analysis.update_fields
+
+
+def extract_fields(lambda_code: str, use_cache: bool = True) -> Tuple[List[str], List[str]]:
+    """
+    Extrae en una sola pasada los campos procesados y los de UpdateExpression.
+    
+    El código Python se analiza con el AST; si no parsea se analiza como
+    JavaScript con el tokenizer de js_analyzer. El resultado se cachea por
+    hash del código (ver analysis_cache).
+    
+    Args:
+        lambda_code: Código fuente de la función Lambda
+        use_cache: Si es False se analiza siempre el código
+        
+    Returns:
+        Tupla (campos procesados del body, campos en UpdateExpression)
+    """
+    if not use_cache:
+        return _extract_fields_uncached(lambda_code)
+    processed, update = get_analysis_cache().get_or_compute(
+        'fields', ANALYZER_VERSION, lambda_code,
+        lambda: [list(fields) for fields in _extract_fields_uncached(lambda_code)]
+    )
+    return list(processed), list(update)
+
+
+def _extract_parameter_fields_uncached(lambda_code: str) -> Dict[str, List[str]]:
+    parameters = {}
+    for location, source in PARAMETER_SOURCES.items():
+        try:
+            analysis = analyze_python_fields(lambda_code, source)
+        except (SyntaxError, ValueError):
+            analysis = analyze_javascript_fields(lambda_code, source)
+        parameters[location] = analysis.processed_fields
+    return parameters
+
+
+def extract_parameter_fields(lambda_code: str) -> Dict[str, List[str]]:
+    """
+    Extrae los parámetros de query y de path que lee la lambda.
+    
+    Args:
+        lambda_code: Código fuente de la función Lambda
+        
+    Returns:
+        Diccionario ubicación ('query', 'path') -> nombres de parámetros
+    """
+    parameters = get_analysis_cache().get_or_compute(
+        'parameters', ANALYZER_VERSION, lambda_code,
+        lambda: _extract_parameter_fields_uncached(lambda_code)
+    )
+    return {location: list(names) for location, names in parameters.items()}
+
+
+def _extract_dynamo_commands_uncached(lambda_code: str) -> List[DynamoCommand]:
+    try:
+        return analyze_python_fields(lambda_code).dynamo_commands
+    except (SyntaxError, ValueError):
+        return analyze_javascript_fields(lambda_code).dynamo_commands
+
+
+def extract_dynamo_commands(lambda_code: str, use_cache: bool = True) -> List[DynamoCommand]:
+    """
+    Extrae las llamadas a DynamoDB (Get/Put/Update/Delete/Query/Scan) del handler.
+    
+    En Python se reconocen los métodos de boto3 sobre dynamodb.Table(...) o
+    el client (con TableName) y las condiciones Key(...)/Attr(...); en
+    JavaScript, los comandos del SDK v3 (ver js_analyzer).
+    
+    Args:
+        lambda_code: Código fuente de la función Lambda
+        use_cache: Si es False se analiza siempre el código
+        
+    Returns:
+        Lista de DynamoCommand en orden de aparición
+    """
+    if not use_cache:
+        return _extract_dynamo_commands_uncached(lambda_code)
+    commands = get_analysis_cache().get_or_compute(
+        'dynamo', ANALYZER_VERSION, lambda_code,
+        lambda: [asdict(command) for command in _extract_dynamo_commands_uncached(lambda_code)]
+    )
+    return [DynamoCommand(**command) for command in commands]
+
+
+def extract_update_expression_fields(lambda_code: str) -> List[str]:
+    """
+    Extrae los campos que están siendo incluidos en UpdateExpression de DynamoDB.
+    
+    Args:
+        lambda_code: Código fuente de la función Lambda
+        
+    Returns:
+        Lista de nombres de campos encontrados en UpdateExpression
+    """
+    return extract_fields(lambda_code)[1]
+
+
+def extract_processed_fields(lambda_code: str) -> List[str]:
+    """
+    Extrae los campos que la lambda procesa del request body.
+    
+    Args:
+        lambda_code: Código fuente de la función Lambda
+        
+    Returns:
+        Lista de nombres de campos procesados
+    """
+    return extract_fields(lambda_code)[0]
+
+
 def analyze_lambda_code(lambda_name: str, lambda_code: str) -> DiagnosticReport:
     """
     Analiza el código de una lambda para identificar problemas.
@@ -106,11 +655,38 @@ def analyze_lambda_code(lambda_name: str, lambda_code: str) -> DiagnosticReport:
     Returns:
         DiagnosticReport con hallazgos y recomendaciones
     """
+    # Los hallazgos solo dependen del código, así que se cachean por su hash
+    cached = get_analysis_cache().get_or_compute(
+        'findings', ANALYZER_VERSION, lambda_code,
+        lambda: [asdict(finding) for finding in _find_issues(lambda_code)]
+    )
+    findings = [Finding(**finding) for finding in cached]
+    
+    # Generar resumen
+    critical_count = sum(1 for f in findings if f.severity == 'critical')
+    warning_count = sum(1 for f in findings if f.severity == 'warning')
+    
+    if critical_count > 0:
+        summary = f'Se encontraron {critical_count} problemas críticos y {warning_count} advertencias'
+    elif warning_count > 0:
+        summary = f'Se encontraron {warning_count} advertencias'
+    else:
+        summary = 'No se encontraron problemas críticos'
+    
+    return DiagnosticReport(
+        lambda_name=lambda_name,
+        findings=findings,
+        summary=summary,
+        requires_code_change=critical_count > 0,
+        requires_config_change=False
+    )
+
+
+def _find_issues(lambda_code: str) -> List[Finding]:
     findings = []
     
     # Extraer campos procesados y campos en UpdateExpression
-    processed_fields = extract_processed_fields(lambda_code)
-    update_fields = extract_update_expression_fields(lambda_code)
+    processed_fields, update_fields = extract_fields(lambda_code)
     
     # Verificar si fechaTurno y horaTurno están en UpdateExpression
     fecha_in_update = any('fecha' in f.lower() for f in update_fields)
@@ -178,24 +754,7 @@ def analyze_lambda_code(lambda_name: str, lambda_code: str) -> DiagnosticReport:
             recommendation='Agregar logging del UpdateExpression y expression_values antes de ejecutar update_item'
         ))
     
-    # Generar resumen
-    critical_count = sum(1 for f in findings if f.severity == 'critical')
-    warning_count = sum(1 for f in findings if f.severity == 'warning')
-    
-    if critical_count > 0:
-        summary = f'Se encontraron {critical_count} problemas críticos y {warning_count} advertencias'
-    elif warning_count > 0:
-        summary = f'Se encontraron {warning_count} advertencias'
-    else:
-        summary = 'No se encontraron problemas críticos'
-    
-    return DiagnosticReport(
-        lambda_name=lambda_name,
-        findings=findings,
-        summary=summary,
-        requires_code_change=critical_count > 0,
-        requires_config_change=False
-    )
+    return findings
 
 
 def compare_field_handling(modify_lambda_code: str, create_lambda_code: str) -> Dict[str, Any]:
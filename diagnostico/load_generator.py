@@ -0,0 +1,453 @@
+"""
+Generador de carga guiado por la especificación OpenAPI.
+
+Lee turnos-medicos-api-openapi.yaml, sintetiza request bodies válidos
+(examples, enums y formats del schema) y deliberadamente inválidos (campo
+requerido ausente, tipo, enum o formato incorrecto, JSON roto) y los envía
+con un cliente HTTP/1.1 asyncio con pool de conexiones keep-alive a una tasa
+fija (lazo abierto: la latencia se mide desde el instante programado, así
+que la espera por conexiones del pool también cuenta).
+
+Reporta p50/p95/p99 por operación y las respuestas inesperadas: bodies
+válidos que no reciben 2xx e inválidos que no reciben 4xx. Conectar y leer
+cada respuesta tienen un timeout; los timeouts y cualquier otra excepción se
+cuentan por operación sin cortar la corrida. Sin --url levanta
+el stub local (stub_api_server) en el mismo proceso y corre sin red; en ese
+caso cliente y servidor comparten el event loop y la latencia medida incluye
+ambos lados.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import ssl
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+import yaml
+
+from body_replay import BodyValidator, get_body_validator, request_body_schema
+from cloudwatch_analyzer import LatencyHistogram
+from stub_api_server import StubApiServer, StubOperation, example_from_schema, spec_operations
+from template_index import load_template_index
+
+
+DEFAULT_RPS = 50.0
+DEFAULT_DURATION_SECONDS = 10.0
+DEFAULT_CONNECTIONS = 16
+DEFAULT_INVALID_RATIO = 0.2
+DEFAULT_TIMEOUT_SECONDS = 10.0  # para conectar y para recibir cada respuesta
+
+# Requests en vuelo por conexión antes de frenar al planificador
+MAX_IN_FLIGHT_PER_CONNECTION = 16
+
+# Mutaciones que la API debería rechazar con 4xx
+MUTATIONS = ('missing', 'type', 'enum', 'format', 'json')
+
+_WRONG_TYPE_VALUES = {'string': 12345, 'integer': 'texto', 'number': 'texto', 'boolean': 'si', 'object': 'texto',
+                      'array': 'texto'}
+
+
+@dataclass
+class SyntheticRequest:
+    """Body generado para una operación"""
+    body: str
+    kind: str  # 'valid' o una de MUTATIONS
+    field: Optional[str] = None  # campo mutado
+
+    @property
+    def expects_success(self) -> bool:
+        return self.kind == 'valid'
+
+
+class BodySynthesizer:
+    """
+    Genera bodies de una operación a partir de su schema.
+
+    Los bodies válidos se verifican contra el BodyValidator de la operación;
+    los que el propio spec declara mal (un example que viola su format, por
+    ejemplo) quedan en spec_issues.
+    """
+
+    def __init__(self, spec: dict, endpoint: str, method: str = 'post', rng: Optional[random.Random] = None):
+        self.endpoint = endpoint
+        self.method = method
+        self.schema = request_body_schema(spec, endpoint, method)
+        self.validator: Optional[BodyValidator] = get_body_validator(spec, endpoint, method)
+        self.rng = rng or random.Random()
+        self.spec_issues: Counter = Counter()
+        properties = self.schema.get('properties') or {}
+        self.mutations = [kind for kind, available in (
+            ('missing', bool(self.schema.get('required'))),
+            ('type', bool(properties)),
+            ('enum', any(p.get('enum') for p in properties.values())),
+            ('format', any(p.get('format') for p in properties.values())),
+            ('json', bool(self.schema)),
+        ) if available]
+
+    def valid(self) -> Dict[str, Any]:
+        body = example_from_schema(self.schema, self.rng) if self.schema else {}
+        if self.validator is not None:
+            for name, kind in self.validator.validate(body):
+                if kind != 'undocumented':
+                    self.spec_issues[(name, kind)] += 1
+        return body
+
+    def request(self, invalid_ratio: float = 0.0) -> SyntheticRequest:
+        """Un body válido o, con probabilidad invalid_ratio, una mutación."""
+        if self.mutations and self.rng.random() < invalid_ratio:
+            return self.invalid(self.rng.choice(self.mutations))
+        return SyntheticRequest(json.dumps(self.valid(), ensure_ascii=False), 'valid')
+
+    def invalid(self, kind: str) -> SyntheticRequest:
+        """Body que viola el schema con la mutación indicada."""
+        body = self.valid()
+        properties = self.schema.get('properties') or {}
+        if kind == 'json':
+            return SyntheticRequest(json.dumps(body, ensure_ascii=False)[:-1], kind)
+        if kind == 'missing':
+            name = self.rng.choice(self.schema['required'])
+            body.pop(name, None)
+            return SyntheticRequest(json.dumps(body, ensure_ascii=False), kind, name)
+        candidates = [name for name, prop in properties.items()
+                      if kind == 'type' or (kind == 'enum' and prop.get('enum'))
+                      or (kind == 'format' and prop.get('format'))]
+        name = self.rng.choice(candidates)
+        prop = properties[name]
+        if kind == 'type':
+            body[name] = _WRONG_TYPE_VALUES.get(prop.get('type', 'string'), 12345)
+        elif kind == 'enum':
+            body[name] = 'valor-fuera-del-enum'
+        else:
+            body[name] = 'formato-invalido'
+        return SyntheticRequest(json.dumps(body, ensure_ascii=False), kind, name)
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones HTTP/1.1 keep-alive sobre asyncio.
+
+    Las conexiones se abren a demanda hasta size y se reutiliza primero la
+    última liberada (LIFO), así que a baja tasa alcanza con pocas; una
+    conexión que falla o excede el timeout se descarta y su lugar queda libre
+    para reabrirla.
+    """
+
+    def __init__(self, url: str, size: int = DEFAULT_CONNECTIONS, timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        parts = urlsplit(url)
+        self.host = parts.hostname or 'localhost'
+        self.secure = parts.scheme == 'https'
+        self.port = parts.port or (443 if self.secure else 80)
+        self.base_path = parts.path.rstrip('/')
+        self.size = size
+        self.timeout = timeout
+        self.opened = 0
+        self._idle: asyncio.LifoQueue = asyncio.LifoQueue()
+        for _ in range(size):
+            self._idle.put_nowait(None)
+
+    async def request(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, bytes]:
+        """
+        Envía un request y espera la respuesta completa.
+
+        Returns:
+            (status, body de la respuesta)
+
+        Raises:
+            asyncio.TimeoutError: Si conectar o recibir la respuesta supera self.timeout
+        """
+        connection = await self._idle.get()
+        try:
+            if connection is None:
+                connection = await asyncio.wait_for(asyncio.open_connection(
+                    self.host, self.port, ssl=ssl.create_default_context() if self.secure else None), self.timeout)
+                self.opened += 1
+            reader, writer = connection
+            head = [f'{method} {self.base_path}{path} HTTP/1.1', f'Host: {self.host}',
+                    f'Content-Length: {len(body)}', 'Connection: keep-alive']
+            head.extend(f'{name}: {value}' for name, value in headers.items())
+            writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+            status, response, keep_alive = await asyncio.wait_for(self._exchange(reader, writer), self.timeout)
+        except BaseException:
+            if connection is not None:
+                connection[1].close()
+            self._idle.put_nowait(None)
+            raise
+        if keep_alive:
+            self._idle.put_nowait(connection)
+        else:
+            connection[1].close()
+            self._idle.put_nowait(None)
+        return status, response
+
+    async def _exchange(self, reader: asyncio.StreamReader,
+                        writer: asyncio.StreamWriter) -> Tuple[int, bytes, bool]:
+        await writer.drain()
+        return await self._read_response(reader)
+
+    async def _read_response(self, reader: asyncio.StreamReader) -> Tuple[int, bytes, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError('La conexión se cerró sin respuesta')
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        if 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b''.join(chunks)
+        else:
+            body, keep_alive = await reader.read(), False
+        return status, body, keep_alive
+
+    async def close(self):
+        while not self._idle.empty():
+            connection = self._idle.get_nowait()
+            if connection is not None:
+                connection[1].close()
+
+
+@dataclass
+class OperationStats:
+    """Resultados de carga de una operación"""
+    endpoint: str
+    method: str
+    operation_id: Optional[str]
+    latency_ms: LatencyHistogram = field(default_factory=LatencyHistogram)
+    status_codes: Counter = field(default_factory=Counter)
+    by_kind: Counter = field(default_factory=Counter)  # (kind, clase de status) -> cantidad
+    unexpected: Counter = field(default_factory=Counter)  # (kind, campo, status) -> cantidad
+    connection_errors: int = 0
+    timeouts: int = 0
+    errors: Counter = field(default_factory=Counter)  # excepción inesperada -> cantidad
+    spec_issues: Counter = field(default_factory=Counter)
+
+    @property
+    def failed(self) -> int:
+        """Requests sin respuesta: conexión, timeout u otra excepción."""
+        return self.connection_errors + self.timeouts + sum(self.errors.values())
+
+    @property
+    def requests(self) -> int:
+        return self.latency_ms.count + self.failed
+
+    @property
+    def name(self) -> str:
+        return self.operation_id or f'{self.method.upper()} {self.endpoint}'
+
+
+@dataclass
+class LoadReport:
+    """Resultado de una corrida del generador"""
+    url: str
+    target_rps: float
+    elapsed_seconds: float
+    connections: int
+    operations: List[OperationStats]
+
+    @property
+    def requests(self) -> int:
+        return sum(stats.requests for stats in self.operations)
+
+    @property
+    def achieved_rps(self) -> float:
+        return self.requests / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def unexpected(self) -> int:
+        return sum(sum(stats.unexpected.values()) for stats in self.operations)
+
+
+def _status_class(status: int) -> str:
+    return f'{status // 100}xx'
+
+
+async def run_load(url: str, spec: dict, rps: float = DEFAULT_RPS, duration: float = DEFAULT_DURATION_SECONDS,
+                   connections: int = DEFAULT_CONNECTIONS, invalid_ratio: float = DEFAULT_INVALID_RATIO,
+                   api_key: Optional[str] = None, operations: Optional[List[str]] = None,
+                   seed: Optional[int] = None, timeout: float = DEFAULT_TIMEOUT_SECONDS) -> LoadReport:
+    """
+    Dispara rps × duration requests repartidos entre las operaciones del spec.
+
+    Args:
+        url: URL base de la API (incluye el stage, ej: https://x.execute-api.../prod)
+        spec: Especificación OpenAPI parseada
+        rps: Tasa objetivo de requests por segundo
+        duration: Duración de la corrida en segundos
+        connections: Tamaño del pool de conexiones
+        invalid_ratio: Fracción de bodies deliberadamente inválidos
+        api_key: Valor para el header de API key de las operaciones que lo piden
+        operations: operationIds o paths a incluir (None: todas)
+        seed: Semilla para reproducir los bodies
+        timeout: Segundos máximos para conectar y para recibir cada respuesta
+
+    Returns:
+        LoadReport con la latencia y los status por operación
+    """
+    rng = random.Random(seed)
+    selected: List[StubOperation] = [
+        op for op in spec_operations(spec)
+        if not operations or op.operation_id in operations or op.endpoint in operations
+    ]
+    if not selected:
+        raise ValueError('No hay operaciones para generar carga')
+    synthesizers = [BodySynthesizer(spec, op.endpoint, op.method, random.Random(rng.random())) for op in selected]
+    stats = [OperationStats(op.endpoint, op.method, op.operation_id) for op in selected]
+
+    pool = ConnectionPool(url, connections, timeout)
+    in_flight = asyncio.Semaphore(connections * MAX_IN_FLIGHT_PER_CONNECTION)
+
+    async def send(op: StubOperation, synthesizer: BodySynthesizer, op_stats: OperationStats, scheduled: float):
+        request = synthesizer.request(invalid_ratio)
+        headers = {'Content-Type': 'application/json'}
+        if op.api_key_header and api_key:
+            headers[op.api_key_header] = api_key
+        try:
+            status, _ = await pool.request(op.method.upper(), op.endpoint, headers, request.body.encode('utf-8'))
+        except asyncio.TimeoutError:
+            # Va antes que OSError: desde Python 3.11 TimeoutError es un OSError
+            op_stats.timeouts += 1
+            return
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            op_stats.connection_errors += 1
+            return
+        except Exception as e:
+            # Cualquier otra falla cuenta para este request y no aborta el gather
+            op_stats.errors[type(e).__name__] += 1
+            return
+        finally:
+            in_flight.release()
+        op_stats.latency_ms.add((time.perf_counter() - scheduled) * 1000)
+        op_stats.status_codes[status] += 1
+        op_stats.by_kind[(request.kind, _status_class(status))] += 1
+        success = 200 <= status < 300
+        if (request.expects_success and not success) or (not request.expects_success and not 400 <= status < 500):
+            op_stats.unexpected[(request.kind, request.field, status)] += 1
+
+    total = max(1, int(rps * duration))
+    tasks = []
+    started = time.perf_counter()
+    try:
+        for i in range(total):
+            scheduled = started + i / rps
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await in_flight.acquire()
+            k = rng.randrange(len(selected))
+            tasks.append(asyncio.create_task(send(selected[k], synthesizers[k], stats[k], scheduled)))
+        await asyncio.gather(*tasks)
+    finally:
+        await pool.close()
+    elapsed = time.perf_counter() - started
+
+    for op_stats, synthesizer in zip(stats, synthesizers):
+        op_stats.spec_issues = synthesizer.spec_issues
+    return LoadReport(url, rps, elapsed, connections, stats)
+
+
+def print_load_report(report: LoadReport):
+    """Imprime el resultado de la carga de forma legible."""
+    print(f"\n{'='*80}")
+    print("GENERADOR DE CARGA OPENAPI")
+    print(f"{'='*80}")
+    print(f"\nURL: {report.url}")
+    print(f"Requests: {report.requests} en {report.elapsed_seconds:.1f}s "
+          f"({report.achieved_rps:,.1f} req/s de {report.target_rps:,.1f} objetivo, {report.connections} conexiones)")
+
+    print(f"\n  {'Operación':<24} {'Req':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'2xx':>6} {'4xx':>6} {'5xx':>6} "
+          f"{'Err':>5}")
+    for stats in report.operations:
+        classes = Counter()
+        for status, count in stats.status_codes.items():
+            classes[_status_class(status)] += count
+        p50, p95, p99 = (stats.latency_ms.percentile(p) or 0.0 for p in (50, 95, 99))
+        print(f"  {stats.name[:24]:<24} {stats.requests:>6} {p50:>7.1f}ms {p95:>7.1f}ms {p99:>7.1f}ms "
+              f"{classes['2xx']:>6} {classes['4xx']:>6} {classes['5xx']:>6} {stats.failed:>5}")
+
+    for stats in report.operations:
+        if stats.timeouts:
+            print(f"\n⏳ {stats.name}: {stats.timeouts} requests sin respuesta dentro del timeout")
+        for name, count in stats.errors.most_common():
+            print(f"\n❌ {stats.name}: {count} requests fallaron con {name}")
+
+    if report.unexpected:
+        print("\n⚠️  Respuestas inesperadas:")
+        for stats in report.operations:
+            for (kind, name, status), count in stats.unexpected.most_common():
+                if kind == 'valid':
+                    print(f"   {stats.name}: body válido → {status} ({count})")
+                else:
+                    target = f" en {name}" if name else ''
+                    print(f"   {stats.name}: body inválido ({kind}{target}) → {status} ({count})")
+    else:
+        print("\n✅ Todas las respuestas coinciden con lo esperado (válidos 2xx, inválidos 4xx)")
+
+    for stats in report.operations:
+        for (name, kind), count in stats.spec_issues.most_common():
+            print(f"   📄 {stats.name}: el example del spec viola su propio schema en {name} ({kind})")
+    print(f"\n{'='*80}\n")
+
+
+async def _run_with_stub(spec: dict, args) -> LoadReport:
+    index = load_template_index(args.template) if args.template else None
+    server = await StubApiServer(spec, index, api_key=args.api_key, latency_ms=args.stub_latency_ms,
+                                 seed=args.seed).start(port=0)
+    try:
+        return await run_load(server.url, spec, args.rps, args.duration, args.connections, args.invalid_ratio,
+                              args.api_key, args.operation, args.seed, args.timeout)
+    finally:
+        await server.stop()
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Generador de carga a partir de la especificación OpenAPI')
+    parser.add_argument('--openapi', default='documentos_salud_connect_ia/turnos-medicos-api-openapi.yaml')
+    parser.add_argument('--url', help='URL base de la API (sin --url se usa el stub local)')
+    parser.add_argument('--template', default='documentos_salud_connect_ia/turnos-medicos-api-final.yaml',
+                        help='Template para las Lambdas del stub local ("" para responder solo desde el spec)')
+    parser.add_argument('--rps', type=float, default=DEFAULT_RPS)
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION_SECONDS, help='Segundos')
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS)
+    parser.add_argument('--invalid-ratio', type=float, default=DEFAULT_INVALID_RATIO)
+    parser.add_argument('--api-key', help='Valor del header de API key')
+    parser.add_argument('--operation', action='append', help='operationId o path a incluir (repetible)')
+    parser.add_argument('--stub-latency-ms', type=float, default=0.0)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT_SECONDS,
+                        help='Segundos para conectar y para recibir cada respuesta')
+    args = parser.parse_args()
+
+    with open(args.openapi, 'r', encoding='utf-8') as f:
+        spec = yaml.safe_load(f)
+
+    if args.url:
+        report = asyncio.run(run_load(args.url, spec, args.rps, args.duration, args.connections,
+                                      args.invalid_ratio, args.api_key, args.operation, args.seed,
+                                      args.timeout))
+    else:
+        report = asyncio.run(_run_with_stub(spec, args))
+    print_load_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,1055 @@
+"""
+Harness de ejecución local para las Lambdas Python inline del template.
+
+GetTurnosPacienteFunction y ModifyTurnoFunction (y cualquier otra función
+python3.x con código en ZipFile) se extraen del template, se cargan como
+módulos y se ejecutan con un boto3 falso cuyo recurso DynamoDB está
+respaldado por tablas en memoria. Las tablas respetan el key schema y los
+GSIs del template: validan claves, evalúan KeyCondition/Filter/Condition
+expressions, aplican UpdateExpressions, cortan las páginas en 1 MB y
+rechazan floats y palabras reservadas como lo haría boto3/DynamoDB.
+
+Con eso se pueden disparar eventos de API Gateway contra los handlers con
+alta concurrencia y medir latencia y throughput sin red ni deploy.
+"""
+
+import argparse
+import copy
+import json
+import math
+import os
+import random
+import re
+import sys
+import threading
+import time
+import types
+import uuid
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import List, Dict, Any, Optional, Callable, Tuple
+from unittest import mock
+
+from cloudwatch_analyzer import LatencyHistogram
+from dynamodb_access import (
+    DEFAULT_SEED_DATA,
+    PAGE_LIMIT_BYTES,
+    READ_UNIT_BYTES,
+    WRITE_UNIT_BYTES,
+    KeySchema,
+    TableSchema,
+    dynamodb_item_size,
+    load_seed_data,
+    parse_table_schemas,
+)
+from lambda_analyzer import analyze_python_fields
+from template_index import TemplateIndex, ApiRoute, discover_api_routes, load_template_index
+
+
+# Concurrencia y cantidad de requests por defecto de la carga
+DEFAULT_CONCURRENCY = 32
+DEFAULT_REQUESTS = 2000
+
+# Líneas que imprimen los handlers que se conservan por función
+DEFAULT_LOG_LIMIT = 10000
+
+# Subconjunto de las palabras reservadas de DynamoDB que aparecen como nombres
+# de atributo en modelos de este tipo (la lista completa tiene ~570)
+RESERVED_WORDS = frozenset({
+    'comment', 'count', 'data', 'date', 'day', 'description', 'duration', 'hour', 'key', 'level', 'location',
+    'minute', 'month', 'name', 'number', 'order', 'owner', 'range', 'size', 'source', 'state', 'status',
+    'time', 'timestamp', 'total', 'type', 'user', 'value', 'values', 'year', 'zone',
+})
+
+_KEYWORDS = {'AND', 'OR', 'NOT', 'BETWEEN', 'IN', 'SET', 'REMOVE', 'ADD', 'DELETE'}
+
+_TOKEN_RE = re.compile(
+    r'\s*(?:(?P<value>:[A-Za-z0-9_]+)|(?P<name>#?[A-Za-z_][A-Za-z0-9_]*)|(?P<number>\d+)'
+    r'|(?P<op><>|<=|>=|[=<>(),.+\-\[\]]))'
+)
+
+_MISSING = object()
+
+
+class ClientError(Exception):
+    """Equivalente local de botocore.exceptions.ClientError."""
+
+    def __init__(self, error_response: Dict[str, Any], operation_name: str):
+        self.response = error_response
+        self.operation_name = operation_name
+        error = error_response.get('Error', {})
+        super().__init__(f"An error occurred ({error.get('Code')}) when calling the {operation_name} "
+                         f"operation: {error.get('Message')}")
+
+
+def _client_error(code: str, message: str, operation: str) -> ClientError:
+    return ClientError({'Error': {'Code': code, 'Message': message}}, operation)
+
+
+def _serialize(value: Any, operation: str) -> Any:
+    """Valida un valor como lo hace el TypeSerializer de boto3 y normaliza los números a Decimal."""
+    if isinstance(value, bool) or value is None or isinstance(value, (str, bytes, Decimal)):
+        return value
+    if isinstance(value, float):
+        raise TypeError('Float types are not supported. Use Decimal types instead.')
+    if isinstance(value, int):
+        return Decimal(value)
+    if isinstance(value, dict):
+        return {str(k): _serialize(v, operation) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_serialize(v, operation) for v in value]
+    if isinstance(value, (set, frozenset)):
+        if not value:
+            raise _client_error('ValidationException', 'An string set  may not be empty', operation)
+        return {_serialize(v, operation) for v in value}
+    raise TypeError(f'Unsupported type "{type(value)}" for value "{value}"')
+
+
+def _tokenize(expression: str, operation: str) -> List[Tuple[str, str]]:
+    tokens, position = [], 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_RE.match(expression, position)
+        if not match or match.end() == position:
+            raise _client_error('ValidationException',
+                                f'Invalid expression: Syntax error; token: "{expression[position:].strip()[:10]}"',
+                                operation)
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'name' and text.upper() in _KEYWORDS:
+            kind, text = 'keyword', text.upper()
+        tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+
+class _ExpressionParser:
+    """
+    Parser recursivo de expresiones de DynamoDB.
+
+    Produce tuplas ('path', [partes]), ('value', v), ('cmp', op, a, b),
+    ('between', x, lo, hi), ('in', x, [..]), ('and'|'or', a, b), ('not', a),
+    ('func', nombre, [args]) que evalúa _evaluate.
+    """
+
+    def __init__(self, expression: str, names: Optional[Dict[str, str]], values: Optional[Dict[str, Any]],
+                 operation: str):
+        self.tokens = _tokenize(expression, operation)
+        self.position = 0
+        self.names = names or {}
+        self.values = values or {}
+        self.operation = operation
+        self.used_names = set()
+        self.used_values = set()
+
+    def error(self, message: str) -> ClientError:
+        return _client_error('ValidationException', f'Invalid expression: {message}', self.operation)
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, text: Optional[str] = None) -> Tuple[str, str]:
+        kind, value = self.peek()
+        if kind is None or (text is not None and value != text):
+            raise self.error(f'Syntax error; expected "{text}"' if text else 'Syntax error; unexpected end')
+        self.position += 1
+        return kind, value
+
+    def done(self) -> bool:
+        return self.position >= len(self.tokens)
+
+    def condition(self):
+        node = self.conjunction()
+        while self.peek() == ('keyword', 'OR'):
+            self.take()
+            node = ('or', node, self.conjunction())
+        return node
+
+    def conjunction(self):
+        node = self.negation()
+        while self.peek() == ('keyword', 'AND'):
+            self.take()
+            node = ('and', node, self.negation())
+        return node
+
+    def negation(self):
+        if self.peek() == ('keyword', 'NOT'):
+            self.take()
+            return ('not', self.negation())
+        return self.comparison()
+
+    def comparison(self):
+        if self.peek() == ('op', '('):
+            self.take()
+            node = self.condition()
+            self.take(')')
+            return node
+        kind, text = self.peek()
+        if kind == 'name' and self.peek(1) == ('op', '(') and text != 'size':
+            return self.function()
+        left = self.operand()
+        kind, text = self.peek()
+        if kind == 'op' and text in ('=', '<>', '<', '<=', '>', '>='):
+            self.take()
+            return ('cmp', text, left, self.operand())
+        if (kind, text) == ('keyword', 'BETWEEN'):
+            self.take()
+            low = self.operand()
+            self.take('AND')
+            return ('between', left, low, self.operand())
+        if (kind, text) == ('keyword', 'IN'):
+            self.take()
+            self.take('(')
+            options = [self.operand()]
+            while self.peek() == ('op', ','):
+                self.take()
+                options.append(self.operand())
+            self.take(')')
+            return ('in', left, options)
+        raise self.error(f'Syntax error; token: "{text}"')
+
+    def function(self):
+        _, name = self.take()
+        self.take('(')
+        args = [self.operand()]
+        while self.peek() == ('op', ','):
+            self.take()
+            args.append(self.operand())
+        self.take(')')
+        if name not in ('attribute_exists', 'attribute_not_exists', 'begins_with', 'contains', 'attribute_type'):
+            raise self.error(f'Invalid function name; function: {name}')
+        return ('func', name, args)
+
+    def operand(self):
+        kind, text = self.peek()
+        if kind == 'value':
+            self.take()
+            if text not in self.values:
+                raise self.error(f'An expression attribute value used in expression is not defined; '
+                                 f'attribute value: {text}')
+            self.used_values.add(text)
+            return ('value', self.values[text])
+        if kind == 'name' and text == 'size' and self.peek(1) == ('op', '('):
+            self.take()
+            self.take('(')
+            path = self.path()
+            self.take(')')
+            return ('size', path)
+        return self.path()
+
+    def path(self):
+        parts = [self.attribute()]
+        while self.peek() in (('op', '.'), ('op', '[')):
+            _, separator = self.take()
+            if separator == '.':
+                parts.append(self.attribute())
+            else:
+                _, number = self.take()
+                self.take(']')
+                parts.append(int(number))
+        return ('path', parts)
+
+    def attribute(self) -> str:
+        kind, text = self.take()
+        if kind != 'name':
+            raise self.error(f'Syntax error; token: "{text}"')
+        if text.startswith('#'):
+            if text not in self.names:
+                raise self.error(f'An expression attribute name used in the document path is not defined; '
+                                 f'attribute name: {text}')
+            self.used_names.add(text)
+            return self.names[text]
+        if text.lower() in RESERVED_WORDS:
+            raise self.error(f'Attribute name is a reserved keyword; reserved keyword: {text}')
+        return text
+
+
+def _resolve(item: Any, parts: List[Any]) -> Any:
+    for part in parts:
+        if isinstance(part, int):
+            if not isinstance(item, list) or part >= len(item):
+                return _MISSING
+            item = item[part]
+        elif isinstance(item, dict) and part in item:
+            item = item[part]
+        else:
+            return _MISSING
+    return item
+
+
+def _operand_value(node, item: Dict[str, Any]) -> Any:
+    if node[0] == 'value':
+        return node[1]
+    if node[0] == 'size':
+        value = _resolve(item, node[1][1])
+        if value is _MISSING or isinstance(value, (bool, Decimal)) or value is None:
+            return _MISSING
+        return Decimal(dynamodb_item_size(value) if isinstance(value, str) else len(value))
+    return _resolve(item, node[1])
+
+
+def _same_type(a: Any, b: Any) -> bool:
+    numeric = (int, Decimal)
+    return (isinstance(a, numeric) and isinstance(b, numeric) and not isinstance(a, bool)
+            and not isinstance(b, bool)) or type(a) is type(b)
+
+
+def _evaluate(node, item: Dict[str, Any]) -> bool:
+    kind = node[0]
+    if kind == 'and':
+        return _evaluate(node[1], item) and _evaluate(node[2], item)
+    if kind == 'or':
+        return _evaluate(node[1], item) or _evaluate(node[2], item)
+    if kind == 'not':
+        return not _evaluate(node[1], item)
+    if kind == 'func':
+        name, args = node[1], node[2]
+        value = _operand_value(args[0], item)
+        if name == 'attribute_exists':
+            return value is not _MISSING
+        if name == 'attribute_not_exists':
+            return value is _MISSING
+        operand = _operand_value(args[1], item)
+        if name == 'begins_with':
+            return isinstance(value, (str, bytes)) and _same_type(value, operand) and value.startswith(operand)
+        if name == 'contains':
+            if isinstance(value, str):
+                return isinstance(operand, str) and operand in value
+            return isinstance(value, (list, set)) and operand in value
+        return False
+    if kind == 'in':
+        value = _operand_value(node[1], item)
+        return value is not _MISSING and any(value == _operand_value(o, item) for o in node[2])
+    if kind == 'between':
+        value, low, high = (_operand_value(n, item) for n in node[1:])
+        if _MISSING in (value, low, high) or not (_same_type(value, low) and _same_type(value, high)):
+            return False
+        return low <= value <= high
+    # 'cmp'
+    op, left, right = node[1], _operand_value(node[2], item), _operand_value(node[3], item)
+    if left is _MISSING or right is _MISSING:
+        return op == '<>' and (left is _MISSING) != (right is _MISSING)
+    if op == '=':
+        return _same_type(left, right) and left == right
+    if op == '<>':
+        return not (_same_type(left, right) and left == right)
+    if not _same_type(left, right) or isinstance(left, (dict, list, set, bool)) or left is None:
+        return False
+    return {'<': left < right, '<=': left <= right, '>': left > right, '>=': left >= right}[op]
+
+
+def compile_condition(expression: str, names: Optional[Dict[str, str]] = None,
+                      values: Optional[Dict[str, Any]] = None,
+                      operation: str = 'Query') -> Tuple[Any, _ExpressionParser]:
+    """
+    Parsea una Condition/Filter/KeyConditionExpression.
+
+    Returns:
+        (árbol de la expresión, parser con los nombres y valores usados)
+    """
+    parser = _ExpressionParser(expression, names, values, operation)
+    node = parser.condition()
+    if not parser.done():
+        raise parser.error(f'Syntax error; token: "{parser.peek()[1]}"')
+    return node, parser
+
+
+def _set_path(item: Dict[str, Any], parts: List[Any], value: Any, operation: str):
+    target = item
+    for part in parts[:-1]:
+        target = target[part] if isinstance(part, int) or part in target else _MISSING
+        if target is _MISSING or not isinstance(target, (dict, list)):
+            raise _client_error('ValidationException',
+                                'The document path provided in the update expression is invalid for update',
+                                operation)
+    last = parts[-1]
+    if isinstance(last, int) and isinstance(target, list):
+        if last < len(target):
+            target[last] = value
+        else:
+            target.append(value)
+    else:
+        target[last] = value
+
+
+def _remove_path(item: Dict[str, Any], parts: List[Any]):
+    parent = _resolve(item, parts[:-1]) if len(parts) > 1 else item
+    last = parts[-1]
+    if isinstance(parent, dict):
+        parent.pop(last, None)
+    elif isinstance(parent, list) and isinstance(last, int) and last < len(parent):
+        del parent[last]
+
+
+class _UpdateParser(_ExpressionParser):
+    """Parser de UpdateExpression: SET / REMOVE / ADD / DELETE."""
+
+    def actions(self) -> List[Tuple[str, Any, Any]]:
+        actions, clause, seen = [], None, set()
+        while not self.done():
+            kind, text = self.peek()
+            if kind == 'keyword' and text in ('SET', 'REMOVE', 'ADD', 'DELETE'):
+                self.take()
+                if text in seen:
+                    raise self.error(f'The "{text}" section can only be used once in an update expression')
+                clause = text
+                seen.add(text)
+            elif clause is None:
+                raise self.error(f'Syntax error; token: "{text}"')
+            path = self.path()
+            if clause == 'SET':
+                self.take('=')
+                actions.append(('SET', path, self.set_value()))
+            elif clause == 'REMOVE':
+                actions.append(('REMOVE', path, None))
+            else:
+                actions.append((clause, path, self.operand()))
+            if self.peek() == ('op', ','):
+                self.take()
+        if not actions:
+            raise self.error('The expression can not be empty')
+        return actions
+
+    def set_value(self):
+        node = self.set_operand()
+        if self.peek() in (('op', '+'), ('op', '-')):
+            _, op = self.take()
+            node = ('arith', op, node, self.set_operand())
+        return node
+
+    def set_operand(self):
+        kind, text = self.peek()
+        if kind == 'name' and text in ('if_not_exists', 'list_append') and self.peek(1) == ('op', '('):
+            self.take()
+            self.take('(')
+            first = self.path() if text == 'if_not_exists' else self.set_operand()
+            self.take(',')
+            second = self.set_operand()
+            self.take(')')
+            return (text, first, second)
+        return self.operand()
+
+
+def _update_value(node, item: Dict[str, Any], operation: str) -> Any:
+    kind = node[0]
+    if kind == 'if_not_exists':
+        current = _resolve(item, node[1][1])
+        return _update_value(node[2], item, operation) if current is _MISSING else current
+    if kind == 'list_append':
+        first, second = _update_value(node[1], item, operation), _update_value(node[2], item, operation)
+        if not isinstance(first, list) or not isinstance(second, list):
+            raise _client_error('ValidationException', 'An operand in the update expression has an incorrect data '
+                                'type', operation)
+        return first + second
+    if kind == 'arith':
+        left, right = _update_value(node[2], item, operation), _update_value(node[3], item, operation)
+        if not isinstance(left, Decimal) or not isinstance(right, Decimal):
+            raise _client_error('ValidationException', 'An operand in the update expression has an incorrect data '
+                                'type', operation)
+        return left + right if node[1] == '+' else left - right
+    value = _operand_value(node, item)
+    if value is _MISSING:
+        raise _client_error('ValidationException', 'The provided expression refers to an attribute that does not '
+                            'exist in the item', operation)
+    return copy.deepcopy(value)
+
+
+class InMemoryDynamoTable:
+    """
+    Tabla DynamoDB en memoria con la interfaz de boto3.resource('dynamodb').Table.
+
+    Mantiene los ítems por clave primaria y un índice por partition key para
+    cada GSI. Es thread-safe: todas las operaciones toman el mismo lock, como
+    una única partición sin contención de red.
+    """
+
+    def __init__(self, schema: TableSchema):
+        self.schema = schema
+        self.name = schema.table_name or schema.logical_id
+        self.items: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        self.partitions: Dict[Optional[str], Dict[Any, Dict[Tuple[Any, ...], None]]] = {
+            index: {} for index in [None, *schema.indexes]
+        }
+        self.consumed_read_units = 0.0
+        self.consumed_write_units = 0.0
+        self.operations: Counter = Counter()
+        self._lock = threading.RLock()
+
+    @property
+    def table_name(self) -> str:
+        return self.name
+
+    def _key_of(self, item: Dict[str, Any], schema: KeySchema) -> Optional[Tuple[Any, ...]]:
+        if any(name not in item for name in schema.keys):
+            return None
+        return tuple(item[name] for name in schema.keys)
+
+    def _primary_key(self, key: Dict[str, Any], operation: str, exact: bool = True) -> Tuple[Any, ...]:
+        primary = self.schema.primary
+        if (exact and set(key) != set(primary.keys)) or any(name not in key for name in primary.keys):
+            raise _client_error('ValidationException', 'The provided key element does not match the schema',
+                                operation)
+        for name in primary.keys:
+            if not isinstance(key[name], (str, Decimal, bytes)) or key[name] in ('', b''):
+                raise _client_error('ValidationException', 'One or more parameter values are not valid. The '
+                                    f'AttributeValue for a key attribute cannot contain an empty value. Key: {name}',
+                                    operation)
+        return tuple(key[name] for name in primary.keys)
+
+    def _store(self, key: Tuple[Any, ...], item: Optional[Dict[str, Any]]):
+        old = self.items.pop(key, None)
+        for index, partitions in self.partitions.items():
+            schema = self.schema.key_schema(index)
+            if old is not None and schema.hash_key in old:
+                partitions.get(old[schema.hash_key], {}).pop(key, None)
+            if item is not None and schema.hash_key in item:
+                partitions.setdefault(item[schema.hash_key], {})[key] = None
+        if item is not None:
+            self.items[key] = item
+
+    def _check_condition(self, kwargs: Dict[str, Any], item: Optional[Dict[str, Any]], operation: str):
+        expression = kwargs.get('ConditionExpression')
+        if expression and not _evaluate(self._parse(expression, kwargs, operation), item or {}):
+            raise _client_error('ConditionalCheckFailedException', 'The conditional request failed', operation)
+
+    def _parse(self, expression: str, kwargs: Dict[str, Any], operation: str):
+        values = _serialize(kwargs.get('ExpressionAttributeValues') or {}, operation)
+        node, _ = compile_condition(expression, kwargs.get('ExpressionAttributeNames'), values, operation)
+        return node
+
+    def _write_units(self, *items: Optional[Dict[str, Any]]) -> float:
+        size = max(dynamodb_item_size(item) for item in items if item is not None)
+        return float(math.ceil(size / WRITE_UNIT_BYTES))
+
+    def _returned(self, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]], kwargs: Dict[str, Any]):
+        mode = kwargs.get('ReturnValues', 'NONE')
+        if mode in ('ALL_OLD', 'UPDATED_OLD') and old is not None:
+            return {'Attributes': copy.deepcopy(old)}
+        if mode in ('ALL_NEW', 'UPDATED_NEW') and new is not None:
+            return {'Attributes': copy.deepcopy(new)}
+        return {}
+
+    def put_item(self, Item: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        item = _serialize(Item, 'PutItem')
+        key = self._primary_key(item, 'PutItem', exact=False)
+        with self._lock:
+            old = self.items.get(key)
+            self._check_condition(kwargs, old, 'PutItem')
+            self._store(key, item)
+            self.operations['PutItem'] += 1
+            self.consumed_write_units += self._write_units(old, item)
+        return self._returned(old, None, kwargs)
+
+    def get_item(self, Key: Dict[str, Any], ConsistentRead: bool = False, **kwargs) -> Dict[str, Any]:
+        key = self._primary_key(_serialize(Key, 'GetItem'), 'GetItem')
+        with self._lock:
+            item = self.items.get(key)
+            self.operations['GetItem'] += 1
+            size = dynamodb_item_size(item) if item is not None else 0
+            self.consumed_read_units += max(1, math.ceil(size / READ_UNIT_BYTES)) * (1.0 if ConsistentRead else 0.5)
+            return {'Item': copy.deepcopy(item)} if item is not None else {}
+
+    def delete_item(self, Key: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        key = self._primary_key(_serialize(Key, 'DeleteItem'), 'DeleteItem')
+        with self._lock:
+            old = self.items.get(key)
+            self._check_condition(kwargs, old, 'DeleteItem')
+            self._store(key, None)
+            self.operations['DeleteItem'] += 1
+            self.consumed_write_units += self._write_units(old, {}) if old is not None else 1.0
+        return self._returned(old, None, kwargs)
+
+    def update_item(self, Key: Dict[str, Any], UpdateExpression: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        key_item = _serialize(Key, 'UpdateItem')
+        key = self._primary_key(key_item, 'UpdateItem')
+        values = _serialize(kwargs.get('ExpressionAttributeValues') or {}, 'UpdateItem')
+        actions = []
+        if UpdateExpression:
+            parser = _UpdateParser(UpdateExpression, kwargs.get('ExpressionAttributeNames'), values, 'UpdateItem')
+            actions = parser.actions()
+            key_paths = [path for _, path, _ in actions if path[1][0] in self.schema.primary.keys]
+            if key_paths:
+                raise _client_error('ValidationException', 'One or more parameter values were invalid: Cannot '
+                                    f'update attribute {key_paths[0][1][0]}. This attribute is part of the key',
+                                    'UpdateItem')
+        with self._lock:
+            old = self.items.get(key)
+            self._check_condition(kwargs, old, 'UpdateItem')
+            new = copy.deepcopy(old) if old is not None else dict(key_item)
+            for action, path, operand in actions:
+                parts = path[1]
+                if action == 'SET':
+                    _set_path(new, parts, _update_value(operand, new, 'UpdateItem'), 'UpdateItem')
+                elif action == 'REMOVE':
+                    _remove_path(new, parts)
+                else:
+                    current, value = _resolve(new, parts), _operand_value(operand, new)
+                    if action == 'ADD' and isinstance(value, Decimal):
+                        _set_path(new, parts, (current if current is not _MISSING else Decimal(0)) + value,
+                                  'UpdateItem')
+                    elif isinstance(value, set):
+                        current = current if isinstance(current, set) else set()
+                        _set_path(new, parts, current | value if action == 'ADD' else current - value, 'UpdateItem')
+            self._store(key, new)
+            self.operations['UpdateItem'] += 1
+            self.consumed_write_units += self._write_units(old, new)
+        return self._returned(old, new, kwargs)
+
+    def _page(self, candidates: List[Dict[str, Any]], schema: KeySchema, kwargs: Dict[str, Any],
+              operation: str) -> Dict[str, Any]:
+        start = kwargs.get('ExclusiveStartKey')
+        if start:
+            start_key = self._primary_key(_serialize(start, operation), operation, exact=False)
+            keys = [self._key_of(item, self.schema.primary) for item in candidates]
+            candidates = candidates[keys.index(start_key) + 1:] if start_key in keys else []
+        limit = kwargs.get('Limit')
+        filter_node = self._parse(kwargs['FilterExpression'], kwargs, operation) \
+            if kwargs.get('FilterExpression') else None
+
+        items, scanned, size, last = [], 0, 0, None
+        for item in candidates:
+            if (limit is not None and scanned >= limit) or size >= PAGE_LIMIT_BYTES:
+                last = candidates[scanned - 1]
+                break
+            scanned += 1
+            size += dynamodb_item_size(item)
+            if filter_node is None or _evaluate(filter_node, item):
+                items.append(copy.deepcopy(item))
+
+        factor = 1.0 if kwargs.get('ConsistentRead') else 0.5
+        self.consumed_read_units += max(1, math.ceil(size / READ_UNIT_BYTES)) * factor
+        self.operations[operation] += 1
+        response = {'Items': items, 'Count': len(items), 'ScannedCount': scanned}
+        if last is not None:
+            key_names = dict.fromkeys(self.schema.primary.keys + schema.keys)
+            response['LastEvaluatedKey'] = {name: last[name] for name in key_names if name in last}
+        return response
+
+    def query(self, KeyConditionExpression: str, IndexName: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        schema = self.schema.key_schema(IndexName)
+        if schema is None:
+            raise _client_error('ValidationException', 'The table does not have the specified index: '
+                                f'{IndexName}', 'Query')
+        if IndexName and kwargs.get('ConsistentRead'):
+            raise _client_error('ValidationException', 'Consistent reads are not supported on global secondary '
+                                'indexes', 'Query')
+        node = self._parse(KeyConditionExpression, kwargs, 'Query')
+        hash_value = self._hash_value(node, schema)
+        if hash_value is _MISSING:
+            raise _client_error('ValidationException', 'Query condition missed key schema element: '
+                                f'{schema.hash_key}', 'Query')
+        with self._lock:
+            keys = list(self.partitions[IndexName].get(hash_value, {}))
+            candidates = [item for item in (self.items[k] for k in keys) if _evaluate(node, item)]
+            if schema.range_key:
+                candidates.sort(key=lambda item: item.get(schema.range_key),
+                                reverse=kwargs.get('ScanIndexForward', True) is False)
+            return self._page(candidates, schema, kwargs, 'Query')
+
+    def scan(self, IndexName: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        schema = self.schema.key_schema(IndexName)
+        if schema is None:
+            raise _client_error('ValidationException', 'The table does not have the specified index: '
+                                f'{IndexName}', 'Scan')
+        with self._lock:
+            candidates = list(self.items.values())
+            if IndexName:
+                candidates = [item for item in candidates if schema.hash_key in item]
+            return self._page(candidates, schema, kwargs, 'Scan')
+
+    def _hash_value(self, node, schema: KeySchema) -> Any:
+        """Valor de la igualdad sobre la partition key en una KeyConditionExpression."""
+        if node[0] == 'and':
+            left = self._hash_value(node[1], schema)
+            return left if left is not _MISSING else self._hash_value(node[2], schema)
+        if node[0] == 'cmp' and node[1] == '=':
+            for path, value in ((node[2], node[3]), (node[3], node[2])):
+                if path[0] == 'path' and path[1] == [schema.hash_key] and value[0] == 'value':
+                    return value[1]
+        return _MISSING
+
+    def load_items(self, items: List[Dict[str, Any]]) -> int:
+        """
+        Carga ítems directamente (sin contar capacidad).
+
+        Returns:
+            Cantidad de ítems rechazados por no tener la clave primaria
+        """
+        rejected = 0
+        for item in items:
+            try:
+                self.put_item(Item=item)
+            except (ClientError, TypeError):
+                rejected += 1
+        self.consumed_write_units = 0.0
+        self.operations.clear()
+        return rejected
+
+
+class FakeDynamoResource:
+    """Equivalente de boto3.resource('dynamodb') sobre tablas en memoria."""
+
+    def __init__(self, tables: Dict[str, InMemoryDynamoTable]):
+        self._tables = {table.name: table for table in tables.values()}
+
+    def Table(self, name: str) -> InMemoryDynamoTable:
+        if name not in self._tables:
+            raise _client_error('ResourceNotFoundException', f'Requested resource not found: Table: {name} not '
+                                'found', 'DescribeTable')
+        return self._tables[name]
+
+
+def fake_boto3_modules(resource: FakeDynamoResource) -> Dict[str, types.ModuleType]:
+    """
+    Módulos boto3/botocore falsos para inyectar en sys.modules.
+
+    Solo boto3.resource('dynamodb') está implementado; cualquier otro servicio
+    o boto3.client falla con NotImplementedError para que no se use la red.
+    """
+    def _resource(service_name, *args, **kwargs):
+        if service_name != 'dynamodb':
+            raise NotImplementedError(f'El harness local no implementa boto3.resource({service_name!r})')
+        return resource
+
+    def _client(service_name, *args, **kwargs):
+        raise NotImplementedError(f'El harness local no implementa boto3.client({service_name!r})')
+
+    boto3 = types.ModuleType('boto3')
+    boto3.resource = _resource
+    boto3.client = _client
+    botocore = types.ModuleType('botocore')
+    exceptions = types.ModuleType('botocore.exceptions')
+    exceptions.ClientError = ClientError
+    botocore.exceptions = exceptions
+    return {'boto3': boto3, 'botocore': botocore, 'botocore.exceptions': exceptions}
+
+
+class _FunctionOs(types.ModuleType):
+    """
+    Módulo os que ve cada función: delega todo en os salvo environ y getenv,
+    que leen el entorno propio de la función. Así un handler que lee
+    os.environ al invocarse ve las variables del template sin tocar el
+    os.environ del proceso, que comparten los threads de la carga.
+    """
+
+    def __init__(self, environ: Dict[str, str]):
+        super().__init__('os')
+        self.environ = environ
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(os, name)
+
+    def getenv(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        return self.environ.get(key, default)
+
+
+@dataclass
+class LambdaContext:
+    """Contexto de invocación mínimo que reciben los handlers"""
+    function_name: str
+    memory_limit_in_mb: int
+    timeout_seconds: int
+    aws_request_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    started: float = field(default_factory=time.monotonic)
+
+    def get_remaining_time_in_millis(self) -> int:
+        return max(0, int((self.timeout_seconds - (time.monotonic() - self.started)) * 1000))
+
+
+@dataclass
+class LocalFunction:
+    """Función cargada en el harness"""
+    name: str
+    handler: Callable[[Dict[str, Any], Any], Any]
+    memory_size_mb: int
+    timeout_seconds: int
+    route: Optional[ApiRoute]
+    fields: List[str]
+    logs: deque
+    environment: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class LoadResult:
+    """Resultado de una corrida de carga contra una función"""
+    function_name: str
+    requests: int
+    concurrency: int
+    elapsed_seconds: float
+    latency_ms: LatencyHistogram
+    status_codes: Counter
+    exceptions: int = 0
+    timeouts: int = 0
+    sample_errors: List[str] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        errors = self.exceptions + sum(n for code, n in self.status_codes.items() if code >= 500)
+        return errors / self.requests if self.requests else 0.0
+
+
+def api_gateway_event(body: Any, route: Optional[ApiRoute] = None, request_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Evento de proxy de API Gateway (REST) para un body.
+
+    Args:
+        body: Body del request (se serializa a JSON si no es str)
+        route: Ruta de la función (path y método)
+        request_id: requestId del requestContext
+    """
+    path = route.path if route else '/'
+    method = (route.method if route else 'post').upper()
+    return {
+        'resource': path,
+        'path': path,
+        'httpMethod': method,
+        'headers': {'Content-Type': 'application/json'},
+        'queryStringParameters': None,
+        'pathParameters': None,
+        'requestContext': {'requestId': request_id or str(uuid.uuid4()), 'httpMethod': method,
+                           'resourcePath': path, 'stage': 'local'},
+        'body': body if isinstance(body, str) or body is None else json.dumps(body),
+        'isBase64Encoded': False,
+    }
+
+
+class LocalLambdaHarness:
+    """
+    Ejecuta las Lambdas Python inline del template contra tablas en memoria.
+
+    Las tablas se crean desde el key schema del template y se comparten entre
+    todas las funciones cargadas, así que una escritura de una función la ve
+    la siguiente.
+    """
+
+    def __init__(self, index: TemplateIndex, seed_data: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 log_limit: int = DEFAULT_LOG_LIMIT):
+        self.index = index
+        self.tables = {logical_id: InMemoryDynamoTable(schema)
+                       for logical_id, schema in parse_table_schemas(index).items()}
+        self.resource = FakeDynamoResource(self.tables)
+        self.routes = {route.lambda_name: route for route in discover_api_routes(index) if route.lambda_name}
+        self.log_limit = log_limit
+        self.rejected_seed_items: Dict[str, int] = {}
+        self._functions: Dict[str, LocalFunction] = {}
+        self._load_lock = threading.Lock()
+        for table_id, items in (seed_data or {}).items():
+            if table_id in self.tables:
+                self.rejected_seed_items[table_id] = self.tables[table_id].load_items(items)
+
+    def python_functions(self) -> List[str]:
+        """Funciones con runtime Python y código inline."""
+        return [name for name, info in self.index.lambdas.items()
+                if info.language == 'python' and info.inline_code]
+
+    def _environment(self, environment: Dict[str, Any]) -> Dict[str, str]:
+        resolved = {}
+        for name, value in environment.items():
+            if isinstance(value, dict) and 'Ref' in value:
+                table = self.tables.get(value['Ref'])
+                value = table.name if table is not None else value['Ref']
+            elif isinstance(value, dict) and isinstance(value.get('Fn::GetAtt'), list):
+                value = '.'.join(str(part) for part in value['Fn::GetAtt'])
+            resolved[name] = value if isinstance(value, str) else json.dumps(value)
+        return resolved
+
+    def load(self, name: str) -> LocalFunction:
+        """
+        Carga una función como módulo con boto3 reemplazado por el fake.
+
+        Las variables de entorno se resuelven contra las tablas en memoria y
+        el módulo importa un os propio (_FunctionOs) cuyo environ las
+        contiene, tanto en la inicialización como en cada invocación.
+        """
+        with self._load_lock:
+            if name in self._functions:
+                return self._functions[name]
+            info = self.index.get_lambda(name)
+            if info.language != 'python' or not info.inline_code:
+                raise ValueError(f"{name} no es una función Python con código inline")
+
+            logs: deque = deque(maxlen=self.log_limit)
+            module = types.ModuleType(f'local_lambda_{name}')
+            module.__dict__['print'] = lambda *args, **kwargs: logs.append(' '.join(str(a) for a in args))
+            environment = dict(os.environ, **self._environment(info.environment))
+            modules = dict(fake_boto3_modules(self.resource), os=_FunctionOs(environment))
+            with mock.patch.dict(sys.modules, modules):
+                exec(compile(info.inline_code, f'<{name}>', 'exec'), module.__dict__)
+
+            handler_name = (info.handler or 'index.handler').rsplit('.', 1)[-1]
+            function = LocalFunction(
+                name=name,
+                handler=getattr(module, handler_name),
+                memory_size_mb=info.memory_size_mb,
+                timeout_seconds=info.timeout_seconds,
+                route=self.routes.get(name),
+                fields=analyze_python_fields(info.inline_code).processed_fields,
+                logs=logs,
+                environment=environment,
+            )
+            self._functions[name] = function
+            return function
+
+    def invoke(self, name: str, event: Dict[str, Any]) -> Tuple[Any, float]:
+        """
+        Invoca el handler con un evento.
+
+        Returns:
+            (respuesta del handler, latencia en ms)
+        """
+        function = self.load(name)
+        context = LambdaContext(name, function.memory_size_mb, function.timeout_seconds)
+        started = time.perf_counter()
+        response = function.handler(event, context)
+        return response, (time.perf_counter() - started) * 1000
+
+    def bodies_from_table(self, name: str, table_id: str, count: int, seed: int = 42) -> List[Dict[str, Any]]:
+        """
+        Bodies para una función a partir de ítems de una tabla, proyectados a
+        los campos que el handler lee del body.
+        """
+        function = self.load(name)
+        items = list(self.tables[table_id].items.values())
+        if not items:
+            return []
+        rng = random.Random(seed)
+        bodies = []
+        for _ in range(count):
+            item = rng.choice(items)
+            body = {f: item[f] for f in function.fields if f in item}
+            bodies.append(json.loads(json.dumps(body, default=str)))
+        return bodies
+
+    def run_load(self, name: str, bodies: List[Any], requests: int = DEFAULT_REQUESTS,
+                 concurrency: int = DEFAULT_CONCURRENCY) -> LoadResult:
+        """
+        Dispara requests eventos de API Gateway contra una función desde
+        concurrency threads, ciclando sobre bodies.
+
+        Los threads comparten el módulo y las tablas, como instancias calientes
+        de la misma función; con el GIL el throughput medido es el de un solo
+        proceso.
+        """
+        function = self.load(name)
+        if not bodies:
+            raise ValueError(f"No hay bodies para {name}")
+        latency = LatencyHistogram()
+        status_codes: Counter = Counter()
+        result = LoadResult(name, requests, concurrency, 0.0, latency, status_codes)
+        lock = threading.Lock()
+
+        def worker(i: int):
+            event = api_gateway_event(bodies[i % len(bodies)], function.route, request_id=f'local-{i}')
+            error = None
+            try:
+                response, elapsed = self.invoke(name, event)
+                status = response.get('statusCode', 200) if isinstance(response, dict) else 200
+                if status >= 500:
+                    error = str(response.get('body'))[:200]
+            except Exception as e:
+                elapsed, status, error = None, None, f'{type(e).__name__}: {e}'
+            with lock:
+                if elapsed is not None:
+                    latency.add(elapsed)
+                    if elapsed > function.timeout_seconds * 1000:
+                        result.timeouts += 1
+                if status is None:
+                    result.exceptions += 1
+                else:
+                    status_codes[status] += 1
+                if error and len(result.sample_errors) < 5:
+                    result.sample_errors.append(error)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(worker, range(requests)))
+        result.elapsed_seconds = time.perf_counter() - started
+        return result
+
+
+def print_load_results(results: List[LoadResult], harness: Optional[LocalLambdaHarness] = None):
+    """Imprime los resultados de carga de forma legible."""
+    print(f"\n{'='*80}")
+    print("EJECUCIÓN LOCAL DE LAMBDAS")
+    print(f"{'='*80}")
+    print(f"\n  {'Función':<28} {'Req':>7} {'Conc':>5} {'req/s':>9} {'p50':>8} {'p90':>8} {'p99':>8} {'Errores':>8}")
+    for result in results:
+        p50, p90, p99 = (result.latency_ms.percentile(p) or 0.0 for p in (50, 90, 99))
+        print(f"  {result.function_name[:28]:<28} {result.requests:>7} {result.concurrency:>5} "
+              f"{result.throughput:>9,.0f} {p50:>6.2f}ms {p90:>6.2f}ms {p99:>6.2f}ms {result.error_rate:>7.1%}")
+
+    for result in results:
+        codes = ', '.join(f'{code}: {n}' for code, n in sorted(result.status_codes.items()))
+        print(f"\n📊 {result.function_name}: {codes or 'sin respuestas'}")
+        if result.timeouts:
+            print(f"   ⏱️  {result.timeouts} invocaciones superaron el Timeout")
+        for error in result.sample_errors:
+            print(f"   ❌ {error}")
+
+    if harness is not None:
+        print("\n🗄️  Tablas en memoria:")
+        for table in harness.tables.values():
+            operations = ', '.join(f'{op}: {n}' for op, n in sorted(table.operations.items()))
+            print(f"   {table.name}: {len(table.items)} ítems, {table.consumed_read_units:,.1f} RCU, "
+                  f"{table.consumed_write_units:,.1f} WCU ({operations or 'sin operaciones'})")
+        for table_id, rejected in harness.rejected_seed_items.items():
+            if rejected:
+                print(f"   ⚠️  {rejected} ítems de seed de {table_id} rechazados (sin clave primaria)")
+    print(f"\n{'='*80}\n")
+
+
+def synthetic_turnos(pacientes: int, per_paciente: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Turnos sintéticos para poblar TurnosTable."""
+    rng = random.Random(seed)
+    turnos = []
+    for p in range(pacientes):
+        for t in range(per_paciente):
+            turnos.append({
+                'turnoId': f'turno-{p}-{t}',
+                'pacienteId': f'paciente-{p}',
+                'medicoId': f'medico-{rng.randint(1, 8)}',
+                'fechaTurno': f'2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+                'horaTurno': f'{rng.randint(8, 19):02d}:00',
+                'motivoConsulta': 'Control',
+                'estado': 'confirmado',
+            })
+    return turnos
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Ejecución local de las Lambdas Python del template')
+    parser.add_argument('--template', default='documentos_salud_connect_ia/turnos-medicos-api-final.yaml')
+    parser.add_argument('--function', action='append', help='Función a ejecutar (default: las Python con ruta de API)')
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--table', default='TurnosTable', help='Tabla de la que se arman los bodies')
+    parser.add_argument('--pacientes', type=int, default=200)
+    parser.add_argument('--turnos-por-paciente', type=int, default=5)
+    args = parser.parse_args()
+
+    index = load_template_index(args.template)
+    seed_data = load_seed_data(DEFAULT_SEED_DATA)
+    seed_data.setdefault('TurnosTable', synthetic_turnos(args.pacientes, args.turnos_por_paciente))
+    harness = LocalLambdaHarness(index, seed_data)
+
+    names = args.function or [name for name in harness.python_functions() if name in harness.routes]
+    results = []
+    for name in names:
+        bodies = harness.bodies_from_table(name, args.table, min(args.requests, 1000))
+        if not bodies:
+            print(f"⚠️  {args.table} está vacía: no hay bodies para {name}")
+            continue
+        results.append(harness.run_load(name, bodies, args.requests, args.concurrency))
+    print_load_results(results, harness)
+
+
+if __name__ == '__main__':
+    main()
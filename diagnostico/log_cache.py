@@ -0,0 +1,657 @@
+"""
+Cache local columnar de eventos de CloudWatch para re-analizar sin descargar.
+
+Mientras se itera sobre un diagnóstico se analiza muchas veces la misma
+ventana de logs. Este módulo guarda los eventos descargados en un archivo
+columnar comprimido y deja ya extraído todo lo que necesita el analizador:
+
+- timestamp (int64), nivel y requestId (codificados con diccionario)
+- mensaje (zlib, con offsets para reconstruir cada línea)
+- máscara de bits con los patrones de cloudwatch_analyzer por línea
+- request bodies ya parseados y métricas de las líneas REPORT
+
+El análisis hace un memory-map del archivo, busca el rango de tiempo con
+bisect sobre la columna de timestamps y agrega contadores y bodies sin volver
+a parsear JSON. La escritura es en streaming: los mensajes se vuelcan a un
+archivo temporal y las columnas comprimidas se escriben a medida que se
+recorren los eventos ordenados. Si una ventana cacheada cubre solo el
+principio de la pedida se descarga únicamente lo que falta desde su fin. El
+directorio del cache se limpia por antigüedad y tamaño.
+"""
+
+import hashlib
+import itertools
+import json
+import math
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple, Union
+
+from cloudwatch_analyzer import (
+    LogAnalysis,
+    LogAnalysisAccumulator,
+    ReportMetrics,
+    PATTERN_NAMES,
+    DEFAULT_MAX_SAMPLE_BODIES,
+    line_pattern_flags,
+    parse_log_entry,
+    parse_report_line,
+    request_bodies_from_entry
+)
+from cloudwatch_fetcher import iter_log_events, format_event, time_window, FetchStats
+from request_correlation import extract_request_context
+
+
+# Identificación y versión del formato de archivo
+CACHE_MAGIC = b'DXLCACHE'
+CACHE_VERSION = 1
+CACHE_SUFFIX = '.dxlc'
+
+# Límites por defecto del directorio de cache
+DEFAULT_MAX_AGE_SECONDS = 3600
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Antigüedad máxima del final de una ventana cacheada para usarla tal cual
+# (0: si no llega al final pedido se descarga lo que falta)
+DEFAULT_MAX_STALENESS_MS = 0
+
+# Alineación de las columnas dentro del archivo
+_ALIGNMENT = 8
+
+# magic, versión, largo del header
+_PREAMBLE = struct.Struct('<8sII')
+
+# Campos de ReportMetrics guardados en la columna report_values
+_REPORT_FIELDS = ('duration_ms', 'billed_duration_ms', 'memory_size_mb', 'max_memory_used_mb', 'init_duration_ms')
+
+
+@dataclass
+class CacheEntry:
+    """Metadatos de un archivo del cache"""
+    path: str
+    log_group: str
+    start_ms: int
+    end_ms: int
+    rows: int
+    size_bytes: int
+    created_at: float
+
+
+def _dictionary_index(dictionary: Dict[str, int], values: List[str], value: Optional[str]) -> int:
+    if value is None:
+        return -1
+    index = dictionary.get(value)
+    if index is None:
+        index = dictionary[value] = len(values)
+        values.append(value)
+    return index
+
+
+class _CompressedColumn:
+    """Columna comprimida con zlib que se escribe en streaming a un archivo temporal."""
+
+    def __init__(self, directory: str):
+        self.file = tempfile.TemporaryFile(dir=directory)
+        self.length = 0
+        self._compressor = zlib.compressobj()
+
+    def write(self, data: bytes):
+        chunk = self._compressor.compress(data)
+        self.file.write(chunk)
+        self.length += len(chunk)
+
+    def finish(self) -> '_CompressedColumn':
+        chunk = self._compressor.flush()
+        self.file.write(chunk)
+        self.length += len(chunk)
+        self.file.seek(0)
+        return self
+
+    def close(self):
+        self.file.close()
+
+
+def _ordered_events(events: Iterable[Dict[str, Any]], spill) -> Iterator[Dict[str, Any]]:
+    """
+    Recorre los eventos ordenados por (timestamp, eventId) sin tenerlos en memoria.
+
+    Los mensajes se vuelcan a spill; en memoria quedan solo timestamps y offsets.
+    """
+    timestamps = array('q')
+    offsets = array('Q', [0])
+    id_lengths = array('I')
+    for event in events:
+        event_id = event.get('eventId', '').encode('utf-8')
+        record = event_id + event['message'].encode('utf-8')
+        spill.write(record)
+        timestamps.append(event['timestamp'])
+        id_lengths.append(len(event_id))
+        offsets.append(offsets[-1] + len(record))
+    spill.flush()
+    if not timestamps or offsets[-1] == 0:
+        for row in sorted(range(len(timestamps)), key=timestamps.__getitem__):
+            yield {'timestamp': timestamps[row], 'message': ''}
+        return
+
+    order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+    with mmap.mmap(spill.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        def event_id(row: int) -> bytes:
+            return data[offsets[row]:offsets[row] + id_lengths[row]]
+
+        position = 0
+        while position < len(order):
+            # Los empates de timestamp (pocos) se desempatan por eventId como antes
+            end = position + 1
+            while end < len(order) and timestamps[order[end]] == timestamps[order[position]]:
+                end += 1
+            run = order[position:end]
+            for row in (sorted(run, key=event_id) if len(run) > 1 else run):
+                yield {'timestamp': timestamps[row],
+                       'message': data[offsets[row] + id_lengths[row]:offsets[row + 1]].decode('utf-8')}
+            position = end
+
+
+def _build_columns(events: Iterable[Dict[str, Any]],
+                   directory: str) -> Tuple[Dict[str, Union[bytes, _CompressedColumn]], Dict[str, Any]]:
+    """Extrae las columnas de una secuencia de eventos ordenada por timestamp."""
+    timestamps = array('q')
+    levels = array('h')
+    request_ids = array('i')
+    flags = array('B')
+    message_offsets = array('Q', [0])
+    messages = _CompressedColumn(directory)
+    body_rows = array('I')
+    bodies = _CompressedColumn(directory)
+    bodies.write(b'[')
+    report_rows = array('I')
+    report_values = array('d')
+    report_ids = []
+    level_index, level_values = {}, []
+    request_index, request_values = {}, []
+    offset = 0
+
+    for row, event in enumerate(events):
+        line = format_event(event)
+        message = event['message'].encode('utf-8')
+        timestamps.append(event['timestamp'])
+        offset += len(message)
+        message_offsets.append(offset)
+        messages.write(message)
+        flags.append(line_pattern_flags(line.lower()))
+
+        # Misma secuencia de decisiones que LogAnalysisAccumulator.add_lines
+        parsed = None
+        report = parse_report_line(line) if 'report' in line.lower() else None
+        if report is not None:
+            report_rows.append(row)
+            report_ids.append(report.request_id)
+            report_values.extend(
+                math.nan if getattr(report, name) is None else getattr(report, name)
+                for name in _REPORT_FIELDS
+            )
+        if '{' in line:
+            parsed = parse_log_entry(line)
+        if report is None and 'body' in line and isinstance(parsed, dict) and ('body' in parsed or 'event' in parsed):
+            for body in request_bodies_from_entry(parsed):
+                bodies.write((b', ' if body_rows else b'') + json.dumps(body, ensure_ascii=False).encode('utf-8'))
+                body_rows.append(row)
+
+        context = extract_request_context(line, parsed)
+        levels.append(_dictionary_index(level_index, level_values, context['level']))
+        request_ids.append(_dictionary_index(request_index, request_values, context['request_id']))
+
+    bodies.write(b']')
+    columns = {
+        'timestamp': timestamps.tobytes(),
+        'level': levels.tobytes(),
+        'request_id': request_ids.tobytes(),
+        'flags': flags.tobytes(),
+        'message_offsets': message_offsets.tobytes(),
+        'messages': messages.finish(),
+        'body_rows': body_rows.tobytes(),
+        'bodies': bodies.finish(),
+        'report_rows': report_rows.tobytes(),
+        'report_values': report_values.tobytes(),
+        'report_ids': zlib.compress(json.dumps(report_ids).encode('utf-8')),
+        'request_id_values': zlib.compress(json.dumps(request_values).encode('utf-8')),
+    }
+    header = {
+        'rows': len(timestamps),
+        'levels': level_values,
+        'typecodes': {
+            'timestamp': 'q', 'level': 'h', 'request_id': 'i', 'flags': 'B',
+            'message_offsets': 'Q', 'body_rows': 'I', 'report_rows': 'I', 'report_values': 'd'
+        }
+    }
+    return columns, header
+
+
+def write_log_cache(path: str, events: Iterable[Dict[str, Any]], log_group: str,
+                    start_ms: int, end_ms: int) -> CacheEntry:
+    """
+    Escribe un archivo de cache columnar con los eventos de una ventana.
+
+    Los eventos se consumen en streaming: en memoria quedan las columnas
+    numéricas, no los mensajes.
+
+    Args:
+        path: Archivo de destino (se reemplaza en forma atómica)
+        events: Eventos de FilterLogEvents ('timestamp', 'message', 'eventId')
+        log_group: Log group de origen
+        start_ms: Inicio de la ventana en ms epoch
+        end_ms: Fin de la ventana en ms epoch
+
+    Returns:
+        CacheEntry del archivo escrito
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryFile(dir=directory) as spill:
+        columns, header = _build_columns(_ordered_events(events, spill), directory)
+    created_at = time.time()
+    header.update({
+        'log_group': log_group,
+        'start_ms': start_ms,
+        'end_ms': end_ms,
+        'created_at': created_at,
+        'columns': {}
+    })
+
+    position = 0
+    for name, data in columns.items():
+        length = data.length if isinstance(data, _CompressedColumn) else len(data)
+        header['columns'][name] = [position, length]
+        position += length + (-length % _ALIGNMENT)
+    header_bytes = json.dumps(header).encode('utf-8')
+
+    fd, tmp_path = tempfile.mkstemp(prefix='.cache-', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            preamble = _PREAMBLE.pack(CACHE_MAGIC, CACHE_VERSION, len(header_bytes)) + header_bytes
+            f.write(preamble + b'\0' * (-len(preamble) % _ALIGNMENT))
+            for name, data in columns.items():
+                if isinstance(data, _CompressedColumn):
+                    shutil.copyfileobj(data.file, f)
+                else:
+                    f.write(data)
+                f.write(b'\0' * (-header['columns'][name][1] % _ALIGNMENT))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    finally:
+        for data in columns.values():
+            if isinstance(data, _CompressedColumn):
+                data.close()
+
+    return CacheEntry(path, log_group, start_ms, end_ms, header['rows'], os.path.getsize(path), created_at)
+
+
+def read_cache_entry(path: str) -> CacheEntry:
+    """
+    Lee los metadatos de un archivo de cache desde su header, sin mapear las columnas.
+
+    Raises:
+        ValueError: Si el archivo no es un cache compatible
+    """
+    with open(path, 'rb') as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise ValueError(f"{path} no es un cache de logs compatible")
+        magic, version, header_len = _PREAMBLE.unpack(preamble)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            raise ValueError(f"{path} no es un cache de logs compatible")
+        header = json.loads(f.read(header_len))
+        size = os.fstat(f.fileno()).st_size
+    return CacheEntry(path, header['log_group'], header['start_ms'], header['end_ms'], header['rows'], size,
+                      header['created_at'])
+
+
+class CachedLogs:
+    """
+    Vista de solo lectura sobre un archivo de cache, mapeado en memoria.
+
+    Las columnas numéricas se leen directamente del mmap; las comprimidas se
+    descomprimen recién cuando se necesitan.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: Dict[str, memoryview] = {}
+        self._decoded: Dict[str, Any] = {}
+
+        magic, version, header_len = _PREAMBLE.unpack_from(self._mmap, 0)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            self.close()
+            raise ValueError(f"{path} no es un cache de logs compatible")
+        self.header = json.loads(self._mmap[_PREAMBLE.size:_PREAMBLE.size + header_len])
+        preamble_len = _PREAMBLE.size + header_len
+        self._data_start = preamble_len + (-preamble_len % _ALIGNMENT)
+
+    def __enter__(self) -> 'CachedLogs':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.header['rows']
+
+    def close(self):
+        """Libera las vistas y cierra el mmap."""
+        for view in self._views.values():
+            view.release()
+        self._views.clear()
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    @property
+    def entry(self) -> CacheEntry:
+        return CacheEntry(self.path, self.header['log_group'], self.header['start_ms'], self.header['end_ms'],
+                          len(self), os.path.getsize(self.path), self.header['created_at'])
+
+    def _raw(self, name: str) -> bytes:
+        offset, length = self.header['columns'][name]
+        start = self._data_start + offset
+        return self._mmap[start:start + length]
+
+    def column(self, name: str) -> memoryview:
+        """Devuelve una columna numérica como memoryview tipado sobre el mmap."""
+        view = self._views.get(name)
+        if view is None:
+            offset, length = self.header['columns'][name]
+            start = self._data_start + offset
+            view = memoryview(self._mmap)[start:start + length].cast(self.header['typecodes'][name])
+            self._views[name] = view
+        return view
+
+    def _decoded_column(self, name: str) -> Any:
+        if name not in self._decoded:
+            data = zlib.decompress(self._raw(name))
+            self._decoded[name] = data if name == 'messages' else json.loads(data)
+        return self._decoded[name]
+
+    def row_range(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Tuple[int, int]:
+        """Filas [inicio, fin) con timestamp dentro de [start_ms, end_ms]."""
+        timestamps = self.column('timestamp')
+        lo = 0 if start_ms is None else bisect_left(timestamps, start_ms)
+        hi = len(self) if end_ms is None else bisect_right(timestamps, end_ms)
+        return lo, max(lo, hi)
+
+    def message(self, row: int) -> str:
+        """Mensaje original de una fila."""
+        offsets = self.column('message_offsets')
+        return self._decoded_column('messages')[offsets[row]:offsets[row + 1]].decode('utf-8')
+
+    def row(self, row: int) -> Dict[str, Any]:
+        """Reconstruye una fila con timestamp, requestId, nivel y mensaje."""
+        level = self.column('level')[row]
+        request_id = self.column('request_id')[row]
+        return {
+            'timestamp': self.column('timestamp')[row],
+            'level': self.header['levels'][level] if level >= 0 else None,
+            'request_id': self._decoded_column('request_id_values')[request_id] if request_id >= 0 else None,
+            'message': self.message(row)
+        }
+
+    def iter_lines(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Iterator[str]:
+        """Itera las líneas en el formato de `aws logs tail --format short`."""
+        timestamps = self.column('timestamp')
+        lo, hi = self.row_range(start_ms, end_ms)
+        for row in range(lo, hi):
+            yield format_event({'timestamp': timestamps[row], 'message': self.message(row)})
+
+    def pattern_counts(self, lo: int, hi: int) -> Dict[str, int]:
+        """Cuenta los patrones de las filas [lo, hi) a partir de la columna de flags."""
+        counts = dict.fromkeys(PATTERN_NAMES, 0)
+        # Counter sobre bytes cuenta en C; solo hay 256 máscaras distintas
+        for mask, occurrences in Counter(self._raw_slice('flags', lo, hi)).items():
+            for bit, name in enumerate(PATTERN_NAMES):
+                if mask & (1 << bit):
+                    counts[name] += occurrences
+        return counts
+
+    def _raw_slice(self, name: str, lo: int, hi: int) -> bytes:
+        offset, _ = self.header['columns'][name]
+        start = self._data_start + offset
+        return self._mmap[start + lo:start + hi]
+
+    def bodies(self, lo: int, hi: int) -> List[Any]:
+        """Request bodies ya extraídos de las filas [lo, hi)."""
+        rows = self.column('body_rows')
+        first, last = bisect_left(rows, lo), bisect_left(rows, hi)
+        return self._decoded_column('bodies')[first:last]
+
+    def reports(self, lo: int, hi: int) -> List[ReportMetrics]:
+        """Métricas REPORT de las filas [lo, hi)."""
+        rows = self.column('report_rows')
+        first, last = bisect_left(rows, lo), bisect_left(rows, hi)
+        width = len(_REPORT_FIELDS)
+        values = self.column('report_values')[first * width:last * width].tolist()
+        request_ids = self._decoded_column('report_ids')[first:last]
+        return [
+            ReportMetrics(request_id, duration, billed, int(memory_size), int(max_memory),
+                          None if math.isnan(init) else init)
+            for request_id, duration, billed, memory_size, max_memory, init in zip(
+                request_ids, values[0::width], values[1::width], values[2::width],
+                values[3::width], values[4::width]
+            )
+        ]
+
+    def analyze(self, analysis_name: Optional[str] = None, start_ms: Optional[int] = None,
+                end_ms: Optional[int] = None, max_sample_bodies: Optional[int] = DEFAULT_MAX_SAMPLE_BODIES,
+                seed: Optional[int] = None) -> LogAnalysis:
+        """
+        Analiza las filas de un rango de tiempo sin re-parsear el texto.
+
+        Args:
+            analysis_name: Nombre para el LogAnalysis (default: log group del cache)
+            start_ms: Inicio del rango en ms epoch (default: todo el cache)
+            end_ms: Fin del rango en ms epoch (default: todo el cache)
+            max_sample_bodies: Tamaño del reservoir de request bodies
+            seed: Semilla del muestreo
+
+        Returns:
+            LogAnalysis equivalente a analizar las líneas del rango
+        """
+        lo, hi = self.row_range(start_ms, end_ms)
+        accumulator = LogAnalysisAccumulator(max_sample_bodies=max_sample_bodies, seed=seed)
+        accumulator.add_extracted(hi - lo, self.pattern_counts(lo, hi), self.bodies(lo, hi), self.reports(lo, hi))
+        return accumulator.to_analysis(analysis_name or self.header['log_group'], time_range='cache local')
+
+
+class LogCache:
+    """
+    Directorio de archivos de cache, uno por log group y ventana descargada.
+
+    Los archivos más viejos que max_age_seconds se eliminan, y si el
+    directorio supera max_bytes se eliminan los menos usados recientemente.
+    Los metadatos de cada archivo se leen una sola vez de su header.
+    """
+
+    def __init__(self, directory: str, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        # Reentrante: evict() lista las entradas con el lock tomado
+        self._lock = threading.RLock()
+        # nombre de archivo -> (inode, CacheEntry); os.replace cambia el inode al reescribir
+        self._index: Dict[str, Tuple[int, CacheEntry]] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def _digest(log_group: str) -> str:
+        return hashlib.sha1(log_group.encode('utf-8')).hexdigest()[:16]
+
+    def _path(self, log_group: str, start_ms: int, end_ms: int) -> str:
+        return os.path.join(self.directory, f'{self._digest(log_group)}-{start_ms}-{end_ms}{CACHE_SUFFIX}')
+
+    def entries(self, log_group: Optional[str] = None) -> List[CacheEntry]:
+        """
+        Lista los archivos del cache que se pueden leer.
+
+        Args:
+            log_group: Solo los de este log group (se filtra por nombre de archivo)
+        """
+        prefix = f'{self._digest(log_group)}-' if log_group is not None else ''
+        entries = []
+        # Los threads de fetch_logs comparten el cache: el índice se actualiza con el lock
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if not name.endswith(CACHE_SUFFIX) or not name.startswith(prefix):
+                    continue
+                path = os.path.join(self.directory, name)
+                try:
+                    inode = os.stat(path).st_ino
+                    known = self._index.get(name)
+                    if known is None or known[0] != inode:
+                        known = self._index[name] = (inode, read_cache_entry(path))
+                except (OSError, ValueError):
+                    self._index.pop(name, None)
+                    continue
+                if log_group is None or known[1].log_group == log_group:
+                    entries.append(known[1])
+        return entries
+
+    def store(self, log_group: str, start_ms: int, end_ms: int, events: Iterable[Dict[str, Any]]) -> CacheEntry:
+        """
+        Guarda los eventos de una ventana y aplica la política de eviction.
+
+        La ventana recién escrita no se elimina aunque supere max_bytes por sí
+        sola: el llamador la va a leer a continuación.
+        """
+        entry = write_log_cache(self._path(log_group, start_ms, end_ms), events, log_group, start_ms, end_ms)
+        with self._lock:
+            try:
+                self._index[os.path.basename(entry.path)] = (os.stat(entry.path).st_ino, entry)
+            except FileNotFoundError:
+                pass
+        self.evict(keep=entry.path)
+        return entry
+
+    def find(self, log_group: str, start_ms: int, end_ms: int,
+             max_staleness_ms: int = DEFAULT_MAX_STALENESS_MS) -> Optional[CacheEntry]:
+        """
+        Busca un archivo que cubra la ventana pedida.
+
+        Una ventana cacheada sirve si empieza antes que la pedida y termina a
+        lo sumo max_staleness_ms antes de su fin (con el default, si cubre
+        hasta el fin). Entre las que sirven se elige la que termina más tarde.
+        """
+        candidates = [
+            entry for entry in self.entries(log_group)
+            if entry.start_ms <= start_ms
+            and entry.end_ms >= end_ms - max_staleness_ms
+            and time.time() - entry.created_at <= self.max_age_seconds
+        ]
+        if not candidates:
+            return None
+        entry = max(candidates, key=lambda e: e.end_ms)
+        # Marcar como usado para la eviction por LRU
+        os.utime(entry.path)
+        return entry
+
+    def evict(self, now: Optional[float] = None, keep: Optional[str] = None):
+        """
+        Elimina archivos vencidos y, si hace falta, los menos usados hasta entrar en max_bytes.
+
+        Args:
+            now: Hora de referencia en segundos epoch (default: ahora)
+            keep: Archivo que no se elimina (la ventana que se está por devolver)
+        """
+        now = now if now is not None else time.time()
+        with self._lock:
+            files, kept_bytes = [], 0
+            for entry in self.entries():
+                if entry.path == keep:
+                    kept_bytes = entry.size_bytes
+                    continue
+                try:
+                    last_used = os.stat(entry.path).st_mtime
+                    if now - entry.created_at > self.max_age_seconds:
+                        os.unlink(entry.path)
+                        continue
+                except FileNotFoundError:
+                    continue
+                files.append((last_used, entry.size_bytes, entry.path))
+
+            total = kept_bytes + sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                os.unlink(path)
+                total -= size
+
+    def get_or_fetch(self, client, log_group: str, minutes: int = 30, now_ms: Optional[int] = None,
+                     stats: Optional[FetchStats] = None, **kwargs) -> Tuple[CachedLogs, int, int]:
+        """
+        Devuelve los logs de la ventana desde el cache, descargándolos si no están.
+
+        Si una ventana cacheada cubre el inicio pero no llega al fin, se
+        descargan solo los eventos posteriores a su fin y se guarda la
+        ventana completa (prefijo cacheado + delta).
+
+        Args:
+            client: Cliente de CloudWatch Logs
+            log_group: Nombre del log group (exacto o prefijo terminado en '*')
+            minutes: Minutos hacia atrás para buscar logs
+            now_ms: Fin de la ventana en ms epoch (default: ahora)
+            stats: FetchStats a completar si hay que descargar (opcional)
+            **kwargs: Parámetros adicionales de iter_log_events
+
+        Returns:
+            Tupla (CachedLogs abierto, inicio, fin) con la ventana a analizar
+        """
+        start_ms, end_ms = time_window(minutes, now_ms)
+        # Ventana cacheada que cubre el inicio y llega más lejos
+        entry = self.find(log_group, start_ms, start_ms)
+        if entry is None or entry.end_ms < end_ms:
+            delta_start = entry.end_ms + 1 if entry is not None else start_ms
+            events = iter_log_events(client, log_group, delta_start, end_ms, stats=stats, **kwargs)
+            if entry is not None:
+                events = itertools.chain(self._cached_events(entry, start_ms), events)
+            entry = self.store(log_group, start_ms, end_ms, events)
+        return CachedLogs(entry.path), start_ms, end_ms
+
+    @staticmethod
+    def _cached_events(entry: CacheEntry, start_ms: int) -> Iterator[Dict[str, Any]]:
+        with CachedLogs(entry.path) as cached:
+            timestamps = cached.column('timestamp')
+            lo, hi = cached.row_range(start_ms, None)
+            for row in range(lo, hi):
+                yield {'timestamp': timestamps[row], 'message': cached.message(row)}
+
+
+def fetch_and_analyze_cached(client, cache: LogCache, log_group: str, minutes: int = 30,
+                             analysis_name: Optional[str] = None,
+                             max_sample_bodies: Optional[int] = DEFAULT_MAX_SAMPLE_BODIES,
+                             stats: Optional[FetchStats] = None, now_ms: Optional[int] = None,
+                             correlator=None, **kwargs) -> LogAnalysis:
+    """
+    Como cloudwatch_fetcher.fetch_and_analyze, pero reutilizando el cache local.
+    El correlator (opcional) recibe las líneas de la ventana desde el cache.
+
+    Returns:
+        LogAnalysis de la ventana pedida
+    """
+    cached, start_ms, end_ms = cache.get_or_fetch(client, log_group, minutes, now_ms=now_ms, stats=stats, **kwargs)
+    with cached:
+        analysis = cached.analyze(analysis_name or log_group, start_ms, end_ms, max_sample_bodies=max_sample_bodies)
+        if correlator is not None:
+            correlator.add_lines(cached.iter_lines(start_ms, end_ms))
+    analysis.time_range = f'last {minutes} minutes (cache)'
+    return analysis
@@ -7,9 +7,13 @@ los que procesan las lambdas, y viceversa.
 
 import yaml
 import json
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
-from lambda_analyzer import extract_processed_fields
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from lambda_analyzer import PARAMETER_SOURCES, extract_parameter_fields, extract_processed_fields
+from template_index import HTTP_METHODS, ApiRoute, TemplateIndex, discover_api_routes
+from type_inference import TYPE_ISSUES, InferredFieldType, check_field_type, infer_field_types
 
 
 @dataclass
@@ -20,6 +24,13 @@ class FieldDiscrepancy:
     in_lambda: bool
     openapi_type: Optional[str]
     lambda_processing: Optional[str]
+    location: str = 'body'  # 'body', 'query' o 'path'
+    # 'missing' o un chequeo de type_inference.TYPE_ISSUES
+    issue: str = 'missing'
+    detail: Optional[str] = None
+    expected_format: Optional[str] = None
+    lambda_type: Optional[str] = None
+    lambda_format: Optional[str] = None
 
 
 @dataclass
@@ -32,6 +43,188 @@ class ConsistencyReport:
     missing_in_lambda: List[str]
     missing_in_openapi: List[str]
     recommendations: List[str]
+    method: str = 'post'
+    # Campos con errores de tipo/formato y con advertencias de formato
+    type_mismatches: List[str] = field(default_factory=list)
+    format_warnings: List[str] = field(default_factory=list)
+
+
+# Specs con resolver cacheado (los resolvers mantienen vivo su spec)
+MAX_CACHED_RESOLVERS = 8
+
+# Palabras clave de composición de schemas
+_COMPOSITION_KEYS = ('allOf', 'oneOf', 'anyOf')
+
+
+class SchemaResolver:
+    """
+    Resuelve $ref (JSON pointers locales) y aplana allOf/oneOf/anyOf de un spec.
+    
+    Cada schema se aplana una sola vez por spec: los resultados se memoizan por
+    referencia y por nodo, así que validar varios endpoints que comparten
+    componentes no vuelve a recorrerlos. Las referencias circulares se cortan
+    y se marcan con 'x-circular-ref' en vez de recursar indefinidamente.
+    
+    Semántica del aplanado:
+    - allOf: unión de properties y de required
+    - oneOf/anyOf: unión de properties; un campo es requerido solo si lo es
+      en todas las alternativas
+    """
+    
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self._flat_by_ref: Dict[str, Dict[str, Any]] = {}
+        self._flat_by_node: Dict[int, Dict[str, Any]] = {}
+        self._in_progress: Set[str] = set()
+        self._lock = threading.RLock()
+    
+    def resolve_pointer(self, ref: str) -> Any:
+        """
+        Devuelve el nodo al que apunta un $ref local ('#/components/schemas/X').
+        
+        Raises:
+            ValueError: Si la referencia es externa o no existe en el spec
+        """
+        if not ref.startswith('#'):
+            raise ValueError(f"Referencia externa no soportada: {ref}")
+        node: Any = self.spec
+        for token in ref[1:].split('/')[1:]:
+            token = token.replace('~1', '/').replace('~0', '~')
+            if isinstance(node, list) and token.isdigit() and int(token) < len(node):
+                node = node[int(token)]
+            elif isinstance(node, dict) and token in node:
+                node = node[token]
+            else:
+                raise ValueError(f"Referencia no encontrada en el spec: {ref}")
+        return node
+    
+    def deref(self, node: Any) -> Any:
+        """Sigue una cadena de $ref (sin aplanar) hasta un nodo concreto."""
+        seen = set()
+        while isinstance(node, dict) and '$ref' in node:
+            ref = node['$ref']
+            if ref in seen:
+                raise ValueError(f"Referencia circular: {ref}")
+            seen.add(ref)
+            node = self.resolve_pointer(ref)
+        return node
+    
+    def flatten(self, schema: Any) -> Dict[str, Any]:
+        """
+        Aplana un schema: resuelve $ref, combina allOf/oneOf/anyOf y aplana
+        recursivamente sus properties e items.
+        
+        Args:
+            schema: Schema de OpenAPI (puede ser un $ref)
+            
+        Returns:
+            Schema sin $ref ni composiciones (salvo ciclos marcados)
+        """
+        with self._lock:
+            return self._flatten(schema)
+    
+    def _flatten(self, schema: Any) -> Dict[str, Any]:
+        if not isinstance(schema, dict):
+            return {}
+        
+        ref = schema.get('$ref')
+        if ref is not None:
+            if ref in self._flat_by_ref:
+                return self._flat_by_ref[ref]
+            if ref in self._in_progress:
+                return {'x-circular-ref': ref}
+            self._in_progress.add(ref)
+            try:
+                flat = self._flatten(self.resolve_pointer(ref))
+            finally:
+                self._in_progress.discard(ref)
+            self._flat_by_ref[ref] = flat
+            # Claves junto al $ref (description, example, ...) pisan las del destino
+            siblings = {k: v for k, v in schema.items() if k != '$ref'}
+            return {**flat, **siblings} if siblings else flat
+        
+        cached = self._flat_by_node.get(id(schema))
+        if cached is not None:
+            return cached
+        
+        flat = {k: v for k, v in schema.items() if k not in _COMPOSITION_KEYS and k not in ('properties', 'items')}
+        properties: Dict[str, Any] = {}
+        required: List[str] = list(schema.get('required', []))
+        
+        for part in schema.get('allOf', []):
+            part_flat = self._flatten(part)
+            _merge_schema(flat, part_flat, properties)
+            required.extend(part_flat.get('required', []))
+        
+        for key in ('oneOf', 'anyOf'):
+            alternatives = [self._flatten(alternative) for alternative in schema.get(key, [])]
+            if not alternatives:
+                continue
+            same_type = len({alternative.get('type') for alternative in alternatives}) == 1
+            common_required = set(alternatives[0].get('required', []))
+            for alternative in alternatives:
+                common_required &= set(alternative.get('required', []))
+                _merge_schema(flat, alternative, properties, keep_type=same_type)
+            required.extend(sorted(common_required))
+        
+        for name, property_schema in (schema.get('properties') or {}).items():
+            properties[name] = _merge_property(properties.get(name), self._flatten(property_schema))
+        
+        if properties:
+            flat['properties'] = properties
+        if required:
+            flat['required'] = list(dict.fromkeys(required))
+        if 'items' in schema:
+            flat['items'] = self._flatten(schema['items'])
+        
+        self._flat_by_node[id(schema)] = flat
+        return flat
+
+
+def _merge_property(current: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, Any]:
+    if current is None:
+        return new
+    merged = dict(current)
+    merged.update(new)
+    return merged
+
+
+def _merge_schema(flat: Dict[str, Any], part: Dict[str, Any], properties: Dict[str, Any], keep_type: bool = True):
+    for key, value in part.items():
+        if key in ('properties', 'required'):
+            continue
+        if key == 'type' and not keep_type:
+            continue
+        flat.setdefault(key, value)
+    for name, property_schema in (part.get('properties') or {}).items():
+        properties[name] = _merge_property(properties.get(name), property_schema)
+
+
+_RESOLVERS: 'OrderedDict[int, SchemaResolver]' = OrderedDict()
+_RESOLVERS_LOCK = threading.Lock()
+
+
+def get_schema_resolver(openapi_spec: dict) -> SchemaResolver:
+    """
+    Devuelve el SchemaResolver memoizado de un spec (uno por objeto spec).
+    
+    Args:
+        openapi_spec: Especificación OpenAPI parseada
+        
+    Returns:
+        SchemaResolver compartido por todas las validaciones de ese spec
+    """
+    key = id(openapi_spec)
+    with _RESOLVERS_LOCK:
+        resolver = _RESOLVERS.get(key)
+        if resolver is not None and resolver.spec is openapi_spec:
+            _RESOLVERS.move_to_end(key)
+            return resolver
+        resolver = SchemaResolver(openapi_spec)
+        _RESOLVERS[key] = resolver
+        while len(_RESOLVERS) > MAX_CACHED_RESOLVERS:
+            _RESOLVERS.popitem(last=False)
+        return resolver
 
 
 def extract_request_fields(openapi_spec: dict, endpoint: str, method: str = 'post') -> Dict[str, Any]:
@@ -54,18 +247,20 @@ def extract_request_fields(openapi_spec: dict, endpoint: str, method: str = 'pos
     }
     
     try:
+        resolver = get_schema_resolver(openapi_spec)
+        
         # Navegar a la definición del endpoint
-        path_item = openapi_spec.get('paths', {}).get(endpoint, {})
+        path_item = resolver.deref(openapi_spec.get('paths', {}).get(endpoint, {}))
         operation = path_item.get(method, {})
         
-        # Obtener requestBody
-        request_body = operation.get('requestBody', {})
+        # Obtener requestBody (puede ser un $ref a components/requestBodies)
+        request_body = resolver.deref(operation.get('requestBody', {}))
         content = request_body.get('content', {})
         json_content = content.get('application/json', {})
-        schema = json_content.get('schema', {})
+        schema = resolver.flatten(json_content.get('schema', {}))
         
         # Extraer campos requeridos
-        required_fields = schema.get('required', [])
+        required_fields = list(schema.get('required', []))
         fields_info['required'] = required_fields
         
         # Extraer todas las propiedades
@@ -77,6 +272,7 @@ def extract_request_fields(openapi_spec: dict, endpoint: str, method: str = 'pos
                 'description': field_spec.get('description', ''),
                 'required': field_name in required_fields,
                 'format': field_spec.get('format', None),
+                'pattern': field_spec.get('pattern', None),
                 'example': field_spec.get('example', None)
             }
             
@@ -89,54 +285,86 @@ def extract_request_fields(openapi_spec: dict, endpoint: str, method: str = 'pos
     return fields_info
 
 
-def validate_openapi_lambda_consistency(
-    openapi_spec: dict,
-    lambda_code: str,
+def _qualified(location: str, name: str) -> str:
+    """Nombre de un campo en los reportes: sin prefijo para el body, 'query:x' para parámetros."""
+    return name if location == 'body' else f'{location}:{name}'
+
+
+def _build_consistency_report(
     endpoint: str,
-    lambda_name: str
+    method: str,
+    lambda_name: str,
+    openapi_fields: Dict[str, Dict[str, Dict[str, Any]]],
+    lambda_fields: Dict[str, Set[str]],
+    lambda_types: Optional[Dict[str, Dict[str, InferredFieldType]]] = None
 ) -> ConsistencyReport:
     """
-    Valida que los campos en OpenAPI coincidan con los procesados en la lambda.
+    Compara los campos de una operación OpenAPI con los que lee la lambda.
     
     Args:
-        openapi_spec: Especificación OpenAPI parseada
-        lambda_code: Código de la función Lambda
-        endpoint: Endpoint a validar (ej: /turnos/modificar)
+        endpoint: Path de la operación
+        method: Método HTTP
         lambda_name: Nombre de la lambda
+        openapi_fields: Ubicación -> nombre -> info del campo en OpenAPI
+        lambda_fields: Ubicación -> nombres que lee la lambda
+        lambda_types: Ubicación -> campo -> tipo inferido (ver
+            type_inference.infer_field_types); None omite el chequeo de tipos
         
     Returns:
-        ConsistencyReport con discrepancias encontradas
+        ConsistencyReport de la operación
     """
-    # Extraer campos de OpenAPI
-    openapi_fields = extract_request_fields(openapi_spec, endpoint)
-    openapi_field_names = set(openapi_fields['all_fields'].keys())
-    
-    # Extraer campos procesados por la lambda
-    lambda_fields = set(extract_processed_fields(lambda_code))
-    
-    # Identificar discrepancias
-    missing_in_lambda = openapi_field_names - lambda_fields
-    missing_in_openapi = lambda_fields - openapi_field_names
-    
-    # Crear lista de discrepancias detalladas
     discrepancies = []
+    missing_in_lambda = set()
+    missing_in_openapi = set()
+    type_mismatches = set()
+    format_warnings = set()
+    openapi_field_names = set()
+    lambda_field_names = set()
     
-    for field in openapi_field_names | lambda_fields:
-        in_openapi = field in openapi_field_names
-        in_lambda = field in lambda_fields
+    for location in dict.fromkeys(list(openapi_fields) + list(lambda_fields)):
+        documented = openapi_fields.get(location, {})
+        processed = lambda_fields.get(location, set())
+        openapi_field_names |= {_qualified(location, name) for name in documented}
+        lambda_field_names |= {_qualified(location, name) for name in processed}
         
-        if in_openapi != in_lambda:
-            openapi_type = None
-            if in_openapi:
-                openapi_type = openapi_fields['all_fields'][field].get('type')
+        for field in set(documented) | processed:
+            in_openapi = field in documented
+            in_lambda = field in processed
             
-            discrepancies.append(FieldDiscrepancy(
-                field_name=field,
-                in_openapi=in_openapi,
-                in_lambda=in_lambda,
-                openapi_type=openapi_type,
-                lambda_processing='processed' if in_lambda else 'not_processed'
-            ))
+            if in_openapi != in_lambda:
+                if in_openapi:
+                    missing_in_lambda.add(_qualified(location, field))
+                else:
+                    missing_in_openapi.add(_qualified(location, field))
+                
+                discrepancies.append(FieldDiscrepancy(
+                    field_name=field,
+                    in_openapi=in_openapi,
+                    in_lambda=in_lambda,
+                    openapi_type=documented[field].get('type') if in_openapi else None,
+                    lambda_processing='processed' if in_lambda else 'not_processed',
+                    location=location
+                ))
+            elif lambda_types is not None:
+                inferred = lambda_types.get(location, {}).get(field)
+                for issue in check_field_type(field, documented[field], inferred, location):
+                    if issue.severity == 'error':
+                        type_mismatches.add(_qualified(location, field))
+                    else:
+                        format_warnings.add(_qualified(location, field))
+                    discrepancies.append(FieldDiscrepancy(
+                        field_name=field,
+                        in_openapi=True,
+                        in_lambda=True,
+                        openapi_type=documented[field].get('type'),
+                        lambda_processing='processed',
+                        location=location,
+                        issue=issue.issue,
+                        detail=issue.detail,
+                        expected_format=issue.expected_format,
+                        lambda_type=issue.lambda_type,
+                        lambda_format=issue.lambda_format
+                    ))
     
     # Generar recomendaciones
     recommendations = []
@@ -153,12 +381,24 @@ def validate_openapi_lambda_consistency(
             "Considerar agregar a OpenAPI para documentación completa."
         )
     
+    if type_mismatches:
+        recommendations.append(
+            f"Campos cuyo tipo o formato en OpenAPI no coincide con lo que acepta la lambda: {sorted(type_mismatches)}. "
+            "Alinear type/format/example del schema con la conversión o el parser de la lambda."
+        )
+    
+    if format_warnings:
+        recommendations.append(
+            f"Campos con formato que OpenAPI declara y la lambda no valida (o al revés): {sorted(format_warnings)}. "
+            "Validar el formato en la lambda o documentarlo en OpenAPI."
+        )
+    
     # Verificar campos de fecha/hora específicamente
     fecha_fields_openapi = [f for f in openapi_field_names if 'fecha' in f.lower()]
     hora_fields_openapi = [f for f in openapi_field_names if 'hora' in f.lower()]
     
-    fecha_fields_lambda = [f for f in lambda_fields if 'fecha' in f.lower()]
-    hora_fields_lambda = [f for f in lambda_fields if 'hora' in f.lower()]
+    fecha_fields_lambda = [f for f in lambda_field_names if 'fecha' in f.lower()]
+    hora_fields_lambda = [f for f in lambda_field_names if 'hora' in f.lower()]
     
     if fecha_fields_openapi and not fecha_fields_lambda:
         recommendations.append(
@@ -172,7 +412,7 @@ def validate_openapi_lambda_consistency(
             "pero la lambda no los procesa."
         )
     
-    is_consistent = len(discrepancies) == 0
+    is_consistent = not missing_in_lambda and not missing_in_openapi and not type_mismatches
     
     return ConsistencyReport(
         endpoint=endpoint,
@@ -181,7 +421,162 @@ def validate_openapi_lambda_consistency(
         discrepancies=discrepancies,
         missing_in_lambda=list(missing_in_lambda),
         missing_in_openapi=list(missing_in_openapi),
-        recommendations=recommendations
+        recommendations=recommendations,
+        method=method,
+        type_mismatches=sorted(type_mismatches),
+        format_warnings=sorted(format_warnings)
+    )
+
+
+def validate_openapi_lambda_consistency(
+    openapi_spec: dict,
+    lambda_code: str,
+    endpoint: str,
+    lambda_name: str
+) -> ConsistencyReport:
+    """
+    Valida que los campos en OpenAPI coincidan con los procesados en la lambda.
+    
+    Args:
+        openapi_spec: Especificación OpenAPI parseada
+        lambda_code: Código de la función Lambda
+        endpoint: Endpoint a validar (ej: /turnos/modificar)
+        lambda_name: Nombre de la lambda
+        
+    Returns:
+        ConsistencyReport con discrepancias encontradas
+    """
+    # Extraer campos de OpenAPI
+    openapi_fields = extract_request_fields(openapi_spec, endpoint)
+    
+    # Extraer campos procesados por la lambda
+    lambda_fields = set(extract_processed_fields(lambda_code))
+    
+    return _build_consistency_report(
+        endpoint, 'post', lambda_name,
+        {'body': openapi_fields['all_fields']},
+        {'body': lambda_fields},
+        {'body': infer_field_types(lambda_code)}
+    )
+
+
+def extract_operation_parameters(openapi_spec: dict, endpoint: str, method: str) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Extrae los parámetros de query y de path de una operación.
+    
+    Los parámetros del path item se heredan y la operación puede redefinirlos
+    (mismo nombre y ubicación).
+    
+    Args:
+        openapi_spec: Especificación OpenAPI parseada
+        endpoint: Path de la operación
+        method: Método HTTP
+        
+    Returns:
+        Diccionario ubicación ('query', 'path') -> nombre -> info del parámetro
+    """
+    resolver = get_schema_resolver(openapi_spec)
+    path_item = resolver.deref(openapi_spec.get('paths', {}).get(endpoint, {}))
+    operation = resolver.deref(path_item.get(method, {}))
+    
+    parameters: Dict[str, Dict[str, Dict[str, Any]]] = {location: {} for location in PARAMETER_SOURCES}
+    for parameter in list(path_item.get('parameters', [])) + list(operation.get('parameters', [])):
+        parameter = resolver.deref(parameter)
+        location = parameter.get('in')
+        if location not in parameters or 'name' not in parameter:
+            continue
+        schema = resolver.flatten(parameter.get('schema', {}))
+        parameters[location][parameter['name']] = {
+            'type': schema.get('type', 'unknown'),
+            'description': parameter.get('description', ''),
+            'required': bool(parameter.get('required', location == 'path')),
+            'format': schema.get('format'),
+            'pattern': schema.get('pattern'),
+            'example': parameter.get('example', schema.get('example'))
+        }
+    return parameters
+
+
+@dataclass
+class ApiSweepResult:
+    """Resultado de validar todas las operaciones de un spec contra el template"""
+    reports: List[ConsistencyReport]
+    # Rutas del template que el spec no documenta
+    undocumented_routes: List[ApiRoute]
+    # Operaciones del spec sin integración en el template: (path, método)
+    unintegrated_operations: List[Tuple[str, str]]
+    # Rutas cuya lambda no tiene AWS::Lambda::Permission para API Gateway
+    routes_without_permission: List[ApiRoute]
+
+
+def sweep_openapi_consistency(openapi_spec: dict, index: TemplateIndex,
+                              routes: Optional[List[ApiRoute]] = None) -> ApiSweepResult:
+    """
+    Valida en una pasada todas las operaciones del spec contra las lambdas del template.
+    
+    El mapa endpoint -> Lambda se descubre del RestApi del template (ver
+    template_index.discover_api_routes). Los campos de cada operación (body,
+    query y path) y los de cada lambda se indexan una sola vez antes de
+    comparar, así que una lambda detrás de varias rutas se analiza una vez.
+    
+    Args:
+        openapi_spec: Especificación OpenAPI parseada
+        index: Índice del template
+        routes: Rutas ya descubiertas (default: discover_api_routes(index))
+        
+    Returns:
+        ApiSweepResult con un ConsistencyReport por ruta documentada
+    """
+    routes = discover_api_routes(index) if routes is None else routes
+    
+    # Índice de operaciones del spec: (path, método) -> ubicación -> campos
+    operations: Dict[Tuple[str, str], Dict[str, Dict[str, Dict[str, Any]]]] = {}
+    for path, path_item in (openapi_spec.get('paths') or {}).items():
+        for method in path_item or {}:
+            if method not in HTTP_METHODS:
+                continue
+            fields = extract_operation_parameters(openapi_spec, path, method)
+            fields['body'] = extract_request_fields(openapi_spec, path, method)['all_fields']
+            operations[(path, method)] = fields
+    
+    # Índice de lambdas: nombre -> ubicación -> campos leídos (y sus tipos inferidos)
+    lambda_fields: Dict[str, Dict[str, Set[str]]] = {}
+    lambda_types: Dict[str, Dict[str, Dict[str, InferredFieldType]]] = {}
+    for route in routes:
+        if route.lambda_name is None or route.lambda_name in lambda_fields:
+            continue
+        code = index.lambdas[route.lambda_name].inline_code
+        if code is None:
+            continue
+        fields = {location: set(names) for location, names in extract_parameter_fields(code).items()}
+        fields['body'] = set(extract_processed_fields(code))
+        lambda_fields[route.lambda_name] = fields
+        types = {location: infer_field_types(code, source) for location, source in PARAMETER_SOURCES.items()}
+        types['body'] = infer_field_types(code)
+        lambda_types[route.lambda_name] = types
+    
+    reports, undocumented = [], []
+    integrated = set()
+    for route in routes:
+        candidates = [route.method] if route.method != 'any' else \
+            [method for (path, method) in operations if path == route.path]
+        documented = [(route.path, method) for method in candidates if (route.path, method) in operations]
+        if not documented:
+            undocumented.append(route)
+            continue
+        for key in documented:
+            integrated.add(key)
+            if route.lambda_name in lambda_fields:
+                reports.append(_build_consistency_report(
+                    route.path, key[1], route.lambda_name, operations[key], lambda_fields[route.lambda_name],
+                    lambda_types[route.lambda_name]
+                ))
+    
+    return ApiSweepResult(
+        reports=reports,
+        undocumented_routes=undocumented,
+        unintegrated_operations=[key for key in operations if key not in integrated],
+        routes_without_permission=[route for route in routes if route.lambda_name and not route.has_permission]
     )
 
 
@@ -206,6 +601,16 @@ def print_consistency_report(report: ConsistencyReport):
         for field in report.missing_in_openapi:
             print(f"   - {field}")
     
+    if report.type_mismatches:
+        print(f"\n🔴 Campos con tipo o formato incompatible:")
+        for field_name in report.type_mismatches:
+            print(f"   - {field_name}")
+    
+    if report.format_warnings:
+        print(f"\n⚠️  Campos con formato sin validar o sin documentar:")
+        for field_name in report.format_warnings:
+            print(f"   - {field_name}")
+    
     if report.discrepancies:
         print(f"\n{'─'*80}")
         print("DISCREPANCIAS DETALLADAS:")
@@ -219,6 +624,8 @@ def print_consistency_report(report: ConsistencyReport):
             print(f"    OpenAPI: {openapi_status} | Lambda: {lambda_status}")
             if disc.openapi_type:
                 print(f"    Tipo en OpenAPI: {disc.openapi_type}")
+            if disc.issue != 'missing':
+                print(f"    {TYPE_ISSUES[disc.issue][1]}: {disc.detail}")
     
     if report.recommendations:
         print(f"\n{'─'*80}")
@@ -0,0 +1,427 @@
+"""
+Serialización de los reportes del diagnóstico a formatos para máquinas.
+
+- JSON: un documento por reporte, con la misma información que imprimen
+  print_report, print_log_analysis y print_consistency_report.
+- JSON Lines: registros planos que se escriben a medida que se generan (un
+  hallazgo, una discrepancia o un request body por línea), así un análisis de
+  logs grande no se arma entero en memoria como string.
+- SARIF 2.1.0: los hallazgos de código y las inconsistencias OpenAPI-Lambda
+  como resultados de análisis estático, para herramientas de code scanning.
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from cloudwatch_analyzer import LogAnalysis
+from lambda_analyzer import ANALYZER_VERSION, DiagnosticReport, Finding
+from openapi_validator import ConsistencyReport, FieldDiscrepancy
+from type_inference import TYPE_ISSUES
+
+
+# Versión del formato de los registros JSON / JSONL
+SCHEMA_VERSION = 1
+
+SARIF_VERSION = '2.1.0'
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
+TOOL_NAME = 'diagnostico-turnos'
+
+# Severidad de los hallazgos -> nivel de SARIF
+SARIF_LEVELS = {'critical': 'error', 'warning': 'warning', 'info': 'note'}
+
+# Cada cuántos registros se hace flush del archivo en write_jsonl
+DEFAULT_FLUSH_EVERY = 1000
+
+
+def dumps(value: Any) -> str:
+    """
+    Serializa a JSON en una línea, usando orjson si está instalado.
+
+    orjson no acepta enteros de más de 64 bits; en ese caso se usa json.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str).decode('utf-8')
+        except TypeError:
+            pass
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+# ---------------------------------------------------------------------------
+# JSON: un documento por reporte
+# ---------------------------------------------------------------------------
+
+def finding_to_dict(finding: Finding) -> Dict[str, Any]:
+    return asdict(finding)
+
+
+def discrepancy_to_dict(discrepancy: FieldDiscrepancy) -> Dict[str, Any]:
+    return asdict(discrepancy)
+
+
+def diagnostic_report_to_dict(report: DiagnosticReport) -> Dict[str, Any]:
+    return {
+        'type': 'diagnostic_report',
+        'schema_version': SCHEMA_VERSION,
+        'lambda_name': report.lambda_name,
+        'summary': report.summary,
+        'requires_code_change': report.requires_code_change,
+        'requires_config_change': report.requires_config_change,
+        'findings': [finding_to_dict(finding) for finding in report.findings]
+    }
+
+
+def consistency_report_to_dict(report: ConsistencyReport) -> Dict[str, Any]:
+    return {
+        'type': 'consistency_report',
+        'schema_version': SCHEMA_VERSION,
+        'endpoint': report.endpoint,
+        'method': report.method,
+        'lambda_name': report.lambda_name,
+        'is_consistent': report.is_consistent,
+        'missing_in_lambda': sorted(report.missing_in_lambda),
+        'missing_in_openapi': sorted(report.missing_in_openapi),
+        'type_mismatches': sorted(report.type_mismatches),
+        'format_warnings': sorted(report.format_warnings),
+        'discrepancies': [discrepancy_to_dict(d) for d in report.discrepancies],
+        'recommendations': list(report.recommendations)
+    }
+
+
+def _log_analysis_header(analysis: LogAnalysis) -> Dict[str, Any]:
+    return {
+        'type': 'log_analysis',
+        'schema_version': SCHEMA_VERSION,
+        'log_group': analysis.log_group,
+        'time_range': analysis.time_range,
+        'total_entries': analysis.total_entries,
+        'error_count': analysis.error_count,
+        'request_body_count': max(analysis.request_body_count, len(analysis.request_bodies)),
+        'sampled_request_bodies': len(analysis.request_bodies),
+        'patterns': dict(analysis.patterns),
+        'field_stats': analysis.field_stats,
+        'lambda_metrics': analysis.lambda_metrics.summary(),
+        'recommendations': list(analysis.recommendations)
+    }
+
+
+def log_analysis_to_dict(analysis: LogAnalysis) -> Dict[str, Any]:
+    data = _log_analysis_header(analysis)
+    data['request_bodies'] = list(analysis.request_bodies)
+    return data
+
+
+_TO_DICT = (
+    (DiagnosticReport, diagnostic_report_to_dict),
+    (ConsistencyReport, consistency_report_to_dict),
+    (LogAnalysis, log_analysis_to_dict),
+    (Finding, finding_to_dict),
+    (FieldDiscrepancy, discrepancy_to_dict),
+)
+
+
+def to_dict(report: Any) -> Dict[str, Any]:
+    """
+    Convierte cualquiera de los reportes del diagnóstico a un dict serializable.
+
+    Args:
+        report: Finding, DiagnosticReport, LogAnalysis, FieldDiscrepancy o ConsistencyReport
+
+    Returns:
+        Diccionario compatible con JSON
+    """
+    for report_type, converter in _TO_DICT:
+        if isinstance(report, report_type):
+            return converter(report)
+    raise TypeError(f'No se sabe serializar {type(report).__name__}')
+
+
+def write_json(reports: Any, fp: TextIO, indent: Optional[int] = 2):
+    """
+    Escribe uno o varios reportes como un documento JSON.
+
+    Args:
+        reports: Un reporte o una lista de reportes
+        fp: Archivo de texto abierto para escritura
+        indent: Indentación (None = una sola línea)
+    """
+    if isinstance(reports, (list, tuple)):
+        data = [to_dict(report) for report in reports]
+    else:
+        data = to_dict(reports)
+    json.dump(data, fp, ensure_ascii=False, indent=indent, default=str)
+    fp.write('\n')
+
+
+# ---------------------------------------------------------------------------
+# JSON Lines: registros planos en streaming
+# ---------------------------------------------------------------------------
+
+def iter_records(report: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Genera los registros JSONL de un reporte.
+
+    Un DiagnosticReport produce un registro de resumen y uno por hallazgo, un
+    ConsistencyReport uno de resumen y uno por discrepancia, y un LogAnalysis
+    uno de resumen y uno por request body de la muestra. Los registros de
+    detalle repiten la clave del reporte (lambda_name, endpoint o log_group)
+    para poder filtrarlos sin reconstruir la jerarquía.
+
+    Args:
+        report: Reporte a serializar
+
+    Yields:
+        Diccionarios compatibles con JSON
+    """
+    if isinstance(report, DiagnosticReport):
+        header = diagnostic_report_to_dict(report)
+        findings = header.pop('findings')
+        header['finding_count'] = len(findings)
+        yield header
+        for finding in findings:
+            yield {'type': 'finding', 'lambda_name': report.lambda_name, **finding}
+    elif isinstance(report, ConsistencyReport):
+        header = consistency_report_to_dict(report)
+        discrepancies = header.pop('discrepancies')
+        yield header
+        for discrepancy in discrepancies:
+            yield {'type': 'field_discrepancy', 'endpoint': report.endpoint,
+                   'lambda_name': report.lambda_name, **discrepancy}
+    elif isinstance(report, LogAnalysis):
+        yield _log_analysis_header(report)
+        for index, body in enumerate(report.request_bodies):
+            yield {'type': 'request_body', 'log_group': report.log_group, 'index': index, 'body': body}
+    else:
+        yield {'type': type(report).__name__.lower(), **to_dict(report)}
+
+
+def write_jsonl(reports: Iterable[Any], fp: TextIO, flush_every: int = DEFAULT_FLUSH_EVERY) -> int:
+    """
+    Escribe reportes como JSON Lines a medida que el iterable los produce.
+
+    Args:
+        reports: Iterable (puede ser un generador) de reportes
+        fp: Archivo de texto abierto para escritura
+        flush_every: Registros entre cada flush
+
+    Returns:
+        Cantidad de registros escritos
+    """
+    written = 0
+    for report in reports:
+        for record in iter_records(report):
+            fp.write(dumps(record))
+            fp.write('\n')
+            written += 1
+            if written % flush_every == 0:
+                fp.flush()
+    fp.flush()
+    return written
+
+
+# ---------------------------------------------------------------------------
+# SARIF 2.1.0
+# ---------------------------------------------------------------------------
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-') or 'general'
+
+
+def _finding_rule_id(finding: Finding) -> str:
+    return f'{finding.category}/{_slug(finding.location)}'
+
+
+def _fingerprint(*parts: str) -> str:
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+class _LineLocator:
+    """Busca (y cachea) la línea donde se declara un recurso o un path."""
+
+    def __init__(self):
+        self._lines: Dict[str, List[str]] = {}
+
+    def find(self, path: Optional[str], key: str) -> Optional[int]:
+        if not path:
+            return None
+        if path not in self._lines:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._lines[path] = f.read().splitlines()
+            except OSError:
+                self._lines[path] = []
+        pattern = re.compile(r'^\s*["\']?' + re.escape(key) + r'["\']?\s*:')
+        for number, line in enumerate(self._lines[path], 1):
+            if pattern.match(line):
+                return number
+        return None
+
+
+def _location(uri: Optional[str], line: Optional[int], logical_name: str, kind: str) -> Dict[str, Any]:
+    location: Dict[str, Any] = {
+        'logicalLocations': [{'name': logical_name, 'kind': kind}]
+    }
+    if uri:
+        physical: Dict[str, Any] = {'artifactLocation': {'uri': uri.replace(os.sep, '/')}}
+        if line:
+            physical['region'] = {'startLine': line}
+        location['physicalLocation'] = physical
+    return location
+
+
+def to_sarif(
+    diagnostic_reports: Sequence[DiagnosticReport] = (),
+    consistency_reports: Sequence[ConsistencyReport] = (),
+    template_path: Optional[str] = None,
+    openapi_path: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Arma un log SARIF 2.1.0 con los hallazgos del diagnóstico.
+
+    Los hallazgos de cada Lambda se ubican en su recurso del template y las
+    inconsistencias en el path del endpoint en la especificación OpenAPI,
+    cuando se pasan las rutas de esos archivos.
+
+    Args:
+        diagnostic_reports: Reportes de analyze_lambda_code
+        consistency_reports: Reportes de validate_openapi_lambda_consistency
+        template_path: Template de CloudFormation (para ubicar las lambdas)
+        openapi_path: Especificación OpenAPI (para ubicar los endpoints)
+
+    Returns:
+        Diccionario con el log SARIF
+    """
+    locator = _LineLocator()
+    rules: Dict[str, Dict[str, Any]] = {}
+    rule_indexes: Dict[str, int] = {}
+    results: List[Dict[str, Any]] = []
+
+    def add_rule(rule_id: str, name: str, description: str, help_text: str, level: str) -> int:
+        if rule_id not in rules:
+            rules[rule_id] = {
+                'id': rule_id,
+                'name': name,
+                'shortDescription': {'text': description},
+                'help': {'text': help_text},
+                'defaultConfiguration': {'level': level}
+            }
+            rule_indexes[rule_id] = len(rule_indexes)
+        return rule_indexes[rule_id]
+
+    for report in diagnostic_reports:
+        line = locator.find(template_path, report.lambda_name)
+        for finding in report.findings:
+            rule_id = _finding_rule_id(finding)
+            level = SARIF_LEVELS.get(finding.severity, 'warning')
+            rule_index = add_rule(rule_id, _slug(finding.location), finding.location, finding.recommendation, level)
+            results.append({
+                'ruleId': rule_id,
+                'ruleIndex': rule_index,
+                'level': level,
+                'message': {'text': f'{report.lambda_name}: {finding.description}'},
+                'locations': [_location(template_path, line, report.lambda_name, 'function')],
+                'partialFingerprints': {
+                    'diagnosticoFinding/v1': _fingerprint(rule_id, report.lambda_name, finding.description)
+                },
+                'properties': {
+                    'severity': finding.severity,
+                    'category': finding.category,
+                    'recommendation': finding.recommendation
+                }
+            })
+
+    consistency_rules = {
+        'missing_in_lambda': ('consistency/missing-in-lambda', 'error',
+                              'Campo definido en OpenAPI que la Lambda no procesa',
+                              'Procesar el campo en la Lambda o quitarlo de la especificación OpenAPI'),
+        'missing_in_openapi': ('consistency/missing-in-openapi', 'warning',
+                               'Campo procesado por la Lambda que no está en OpenAPI',
+                               'Agregar el campo al schema del requestBody en OpenAPI'),
+    }
+    for report in consistency_reports:
+        line = locator.find(openapi_path, report.endpoint)
+        for attribute, (rule_id, level, description, help_text) in consistency_rules.items():
+            for field_name in sorted(getattr(report, attribute)):
+                rule_index = add_rule(rule_id, rule_id.split('/', 1)[1], description, help_text, level)
+                results.append({
+                    'ruleId': rule_id,
+                    'ruleIndex': rule_index,
+                    'level': level,
+                    'message': {'text': f"{report.method.upper()} {report.endpoint} <-> {report.lambda_name}: "
+                                        f"campo '{field_name}'"},
+                    'locations': [_location(openapi_path, line, report.endpoint, 'resource')],
+                    'partialFingerprints': {
+                        'diagnosticoFinding/v1': _fingerprint(rule_id, report.endpoint, report.lambda_name, field_name)
+                    },
+                    'properties': {'field': field_name, 'lambda_name': report.lambda_name}
+                })
+        # Tipos y formatos: una regla por tipo de chequeo, con el detalle en el mensaje
+        for disc in report.discrepancies:
+            if disc.issue == 'missing':
+                continue
+            severity, description, help_text = TYPE_ISSUES[disc.issue]
+            rule_id = f"consistency/{disc.issue.replace('_', '-')}"
+            rule_index = add_rule(rule_id, rule_id.split('/', 1)[1], description, help_text, severity)
+            results.append({
+                'ruleId': rule_id,
+                'ruleIndex': rule_index,
+                'level': severity,
+                'message': {'text': f"{report.method.upper()} {report.endpoint} <-> {report.lambda_name}: "
+                                    f"campo '{disc.field_name}': {disc.detail}"},
+                'locations': [_location(openapi_path, line, report.endpoint, 'resource')],
+                'partialFingerprints': {
+                    'diagnosticoFinding/v1': _fingerprint(rule_id, report.endpoint, report.lambda_name,
+                                                          disc.location, disc.field_name, disc.detail)
+                },
+                'properties': {
+                    'field': disc.field_name,
+                    'lambda_name': report.lambda_name,
+                    'expected_format': disc.expected_format,
+                    'lambda_format': disc.lambda_format,
+                    'lambda_type': disc.lambda_type
+                }
+            })
+
+    return {
+        '$schema': SARIF_SCHEMA,
+        'version': SARIF_VERSION,
+        'runs': [{
+            'tool': {'driver': {
+                'name': TOOL_NAME,
+                'version': ANALYZER_VERSION,
+                'rules': list(rules.values())
+            }},
+            'results': results
+        }]
+    }
+
+
+def write_sarif(
+    diagnostic_reports: Sequence[DiagnosticReport],
+    consistency_reports: Sequence[ConsistencyReport],
+    fp: TextIO,
+    template_path: Optional[str] = None,
+    openapi_path: Optional[str] = None
+):
+    """
+    Escribe el log SARIF de to_sarif en un archivo.
+
+    Args:
+        diagnostic_reports: Reportes de analyze_lambda_code
+        consistency_reports: Reportes de validate_openapi_lambda_consistency
+        fp: Archivo de texto abierto para escritura
+        template_path: Template de CloudFormation (para ubicar las lambdas)
+        openapi_path: Especificación OpenAPI (para ubicar los endpoints)
+    """
+    sarif = to_sarif(diagnostic_reports, consistency_reports, template_path, openapi_path)
+    json.dump(sarif, fp, ensure_ascii=False, indent=2)
+    fp.write('\n')
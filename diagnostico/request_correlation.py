@@ -0,0 +1,346 @@
+"""
+Correlación de logs de CloudWatch por requestId.
+
+Este módulo agrupa las líneas de log de cada invocación (request recibido,
+mensajes intermedios, éxito/error y línea REPORT) en un timeline por request,
+y reporta los requests más lentos y la latencia de los caminos de error.
+
+El uso de memoria está acotado: los requests abiertos se guardan en un LRU de
+tamaño max_open_requests y se cierran en cuanto aparece su línea REPORT.
+"""
+
+import heapq
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterable
+
+from cloudwatch_analyzer import (
+    LatencyHistogram,
+    parse_log_entry,
+    parse_report_line,
+    request_bodies_from_entry
+)
+
+
+# Requests abiertos como máximo antes de empezar a desalojar los más viejos
+DEFAULT_MAX_OPEN_REQUESTS = 10_000
+
+# Eventos guardados por request (el resto solo se cuenta)
+MAX_EVENTS_PER_REQUEST = 50
+
+# Cantidad de requests más lentos que se reportan
+DEFAULT_TOP_SLOWEST = 10
+
+# START/END/REPORT RequestId: <id>
+_PLATFORM_REQUEST_ID_RE = re.compile(r'\b(?:START|END|REPORT) RequestId: (\S+)')
+
+# Prefijo de las líneas de texto de Lambda: timestamp\trequestId\tLEVEL\t
+_TEXT_PREFIX_RE = re.compile(r'(\d{4}-\d{2}-\d{2}T[\d:.]+Z?)\t([0-9a-fA-F-]{8,})\t([A-Z]+)\t')
+
+# Timestamp al inicio de la línea (salida de `aws logs tail --format short`)
+_LEADING_TIMESTAMP_RE = re.compile(r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?)')
+
+
+@dataclass
+class TimelineEvent:
+    """Un evento del timeline de un request"""
+    kind: str  # 'received', 'message', 'success', 'error', 'report'
+    timestamp: Optional[str]
+    message: str
+
+
+@dataclass
+class RequestTimeline:
+    """Timeline de una invocación agrupada por requestId"""
+    request_id: str
+    events: List[TimelineEvent] = field(default_factory=list)
+    body: Optional[Any] = None
+    status: str = 'unknown'  # 'success', 'error', 'unknown'
+    duration_ms: Optional[float] = None
+    cold_start: bool = False
+    first_timestamp: Optional[str] = None
+    last_timestamp: Optional[str] = None
+    dropped_events: int = 0
+    completed: bool = False  # True si se vio la línea REPORT
+
+    def add_event(self, event: TimelineEvent):
+        """Agrega un evento respetando MAX_EVENTS_PER_REQUEST."""
+        if event.timestamp:
+            if self.first_timestamp is None:
+                self.first_timestamp = event.timestamp
+            self.last_timestamp = event.timestamp
+        if len(self.events) < MAX_EVENTS_PER_REQUEST:
+            self.events.append(event)
+        else:
+            self.dropped_events += 1
+
+    def latency_ms(self) -> Optional[float]:
+        """Duración del REPORT o, si no hay, la diferencia entre timestamps."""
+        if self.duration_ms is not None:
+            return self.duration_ms
+        start = _parse_timestamp(self.first_timestamp)
+        end = _parse_timestamp(self.last_timestamp)
+        if start and end:
+            return (end - start).total_seconds() * 1000
+        return None
+
+
+@dataclass
+class CorrelationReport:
+    """Resultado de la correlación por requestId"""
+    total_lines: int
+    correlated_lines: int
+    completed_requests: int
+    evicted_requests: int
+    open_requests: int
+    error_requests: int
+    slowest_requests: List[RequestTimeline]
+    success_latency: LatencyHistogram
+    error_latency: LatencyHistogram
+
+
+def _parse_timestamp(timestamp: Optional[str]) -> Optional[datetime]:
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def extract_request_context(log_line: str, parsed: Optional[Dict[str, Any]]) -> Dict[str, Optional[str]]:
+    """
+    Obtiene requestId, timestamp y mensaje de una línea de log.
+
+    Args:
+        log_line: Línea de log original
+        parsed: Resultado de parse_log_entry para la línea (o None)
+
+    Returns:
+        Diccionario con 'request_id', 'timestamp', 'level' y 'message'
+    """
+    context = {'request_id': None, 'timestamp': None, 'level': None, 'message': ''}
+
+    leading = _LEADING_TIMESTAMP_RE.match(log_line)
+    if leading:
+        context['timestamp'] = leading.group(1)
+
+    text_prefix = _TEXT_PREFIX_RE.search(log_line)
+    if text_prefix:
+        context['timestamp'] = text_prefix.group(1)
+        context['request_id'] = text_prefix.group(2)
+        context['level'] = text_prefix.group(3)
+
+    if isinstance(parsed, dict):
+        record = parsed.get('record') if isinstance(parsed.get('record'), dict) else {}
+        context['request_id'] = (
+            parsed.get('requestId') or record.get('requestId') or context['request_id']
+        )
+        context['timestamp'] = parsed.get('timestamp') or parsed.get('time') or context['timestamp']
+        context['level'] = parsed.get('level') or context['level']
+        message = parsed.get('message')
+        context['message'] = message if isinstance(message, str) else parsed.get('type', '')
+
+    if context['request_id'] is None:
+        platform = _PLATFORM_REQUEST_ID_RE.search(log_line)
+        if platform:
+            context['request_id'] = platform.group(1)
+            context['message'] = platform.group(0).split(' ')[0]
+
+    return context
+
+
+def _classify(context: Dict[str, Optional[str]], parsed: Optional[Dict[str, Any]]) -> str:
+    message_lower = (context['message'] or '').lower()
+    level = (context['level'] or '').upper()
+
+    if level == 'ERROR' or (isinstance(parsed, dict) and 'error' in parsed):
+        return 'error'
+    if 'request received' in message_lower:
+        return 'received'
+    if 'success' in message_lower:
+        return 'success'
+    return 'message'
+
+
+class RequestCorrelator:
+    """
+    Agrupa líneas de log por requestId en un LRU de requests abiertos.
+
+    Un request se cierra al aparecer su línea REPORT; si se supera
+    max_open_requests, se desaloja el request menos recientemente actualizado
+    y se contabiliza como incompleto.
+    """
+
+    def __init__(self, max_open_requests: int = DEFAULT_MAX_OPEN_REQUESTS,
+                 top_slowest: int = DEFAULT_TOP_SLOWEST):
+        self.max_open_requests = max_open_requests
+        self.top_slowest = top_slowest
+        self.total_lines = 0
+        self.correlated_lines = 0
+        self.completed_requests = 0
+        self.evicted_requests = 0
+        self.error_requests = 0
+        self.success_latency = LatencyHistogram()
+        self.error_latency = LatencyHistogram()
+        self._open: 'OrderedDict[str, RequestTimeline]' = OrderedDict()
+        # Min-heap (latencia, orden, timeline) con los requests más lentos
+        self._slowest: List[Any] = []
+        self._closed_order = 0
+
+    def _timeline(self, request_id: str) -> RequestTimeline:
+        timeline = self._open.get(request_id)
+        if timeline is None:
+            timeline = self._open[request_id] = RequestTimeline(request_id=request_id)
+            if len(self._open) > self.max_open_requests:
+                _, evicted = self._open.popitem(last=False)
+                self.evicted_requests += 1
+                self._close(evicted)
+        else:
+            self._open.move_to_end(request_id)
+        return timeline
+
+    def _close(self, timeline: RequestTimeline):
+        if timeline.status == 'error':
+            self.error_requests += 1
+
+        latency = timeline.latency_ms()
+        if latency is None:
+            return
+
+        if timeline.status == 'error':
+            self.error_latency.add(latency)
+        else:
+            self.success_latency.add(latency)
+
+        self._closed_order += 1
+        entry = (latency, self._closed_order, timeline)
+        if len(self._slowest) < self.top_slowest:
+            heapq.heappush(self._slowest, entry)
+        elif latency > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def add_line(self, log_line: str):
+        """Procesa una línea de log."""
+        self.total_lines += 1
+
+        report = parse_report_line(log_line)
+        parsed = parse_log_entry(log_line) if report is None and '{' in log_line else None
+        context = extract_request_context(log_line, parsed)
+
+        request_id = report.request_id if report is not None else context['request_id']
+        if not request_id or request_id == 'unknown':
+            return
+
+        self.correlated_lines += 1
+        timeline = self._timeline(request_id)
+
+        if report is not None:
+            timeline.duration_ms = report.duration_ms
+            timeline.cold_start = report.init_duration_ms is not None
+            timeline.completed = True
+            timeline.add_event(TimelineEvent('report', context['timestamp'], f'{report.duration_ms:.2f} ms'))
+            del self._open[request_id]
+            self.completed_requests += 1
+            self._close(timeline)
+            return
+
+        kind = _classify(context, parsed)
+        if kind == 'received' and timeline.body is None and isinstance(parsed, dict):
+            bodies = request_bodies_from_entry(parsed)
+            if bodies:
+                timeline.body = bodies[0]
+        if kind == 'error':
+            timeline.status = 'error'
+        elif kind == 'success' and timeline.status != 'error':
+            timeline.status = 'success'
+
+        timeline.add_event(TimelineEvent(kind, context['timestamp'], context['message'] or ''))
+
+    def add_lines(self, log_lines: Iterable[str]):
+        """Procesa un iterable de líneas de log."""
+        for log_line in log_lines:
+            self.add_line(log_line)
+
+    def report(self) -> CorrelationReport:
+        """
+        Construye el reporte con lo procesado hasta el momento.
+
+        Los requests que siguen abiertos (sin REPORT) no se incluyen en las
+        latencias, solo se cuentan en open_requests.
+        """
+        slowest = [timeline for _, _, timeline in sorted(self._slowest, key=lambda e: (-e[0], e[1]))]
+        return CorrelationReport(
+            total_lines=self.total_lines,
+            correlated_lines=self.correlated_lines,
+            completed_requests=self.completed_requests,
+            evicted_requests=self.evicted_requests,
+            open_requests=len(self._open),
+            error_requests=self.error_requests,
+            slowest_requests=slowest,
+            success_latency=self.success_latency,
+            error_latency=self.error_latency
+        )
+
+
+def correlate_requests(
+    log_lines: Iterable[str],
+    max_open_requests: int = DEFAULT_MAX_OPEN_REQUESTS,
+    top_slowest: int = DEFAULT_TOP_SLOWEST
+) -> CorrelationReport:
+    """
+    Correlaciona líneas de log por requestId en una sola pasada.
+
+    Args:
+        log_lines: Iterable de líneas de log
+        max_open_requests: Tamaño del LRU de requests abiertos
+        top_slowest: Cantidad de requests más lentos a reportar
+
+    Returns:
+        CorrelationReport con timelines de los requests más lentos
+    """
+    correlator = RequestCorrelator(max_open_requests=max_open_requests, top_slowest=top_slowest)
+    correlator.add_lines(log_lines)
+    return correlator.report()
+
+
+def print_correlation_report(report: CorrelationReport):
+    """Imprime el reporte de correlación de forma legible."""
+    print(f"\n{'='*80}")
+    print("CORRELACIÓN POR REQUEST ID")
+    print(f"{'='*80}")
+    print(f"\nLíneas correlacionadas: {report.correlated_lines}/{report.total_lines}")
+    print(f"Requests completos (con REPORT): {report.completed_requests}")
+    print(f"Requests desalojados sin REPORT: {report.evicted_requests}")
+    print(f"Requests abiertos al final: {report.open_requests}")
+    print(f"Requests con error: {report.error_requests}")
+
+    for label, histogram in (('éxito', report.success_latency), ('error', report.error_latency)):
+        if histogram.count:
+            print(f"\nLatencia camino de {label} p50/p90/p99: "
+                  f"{histogram.percentile(50):.1f} / {histogram.percentile(90):.1f} / "
+                  f"{histogram.percentile(99):.1f} ms ({histogram.count} requests)")
+
+    if report.slowest_requests:
+        print(f"\n{'─'*80}")
+        print("REQUESTS MÁS LENTOS:")
+        print(f"{'─'*80}")
+        for i, timeline in enumerate(report.slowest_requests, 1):
+            icon = '🔴' if timeline.status == 'error' else '✓'
+            cold = ' (cold start)' if timeline.cold_start else ''
+            print(f"\n{i}. {icon} {timeline.request_id}: {timeline.latency_ms():.1f} ms{cold}")
+            for event in timeline.events:
+                print(f"     [{event.kind}] {event.timestamp or '-'} {event.message}")
+            if timeline.body is not None:
+                print(f"     body: {timeline.body}")
+
+    print(f"\n{'='*80}\n")
+
+
+if __name__ == '__main__':
+    from benchmark_log_analysis import generate_log_corpus
+
+    print("Correlacionando logs sintéticos por requestId...")
+    print_correlation_report(correlate_requests(generate_log_corpus(2000), top_slowest=3))
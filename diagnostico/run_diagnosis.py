@@ -6,37 +6,13 @@ para identificar problemas y diferencias en el manejo de campos.
 """
 
 import yaml
-import re
 from lambda_analyzer import (
     analyze_lambda_code,
     compare_field_handling,
     extract_update_expression_fields,
     extract_processed_fields
 )
-
-
-def extract_lambda_code_from_cloudformation(template_path: str, lambda_name: str) -> str:
-    """
-    Extrae el código de una función Lambda del template de CloudFormation.
-    
-    Args:
-        template_path: Ruta al archivo YAML de CloudFormation
-        lambda_name: Nombre lógico de la función Lambda en el template
-        
-    Returns:
-        Código de la función Lambda
-    """
-    with open(template_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Buscar la sección de la lambda específica
-    pattern = rf'{lambda_name}:.*?ZipFile:\s*\|(.+?)(?=\n\s{{0,2}}\w+:|\Z)'
-    match = re.search(pattern, content, re.DOTALL)
-    
-    if match:
-        return match.group(1)
-    else:
-        raise ValueError(f"No se encontró la función Lambda {lambda_name} en el template")
+from template_index import extract_lambda_code_from_cloudformation
 
 
 def print_report(report):
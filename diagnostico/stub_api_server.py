@@ -0,0 +1,418 @@
+"""
+Servidor stub local que imita API Gateway + Lambda para la API de turnos.
+
+Atiende HTTP/1.1 con keep-alive sobre asyncio (solo biblioteca estándar) y
+resuelve cada request contra la especificación OpenAPI:
+- paths o métodos que no están en el spec: 403 "Missing Authentication
+  Token", como API Gateway REST
+- operaciones con security ApiKeyAuth sin la API key: 403 "Forbidden"
+- throttling opcional por token bucket: 429 "Too Many Requests"
+- las funciones Python inline del template se ejecutan de verdad con el
+  harness local (local_lambda_harness) contra DynamoDB en memoria; un
+  handler que lanza o devuelve algo que no es una respuesta de proxy da 502
+- las tablas en memoria se pueblan con los examples de los request bodies
+  que traen la clave primaria completa, así modificar/cancelar el turno del
+  example encuentra un ítem
+- el resto de las operaciones responde con los examples/schemas del spec:
+  400 si el body viola el schema (BodyValidator) y la primera respuesta 2xx
+  si no
+
+Así el generador de carga corre completo sin red.
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import List, Dict, Any, Optional, Tuple
+
+import yaml
+
+from body_replay import OperationMatcher, get_body_validator, request_body_schema
+from local_lambda_harness import LocalLambdaHarness, api_gateway_event
+from openapi_validator import get_schema_resolver
+from template_index import TemplateIndex, discover_api_routes, load_template_index
+from type_inference import OPENAPI_FORMATS
+
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+# Tamaño máximo de body aceptado (API Gateway REST admite 10 MB)
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+# Valores de ejemplo por format para strings sin example
+FORMAT_EXAMPLES = {name: sample for name, (_, _, sample) in OPENAPI_FORMATS.items()}
+FORMAT_EXAMPLES['email'] = 'paciente@ejemplo.com'
+
+_GATEWAY_ERRORS = {
+    403: 'Missing Authentication Token',
+    429: 'Too Many Requests',
+    502: 'Internal server error',
+}
+
+
+def example_from_schema(schema: Dict[str, Any], rng: Optional[random.Random] = None,
+                        include_optional: bool = True) -> Any:
+    """
+    Valor de ejemplo de un schema ya aplanado (sin $ref).
+
+    Usa example, default o enum cuando existen; si no, arma el valor por
+    type/format. Con rng elige entre los valores del enum y decide al azar
+    qué propiedades opcionales incluir.
+
+    Args:
+        schema: Schema aplanado
+        rng: Generador para variar los ejemplos (None: siempre el mismo)
+        include_optional: Incluir las propiedades no requeridas
+
+    Returns:
+        Valor JSON
+    """
+    if 'example' in schema:
+        return copy.deepcopy(schema['example'])
+    if schema.get('enum'):
+        return rng.choice(schema['enum']) if rng else schema['enum'][0]
+    if 'default' in schema:
+        return copy.deepcopy(schema['default'])
+    schema_type = schema.get('type') or ('object' if 'properties' in schema else 'string')
+    if schema_type == 'object':
+        required = set(schema.get('required', []))
+        return {
+            name: example_from_schema(prop, rng, include_optional)
+            for name, prop in (schema.get('properties') or {}).items()
+            if name in required or (include_optional and (rng is None or rng.random() < 0.5))
+        }
+    if schema_type == 'array':
+        return [example_from_schema(schema.get('items') or {}, rng, include_optional)]
+    if schema_type == 'integer':
+        return schema.get('minimum', 1)
+    if schema_type == 'number':
+        return schema.get('minimum', 1)
+    if schema_type == 'boolean':
+        return True
+    value = FORMAT_EXAMPLES.get(schema.get('format'), 'texto')
+    return value.ljust(schema.get('minLength', 0), 'x')
+
+
+@dataclass
+class StubOperation:
+    """Operación del spec tal como la atiende el stub"""
+    endpoint: str
+    method: str
+    operation_id: Optional[str]
+    api_key_header: Optional[str]  # header requerido (en minúsculas) o None
+    lambda_name: Optional[str] = None
+    local: bool = False  # se ejecuta con el harness en vez de sintetizar la respuesta
+    responses: Dict[int, Tuple[Dict[str, Any], Any]] = field(default_factory=dict)  # status -> (schema, ejemplo)
+
+    @property
+    def success_status(self) -> int:
+        return min((status for status in self.responses if 200 <= status < 300), default=200)
+
+
+def spec_operations(spec: dict) -> List[StubOperation]:
+    """
+    Operaciones del spec con su API key y sus respuestas de ejemplo.
+
+    Args:
+        spec: Especificación OpenAPI parseada
+
+    Returns:
+        Lista de StubOperation en el orden del spec
+    """
+    resolver = get_schema_resolver(spec)
+    schemes = (spec.get('components') or {}).get('securitySchemes') or {}
+    operations = []
+    for endpoint, path_item in (spec.get('paths') or {}).items():
+        path_item = resolver.deref(path_item)
+        for method, operation in path_item.items():
+            if method not in ('get', 'put', 'post', 'delete', 'patch', 'head', 'options'):
+                continue
+            operation = resolver.deref(operation)
+            header = None
+            for requirement in operation.get('security', spec.get('security', [])) or []:
+                for scheme_name in requirement:
+                    scheme = resolver.deref(schemes.get(scheme_name) or {})
+                    if scheme.get('type') == 'apiKey' and scheme.get('in') == 'header':
+                        header = scheme['name'].lower()
+            responses = {}
+            for status, response in (operation.get('responses') or {}).items():
+                if not str(status).isdigit():
+                    continue
+                response = resolver.deref(response)
+                media = (response.get('content') or {}).get('application/json') or {}
+                schema = resolver.flatten(media.get('schema') or {})
+                example = media['example'] if 'example' in media else \
+                    example_from_schema(schema) if schema else {'message': response.get('description', '')}
+                responses[int(status)] = (schema, example)
+            operations.append(StubOperation(endpoint, method, operation.get('operationId'), header,
+                                            responses=responses))
+    return operations
+
+
+class TokenBucket:
+    """Limitador de tasa como el throttling de API Gateway (rate + burst)."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def allow(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class StubApiServer:
+    """
+    Servidor HTTP asyncio que responde como el stack desplegado.
+
+    Args:
+        spec: Especificación OpenAPI parseada
+        index: Índice del template (para ejecutar las Lambdas Python localmente)
+        harness: Harness local ya poblado (por defecto uno nuevo sobre index)
+        api_key: API key esperada (None: no se exige)
+        latency_ms: Latencia agregada a cada respuesta (integración + Lambda)
+        jitter_ms: Variación uniforme de la latencia agregada
+        throttle_rps: Límite de requests por segundo (None: sin límite)
+        seed_examples: Poblar las tablas con los examples de los request bodies
+    """
+
+    def __init__(self, spec: dict, index: Optional[TemplateIndex] = None,
+                 harness: Optional[LocalLambdaHarness] = None, api_key: Optional[str] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, throttle_rps: Optional[float] = None,
+                 seed_examples: bool = True, seed: Optional[int] = None):
+        self.spec = spec
+        self.api_key = api_key
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.bucket = TokenBucket(throttle_rps) if throttle_rps else None
+        self.harness = harness if harness is not None else (LocalLambdaHarness(index) if index else None)
+        self.matcher = OperationMatcher(spec)
+        self.operations = {(op.endpoint, op.method): op for op in spec_operations(spec)}
+        self.requests_served = 0
+        self.host = DEFAULT_HOST
+        self._rng = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+        routes = discover_api_routes(self.harness.index) if self.harness else []
+        local = set(self.harness.python_functions()) if self.harness else set()
+        for route in routes:
+            operation = self.operations.get((route.path, route.method))
+            if operation is not None and route.lambda_name:
+                operation.lambda_name = route.lambda_name
+                operation.local = route.lambda_name in local
+        if self.harness is not None and seed_examples:
+            self._seed_from_examples()
+
+    def _seed_from_examples(self):
+        for table in self.harness.tables.values():
+            keys = table.schema.primary.keys
+            items: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+            for operation in self.operations.values():
+                example = example_from_schema(request_body_schema(self.spec, operation.endpoint, operation.method))
+                if isinstance(example, dict) and all(isinstance(example.get(k), str) for k in keys):
+                    items.setdefault(tuple(example[k] for k in keys), {}).update(example)
+            table.load_items(list(items.values()))
+
+    @property
+    def port(self) -> Optional[int]:
+        if self._server is None or not self._server.sockets:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    @property
+    def url(self) -> Optional[str]:
+        return f'http://{self.host}:{self.port}' if self.port else None
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> 'StubApiServer':
+        """Empieza a escuchar (port=0 elige un puerto libre)."""
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+        self.host = host
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Cerrar las conexiones keep-alive abiertas para que sus tareas terminen
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def handle(self, method: str, path: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Any]:
+        """
+        Resuelve un request como API Gateway + Lambda.
+
+        Returns:
+            (status, body JSON o str ya serializado)
+        """
+        self.requests_served += 1
+        if self.bucket is not None and not self.bucket.allow():
+            return 429, {'message': _GATEWAY_ERRORS[429]}
+
+        path = path.split('?', 1)[0]
+        endpoint, _ = self.matcher.match({'path': path})
+        operation = self.operations.get((endpoint, method.lower()))
+        if operation is None:
+            return 403, {'message': _GATEWAY_ERRORS[403]}
+        if operation.api_key_header and self.api_key is not None \
+                and headers.get(operation.api_key_header) != self.api_key:
+            return 403, {'message': 'Forbidden'}
+
+        if self.latency_ms or self.jitter_ms:
+            await asyncio.sleep(max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000)
+
+        text = body.decode('utf-8', errors='replace') if body else None
+        if operation.local:
+            return await self._invoke_lambda(operation, path, headers, text)
+        return self._synthesize(operation, text)
+
+    async def _invoke_lambda(self, operation: StubOperation, path: str, headers: Dict[str, str],
+                             text: Optional[str]) -> Tuple[int, Any]:
+        event = api_gateway_event(text, request_id=str(uuid.uuid4()))
+        event.update({'resource': operation.endpoint, 'path': path, 'httpMethod': operation.method.upper(),
+                      'headers': headers})
+        try:
+            response, _ = await asyncio.to_thread(self.harness.invoke, operation.lambda_name, event)
+        except Exception:
+            return 502, {'message': _GATEWAY_ERRORS[502]}
+        if not isinstance(response, dict) or not isinstance(response.get('statusCode'), int):
+            return 502, {'message': _GATEWAY_ERRORS[502]}
+        response_body = response.get('body')
+        return response['statusCode'], response_body if isinstance(response_body, str) else ''
+
+    def _synthesize(self, operation: StubOperation, text: Optional[str]) -> Tuple[int, Any]:
+        validator = get_body_validator(self.spec, operation.endpoint, operation.method)
+        if validator is not None:
+            try:
+                body = json.loads(text) if text else None
+            except ValueError:
+                return self._error(operation, 400, 'Body JSON inválido')
+            violations = [(name, kind) for name, kind in validator.validate(body) if kind != 'undocumented']
+            if violations:
+                name, kind = violations[0]
+                return self._error(operation, 400, f'Campo inválido: {name} ({kind})')
+        status = operation.success_status
+        _, example = operation.responses.get(status, ({}, {}))
+        return status, example
+
+    def _error(self, operation: StubOperation, status: int, message: str) -> Tuple[int, Any]:
+        schema, example = operation.responses.get(status, ({}, None))
+        if isinstance(example, dict) and 'error' in (schema.get('properties') or example):
+            return status, {**example, 'error': message}
+        return status, {'error': message}
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                parts = request_line.decode('latin-1').split()
+                if len(parts) != 3:
+                    break
+                method, path, version = parts
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY_BYTES:
+                    await self._write(writer, 413, {'message': 'Request Too Long'}, close=True)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self.handle(method, path, headers, body)
+                close = headers.get('connection', '').lower() == 'close' or version == 'HTTP/1.0'
+                await self._write(writer, status, payload, close)
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _write(self, writer: asyncio.StreamWriter, status: int, payload: Any, close: bool):
+        data = (payload if isinstance(payload, str) else json.dumps(payload, ensure_ascii=False)).encode('utf-8')
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ''
+        head = (f'HTTP/1.1 {status} {reason}\r\n'
+                f'Content-Type: application/json\r\n'
+                f'Content-Length: {len(data)}\r\n'
+                f'x-amzn-RequestId: {uuid.uuid4()}\r\n'
+                f'Connection: {"close" if close else "keep-alive"}\r\n\r\n')
+        writer.write(head.encode('latin-1') + data)
+        await writer.drain()
+
+
+def print_stub_operations(server: StubApiServer):
+    """Imprime cómo atiende el stub cada operación."""
+    print(f"\n{'='*80}")
+    print(f"STUB DE API GATEWAY EN {server.url}")
+    print(f"{'='*80}")
+    for operation in server.operations.values():
+        mode = f'🐍 {operation.lambda_name} (local)' if operation.local else '📄 respuesta del spec'
+        key = ' 🔑' if operation.api_key_header and server.api_key else ''
+        print(f"  {operation.method.upper():<6} {operation.endpoint:<22} {mode}{key}")
+    print(f"{'='*80}\n")
+
+
+async def _serve_forever(server: StubApiServer, host: str, port: int):
+    await server.start(host, port)
+    print_stub_operations(server)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    """Función principal."""
+    parser = argparse.ArgumentParser(description='Stub local de API Gateway + Lambda')
+    parser.add_argument('--openapi', default='documentos_salud_connect_ia/turnos-medicos-api-openapi.yaml')
+    parser.add_argument('--template', default='documentos_salud_connect_ia/turnos-medicos-api-final.yaml',
+                        help='Template para ejecutar las Lambdas Python localmente ("" para no usarlo)')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--api-key', help='API key exigida en las operaciones con ApiKeyAuth')
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--throttle-rps', type=float)
+    args = parser.parse_args()
+
+    with open(args.openapi, 'r', encoding='utf-8') as f:
+        spec = yaml.safe_load(f)
+    index = load_template_index(args.template) if args.template else None
+    server = StubApiServer(spec, index, api_key=args.api_key, latency_ms=args.latency_ms,
+                           jitter_ms=args.jitter_ms, throttle_rps=args.throttle_rps)
+    try:
+        asyncio.run(_serve_forever(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
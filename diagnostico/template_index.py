@@ -0,0 +1,354 @@
+"""
+Índice del template de CloudFormation del sistema de turnos médicos.
+
+Parsea el template una sola vez con un loader YAML que entiende los tags
+intrínsecos de CloudFormation (!Ref, !GetAtt, !Sub, ...) y arma un índice
+nombre lógico -> recurso, con la configuración y el código inline (ZipFile)
+de cada función Lambda. El índice se cachea por archivo y se invalida cuando
+cambia su mtime, así que todos los scripts de diagnóstico lo comparten.
+"""
+
+import fnmatch
+import os
+import re
+import threading
+import yaml
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Tuple
+
+
+# Valores por defecto de Lambda cuando el template no los declara
+DEFAULT_LAMBDA_MEMORY_MB = 128
+DEFAULT_LAMBDA_TIMEOUT_SECONDS = 3
+
+LAMBDA_FUNCTION_TYPE = 'AWS::Lambda::Function'
+LAMBDA_PERMISSION_TYPE = 'AWS::Lambda::Permission'
+REST_API_TYPE = 'AWS::ApiGateway::RestApi'
+API_STAGE_TYPE = 'AWS::ApiGateway::Stage'
+
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+
+# Variables de !Sub: ${Recurso} o ${Recurso.Atributo}
+_SUB_VARIABLE_RE = re.compile(r'\$\{([A-Za-z0-9]+)(?:\.[A-Za-z0-9.]+)?\}')
+
+
+class CloudFormationLoader(yaml.SafeLoader):
+    """
+    SafeLoader que convierte los tags cortos de CloudFormation a su forma
+    larga: `!Ref X` -> {'Ref': 'X'}, `!GetAtt A.Arn` -> {'Fn::GetAtt': ['A', 'Arn']},
+    `!Sub ...` -> {'Fn::Sub': ...}.
+    """
+
+
+def _construct_intrinsic(loader: CloudFormationLoader, suffix: str, node: yaml.Node) -> Dict[str, Any]:
+    if isinstance(node, yaml.ScalarNode):
+        value = loader.construct_scalar(node)
+    elif isinstance(node, yaml.SequenceNode):
+        value = loader.construct_sequence(node, deep=True)
+    else:
+        value = loader.construct_mapping(node, deep=True)
+
+    if suffix == 'Ref':
+        return {'Ref': value}
+    if suffix == 'GetAtt' and isinstance(value, str):
+        value = value.split('.', 1)
+    return {f'Fn::{suffix}': value}
+
+
+CloudFormationLoader.add_multi_constructor('!', _construct_intrinsic)
+
+
+@dataclass
+class LambdaFunctionInfo:
+    """Configuración de una función Lambda declarada en el template"""
+    logical_id: str
+    runtime: Optional[str]
+    handler: Optional[str]
+    memory_size_mb: int
+    timeout_seconds: int
+    role: Any
+    inline_code: Optional[str]
+    environment: Dict[str, Any] = field(default_factory=dict)
+    properties: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def language(self) -> Optional[str]:
+        """'python' o 'javascript' según el runtime."""
+        if not self.runtime:
+            return None
+        if self.runtime.startswith('python'):
+            return 'python'
+        if self.runtime.startswith('nodejs'):
+            return 'javascript'
+        return None
+
+
+@dataclass
+class TemplateIndex:
+    """Template parseado con acceso directo a recursos y funciones Lambda"""
+    path: str
+    template: Dict[str, Any]
+    resources: Dict[str, Dict[str, Any]]
+    lambdas: Dict[str, LambdaFunctionInfo]
+
+    def resources_of_type(self, resource_type: str) -> Dict[str, Dict[str, Any]]:
+        """Recursos de un tipo dado (ej: 'AWS::DynamoDB::Table')."""
+        return {
+            logical_id: resource for logical_id, resource in self.resources.items()
+            if resource.get('Type') == resource_type
+        }
+
+    def get_lambda(self, lambda_name: str) -> LambdaFunctionInfo:
+        """
+        Devuelve la función Lambda con ese nombre lógico.
+
+        Raises:
+            ValueError: Si la función no existe en el template
+        """
+        info = self.lambdas.get(lambda_name)
+        if info is None:
+            raise ValueError(f"No se encontró la función Lambda {lambda_name} en el template")
+        return info
+
+
+def _lambda_info(logical_id: str, properties: Dict[str, Any]) -> LambdaFunctionInfo:
+    code = properties.get('Code') or {}
+    environment = (properties.get('Environment') or {}).get('Variables') or {}
+    return LambdaFunctionInfo(
+        logical_id=logical_id,
+        runtime=properties.get('Runtime'),
+        handler=properties.get('Handler'),
+        memory_size_mb=int(properties.get('MemorySize', DEFAULT_LAMBDA_MEMORY_MB)),
+        timeout_seconds=int(properties.get('Timeout', DEFAULT_LAMBDA_TIMEOUT_SECONDS)),
+        role=properties.get('Role'),
+        inline_code=code.get('ZipFile') if isinstance(code, dict) else None,
+        environment=environment,
+        properties=properties
+    )
+
+
+def build_template_index(template: Dict[str, Any], path: str = '<memoria>') -> TemplateIndex:
+    """
+    Arma el índice a partir de un template ya parseado.
+
+    Args:
+        template: Template parseado con CloudFormationLoader
+        path: Ruta de origen (solo informativa)
+
+    Returns:
+        TemplateIndex del template
+    """
+    resources = {
+        logical_id: resource
+        for logical_id, resource in ((template or {}).get('Resources') or {}).items()
+        if isinstance(resource, dict)
+    }
+    lambdas = {
+        logical_id: _lambda_info(logical_id, resource.get('Properties') or {})
+        for logical_id, resource in resources.items()
+        if resource.get('Type') == LAMBDA_FUNCTION_TYPE
+    }
+    return TemplateIndex(path=path, template=template or {}, resources=resources, lambdas=lambdas)
+
+
+# Cache de índices: ruta absoluta -> ((mtime_ns, tamaño), índice)
+_INDEX_CACHE: Dict[str, Tuple[Tuple[int, int], TemplateIndex]] = {}
+_INDEX_LOCK = threading.Lock()
+
+
+def load_template_index(template_path: str) -> TemplateIndex:
+    """
+    Devuelve el índice del template, parseándolo solo si cambió desde la última vez.
+
+    Args:
+        template_path: Ruta al archivo YAML de CloudFormation
+
+    Returns:
+        TemplateIndex del template
+    """
+    path = os.path.abspath(template_path)
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    with _INDEX_LOCK:
+        cached = _INDEX_CACHE.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        template = yaml.load(f, Loader=CloudFormationLoader)
+    index = build_template_index(template, path)
+
+    with _INDEX_LOCK:
+        _INDEX_CACHE[path] = (signature, index)
+    return index
+
+
+def clear_template_cache():
+    """Descarta los índices cacheados."""
+    with _INDEX_LOCK:
+        _INDEX_CACHE.clear()
+
+
+def extract_lambda_code_from_cloudformation(template_path: str, lambda_name: str) -> str:
+    """
+    Extrae el código de una función Lambda del template de CloudFormation.
+
+    Args:
+        template_path: Ruta al archivo YAML de CloudFormation
+        lambda_name: Nombre lógico de la función Lambda en el template
+
+    Returns:
+        Código de la función Lambda
+    """
+    code = load_template_index(template_path).get_lambda(lambda_name).inline_code
+    if code is None:
+        raise ValueError(f"La función Lambda {lambda_name} no tiene código inline (ZipFile)")
+    return code
+
+
+def load_lambda_memory_sizes(template_path: str) -> Dict[str, int]:
+    """
+    Lee el MemorySize configurado de cada función Lambda del template.
+
+    Args:
+        template_path: Ruta al archivo YAML de CloudFormation
+
+    Returns:
+        Diccionario nombre lógico -> MemorySize en MB
+    """
+    return {
+        logical_id: info.memory_size_mb
+        for logical_id, info in load_template_index(template_path).lambdas.items()
+    }
+
+
+@dataclass
+class ApiRoute:
+    """Una operación del RestApi y la función Lambda que la atiende"""
+    api_id: str
+    path: str
+    method: str  # en minúsculas, 'any' para x-amazon-apigateway-any-method
+    lambda_name: Optional[str]
+    source: str  # 'body' (definición OpenAPI del RestApi) o 'permission'
+    has_permission: bool = False
+
+
+def _referenced_resources(value: Any) -> List[str]:
+    """Nombres lógicos referenciados por un valor con funciones intrínsecas."""
+    if isinstance(value, str):
+        return _SUB_VARIABLE_RE.findall(value)
+    if isinstance(value, list):
+        return [name for item in value for name in _referenced_resources(item)]
+    if isinstance(value, dict):
+        if 'Ref' in value and isinstance(value['Ref'], str):
+            return [value['Ref']]
+        if 'Fn::GetAtt' in value:
+            target = value['Fn::GetAtt']
+            return [target[0]] if isinstance(target, list) and target else []
+        return [name for item in value.values() for name in _referenced_resources(item)]
+    return []
+
+
+def _permission_patterns(index: TemplateIndex) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Permisos de invocación desde API Gateway: Lambda -> [(api, patrón stage/METHOD/path)].
+
+    El api es '*' cuando el SourceArn no referencia un RestApi del template.
+    """
+    patterns: Dict[str, List[Tuple[str, str]]] = {}
+    for properties in (r.get('Properties') or {} for r in index.resources_of_type(LAMBDA_PERMISSION_TYPE).values()):
+        if properties.get('Principal') != 'apigateway.amazonaws.com':
+            continue
+        functions = [name for name in _referenced_resources(properties.get('FunctionName')) if name in index.lambdas]
+        if not functions:
+            continue
+        source_arn = properties.get('SourceArn')
+        api_id, pattern = '*', '*'
+        if source_arn is not None:
+            arn = source_arn.get('Fn::Sub') if isinstance(source_arn, dict) else source_arn
+            if isinstance(arn, list):
+                arn = arn[0] if arn else ''
+            arn = arn if isinstance(arn, str) else ''
+            apis = [name for name in _SUB_VARIABLE_RE.findall(arn)
+                    if index.resources.get(name, {}).get('Type') == REST_API_TYPE]
+            if apis:
+                api_id = apis[0]
+                # Lo que sigue al id del api: /stage/METHOD/path
+                pattern = re.split(r'\$\{' + api_id + r'(?:\.[A-Za-z0-9.]+)?\}', arn, maxsplit=1)[-1].lstrip('/') or '*'
+        for function in functions:
+            patterns.setdefault(function, []).append((api_id, pattern))
+    return patterns
+
+
+def _stage_names(index: TemplateIndex, api_id: str) -> List[str]:
+    names = [
+        (r.get('Properties') or {}).get('StageName')
+        for r in index.resources_of_type(API_STAGE_TYPE).values()
+        if api_id in _referenced_resources((r.get('Properties') or {}).get('RestApiId'))
+    ]
+    return [name for name in names if isinstance(name, str)] or ['*']
+
+
+def discover_api_routes(index: TemplateIndex) -> List[ApiRoute]:
+    """
+    Arma el mapa endpoint -> Lambda del template.
+
+    Las rutas salen de la definición OpenAPI inline (Body) de cada
+    AWS::ApiGateway::RestApi, siguiendo el uri de x-amazon-apigateway-integration
+    hasta la función Lambda. Los AWS::Lambda::Permission indican si API Gateway
+    puede invocar esa función en esa ruta; un permiso con método y path
+    concretos que no está en el Body agrega la ruta con source='permission'.
+
+    Args:
+        index: Índice del template
+
+    Returns:
+        Lista de ApiRoute en el orden del template
+    """
+    permissions = _permission_patterns(index)
+    routes: List[ApiRoute] = []
+    seen = set()
+
+    def permitted(api_id: str, lambda_name: Optional[str], method: str, path: str) -> bool:
+        if lambda_name is None:
+            return False
+        verb = '*' if method == 'any' else method.upper()
+        for stage in _stage_names(index, api_id):
+            candidate = f'{stage}/{verb}{path}'
+            for permission_api, pattern in permissions.get(lambda_name, []):
+                if permission_api in ('*', api_id) and fnmatch.fnmatchcase(candidate, pattern):
+                    return True
+        return False
+
+    for api_id, api in index.resources_of_type(REST_API_TYPE).items():
+        body = (api.get('Properties') or {}).get('Body')
+        if not isinstance(body, dict):
+            continue
+        for path, path_item in (body.get('paths') or {}).items():
+            if not isinstance(path_item, dict):
+                continue
+            for key, operation in path_item.items():
+                method = 'any' if key == 'x-amazon-apigateway-any-method' else key.lower()
+                if method not in HTTP_METHODS + ('any',) or not isinstance(operation, dict):
+                    continue
+                integration = operation.get('x-amazon-apigateway-integration') or {}
+                targets = [name for name in _referenced_resources(integration.get('uri')) if name in index.lambdas]
+                lambda_name = targets[0] if targets else None
+                routes.append(ApiRoute(
+                    api_id=api_id, path=path, method=method, lambda_name=lambda_name, source='body',
+                    has_permission=permitted(api_id, lambda_name, method, path)
+                ))
+                seen.add((api_id, path, method))
+
+    for lambda_name, patterns in permissions.items():
+        for api_id, pattern in patterns:
+            parts = pattern.split('/', 2)
+            if api_id == '*' or len(parts) < 3 or '*' in parts[1] + parts[2]:
+                continue
+            method, path = parts[1].lower(), '/' + parts[2]
+            if (api_id, path, method) not in seen:
+                seen.add((api_id, path, method))
+                routes.append(ApiRoute(api_id=api_id, path=path, method=method, lambda_name=lambda_name,
+                                       source='permission', has_permission=True))
+    return routes
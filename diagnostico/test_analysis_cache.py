@@ -0,0 +1,78 @@
+"""
+Tests del cache de análisis de código Lambda.
+"""
+
+import os
+import tempfile
+import unittest
+
+import analysis_cache
+from analysis_cache import AnalysisCache, cache_key
+from lambda_analyzer import extract_fields, analyze_lambda_code
+
+
+CODE = """
+import json
+def handler(event, context):
+    body = json.loads(event['body'])
+    fecha = body.get('fechaTurno') or body.get('fecha')
+    update_expression = 'SET fechaTurno = :f'
+"""
+
+
+class TestAnalysisCache(unittest.TestCase):
+    """Tests del LRU y del store en disco."""
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = AnalysisCache(max_entries=2)
+        calls = []
+        compute = lambda source: cache.get_or_compute('k', '1', source, lambda: calls.append(source) or source)
+        compute('a')
+        compute('b')
+        compute('a')
+        compute('c')  # desaloja 'b'
+        compute('a')
+        compute('b')
+        self.assertEqual(calls, ['a', 'b', 'c', 'b'])
+        self.assertEqual(cache.stats.hits, 2)
+
+    def test_disk_store_survives_new_instance_and_version_bump(self):
+        with tempfile.TemporaryDirectory() as directory:
+            AnalysisCache(directory=directory).get_or_compute('fields', '1', CODE, lambda: [['x'], []])
+
+            cache = AnalysisCache(directory=directory)
+            value = cache.get_or_compute('fields', '1', CODE, lambda: self.fail('no debería recalcular'))
+            self.assertEqual(value, [['x'], []])
+            self.assertEqual(cache.stats.disk_hits, 1)
+
+            cache.get_or_compute('fields', '2', CODE, lambda: [['y'], []])
+            self.assertEqual(cache.stats.misses, 1)
+
+            # Una entrada corrupta se recalcula
+            path = cache._path(cache_key('fields', '1', CODE))
+            with open(path, 'w') as f:
+                f.write('{')
+            cache.clear()
+            self.assertEqual(cache.get_or_compute('fields', '1', CODE, lambda: [['z'], []]), [['z'], []])
+            self.assertTrue(os.path.exists(path))
+
+    def test_analyzer_results_are_cached_and_isolated(self):
+        previous = analysis_cache._default_cache
+        cache = analysis_cache.configure_analysis_cache()
+        try:
+            processed, update = extract_fields(CODE)
+            processed.append('mutado')
+            self.assertEqual(extract_fields(CODE), extract_fields(CODE, use_cache=False))
+            self.assertGreaterEqual(cache.stats.hits, 1)
+
+            first = analyze_lambda_code('A', CODE)
+            second = analyze_lambda_code('B', CODE)
+            self.assertEqual(second.lambda_name, 'B')
+            self.assertEqual(first.findings, second.findings)
+            self.assertIsNot(first.findings[0], second.findings[0])
+        finally:
+            analysis_cache._default_cache = previous
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Tests del diagnóstico en lote de stacks.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from batch_diagnosis import discover_stacks, run_batch
+
+
+TEMPLATE = os.path.join(os.path.dirname(__file__), '..', 'documentos_salud_connect_ia',
+                        'turnos-medicos-api-final.yaml')
+
+
+class TestBatchDiagnosis(unittest.TestCase):
+    """Descubrimiento de templates y reporte JSON Lines."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        for tenant in ('clinica-a', 'clinica-b'):
+            os.makedirs(os.path.join(self.directory, tenant))
+            shutil.copy(TEMPLATE, os.path.join(self.directory, tenant, 'prod.yaml'))
+        with open(os.path.join(self.directory, 'clinica-a', 'prod.openapi.yaml'), 'w') as f:
+            f.write("paths: {}\n")
+        with open(os.path.join(self.directory, 'roto.yaml'), 'w') as f:
+            f.write("Resources: {x: {Type: 'AWS::Lambda::Function'\n")
+        with open(os.path.join(self.directory, 'notas.yaml'), 'w') as f:
+            f.write("otra: cosa\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _run(self, workers):
+        targets = discover_stacks([self.directory], openapi_path=None, prompt_path=None)
+        output = os.path.join(self.directory, f'salida-{workers}.jsonl')
+        summary = run_batch(targets, output, workers=workers)
+        with open(output) as f:
+            records = [json.loads(line) for line in f]
+        return targets, summary, records
+
+    def test_discovers_templates_and_companions(self):
+        targets = discover_stacks([self.directory], openapi_path=None, prompt_path=None)
+        self.assertEqual([t.stack_name for t in targets], ['clinica-a/prod', 'clinica-b/prod', 'roto'])
+        self.assertTrue(targets[0].openapi_path.endswith('prod.openapi.yaml'))
+        self.assertIsNone(targets[1].openapi_path)
+
+    def test_parallel_report_matches_serial(self):
+        _, serial_summary, serial = self._run(workers=1)
+        _, parallel_summary, parallel = self._run(workers=2)
+
+        self.assertEqual(serial[-1]['type'], 'summary')
+        self.assertEqual((serial_summary['ok'], serial_summary['errors']), (2, 1))
+        self.assertEqual(parallel_summary['workers'], 2)
+
+        def comparable(records):
+            return sorted(
+                json.dumps({k: v for k, v in r.items() if k not in ('timings_ms', 'worker_pid')}, sort_keys=True)
+                for r in records if r['type'] == 'stack'
+            )
+
+        self.assertEqual(comparable(serial), comparable(parallel))
+        by_stack = {r['stack']: r for r in serial if r['type'] == 'stack'}
+        self.assertEqual(by_stack['roto']['status'], 'error')
+        self.assertIn('ModifyTurnoFunction', by_stack['clinica-b/prod']['lambdas'])
+        self.assertIn('total', by_stack['clinica-a/prod']['timings_ms'])
+
+
+if __name__ == '__main__':
+    unittest.main()
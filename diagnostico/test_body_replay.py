@@ -0,0 +1,81 @@
+"""
+Tests del replay de request bodies contra el schema de OpenAPI.
+"""
+
+import json
+import unittest
+
+from body_replay import BodyReplay, get_body_validator
+
+
+def _spec():
+    return {
+        'paths': {
+            '/turnos/{turnoId}': {'post': {'requestBody': {'content': {'application/json': {'schema': {
+                '$ref': '#/components/schemas/Modificar'}}}}}},
+        },
+        'components': {'schemas': {'Modificar': {
+            'type': 'object',
+            'required': ['pacienteId'],
+            'properties': {
+                'pacienteId': {'type': 'string'},
+                'fechaTurno': {'type': 'string', 'format': 'date'},
+                'horaTurno': {'type': 'string', 'description': 'Hora (HH:MM)'},
+                'prioridad': {'type': 'integer', 'minimum': 1, 'maximum': 3},
+                'estado': {'type': 'string', 'enum': ['activo', 'cancelado'], 'nullable': True},
+            }
+        }}}
+    }
+
+
+def _line(ts, body, path='/turnos/T-1'):
+    return f'{ts} ' + json.dumps({'level': 'INFO', 'event': {
+        'body': json.dumps(body), 'httpMethod': 'POST', 'path': path}})
+
+
+class TestBodyValidator(unittest.TestCase):
+    """Chequeos del validador compilado."""
+
+    def test_violations_by_field_and_kind(self):
+        validator = get_body_validator(_spec(), '/turnos/{turnoId}')
+        self.assertEqual(validator.validate({
+            'pacienteId': 'P1', 'fechaTurno': '2025-02-15', 'horaTurno': '09:00', 'estado': None}), [])
+        self.assertEqual(sorted(validator.validate({
+            'fecha': '15/02/2025', 'horaTurno': '9hs', 'prioridad': 7, 'estado': 'borrado'})), [
+            ('estado', 'enum'), ('fecha', 'undocumented'), ('horaTurno', 'format'),
+            ('pacienteId', 'missing'), ('prioridad', 'range')])
+        self.assertEqual(validator.validate({'pacienteId': 'P1', 'prioridad': True}), [('prioridad', 'type')])
+        self.assertEqual(validator.substitute_for('fecha'), 'fechaTurno')
+        self.assertIsNone(validator.substitute_for('observaciones'))
+
+    def test_validator_is_compiled_once_per_spec(self):
+        spec = _spec()
+        validator = get_body_validator(spec, '/turnos/{turnoId}')
+        self.assertIs(get_body_validator(spec, '/turnos/{turnoId}'), validator)
+        self.assertIsNot(get_body_validator(_spec(), '/turnos/{turnoId}'), validator)
+        self.assertIsNone(get_body_validator(spec, '/no-existe'))
+
+
+class TestBodyReplay(unittest.TestCase):
+    """Replay en streaming de líneas de log."""
+
+    def test_rates_substitutions_and_timeline(self):
+        replay = BodyReplay(_spec(), bucket_seconds=3600)
+        replay.add_lines([
+            _line('2026-02-05T14:10:00Z', {'pacienteId': 'P1', 'fecha': '2025-02-15'}),
+            _line('2026-02-05T14:20:00Z', {'pacienteId': 'P1', 'fechaTurno': '2025-02-15'}),
+            _line('2026-02-05T15:05:00Z', {'pacienteId': 'P1', 'fechaTurno': '2025-02-15'}),
+            _line('2026-02-05T15:06:00Z', {'pacienteId': 'P1'}, path='/desconocido'),
+            '2026-02-05T15:07:00Z END RequestId: abc',
+        ])
+        report = replay.report()
+        self.assertEqual((report.total_lines, report.body_count, report.unmatched_bodies), (5, 4, 1))
+        operation, = report.operations
+        self.assertEqual((operation.endpoint, operation.bodies, operation.invalid_bodies), ('/turnos/{turnoId}', 3, 1))
+        self.assertEqual(operation.substitutions, {'fecha -> fechaTurno': 1})
+        self.assertEqual(operation.timeline('fecha'), [
+            ('2026-02-05T14:00:00+00:00', 2, 0.5), ('2026-02-05T15:00:00+00:00', 1, 0.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
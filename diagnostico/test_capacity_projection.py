@@ -0,0 +1,131 @@
+"""
+Tests de la proyección de capacidad y costo.
+"""
+
+import math
+import os
+import tempfile
+import unittest
+
+from capacity_projection import log_time_span, project_capacity, saturation_multiplier
+from cloudwatch_analyzer import LambdaMetrics, LogAnalysis, ReportMetrics
+from template_index import build_template_index
+
+
+QUERY_HANDLER = """
+import os
+import boto3
+from boto3.dynamodb.conditions import Key
+
+table = boto3.resource('dynamodb').Table(os.environ['TURNOS_TABLE_NAME'])
+
+def handler(event, context):
+    return table.query(IndexName='PacienteIndex', KeyConditionExpression=Key('pacienteId').eq(event['pacienteId']))
+"""
+
+PUT_HANDLER = """
+import os
+import boto3
+
+table = boto3.resource('dynamodb').Table(os.environ['TURNOS_TABLE_NAME'])
+
+def handler(event, context):
+    table.put_item(Item={'turnoId': '1', 'pacienteId': event['pacienteId'], 'fecha': event['fecha']})
+"""
+
+
+def _function(code, memory=128, timeout=3):
+    return {'Type': 'AWS::Lambda::Function', 'Properties': {
+        'Runtime': 'python3.13', 'MemorySize': memory, 'Timeout': timeout, 'Code': {'ZipFile': code},
+        'Environment': {'Variables': {'TURNOS_TABLE_NAME': {'Ref': 'TurnosTable'}}}}}
+
+
+def _template():
+    return build_template_index({'Resources': {
+        'TurnosTable': {'Type': 'AWS::DynamoDB::Table', 'Properties': {
+            'KeySchema': [{'AttributeName': 'turnoId', 'KeyType': 'HASH'}],
+            'GlobalSecondaryIndexes': [{'IndexName': 'PacienteIndex', 'Projection': {'ProjectionType': 'ALL'},
+                                        'KeySchema': [{'AttributeName': 'pacienteId', 'KeyType': 'HASH'}]}],
+            'BillingMode': 'PAY_PER_REQUEST'}},
+        'GetFn': _function(QUERY_HANDLER),
+        'CreateFn': _function(PUT_HANDLER),
+        'SeedFn': _function('def handler(event, context):\n    pass\n', memory=256, timeout=300),
+        'Seed': {'Type': 'AWS::CloudFormation::CustomResource', 'Properties': {
+            'ServiceToken': {'Fn::GetAtt': ['SeedFn', 'Arn']}, 'TableName': {'Ref': 'TurnosTable'}}},
+    }})
+
+
+def _analysis(name, invocations, duration_ms, bodies):
+    metrics = LambdaMetrics()
+    for i in range(invocations):
+        metrics.add_report(ReportMetrics(f'req-{i}', duration_ms, math.ceil(duration_ms), 128, 60.0, None))
+    analysis = LogAnalysis(name, 'last 1 hours', invocations, 0, bodies, {}, [])
+    analysis.lambda_metrics = metrics
+    return analysis
+
+
+class TestCapacityProjection(unittest.TestCase):
+
+    def test_saturation_multiplier(self):
+        self.assertAlmostEqual(saturation_multiplier(lambda k: 2 * k, 100), 50, delta=0.01)
+        self.assertEqual(saturation_multiplier(lambda k: 1.0, 100), math.inf)
+
+    def test_log_time_span(self):
+        """La ventana sale de los timestamps de los eventos, no del rango nominal del análisis."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'fn.log')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('2026-02-05T10:00:00Z START RequestId: a Version: $LATEST\n'
+                        '{"time": "2026-02-05T13:00:00Z", "type": "platform.report"}\n'
+                        '2026-02-05T16:00:00.500Z REPORT RequestId: b\tDuration: 1.00 ms\n'
+                        'sin timestamp\n')
+            self.assertEqual(log_time_span([path]), 6 * 3600 + 0.5)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('sin timestamp\n')
+            self.assertIsNone(log_time_span([path]))
+
+    def test_projection_scales_with_traffic(self):
+        analyses = {
+            'GetFn': _analysis('GetFn', 3600, 100.0, [{'pacienteId': f'p{i % 10}'} for i in range(100)]),
+            'CreateFn': _analysis('CreateFn', 360, 50.0, [{'pacienteId': 'p1', 'fecha': '2025-01-01'}]),
+        }
+        report = project_capacity(_template(), analyses, 3600, {'TurnosTable': []})
+
+        loads = {load.name: load for load in report.functions}
+        self.assertAlmostEqual(loads['GetFn'].rate_per_second, 1.0)
+        self.assertTrue(loads['SeedFn'].deploy_time)
+
+        base, ten, hundred = report.projections
+        self.assertAlmostEqual(ten.lambda_gb_seconds / base.lambda_gb_seconds, 10)
+        self.assertAlmostEqual(hundred.lambda_requests / base.lambda_requests, 100)
+        self.assertGreater(hundred.read_units, base.read_units * 100)  # las particiones crecen
+        self.assertGreater(base.cost_usd['lambda'], 0)
+
+    def test_unpaginated_query_saturates_first(self):
+        analyses = {
+            'GetFn': _analysis('GetFn', 3600, 100.0, [{'pacienteId': 'p1'}]),
+            'CreateFn': _analysis('CreateFn', 36000, 50.0, [{'pacienteId': 'p1', 'fecha': '2025-01-01'}]),
+        }
+        report = project_capacity(_template(), analyses, 3600, {})
+
+        first = report.first_saturation
+        self.assertIn('sin paginar', first.resource)
+        self.assertIn('GetFn', first.resource)
+        self.assertLess(first.multiplier, 1)
+
+    def test_seed_saturation_scales_with_items(self):
+        """Las funciones de seed se proyectan contra los ítems y no definen la primera saturación."""
+        items = [{'turnoId': f't{i}', 'pacienteId': f'p{i}', 'notas': 'x' * 500} for i in range(100)]
+        report = project_capacity(_template(), {}, 3600, {'TurnosTable': items})
+
+        self.assertFalse(report.traffic_observed)
+        self.assertIsNone(report.first_saturation)
+        seeds = [s for s in report.saturations if s.component == 'Lambda SeedFn']
+        self.assertEqual({s.driver for s in seeds}, {'ítems de seed'})
+        for saturation in seeds:
+            self.assertEqual(saturation.demand, 100)
+            self.assertAlmostEqual(saturation.limit / saturation.demand, saturation.multiplier)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,246 @@
+"""
+Tests para el analizador de logs de CloudWatch.
+
+Feature: diagnostico-actualizacion-turnos
+"""
+
+import os
+import tempfile
+import unittest
+from cloudwatch_analyzer import (
+    analyze_cloudwatch_logs,
+    analyze_cloudwatch_log_stream,
+    analyze_cloudwatch_log_file,
+    analyze_cloudwatch_logs_parallel,
+    LogAnalysisAccumulator,
+    parse_log_entry,
+    parse_report_line,
+    load_lambda_memory_sizes,
+    partition_seeds,
+    LatencyHistogram
+)
+
+from request_correlation import correlate_requests
+
+
+TEMPLATE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..',
+    'documentos_salud_connect_ia', 'turnos-medicos-api-final.yaml'
+)
+
+
+SAMPLE_LOGS = [
+    '{"level": "INFO", "message": "Modificar turno request received", "requestId": "abc123", "event": {"body": "{\\"turnoId\\": \\"TURNO-123\\", \\"pacienteId\\": \\"PAC-456\\", \\"fechaTurno\\": \\"2026-02-10\\", \\"horaTurno\\": \\"14:00\\"}"}}',
+    '{"level": "INFO", "message": "Modifying reservation", "requestId": "abc123", "turnoId": "TURNO-123"}',
+    '{"level": "ERROR", "message": "Missing required parameters", "requestId": "def456", "missingParameters": ["fechaTurno"]}',
+    '{"level": "INFO", "message": "Reservation modified successfully", "requestId": "abc123"}',
+    '{"level": "INFO", "message": "Crear turno request received", "requestId": "ghi789", "event": {"body": "{\\"medicoId\\": \\"M-1\\", \\"fecha\\": \\"2026-02-11\\", \\"hora\\": \\"09:00\\"}"}}',
+    'START RequestId: 8f5e Version: $LATEST',
+    '',
+]
+
+
+class TestParseLogEntry(unittest.TestCase):
+    """Tests del extractor rápido de JSON."""
+
+    def test_lines_without_json(self):
+        """Las líneas START/END/REPORT sin '{' devuelven None."""
+        self.assertIsNone(parse_log_entry('START RequestId: 8f5e Version: $LATEST'))
+        self.assertIsNone(parse_log_entry('REPORT RequestId: 8f5e\tDuration: 12.5 ms\tBilled Duration: 13 ms'))
+        self.assertIsNone(parse_log_entry('solo cierra }'))
+
+    def test_lambda_text_prefix(self):
+        """El JSON después del prefijo timestamp/requestId/level se extrae."""
+        line = '2026-02-05T14:00:00.000Z\tabc123\tINFO\t{"message": "ok", "requestId": "abc123"}'
+        self.assertEqual(parse_log_entry(line), {'message': 'ok', 'requestId': 'abc123'})
+
+    def test_embedded_json_is_greedy(self):
+        """El JSON embebido va del primer '{' al último '}' como la regex original."""
+        line = '2026-02-05T14:00:00 {"a": {"b": 1}} trailing'
+        self.assertEqual(parse_log_entry(line), {'a': {'b': 1}})
+        self.assertIsNone(parse_log_entry('x {"a": 1} y {"b": 2}'))
+
+    def test_multiline_falls_back_to_regex(self):
+        """Con saltos de línea se conserva la semántica de la regex sin DOTALL."""
+        self.assertEqual(parse_log_entry('x {"a": 1}\n{"b": 2'), {'a': 1})
+
+
+class TestStreamingAnalysis(unittest.TestCase):
+    """Tests del modo streaming con memoria acotada."""
+
+    def test_stream_matches_list_analysis(self):
+        """El modo streaming produce los mismos agregados que el modo lista."""
+        logs = SAMPLE_LOGS * 40
+
+        expected = analyze_cloudwatch_logs(logs, 'ModifyTurnoFunction')
+        result = analyze_cloudwatch_log_stream(iter(logs), 'ModifyTurnoFunction')
+
+        self.assertEqual(result.total_entries, expected.total_entries)
+        self.assertEqual(result.patterns, expected.patterns)
+        self.assertEqual(result.field_stats, expected.field_stats)
+        self.assertEqual(result.recommendations, expected.recommendations)
+        self.assertEqual(result.request_body_count, len(expected.request_bodies))
+
+    def test_stream_keeps_bounded_sample(self):
+        """El reservoir nunca supera max_sample_bodies."""
+        logs = SAMPLE_LOGS * 100
+
+        result = analyze_cloudwatch_log_stream(logs, max_sample_bodies=10, seed=7)
+
+        self.assertEqual(len(result.request_bodies), 10)
+        self.assertEqual(result.request_body_count, 200)
+
+    def test_file_analysis(self):
+        """Un archivo exportado se analiza igual que la lista de líneas."""
+        with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False, encoding='utf-8') as f:
+            f.write('\n'.join(SAMPLE_LOGS))
+            path = f.name
+        try:
+            result = analyze_cloudwatch_log_file(path, 'ModifyTurnoFunction')
+        finally:
+            os.unlink(path)
+
+        expected = analyze_cloudwatch_logs(SAMPLE_LOGS, 'ModifyTurnoFunction')
+        self.assertEqual(result.patterns, expected.patterns)
+        self.assertEqual(result.field_stats, expected.field_stats)
+
+
+class TestParallelAnalysis(unittest.TestCase):
+    """Tests de los parciales mezclables del modo paralelo."""
+
+    def test_partitions_get_distinct_seeds(self):
+        """Cada partición muestrea con su propia semilla, reproducible desde la base."""
+        self.assertEqual(partition_seeds(7, 3), [8, 9, 10])
+        self.assertEqual(partition_seeds(None, 2), [None, None])
+
+        logs = SAMPLE_LOGS * 40
+        run = lambda: analyze_cloudwatch_logs_parallel(logs, workers=1, chunk_size=len(SAMPLE_LOGS) * 10,
+                                                       max_sample_bodies=5, seed=3).request_bodies
+        self.assertEqual(run(), run())
+
+    def test_merged_partials_match_serial(self):
+        """Mezclar parciales en orden da el mismo resultado que la ruta serial."""
+        logs = SAMPLE_LOGS * 30
+        expected = analyze_cloudwatch_logs(logs, 'ModifyTurnoFunction')
+
+        merged = LogAnalysisAccumulator(max_sample_bodies=None)
+        for i in range(0, len(logs), 17):
+            partial = LogAnalysisAccumulator(max_sample_bodies=None)
+            partial.add_lines(logs[i:i + 17])
+            merged.merge(partial)
+        result = merged.to_analysis('ModifyTurnoFunction')
+
+        self.assertEqual(result.patterns, expected.patterns)
+        self.assertEqual(result.field_stats, expected.field_stats)
+        self.assertEqual(result.request_bodies, expected.request_bodies)
+        self.assertEqual(result.recommendations, expected.recommendations)
+
+    def test_process_pool_matches_serial(self):
+        """El pool de procesos devuelve el mismo LogAnalysis que la ruta serial."""
+        logs = SAMPLE_LOGS * 30
+        expected = analyze_cloudwatch_logs(logs, 'ModifyTurnoFunction')
+
+        result = analyze_cloudwatch_logs_parallel(logs, 'ModifyTurnoFunction', workers=2, chunk_size=50)
+
+        self.assertEqual(result, expected)
+
+
+class TestReportMetrics(unittest.TestCase):
+    """Tests del parser de líneas REPORT y los histogramas de latencia."""
+
+    def test_parse_text_report(self):
+        """Se parsea la línea REPORT en formato texto, con Init Duration."""
+        line = ('2026-02-05T14:00:00 REPORT RequestId: 8f5e-11\tDuration: 215.43 ms\t'
+                'Billed Duration: 216 ms\tMemory Size: 128 MB\tMax Memory Used: 89 MB\t'
+                'Init Duration: 412.08 ms')
+        report = parse_report_line(line)
+
+        self.assertEqual(report.request_id, '8f5e-11')
+        self.assertAlmostEqual(report.duration_ms, 215.43)
+        self.assertEqual(report.memory_size_mb, 128)
+        self.assertEqual(report.max_memory_used_mb, 89)
+        self.assertAlmostEqual(report.init_duration_ms, 412.08)
+
+    def test_parse_json_platform_report(self):
+        """Se parsea el evento platform.report del LogFormat JSON."""
+        line = ('{"time": "2026-02-05T14:00:00Z", "type": "platform.report", "record": '
+                '{"requestId": "r-1", "metrics": {"durationMs": 10.5, "billedDurationMs": 11, '
+                '"memorySizeMB": 128, "maxMemoryUsedMB": 70}}}')
+        report = parse_report_line(line)
+
+        self.assertEqual(report.request_id, 'r-1')
+        self.assertIsNone(report.init_duration_ms)
+
+    def test_analysis_collects_cold_starts(self):
+        """El análisis acumula invocaciones y cold starts de las líneas REPORT."""
+        logs = [
+            'REPORT RequestId: a\tDuration: 100.0 ms\tBilled Duration: 100 ms\tMemory Size: 128 MB\tMax Memory Used: 80 MB\tInit Duration: 300.0 ms',
+            'REPORT RequestId: b\tDuration: 20.0 ms\tBilled Duration: 20 ms\tMemory Size: 128 MB\tMax Memory Used: 81 MB',
+        ]
+        summary = analyze_cloudwatch_logs(logs).lambda_metrics.summary()
+
+        self.assertEqual(summary['invocations'], 2)
+        self.assertEqual(summary['cold_start_rate'], 0.5)
+        self.assertAlmostEqual(summary['memory_headroom'], 1 - 81 / 128)
+
+    def test_histogram_percentiles_within_precision(self):
+        """Los percentiles del histograma tienen error relativo acotado."""
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.add(float(value))
+
+        self.assertAlmostEqual(histogram.percentile(50), 500, delta=500 * 0.011)
+        self.assertAlmostEqual(histogram.percentile(99), 990, delta=990 * 0.011)
+
+    def test_template_memory_sizes(self):
+        """Se lee el MemorySize del template, con 128 MB por defecto."""
+        memory_sizes = load_lambda_memory_sizes(TEMPLATE_PATH)
+
+        self.assertEqual(memory_sizes['DataSeedingFunction'], 256)
+        self.assertEqual(memory_sizes['ModifyTurnoFunction'], 128)
+
+
+class TestRequestCorrelation(unittest.TestCase):
+    """Tests de la correlación por requestId."""
+
+    def _invocation(self, request_id, duration, error=False):
+        outcome = (
+            '{"level": "ERROR", "message": "Error modifying reservation", "requestId": "%s", "error": "boom"}'
+            if error else
+            '{"level": "INFO", "message": "Reservation modified successfully", "requestId": "%s"}'
+        )
+        return [
+            '{"level": "INFO", "message": "Modificar turno request received", "requestId": "%s", '
+            '"event": {"body": "{\\"turnoId\\": \\"T-1\\"}"}}' % request_id,
+            outcome % request_id,
+            'REPORT RequestId: %s\tDuration: %.1f ms\tBilled Duration: %d ms\t'
+            'Memory Size: 128 MB\tMax Memory Used: 80 MB' % (request_id, duration, duration),
+        ]
+
+    def test_timelines_and_slowest(self):
+        """Cada request se agrupa en un timeline y se reportan los más lentos."""
+        logs = (self._invocation('a', 50) + self._invocation('b', 300, error=True) +
+                self._invocation('c', 120))
+
+        report = correlate_requests(logs, top_slowest=2)
+
+        self.assertEqual(report.completed_requests, 3)
+        self.assertEqual(report.error_requests, 1)
+        self.assertEqual([t.request_id for t in report.slowest_requests], ['b', 'c'])
+        slowest = report.slowest_requests[0]
+        self.assertEqual([e.kind for e in slowest.events], ['received', 'error', 'report'])
+        self.assertEqual(slowest.body, {'turnoId': 'T-1'})
+        self.assertEqual(report.error_latency.count, 1)
+
+    def test_open_requests_are_bounded(self):
+        """El LRU desaloja requests sin REPORT al superar max_open_requests."""
+        logs = ['{"level": "INFO", "message": "x", "requestId": "r%d"}' % i for i in range(100)]
+
+        report = correlate_requests(logs, max_open_requests=10)
+
+        self.assertEqual(report.open_requests, 10)
+        self.assertEqual(report.evicted_requests, 90)
+
+
+if __name__ == '__main__':
+    unittest.main()
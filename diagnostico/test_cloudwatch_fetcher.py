@@ -0,0 +1,379 @@
+"""
+Tests para el cliente nativo de CloudWatch Logs contra el backend en memoria.
+
+Feature: diagnostico-actualizacion-turnos
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+from cloudwatch_analyzer import analyze_cloudwatch_logs
+from cloudwatch_fetcher import (
+    iter_log_events,
+    fetch_and_analyze,
+    format_event,
+    split_time_range,
+    FetchStats
+)
+from log_cache import LogCache, CachedLogs, fetch_and_analyze_cached, write_log_cache
+from checkpoint_store import CheckpointStore, event_key, incremental_fetch_and_analyze
+from fetch_logs import analyze_log_groups
+from request_correlation import RequestCorrelator, correlate_requests
+from test_cloudwatch_analyzer import SAMPLE_LOGS
+
+
+class InMemoryLogsClient:
+    """
+    Backend falso de CloudWatch Logs en memoria.
+
+    Implementa filter_log_events y describe_log_groups con paginación por
+    nextToken, suficiente para probar el fetcher sin red.
+    """
+
+    def __init__(self, page_size: int = 50):
+        self.page_size = page_size
+        self.calls = 0
+        self._groups: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def put_log_events(self, log_group: str, log_stream: str, events: Iterable[Tuple[int, str]]):
+        """Agrega eventos (timestamp en ms, mensaje) a un log stream."""
+        streams = self._groups.setdefault(log_group, {})
+        stream = streams.setdefault(log_stream, [])
+        for timestamp, message in events:
+            stream.append({
+                'logStreamName': log_stream,
+                'timestamp': timestamp,
+                'message': message,
+                'ingestionTime': timestamp,
+                'eventId': f'{log_stream}-{len(stream)}'
+            })
+        stream.sort(key=lambda e: e['timestamp'])
+
+    def describe_log_groups(self, logGroupNamePrefix: str = '', nextToken: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+        names = sorted(name for name in self._groups if name.startswith(logGroupNamePrefix))
+        start = int(nextToken or 0)
+        page = names[start:start + self.page_size]
+        response = {'logGroups': [{'logGroupName': name} for name in page]}
+        if start + self.page_size < len(names):
+            response['nextToken'] = str(start + self.page_size)
+        return response
+
+    def filter_log_events(self, logGroupName: str, logStreamNames: Optional[List[str]] = None,
+                          startTime: Optional[int] = None, endTime: Optional[int] = None,
+                          filterPattern: Optional[str] = None, nextToken: Optional[str] = None,
+                          limit: Optional[int] = None, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            self.calls += 1
+        if logGroupName not in self._groups:
+            raise KeyError(f'ResourceNotFoundException: {logGroupName}')
+
+        streams = self._groups[logGroupName]
+        selected = logStreamNames if logStreamNames is not None else sorted(streams)
+        events = [
+            event
+            for name in selected
+            for event in streams.get(name, [])
+            if (startTime is None or event['timestamp'] >= startTime)
+            and (endTime is None or event['timestamp'] <= endTime)
+            and (not filterPattern or filterPattern in event['message'])
+        ]
+        events.sort(key=lambda e: (e['timestamp'], e['eventId']))
+
+        page_size = min(limit or self.page_size, self.page_size)
+        start = int(nextToken or 0)
+        response = {'events': events[start:start + page_size]}
+        if start + page_size < len(events):
+            response['nextToken'] = str(start + page_size)
+        return response
+
+
+LOG_GROUP = '/aws/lambda/salud-api-stack-ModifyTurnoFunction-ABC'
+BASE_MS = 1_770_000_000_000
+
+
+def build_client(page_size: int = 7) -> InMemoryLogsClient:
+    """Backend con dos log streams y 3 copias de SAMPLE_LOGS repartidas en el tiempo."""
+    client = InMemoryLogsClient(page_size=page_size)
+    lines = SAMPLE_LOGS * 3
+    for stream in range(2):
+        client.put_log_events(LOG_GROUP, f'2026/02/05/[$LATEST]stream{stream}', [
+            (BASE_MS + i * 1000 + stream, line) for i, line in enumerate(lines)
+        ])
+    return client
+
+
+class TestCloudWatchFetcher(unittest.TestCase):
+    """Tests del fetcher paginado y concurrente."""
+
+    def test_split_time_range_is_disjoint(self):
+        """Los slices cubren la ventana sin solaparse (endTime es inclusivo)."""
+        slices = split_time_range(0, 999, 4)
+
+        self.assertEqual(slices[0][0], 0)
+        self.assertEqual(slices[-1][1], 999)
+        for (_, end), (start, _) in zip(slices, slices[1:]):
+            self.assertEqual(start, end + 1)
+
+    def test_fetches_every_event_once(self):
+        """Con slices y páginas concurrentes se obtiene cada evento una sola vez."""
+        client = build_client()
+        stats = FetchStats(log_group=LOG_GROUP)
+
+        events = list(iter_log_events(
+            client, LOG_GROUP[:-3] + '*', BASE_MS, BASE_MS + 60_000,
+            time_slices=5, max_workers=3, stats=stats
+        ))
+
+        self.assertEqual(len(events), 2 * 3 * len(SAMPLE_LOGS))
+        self.assertEqual(len({e['eventId'] for e in events}), len(events))
+        self.assertGreater(stats.pages, stats.tasks)
+
+    def test_stalled_worker_times_out(self):
+        """Un FilterLogEvents colgado corta la iteración con TimeoutError en vez de bloquear."""
+        client = build_client()
+        release = threading.Event()
+        original = client.filter_log_events
+        client.filter_log_events = lambda **kwargs: release.wait() and original(**kwargs)
+        try:
+            with self.assertRaises(TimeoutError):
+                list(iter_log_events(client, LOG_GROUP, BASE_MS, BASE_MS + 60_000, page_timeout=0.2))
+        finally:
+            release.set()
+
+    def test_stream_analysis_matches_list_analysis(self):
+        """Los eventos analizados en streaming dan los mismos agregados."""
+        client = build_client()
+        now_ms = BASE_MS + 60_000
+
+        lines = [format_event(e) for e in iter_log_events(client, LOG_GROUP, BASE_MS, now_ms)]
+        expected = analyze_cloudwatch_logs(lines)
+
+        analysis = fetch_and_analyze(client, LOG_GROUP, minutes=1, now_ms=now_ms, time_slices=3)
+
+        self.assertEqual(analysis.total_entries, len(lines))
+        self.assertEqual(analysis.patterns, expected.patterns)
+        self.assertEqual(analysis.field_stats.keys(), expected.field_stats.keys())
+        self.assertEqual(analysis.request_body_count, expected.request_body_count)
+
+
+class TestConcurrentLogGroups(unittest.TestCase):
+    """Tests del orquestador de varios log groups."""
+
+    def test_concurrent_matches_sequential(self):
+        """La corrida concurrente analiza todos los log groups igual que la secuencial."""
+        client = InMemoryLogsClient(page_size=5)
+        now_ms = int(time.time() * 1000)
+        log_groups = []
+        for i in range(5):
+            name = f'/aws/lambda/salud-api-stack-Function{i}-X'
+            client.put_log_events(name, 's', [(now_ms - 1000 * (j + 1), line) for j, line in enumerate(SAMPLE_LOGS * (i + 1))])
+            log_groups.append((f'Function{i}', name[:-2] + '*'))
+        seen = []
+
+        concurrent = analyze_log_groups(log_groups, 10, client, max_concurrency=3,
+                                        on_result=lambda name, analysis, stats: seen.append(name))
+        sequential = analyze_log_groups(log_groups, 10, client, max_concurrency=1)
+
+        self.assertEqual(sorted(seen), [name for name, _ in log_groups])
+        totals = lambda results: {name: analysis.total_entries for name, analysis, _ in results}
+        self.assertEqual(totals(concurrent), totals(sequential))
+        self.assertEqual(totals(sequential)['Function4'], 5 * len(SAMPLE_LOGS))
+
+    def test_correlation_is_wired_into_the_fetch(self):
+        """Con correlate cada análisis trae su correlación por requestId de las mismas líneas."""
+        client = InMemoryLogsClient(page_size=5)
+        now_ms = int(time.time() * 1000)
+        client.put_log_events(LOG_GROUP, 's', [(now_ms - 30_000 + i, line) for i, line in enumerate(SAMPLE_LOGS * 3)])
+        lines = [format_event(e) for e in iter_log_events(client, LOG_GROUP, now_ms - 60_000, now_ms)]
+        expected = correlate_requests(lines)
+
+        (_, analysis, _), = analyze_log_groups([('Modify', LOG_GROUP)], 1, client, max_concurrency=1, correlate=True)
+        self.assertEqual(analysis.correlation.total_lines, len(lines))
+        self.assertEqual(analysis.correlation.completed_requests, expected.completed_requests)
+        self.assertEqual(analysis.correlation.correlated_lines, expected.correlated_lines)
+        self.assertGreater(expected.correlated_lines, 0)
+
+    def test_correlation_survives_slice_boundaries(self):
+        """Un request partido entre dos slices se correlaciona completo aunque el slice posterior llegue antes."""
+        client = InMemoryLogsClient(page_size=2)
+        boundary = split_time_range(BASE_MS, BASE_MS + 60_000, 4)[1][0]
+        client.put_log_events(LOG_GROUP, 's', [
+            (boundary - 10, 'START RequestId: r1 Version: $LATEST'),
+            (boundary - 5, '{"level": "ERROR", "message": "Turno no encontrado", "requestId": "r1"}'),
+            (boundary + 5, 'REPORT RequestId: r1\tDuration: 12.5 ms\tBilled Duration: 13 ms\t'
+                           'Memory Size: 128 MB\tMax Memory Used: 60 MB'),
+            (boundary + 20_000, 'START RequestId: r2 Version: $LATEST'),
+            (boundary + 20_001, 'REPORT RequestId: r2\tDuration: 3.0 ms\tBilled Duration: 3 ms\t'
+                                'Memory Size: 128 MB\tMax Memory Used: 60 MB'),
+        ])
+        original = client.filter_log_events
+
+        def slow_first_slice(**kwargs):
+            if kwargs['startTime'] == BASE_MS:
+                time.sleep(0.2)
+            return original(**kwargs)
+
+        client.filter_log_events = slow_first_slice
+        correlator = RequestCorrelator()
+        fetch_and_analyze(client, LOG_GROUP, minutes=1, now_ms=BASE_MS + 60_000, time_slices=4, correlator=correlator)
+
+        report = correlator.report()
+        self.assertEqual(report.completed_requests, 2)
+        self.assertEqual(report.open_requests, 0)
+        self.assertEqual(report.error_requests, 1)
+
+
+class TestIncrementalAnalysis(unittest.TestCase):
+    """Tests del análisis incremental con checkpoints."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'checkpoints.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_second_run_only_processes_new_events(self):
+        """Las corridas sucesivas suman solo eventos nuevos y coinciden con una corrida completa."""
+        client = InMemoryLogsClient(page_size=5)
+        first = [(BASE_MS + i * 1000, line) for i, line in enumerate(SAMPLE_LOGS * 2)]
+        client.put_log_events(LOG_GROUP, 's', first)
+
+        analysis, new_events = incremental_fetch_and_analyze(
+            client, LOG_GROUP, CheckpointStore(self.path), now_ms=BASE_MS + 30_000)
+        self.assertEqual(new_events, len(first))
+
+        # Un evento llega con demora dentro del solapamiento y otros después del checkpoint
+        late = [(BASE_MS + 13_500, SAMPLE_LOGS[2])]
+        later = [(BASE_MS + 40_000 + i * 1000, line) for i, line in enumerate(SAMPLE_LOGS)]
+        client.put_log_events(LOG_GROUP, 's', late + later)
+
+        store = CheckpointStore(self.path)
+        analysis, new_events = incremental_fetch_and_analyze(
+            client, LOG_GROUP, store, now_ms=BASE_MS + 60_000)
+        self.assertEqual(new_events, len(late) + len(later))
+        self.assertEqual(store.get(LOG_GROUP).runs, 2)
+
+        full = analyze_cloudwatch_logs([line for _, line in sorted(first + late + later)])
+        self.assertEqual(analysis.total_entries, full.total_entries)
+        self.assertEqual(analysis.patterns, full.patterns)
+        self.assertEqual(analysis.field_stats, full.field_stats)
+        self.assertEqual(analysis.request_body_count, full.request_body_count)
+
+        # Sin eventos nuevos no cambia nada
+        analysis, new_events = incremental_fetch_and_analyze(
+            client, LOG_GROUP, store, now_ms=BASE_MS + 90_000)
+        self.assertEqual(new_events, 0)
+        self.assertEqual(analysis.total_entries, full.total_entries)
+
+    def test_checkpoints_are_copies_and_events_without_id_dedupe(self):
+        """get devuelve una copia y los eventos sin eventId se deduplican por contenido."""
+        store = CheckpointStore(self.path)
+        incremental_fetch_and_analyze(build_client(), LOG_GROUP, store, now_ms=BASE_MS + 60_000)
+        checkpoint = store.get(LOG_GROUP)
+        checkpoint.recent_event_ids.clear()
+        checkpoint.runs = 99
+        self.assertEqual(store.get(LOG_GROUP).runs, 1)
+        self.assertTrue(store.get(LOG_GROUP).recent_event_ids)
+
+        event = {'timestamp': BASE_MS, 'logStreamName': 's', 'message': 'START'}
+        self.assertEqual(event_key(event), event_key(dict(event)))
+        self.assertNotEqual(event_key(event), event_key(dict(event, logStreamName='t')))
+        self.assertEqual(event_key(dict(event, eventId='e-1')), 'e-1')
+
+
+class TestLogCache(unittest.TestCase):
+    """Tests del cache columnar local."""
+
+    REPORT = ('REPORT RequestId: r-1\tDuration: 20.5 ms\tBilled Duration: 21 ms\t'
+              'Memory Size: 128 MB\tMax Memory Used: 80 MB\tInit Duration: 300.0 ms')
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.client = build_client()
+        self.client.put_log_events(LOG_GROUP, 'report', [(BASE_MS + 5_500, self.REPORT)])
+        self.events = list(iter_log_events(self.client, LOG_GROUP, BASE_MS, BASE_MS + 60_000))
+        self.lines = [format_event(e) for e in sorted(self.events, key=lambda e: (e['timestamp'], e['eventId']))]
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_cached_analysis_matches_text_analysis(self):
+        """Analizar las columnas da lo mismo que analizar las líneas, también por rango."""
+        path = os.path.join(self.tmpdir.name, 'window.dxlc')
+        write_log_cache(path, self.events, LOG_GROUP, BASE_MS, BASE_MS + 60_000)
+
+        with CachedLogs(path) as cached:
+            self.assertEqual(list(cached.iter_lines()), self.lines)
+            for start_ms, end_ms in [(None, None), (BASE_MS + 3_000, BASE_MS + 9_000)]:
+                lo, hi = cached.row_range(start_ms, end_ms)
+                expected = analyze_cloudwatch_logs(self.lines[lo:hi])
+                result = cached.analyze(start_ms=start_ms, end_ms=end_ms, max_sample_bodies=None)
+
+                self.assertEqual(result.total_entries, expected.total_entries)
+                self.assertEqual(result.patterns, expected.patterns)
+                self.assertEqual(result.field_stats, expected.field_stats)
+                self.assertEqual(result.request_bodies, expected.request_bodies)
+                self.assertEqual(result.lambda_metrics.summary(), expected.lambda_metrics.summary())
+
+            row = cached.row(0)
+            self.assertEqual((row['level'], row['request_id']), ('INFO', 'abc123'))
+
+    def test_get_or_fetch_reuses_window(self):
+        """La misma ventana no vuelve a llamar a CloudWatch; una posterior descarga solo el delta."""
+        cache = LogCache(self.tmpdir.name)
+        now_ms = BASE_MS + 60_000
+
+        cached, _, _ = cache.get_or_fetch(self.client, LOG_GROUP, minutes=1, now_ms=now_ms)
+        cached.close()
+        calls = self.client.calls
+        cached, _, _ = cache.get_or_fetch(self.client, LOG_GROUP, minutes=1, now_ms=now_ms)
+        with cached:
+            self.assertEqual(len(cached), len(self.events))
+        self.assertEqual(self.client.calls, calls)
+
+        # Un evento posterior al fin cacheado no se pierde: se descarga solo lo que falta
+        self.client.put_log_events(LOG_GROUP, 'late', [(now_ms + 500, 'ERROR tardío')])
+        stats = FetchStats(log_group=LOG_GROUP)
+        cached, start_ms, _ = cache.get_or_fetch(self.client, LOG_GROUP, minutes=1, now_ms=now_ms + 1000,
+                                                 stats=stats)
+        with cached:
+            lines = list(cached.iter_lines())
+        self.assertEqual(stats.events, 1)
+        self.assertEqual(lines[-1], format_event({'timestamp': now_ms + 500, 'message': 'ERROR tardío'}))
+        self.assertEqual(len(lines), sum(1 for e in self.events if e['timestamp'] >= start_ms) + 1)
+
+    def test_eviction_by_age_and_size(self):
+        """Se eliminan los archivos vencidos y los menos usados al superar max_bytes."""
+        cache = LogCache(self.tmpdir.name)
+        for i in range(3):
+            cache.store(LOG_GROUP, BASE_MS + i, BASE_MS + 60_000, self.events)
+        self.assertEqual(len(cache.entries()), 3)
+
+        cache.max_bytes = cache.entries()[0].size_bytes * 2
+        cache.evict()
+        self.assertEqual(len(cache.entries()), 2)
+
+        cache.evict(now=time.time() + cache.max_age_seconds + 1)
+        self.assertEqual(cache.entries(), [])
+
+    def test_window_larger_than_max_bytes_is_kept(self):
+        """Una ventana que sola supera max_bytes se devuelve igual; las anteriores sí se eliminan."""
+        cache = LogCache(self.tmpdir.name)
+        cache.store(LOG_GROUP, BASE_MS, BASE_MS + 30_000, [e for e in self.events if e['timestamp'] <= BASE_MS + 30_000])
+        cache.max_bytes = 100
+
+        analysis = fetch_and_analyze_cached(self.client, cache, LOG_GROUP, minutes=1, now_ms=BASE_MS + 60_000)
+        self.assertEqual(analysis.total_entries, len(self.events))
+        self.assertEqual(len(cache.entries()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
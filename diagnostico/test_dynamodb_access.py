@@ -0,0 +1,123 @@
+"""
+Tests de la extracción de llamadas a DynamoDB y del análisis de acceso.
+"""
+
+import unittest
+
+from dynamodb_access import analyze_dynamodb_access, dynamodb_item_size, expression_attributes
+from lambda_analyzer import extract_dynamo_commands
+from template_index import build_template_index
+
+
+PYTHON_HANDLER = """
+import os
+import boto3
+from boto3.dynamodb.conditions import Key, Attr
+
+table = boto3.resource('dynamodb').Table(os.environ['MEDICOS_TABLE_NAME'])
+
+def handler(event, context):
+    params = {'IndexName': 'EspecialidadIndex'}
+    result = table.query(
+        KeyConditionExpression=Key('especialidad').eq('Cardiología'),
+        FilterExpression=Attr('ciudad').eq('Rosario'),
+        **params
+    )
+    todos = table.scan()
+    table.get_item(Key={'id': '1'})
+"""
+
+
+def _template(code):
+    return build_template_index({'Resources': {
+        'MedicosTable': {'Type': 'AWS::DynamoDB::Table', 'Properties': {
+            'KeySchema': [{'AttributeName': 'medicoId', 'KeyType': 'HASH'}],
+            'GlobalSecondaryIndexes': [{'IndexName': 'EspecialidadIndex', 'Projection': {'ProjectionType': 'ALL'},
+                                        'KeySchema': [{'AttributeName': 'especialidad', 'KeyType': 'HASH'}]}],
+            'BillingMode': 'PAY_PER_REQUEST'}},
+        'SearchFn': {'Type': 'AWS::Lambda::Function', 'Properties': {
+            'Runtime': 'python3.13', 'Code': {'ZipFile': code},
+            'Environment': {'Variables': {'MEDICOS_TABLE_NAME': {'Ref': 'MedicosTable'}}}}},
+    }})
+
+
+class TestDynamoCommandExtraction(unittest.TestCase):
+    """Llamadas de boto3 extraídas con el AST."""
+
+    def test_python_calls_with_conditions_and_spread_params(self):
+        query, scan, get = extract_dynamo_commands(PYTHON_HANDLER, use_cache=False)
+        self.assertEqual((query.command, query.index_name), ('Query', 'EspecialidadIndex'))
+        self.assertEqual(query.table, "os.environ['MEDICOS_TABLE_NAME']")
+        self.assertEqual(query.expressions['KeyConditionExpression'], 'especialidad = :especialidad')
+        self.assertEqual(expression_attributes(query.expressions['FilterExpression']), ['ciudad'])
+        self.assertEqual(scan.command, 'Scan')
+        self.assertEqual(get.key_fields, ['id'])
+
+    def test_consistent_read_and_pagination_per_call(self):
+        """ConsistentRead cuenta solo con el literal verdadero y la paginación es de cada llamada."""
+        python_code = """
+def handler(event, context):
+    table.get_item(Key={'id': '1'}, ConsistentRead=False)
+    table.get_item(Key={'id': '1'}, ConsistentRead=True)
+    table.query(KeyConditionExpression=Key('especialidad').eq('Pediatría'))
+    kwargs = {}
+    while True:
+        page = table.query(KeyConditionExpression=Key('especialidad').eq('Cardiología'), **kwargs)
+        if 'LastEvaluatedKey' not in page:
+            break
+        kwargs['ExclusiveStartKey'] = page['LastEvaluatedKey']
+"""
+        commands = extract_dynamo_commands(python_code, use_cache=False)
+        self.assertEqual([c.consistent_read for c in commands], [False, True, False, False])
+        self.assertEqual([c.paginated for c in commands], [False, False, False, True])
+
+        js_code = """
+exports.handler = async (event) => {
+  await docClient.send(new GetCommand({ TableName: 'T', Key: { id: '1' }, ConsistentRead: false }));
+  await docClient.send(new QueryCommand({ TableName: 'T', KeyConditionExpression: 'a = :a' }));
+  let key;
+  do {
+    const page = await docClient.send(new ScanCommand({ TableName: 'T', ExclusiveStartKey: key }));
+    key = page.LastEvaluatedKey;
+  } while (key);
+};
+"""
+        get, query, scan = extract_dynamo_commands(js_code, use_cache=False)
+        self.assertFalse(get.consistent_read)
+        self.assertEqual([c.paginated for c in (get, query, scan)], [False, False, True])
+
+    def test_expression_attributes_resolve_names_and_skip_functions(self):
+        self.assertEqual(
+            expression_attributes('#e = :e AND begins_with(fecha, :f) OR size(notas) > :n', {'#e': 'estado'}),
+            ['estado', 'fecha', 'notas'])
+
+
+class TestDynamoAccessAnalysis(unittest.TestCase):
+    """Hallazgos y estimación de capacidad contra el key schema."""
+
+    def test_findings_and_read_estimate_from_seed_items(self):
+        seed = [
+            {'medicoId': f'M{i}', 'especialidad': 'Cardiología' if i < 6 else 'Pediatría',
+             'ciudad': 'Rosario' if i % 3 == 0 else 'CABA', 'bio': 'x' * 1000}
+            for i in range(8)
+        ] + [{'especialidad': 'Clínica'}]
+        report = analyze_dynamodb_access(_template(PYTHON_HANDLER), {'MedicosTable': seed})
+
+        query, scan, get = report.patterns
+        self.assertEqual(query.table, 'MedicosTable')
+        self.assertEqual([f.description.split(' ')[0] for f in query.findings], ['FilterExpression', 'Query'])
+        # Cardiología: 6 ítems de ~1 KB -> 2 unidades de 4 KB, eventualmente consistente
+        self.assertEqual(query.estimate.maximum, 1.0)
+        self.assertLess(query.estimate.items_returned, query.estimate.items_read)
+        self.assertTrue(any(f.description.startswith('Scan') for f in scan.findings))
+        self.assertEqual([f.severity for f in get.findings], ['critical'])
+        self.assertEqual([f.severity for f in report.data_findings], ['critical'])
+
+    def test_item_size_follows_dynamodb_rules(self):
+        self.assertEqual(dynamodb_item_size('ñ'), 2)
+        self.assertEqual(dynamodb_item_size(15000), 2)
+        self.assertEqual(dynamodb_item_size({'a': True, 'b': [1, 'xy']}), 3 + (1 + 1 + 1) + (1 + 3 + 2 + 1 + 2 + 1 + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
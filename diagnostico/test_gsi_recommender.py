@@ -0,0 +1,122 @@
+"""
+Tests del recomendador de GSIs por filtros observados.
+"""
+
+import json
+import unittest
+
+from gsi_recommender import SeedTableModel, group_request_bodies, plan_results, recommend_gsis, value_matches
+from template_index import build_template_index
+
+
+SEARCH_CODE = """
+exports.handler = async (event) => {
+  const { especialidad, ciudad } = JSON.parse(event.body);
+  const params = {
+    TableName: process.env.MEDICOS_TABLE_NAME,
+    IndexName: 'EspecialidadIndex',
+    KeyConditionExpression: 'especialidad = :e',
+  };
+  if (ciudad) params.FilterExpression = '%s';
+  return docClient.send(new QueryCommand(params));
+};
+"""
+
+
+def _index(filter_expression='ciudad = :c'):
+    return build_template_index({'Resources': {
+        'MedicosTable': {'Type': 'AWS::DynamoDB::Table', 'Properties': {
+            'KeySchema': [{'AttributeName': 'medicoId', 'KeyType': 'HASH'}],
+            'GlobalSecondaryIndexes': [{'IndexName': 'EspecialidadIndex', 'Projection': {'ProjectionType': 'ALL'},
+                                        'KeySchema': [{'AttributeName': 'especialidad', 'KeyType': 'HASH'}]}]}},
+        'Api': {'Type': 'AWS::ApiGateway::RestApi', 'Properties': {'Body': {'paths': {
+            '/medicos/buscar': {'post': {'x-amazon-apigateway-integration': {
+                'uri': {'Fn::Sub': '${SearchFn.Arn}'}}}}}}}},
+        'SearchFn': {'Type': 'AWS::Lambda::Function', 'Properties': {
+            'Runtime': 'nodejs22.x', 'Code': {'ZipFile': SEARCH_CODE % filter_expression},
+            'Environment': {'Variables': {'MEDICOS_TABLE_NAME': {'Ref': 'MedicosTable'}}}}},
+    }})
+
+
+SEED = [
+    {'medicoId': f'M{i}', 'especialidad': 'Cardiología', 'ciudad': ['CABA', 'Rosario', 'Córdoba'][i % 3],
+     'obrasSociales': [{'nombre': 'OSDE'}], 'bio': 'x' * 3000}
+    for i in range(12)
+]
+
+
+class TestGsiRecommender(unittest.TestCase):
+    """Minado de combinaciones, propuestas y replay."""
+
+    def test_log_bodies_are_grouped_by_route(self):
+        lines = [
+            'ts ' + json.dumps({'event': {'body': json.dumps({'especialidad': 'Cardiología'}),
+                                          'httpMethod': 'POST', 'path': '/medicos/buscar'}}),
+            'ts ' + json.dumps({'body': {'especialidad': 'Pediatría'}}),
+        ]
+        grouped, unmatched = group_request_bodies(lines, _index())
+        self.assertEqual((list(grouped), unmatched), (['SearchFn'], 1))
+        grouped, unmatched = group_request_bodies(lines, _index(), default_lambda='SearchFn')
+        self.assertEqual((len(grouped['SearchFn']), unmatched), (2, 0))
+
+    def test_filtered_combination_gets_sort_key_with_projected_reduction(self):
+        bodies = [{'especialidad': 'Cardiología', 'ciudad': 'Rosario', 'obraSocial': 'OSDE'}] * 3 + \
+                 [{'especialidad': 'Cardiología'}, {'ciudad': 'CABA'}]
+        report = recommend_gsis({'SearchFn': bodies}, _index(), {'MedicosTable': SEED})
+
+        self.assertEqual(report.unmatched_bodies, 1)
+        self.assertEqual([c.attributes for c in report.combinations],
+                         [('ciudad', 'especialidad', 'obrasSociales'), ('especialidad',)])
+        proposal, = report.proposals
+        self.assertEqual((proposal.index_name, proposal.hash_key, proposal.range_key),
+                         ('EspecialidadCiudadIndex', 'especialidad', 'ciudad'))
+        self.assertEqual(proposal.remaining_filters, ['obrasSociales'])
+        self.assertEqual((proposal.replayed, proposal.current_items_read, proposal.proposed_items_read), (3, 36, 12))
+        self.assertAlmostEqual(proposal.current_amplification, 3.0)
+        self.assertAlmostEqual(proposal.proposed_amplification, 1.0)
+        self.assertGreater(proposal.rcu_reduction, 0.5)
+        self.assertEqual(proposal.items_lost, 0)
+
+    def test_proposed_plan_returns_same_items(self):
+        """El plan propuesto devuelve exactamente los ítems del actual, con los mismos filtros."""
+        model = SeedTableModel(SEED)
+        values = {'especialidad': 'Cardiología', 'ciudad': 'Rosario', 'obrasSociales': 'OSDE'}
+        _, current = plan_results(model, values, ['especialidad'], ['obrasSociales'])
+        _, proposed = plan_results(model, values, ['especialidad', 'ciudad'], ['obrasSociales'])
+        self.assertEqual(len(current), 4)
+        self.assertEqual({item['medicoId'] for item in proposed}, {item['medicoId'] for item in current})
+
+    def test_contains_filter_is_proposed_as_equality(self):
+        """contains() se propone en la clave avisando el cambio a igualdad y los ítems que se perderían."""
+        bodies = [{'especialidad': 'Cardiología', 'ciudad': 'Rosario'}] * 2 + \
+                 [{'especialidad': 'Cardiología', 'ciudad': 'Rosa'}]
+        report = recommend_gsis({'SearchFn': bodies}, _index('contains(ciudad, :c)'), {'MedicosTable': SEED})
+
+        proposal, = report.proposals
+        self.assertEqual((proposal.hash_key, proposal.range_key), ('especialidad', 'ciudad'))
+        self.assertEqual(proposal.equality_changes, ['ciudad'])
+        self.assertEqual(proposal.remaining_filters, [])
+        self.assertEqual((proposal.current_items_read, proposal.proposed_items_read), (36, 8))
+        self.assertEqual(proposal.items_lost, 4)  # 'Rosa' ya no coincide con 'Rosario'
+        self.assertEqual(report.unresolved, [])
+
+    def test_list_filters_are_reported_unresolved(self):
+        """Un filtro que solo suma listas sobre la clave actual no tiene índice y no cuenta como resuelto."""
+        bodies = [{'especialidad': 'Cardiología', 'obraSocial': 'OSDE'}] * 2
+        report = recommend_gsis({'SearchFn': bodies}, _index(), {'MedicosTable': SEED})
+
+        self.assertEqual(report.proposals, [])
+        unresolved, = report.unresolved
+        self.assertEqual(unresolved.combination.attributes, ('especialidad', 'obrasSociales'))
+        self.assertIn('obrasSociales', unresolved.reason)
+
+    def test_model_and_matching(self):
+        model = SeedTableModel(SEED)
+        self.assertEqual(len(model.read({'especialidad': 'Cardiología', 'ciudad': 'CABA'})), 4)
+        self.assertEqual(model.read_units(model.read({})), 5.0)
+        self.assertTrue(value_matches([{'nombre': 'OSDE'}], 'OSDE'))
+        self.assertFalse(value_matches('Rosario', 'CABA'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Tests del tokenizer / parser parcial de JavaScript para lambdas Node.js.
+"""
+
+import unittest
+from js_analyzer import analyze_javascript_fields, tokenize
+from lambda_analyzer import extract_fields
+
+
+class TestJavaScriptFieldExtraction(unittest.TestCase):
+    """Extracción de campos del body y de comandos DynamoDB."""
+
+    def test_destructuring_with_defaults_and_renames(self):
+        code = """
+        const body = JSON.parse(event.body || '{}');
+        const {
+          pacienteId,
+          fechaTurno: fecha = null,
+          horaTurno = '09:00',
+          ...resto
+        } = body;
+        const datos = body;
+        const telefono = datos.telefono ?? datos?.['telefonoPaciente'];
+        """
+        analysis = analyze_javascript_fields(code)
+        self.assertEqual(
+            analysis.processed_fields,
+            ['pacienteId', 'fechaTurno', 'horaTurno', 'telefono', 'telefonoPaciente']
+        )
+        self.assertIn('datos', analysis.body_aliases)
+
+    def test_strings_comments_and_regex_are_not_fields(self):
+        code = """
+        // body.comentario no se usa
+        const body = JSON.parse(event.body);
+        const msg = `falta ${body.motivoConsulta} en body.otro`;
+        const re = /body.nada/g;
+        """
+        analysis = analyze_javascript_fields(code)
+        self.assertEqual(analysis.processed_fields, ['motivoConsulta'])
+
+    def test_put_and_update_commands(self):
+        code = """
+        const body = JSON.parse(event.body);
+        const item = { turnoId, pacienteId: body.pacienteId, status: 'confirmado' };
+        item.comentarios = body.comentarios;
+        await docClient.send(new PutCommand({ TableName: TURNOS_TABLE, Item: item }));
+
+        const names = {};
+        names['#status'] = 'status';
+        await docClient.send(new UpdateCommand({
+          TableName: TURNOS_TABLE,
+          Key: { turnoId: body.turnoId },
+          UpdateExpression: `SET #status = :status, ${'cancelledAt'} = :ts`,
+          ExpressionAttributeNames: names,
+          ExpressionAttributeValues: { ':status': 'cancelado', ':ts': Date.now() }
+        }));
+        """
+        analysis = analyze_javascript_fields(code)
+        self.assertEqual(analysis.put_item_fields, ['turnoId', 'pacienteId', 'status', 'comentarios'])
+        self.assertEqual(analysis.update_fields, ['status', 'cancelledAt'])
+
+        put, update = analysis.dynamo_commands
+        self.assertEqual((put.command, put.table), ('Put', 'TURNOS_TABLE'))
+        self.assertEqual(update.key_fields, ['turnoId'])
+        self.assertEqual(update.attribute_names, {'#status': 'status'})
+
+    def test_extract_fields_routes_javascript(self):
+        code = "exports.handler = async (event) => { const { fecha } = JSON.parse(event.body); };"
+        processed, update = extract_fields(code)
+        self.assertEqual(processed, ['fecha'])
+        self.assertEqual(update, [])
+
+    def test_tokenizer_tolerates_unterminated_input(self):
+        for code in ('const a = `x ${', "'sin cerrar", '/* comentario', '{{{ ((( [[['):
+            tokenize(code)
+            analyze_javascript_fields(code)
+
+
+if __name__ == '__main__':
+    unittest.main()
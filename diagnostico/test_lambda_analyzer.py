@@ -10,6 +10,7 @@ import unittest
 from lambda_analyzer import (
     extract_update_expression_fields,
     extract_processed_fields,
+    analyze_python_fields,
     analyze_lambda_code
 )
 
@@ -120,6 +121,52 @@ class TestLambdaAnalyzer(unittest.TestCase):
         self.assertEqual(len(critical_fecha_hora), 0)
 
 
+class TestPythonFieldExtraction(unittest.TestCase):
+    """Tests del extractor basado en AST para handlers Python."""
+    
+    def test_body_aliases_are_followed(self):
+        """Los alias del body (asignaciones, or, dict()) se siguen al extraer campos."""
+        code = """
+        def handler(event, context):
+            payload = json.loads(event.get('body') or '{}')
+            b = payload
+            datos = dict(b)
+            fecha = b.get('fechaTurno')
+            hora = datos['horaTurno']
+            if 'motivo' not in payload:
+                pass
+            nota = f"{payload['nota']}"
+            ignorado = event.get('requestContext')
+        """
+        
+        analysis = analyze_python_fields(code)
+        
+        self.assertEqual(analysis.processed_fields, ['fechaTurno', 'horaTurno', 'motivo', 'nota'])
+        self.assertIn('datos', analysis.body_aliases)
+        self.assertNotIn('requestContext', analysis.processed_fields)
+    
+    def test_update_expression_assembled_across_lines(self):
+        """Se resuelven las partes del SET armadas con listas, joins y f-strings."""
+        code = """
+        def handler(event, context):
+            body = json.loads(event['body'])
+            parts = ['modifiedAt = :modifiedAt']
+            for campo in ('fechaTurno', 'horaTurno'):
+                if campo in body:
+                    parts.append(f'{campo} = :{campo}')
+            expr = 'SET ' + ', '.join(parts) + ', #e = :e'
+            table.update_item(
+                UpdateExpression=expr,
+                ExpressionAttributeNames={'#e': 'estado'}
+            )
+        """
+        
+        fields = extract_update_expression_fields(code)
+        
+        self.assertEqual(sorted(fields), ['estado', 'fechaTurno', 'horaTurno', 'modifiedAt'])
+        self.assertEqual(sorted(extract_processed_fields(code)), ['fechaTurno', 'horaTurno'])
+
+
 # Property-Based Test usando hypothesis (si está disponible)
 try:
     from hypothesis import given, strategies as st
@@ -0,0 +1,130 @@
+"""
+Tests del generador de carga OpenAPI y del stub local de API Gateway.
+"""
+
+import asyncio
+import json
+import os
+import random
+import unittest
+
+import yaml
+
+from load_generator import BodySynthesizer, ConnectionPool, run_load
+from stub_api_server import StubApiServer
+from template_index import load_template_index
+from test_cloudwatch_analyzer import TEMPLATE_PATH
+
+
+OPENAPI_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..',
+    'documentos_salud_connect_ia', 'turnos-medicos-api-openapi.yaml'
+)
+
+
+def _spec():
+    with open(OPENAPI_PATH, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+
+class TestBodySynthesizer(unittest.TestCase):
+    """Bodies generados desde el schema."""
+
+    def test_valid_and_invalid_bodies(self):
+        """Los válidos pasan el validador y cada mutación produce su violación."""
+        synthesizer = BodySynthesizer(_spec(), '/turnos', 'post', random.Random(3))
+        for _ in range(20):
+            body = synthesizer.valid()
+            self.assertEqual([v for v in synthesizer.validator.validate(body) if v[1] != 'undocumented'], [])
+
+        self.assertEqual(synthesizer.mutations, ['missing', 'type', 'format', 'json'])
+        for kind in synthesizer.mutations:
+            request = synthesizer.invalid(kind)
+            if kind == 'json':
+                self.assertRaises(ValueError, json.loads, request.body)
+                continue
+            violations = synthesizer.validator.validate(json.loads(request.body))
+            self.assertIn((request.field, kind), violations)
+
+
+class TestStubAndLoad(unittest.TestCase):
+    """Stub de API Gateway + Lambda y corrida de carga contra él."""
+
+    def test_stub_responses(self):
+        """403 sin ruta o sin API key, 400 por schema y Lambdas Python ejecutadas localmente."""
+        spec = _spec()
+        index = load_template_index(TEMPLATE_PATH)
+
+        async def scenario():
+            server = await StubApiServer(spec, index, api_key='clave').start(port=0)
+            pool = ConnectionPool(server.url, 2)
+            headers = {'x-api-key': 'clave'}
+            try:
+                results = {
+                    'unknown': await pool.request('POST', '/no-existe', headers, b'{}'),
+                    'no_key': await pool.request('POST', '/turnos/paciente', {}, b'{"pacienteId": "p"}'),
+                    'invalid': await pool.request('POST', '/medicos/buscar', headers, b'{"ciudad": "Rosario"}'),
+                    'local': await pool.request('POST', '/turnos/paciente', headers,
+                                                b'{"pacienteId": "84c06ff4ad2440899cbd91eac98f2ca9"}'),
+                    'modify': await pool.request('POST', '/turnos/modificar', headers, json.dumps(
+                        {'turnoId': 'TURNO-2025-02-15-ABC123', 'pacienteId': '84c06ff4ad2440899cbd91eac98f2ca9',
+                         'fechaTurno': '2025-03-01'}).encode()),
+                }
+            finally:
+                await pool.close()
+                await server.stop()
+            return results, pool.opened
+
+        results, opened = asyncio.run(scenario())
+        self.assertEqual(results['unknown'][0], 403)
+        self.assertEqual(results['no_key'][0], 403)
+        self.assertEqual(results['invalid'][0], 400)
+        self.assertEqual(results['local'][0], 200)
+        self.assertEqual(json.loads(results['local'][1])['cantidad'], 1)  # turno sembrado desde los examples
+        self.assertEqual(results['modify'][0], 200)
+        self.assertEqual(opened, 1)  # keep-alive: una sola conexión para requests secuenciales
+
+    def test_run_load_against_stub(self):
+        """La corrida reparte los requests y reporta percentiles por operación."""
+        spec = _spec()
+
+        async def scenario():
+            server = await StubApiServer(spec).start(port=0)
+            try:
+                return await run_load(server.url, spec, rps=400, duration=0.5, connections=4,
+                                      invalid_ratio=0.5, seed=7)
+            finally:
+                await server.stop()
+
+        report = asyncio.run(scenario())
+        self.assertEqual(report.requests, 200)
+        self.assertEqual(len(report.operations), 5)
+        for stats in report.operations:
+            self.assertEqual(stats.connection_errors, 0)
+            self.assertIsNotNone(stats.latency_ms.percentile(99))
+        # Sin template todo se responde desde el spec: válidos 2xx e inválidos 400
+        self.assertEqual(report.unexpected, 0)
+
+    def test_hung_server_counts_timeouts(self):
+        """Un servidor que nunca responde no cuelga la corrida: cada request cuenta como timeout."""
+        async def hang(reader, writer):
+            await reader.read()
+            writer.close()
+
+        async def scenario():
+            server = await asyncio.start_server(hang, '127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            try:
+                return await run_load(f'http://127.0.0.1:{port}', _spec(), rps=40, duration=0.25,
+                                      connections=2, seed=1, timeout=0.2)
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        report = asyncio.run(scenario())
+        self.assertEqual(report.requests, 10)
+        self.assertEqual(sum(stats.timeouts for stats in report.operations), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Tests del harness de ejecución local de Lambdas.
+"""
+
+import json
+import os
+import unittest
+from decimal import Decimal
+
+from dynamodb_access import parse_table_schemas
+from local_lambda_harness import ClientError, InMemoryDynamoTable, LocalLambdaHarness, synthetic_turnos
+from template_index import build_template_index, load_template_index
+from test_cloudwatch_analyzer import TEMPLATE_PATH
+
+
+class TestInMemoryDynamoTable(unittest.TestCase):
+    """Semántica de DynamoDB de las tablas en memoria."""
+
+    def setUp(self):
+        self.table = InMemoryDynamoTable(parse_table_schemas(load_template_index(TEMPLATE_PATH))['TurnosTable'])
+        self.table.load_items(synthetic_turnos(pacientes=3, per_paciente=4))
+
+    def test_key_schema_and_gsi(self):
+        """Query por el GSI devuelve la partición; claves y floats inválidos se rechazan."""
+        result = self.table.query(IndexName='PacienteIndex', KeyConditionExpression='pacienteId = :p',
+                                  ExpressionAttributeValues={':p': 'paciente-1'})
+        self.assertEqual(result['Count'], 4)
+        with self.assertRaises(ClientError):
+            self.table.query(IndexName='MedicoIndex', KeyConditionExpression='medicoId = :m',
+                             ExpressionAttributeValues={':m': 'medico-1'})
+        with self.assertRaises(ClientError):
+            self.table.get_item(Key={'pacienteId': 'paciente-1'})
+        with self.assertRaises(TypeError):
+            self.table.put_item(Item={'turnoId': 'x', 'precio': 1.5})
+
+    def test_update_with_condition(self):
+        """UpdateExpression se aplica solo si se cumple la condición; las palabras reservadas fallan."""
+        updated = self.table.update_item(
+            Key={'turnoId': 'turno-0-0'}, UpdateExpression='SET horaTurno = :h ADD cambios :uno',
+            ConditionExpression='pacienteId = :p', ReturnValues='ALL_NEW',
+            ExpressionAttributeValues={':h': '10:30', ':p': 'paciente-0', ':uno': 1})
+        self.assertEqual(updated['Attributes']['horaTurno'], '10:30')
+        self.assertEqual(updated['Attributes']['cambios'], Decimal(1))
+
+        with self.assertRaises(ClientError) as error:
+            self.table.update_item(Key={'turnoId': 'turno-0-0'}, UpdateExpression='SET horaTurno = :h',
+                                   ConditionExpression='pacienteId = :p',
+                                   ExpressionAttributeValues={':h': '11:00', ':p': 'paciente-2'})
+        self.assertEqual(error.exception.response['Error']['Code'], 'ConditionalCheckFailedException')
+        with self.assertRaises(ClientError):
+            self.table.update_item(Key={'turnoId': 'turno-0-0'}, UpdateExpression='SET status = :s',
+                                   ExpressionAttributeValues={':s': 'cancelado'})
+
+    def test_pagination(self):
+        """Limit corta la página y LastEvaluatedKey permite continuarla."""
+        first = self.table.query(IndexName='PacienteIndex', KeyConditionExpression='pacienteId = :p',
+                                 ExpressionAttributeValues={':p': 'paciente-2'}, Limit=3)
+        self.assertEqual(first['Count'], 3)
+        rest = self.table.query(IndexName='PacienteIndex', KeyConditionExpression='pacienteId = :p',
+                                ExpressionAttributeValues={':p': 'paciente-2'},
+                                ExclusiveStartKey=first['LastEvaluatedKey'])
+        self.assertEqual(rest['Count'], 1)
+        self.assertNotIn('LastEvaluatedKey', rest)
+
+
+class TestLocalLambdaHarness(unittest.TestCase):
+    """Ejecución de los handlers inline del template."""
+
+    def test_template_handlers(self):
+        """GetTurnosPaciente y ModifyTurno corren localmente contra la misma tabla."""
+        harness = LocalLambdaHarness(load_template_index(TEMPLATE_PATH),
+                                     {'TurnosTable': synthetic_turnos(pacientes=5, per_paciente=2)})
+        self.assertIn('GetTurnosPacienteFunction', harness.python_functions())
+
+        modified, _ = harness.invoke('ModifyTurnoFunction', {'body': json.dumps(
+            {'turnoId': 'turno-1-0', 'pacienteId': 'paciente-1', 'fecha': '2025-12-01'})})
+        self.assertEqual(modified['statusCode'], 200)
+
+        found, _ = harness.invoke('GetTurnosPacienteFunction', {'body': json.dumps({'pacienteId': 'paciente-1'})})
+        turnos = json.loads(found['body'])['turnos']
+        self.assertEqual(len(turnos), 2)
+        self.assertIn('2025-12-01', [t['fechaTurno'] for t in turnos])
+
+        bodies = harness.bodies_from_table('GetTurnosPacienteFunction', 'TurnosTable', 20)
+        result = harness.run_load('GetTurnosPacienteFunction', bodies, requests=100, concurrency=8)
+        self.assertEqual(result.status_codes[200], 100)
+        self.assertEqual(result.latency_ms.count, 100)
+        self.assertEqual(result.error_rate, 0.0)
+
+    def test_environment_is_visible_at_call_time(self):
+        """Un handler que lee os.environ al invocarse ve las variables del template, no las del host."""
+        code = ("import os\n"
+                "def handler(event, context):\n"
+                "    return {'statusCode': 200, 'body': os.environ['TABLA'] + ',' + str(os.getenv('TABLA'))}\n")
+        index = build_template_index({'Resources': {
+            'Tabla': {'Type': 'AWS::DynamoDB::Table', 'Properties': {
+                'KeySchema': [{'AttributeName': 'id', 'KeyType': 'HASH'}]}},
+            'EnvFn': {'Type': 'AWS::Lambda::Function', 'Properties': {
+                'Runtime': 'python3.13', 'Handler': 'index.handler', 'Code': {'ZipFile': code},
+                'Environment': {'Variables': {'TABLA': {'Ref': 'Tabla'}}}}},
+        }})
+        harness = LocalLambdaHarness(index)
+        response, _ = harness.invoke('EnvFn', {})
+        self.assertEqual(response['body'], f'{harness.tables["Tabla"].name},{harness.tables["Tabla"].name}')
+        self.assertNotIn('TABLA', os.environ)
+        result = harness.run_load('EnvFn', [{}], requests=20, concurrency=4)
+        self.assertEqual(result.status_codes[200], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
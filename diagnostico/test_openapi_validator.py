@@ -0,0 +1,120 @@
+"""
+Tests de la resolución de $ref y composiciones en openapi_validator.
+"""
+
+import unittest
+
+from openapi_validator import extract_request_fields, get_schema_resolver, sweep_openapi_consistency
+from template_index import build_template_index
+
+
+def _spec():
+    return {
+        'paths': {
+            '/turnos/modificar': {'post': {'requestBody': {'$ref': '#/components/requestBodies/Modificar'}}},
+            '/turnos': {'post': {'requestBody': {'content': {'application/json': {'schema': {
+                'oneOf': [
+                    {'$ref': '#/components/schemas/ConFechaTurno'},
+                    {'type': 'object', 'required': ['pacienteId', 'fecha'],
+                     'properties': {'fecha': {'type': 'string'}}}
+                ]
+            }}}}}},
+        },
+        'components': {
+            'requestBodies': {
+                'Modificar': {'content': {'application/json': {'schema': {
+                    'allOf': [
+                        {'$ref': '#/components/schemas/Base'},
+                        {'type': 'object', 'required': ['horaTurno'],
+                         'properties': {'horaTurno': {'$ref': '#/components/schemas/Hora'}}}
+                    ]
+                }}}}
+            },
+            'schemas': {
+                'Base': {'type': 'object', 'required': ['turnoId'],
+                         'properties': {'turnoId': {'type': 'string'},
+                                        'padre': {'$ref': '#/components/schemas/Base'}}},
+                'Hora': {'type': 'string', 'format': 'time', 'example': '10:00'},
+                'ConFechaTurno': {'type': 'object', 'required': ['pacienteId', 'fechaTurno'],
+                                  'properties': {'pacienteId': {'type': 'string'},
+                                                 'fechaTurno': {'type': 'string', 'format': 'date'}}},
+            }
+        }
+    }
+
+
+class TestSchemaResolution(unittest.TestCase):
+    """$ref, allOf/oneOf y ciclos."""
+
+    def test_ref_and_all_of_are_flattened(self):
+        fields = extract_request_fields(_spec(), '/turnos/modificar')
+        self.assertEqual(sorted(fields['all_fields']), ['horaTurno', 'padre', 'turnoId'])
+        self.assertEqual(fields['required'], ['turnoId', 'horaTurno'])
+        self.assertEqual(fields['all_fields']['horaTurno']['format'], 'time')
+        self.assertEqual(fields['all_fields']['turnoId']['type'], 'string')
+
+    def test_one_of_requires_only_common_fields(self):
+        fields = extract_request_fields(_spec(), '/turnos')
+        self.assertEqual(sorted(fields['all_fields']), ['fecha', 'fechaTurno', 'pacienteId'])
+        self.assertEqual(fields['required'], ['pacienteId'])
+        self.assertEqual(sorted(fields['optional']), ['fecha', 'fechaTurno'])
+
+    def test_cycles_are_cut_and_results_memoized(self):
+        spec = _spec()
+        resolver = get_schema_resolver(spec)
+        self.assertIs(get_schema_resolver(spec), resolver)
+
+        base = resolver.flatten({'$ref': '#/components/schemas/Base'})
+        self.assertEqual(base['properties']['padre'], {'x-circular-ref': '#/components/schemas/Base'})
+        self.assertIs(resolver.flatten({'$ref': '#/components/schemas/Base'}), base)
+
+        with self.assertRaises(ValueError):
+            resolver.flatten({'$ref': '#/components/schemas/NoExiste'})
+
+
+
+class TestConsistencySweep(unittest.TestCase):
+    """Barrido de todas las operaciones del spec contra el template."""
+
+    def test_sweep_covers_parameters_and_unmapped_operations(self):
+        code = """
+import json
+def handler(event, context):
+    medico_id = event['pathParameters']['medicoId']
+    params = event.get('queryStringParameters') or {}
+    pagina = params.get('pagina')
+    body = json.loads(event['body'])
+    motivo = body.get('motivo')
+"""
+        index = build_template_index({'Resources': {
+            'Api': {'Type': 'AWS::ApiGateway::RestApi', 'Properties': {'Body': {'paths': {
+                '/medicos/{medicoId}/turnos': {'post': {'x-amazon-apigateway-integration': {
+                    'uri': {'Fn::Sub': '${TurnosFn.Arn}'}}}},
+                '/oculto': {'get': {'x-amazon-apigateway-integration': {'uri': {'Fn::Sub': '${TurnosFn.Arn}'}}}},
+            }}}},
+            'TurnosFn': {'Type': 'AWS::Lambda::Function', 'Properties': {'Code': {'ZipFile': code}}},
+        }})
+        spec = {'paths': {
+            '/medicos/{medicoId}/turnos': {
+                'parameters': [{'name': 'medicoId', 'in': 'path', 'schema': {'type': 'string'}}],
+                'post': {
+                    'parameters': [{'name': 'orden', 'in': 'query', 'schema': {'type': 'string'}}],
+                    'requestBody': {'content': {'application/json': {'schema': {
+                        'properties': {'motivo': {'type': 'string'}}}}}}
+                }
+            },
+            '/sin-lambda': {'get': {}}
+        }}
+
+        result = sweep_openapi_consistency(spec, index)
+        report, = result.reports
+        self.assertEqual((report.endpoint, report.method), ('/medicos/{medicoId}/turnos', 'post'))
+        self.assertEqual(report.missing_in_lambda, ['query:orden'])
+        self.assertEqual(report.missing_in_openapi, ['query:pagina'])
+        self.assertEqual({d.location for d in report.discrepancies}, {'query'})
+        self.assertEqual([(r.path, r.method) for r in result.undocumented_routes], [('/oculto', 'get')])
+        self.assertEqual(result.unintegrated_operations, [('/sin-lambda', 'get')])
+        self.assertEqual(len(result.routes_without_permission), 2)
+
+if __name__ == '__main__':
+    unittest.main()
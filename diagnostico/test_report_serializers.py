@@ -0,0 +1,81 @@
+"""
+Tests de los serializadores JSON / JSONL / SARIF de los reportes.
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from cloudwatch_analyzer import analyze_cloudwatch_logs
+from lambda_analyzer import DiagnosticReport, Finding
+from openapi_validator import ConsistencyReport, FieldDiscrepancy
+from report_serializers import to_dict, to_sarif, write_json, write_jsonl, write_sarif
+
+
+LOG_LINES = [
+    '{"level": "INFO", "message": "Modificar turno", "event": {"body": "{\\"turnoId\\": \\"T-1\\", \\"fecha\\": \\"2026-02-10\\"}"}}',
+    '{"level": "ERROR", "message": "Missing required parameters", "missingParameters": ["fechaTurno"]}',
+    'REPORT RequestId: abc\tDuration: 215.43 ms\tBilled Duration: 216 ms\tMemory Size: 128 MB\tMax Memory Used: 89 MB',
+]
+
+FINDING = Finding('critical', 'code', 'Campo horaTurno no encontrado en UpdateExpression',
+                  'UpdateExpression construction', 'Incluir horaTurno')
+REPORT = DiagnosticReport('ModifyTurnoFunction', [FINDING], 'Se encontraron 1 problemas críticos', True, False)
+CONSISTENCY = ConsistencyReport(
+    endpoint='/turnos/modificar', lambda_name='ModifyTurnoFunction', is_consistent=False,
+    discrepancies=[FieldDiscrepancy('hora', True, False, 'string', 'not_processed')],
+    missing_in_lambda=['hora'], missing_in_openapi=[], recommendations=[]
+)
+
+
+class TestReportSerializers(unittest.TestCase):
+    """Formatos JSON, JSONL y SARIF."""
+
+    def test_json_round_trip(self):
+        analysis = analyze_cloudwatch_logs(LOG_LINES, 'ModifyTurnoFunction')
+        output = io.StringIO()
+        write_json([REPORT, CONSISTENCY, analysis], output)
+        report, consistency, logs = json.loads(output.getvalue())
+
+        self.assertEqual(report['findings'][0]['severity'], 'critical')
+        self.assertEqual(consistency['discrepancies'][0]['field_name'], 'hora')
+        self.assertEqual(logs['request_bodies'], [{'turnoId': 'T-1', 'fecha': '2026-02-10'}])
+        self.assertEqual(logs['lambda_metrics']['invocations'], 1)
+        self.assertEqual(to_dict(FINDING)['location'], 'UpdateExpression construction')
+
+    def test_jsonl_streams_flat_records(self):
+        analysis = analyze_cloudwatch_logs(LOG_LINES, 'ModifyTurnoFunction')
+        output = io.StringIO()
+        self.assertEqual(write_jsonl((report for report in (REPORT, analysis)), output), 4)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([r['type'] for r in records],
+                         ['diagnostic_report', 'finding', 'log_analysis', 'request_body'])
+        self.assertEqual(records[1]['lambda_name'], 'ModifyTurnoFunction')
+        self.assertNotIn('request_bodies', records[2])
+
+    def test_sarif_locates_findings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            template = os.path.join(directory, 'template.yaml')
+            with open(template, 'w') as f:
+                f.write("Resources:\n  ModifyTurnoFunction:\n    Type: AWS::Lambda::Function\n")
+            sarif = to_sarif([REPORT], [CONSISTENCY], template_path=template)
+
+        self.assertEqual(sarif['version'], '2.1.0')
+        run = sarif['runs'][0]
+        rules = run['tool']['driver']['rules']
+        finding, missing = run['results']
+        self.assertEqual(finding['level'], 'error')
+        self.assertEqual(rules[finding['ruleIndex']]['id'], finding['ruleId'])
+        self.assertEqual(finding['locations'][0]['physicalLocation']['region'], {'startLine': 2})
+        self.assertEqual(missing['ruleId'], 'consistency/missing-in-lambda')
+        self.assertNotIn('physicalLocation', missing['locations'][0])
+
+        output = io.StringIO()
+        write_sarif([REPORT], [CONSISTENCY], output)
+        self.assertEqual(json.loads(output.getvalue()), to_sarif([REPORT], [CONSISTENCY]))
+
+
+if __name__ == '__main__':
+    unittest.main()
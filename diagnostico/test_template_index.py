@@ -0,0 +1,88 @@
+"""
+Tests para el índice del template de CloudFormation.
+
+Feature: diagnostico-actualizacion-turnos
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from template_index import (
+    load_template_index,
+    build_template_index,
+    discover_api_routes,
+    extract_lambda_code_from_cloudformation,
+    DEFAULT_LAMBDA_TIMEOUT_SECONDS
+)
+from test_cloudwatch_analyzer import TEMPLATE_PATH
+
+
+class TestTemplateIndex(unittest.TestCase):
+    """Tests del índice de recursos y funciones Lambda."""
+
+    def test_lambda_configuration(self):
+        """Se indexan runtime, memoria, timeout (con defaults) y el rol como !GetAtt."""
+        index = load_template_index(TEMPLATE_PATH)
+
+        seeding = index.get_lambda('DataSeedingFunction')
+        self.assertEqual((seeding.runtime, seeding.memory_size_mb, seeding.timeout_seconds), ('nodejs22.x', 256, 300))
+
+        modify = index.get_lambda('ModifyTurnoFunction')
+        self.assertEqual(modify.language, 'python')
+        self.assertEqual(modify.timeout_seconds, DEFAULT_LAMBDA_TIMEOUT_SECONDS)
+        self.assertEqual(modify.role, {'Fn::GetAtt': ['LambdaExecutionRole', 'Arn']})
+        self.assertIn('def handler', modify.inline_code)
+        self.assertIn('TurnosTable', index.resources_of_type('AWS::DynamoDB::Table'))
+
+    def test_extract_code_and_missing_lambda(self):
+        """El código inline es el bloque ZipFile completo; una función inexistente da ValueError."""
+        code = extract_lambda_code_from_cloudformation(TEMPLATE_PATH, 'CreateTurnoFunction')
+
+        self.assertTrue(code.startswith('const '))
+        with self.assertRaises(ValueError):
+            extract_lambda_code_from_cloudformation(TEMPLATE_PATH, 'NoExisteFunction')
+
+    def test_cache_is_invalidated_by_mtime(self):
+        """El índice se reutiliza mientras el archivo no cambie."""
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, 'template.yaml')
+            shutil.copy(TEMPLATE_PATH, path)
+            first = load_template_index(path)
+            self.assertIs(load_template_index(path), first)
+
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write('\n# cambio\n')
+            os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+            self.assertIsNot(load_template_index(path), first)
+        finally:
+            shutil.rmtree(tmpdir)
+
+
+    def test_discover_api_routes(self):
+        """Las rutas salen del Body del RestApi y los permisos de API Gateway."""
+        routes = discover_api_routes(load_template_index(TEMPLATE_PATH))
+        self.assertIn(('/turnos/modificar', 'post', 'ModifyTurnoFunction'),
+                      [(r.path, r.method, r.lambda_name) for r in routes])
+        self.assertTrue(all(r.has_permission for r in routes))
+
+        index = build_template_index({'Resources': {
+            'Api': {'Type': 'AWS::ApiGateway::RestApi', 'Properties': {'Body': {'paths': {
+                '/a': {'get': {'x-amazon-apigateway-integration': {
+                    'uri': {'Fn::Sub': 'arn:aws:apigateway:${AWS::Region}:lambda:path/functions/${FnA.Arn}/invocations'}}}}
+            }}}},
+            'FnA': {'Type': 'AWS::Lambda::Function', 'Properties': {}},
+            'FnB': {'Type': 'AWS::Lambda::Function', 'Properties': {}},
+            'PermB': {'Type': 'AWS::Lambda::Permission', 'Properties': {
+                'FunctionName': {'Ref': 'FnB'}, 'Principal': 'apigateway.amazonaws.com',
+                'SourceArn': {'Fn::Sub': 'arn:aws:execute-api:${AWS::Region}:${AWS::AccountId}:${Api}/*/DELETE/b'}}},
+        }})
+        routes = discover_api_routes(index)
+        self.assertEqual([(r.path, r.method, r.lambda_name, r.source, r.has_permission) for r in routes], [
+            ('/a', 'get', 'FnA', 'body', False),
+            ('/b', 'delete', 'FnB', 'permission', True),
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Tests de la inferencia de tipos/formatos y su chequeo contra OpenAPI.
+"""
+
+import unittest
+
+from openapi_validator import validate_openapi_lambda_consistency
+from type_inference import check_field_type, infer_field_types
+
+
+PYTHON_HANDLER = """
+import json
+import re
+from datetime import datetime
+
+HORA = re.compile(r'^\\d{2}:\\d{2}$')
+
+def handler(event, context):
+    body = json.loads(event['body'])
+    fecha = body.get('fechaTurno') or body.get('fecha')
+    datetime.strptime(fecha, '%Y-%m-%d')
+    if not HORA.match(body['horaTurno'].strip()):
+        return {'statusCode': 400}
+    cantidad = int(body.get('cantidad', 1))
+    table.put_item(Item={'fechaTurno': fecha, 'valorConsulta': body['valorConsulta']})
+"""
+
+JAVASCRIPT_HANDLER = """
+export const handler = async (event) => {
+  const body = JSON.parse(event.body);
+  const { horaTurno: hora } = body;
+  const fecha = body.fechaTurno || body.fecha;
+  if (!/^\\d{2}:\\d{2}$/.test(hora)) return { statusCode: 400 };
+  const cuando = new Date(fecha);
+  const pagina = parseInt(event.queryStringParameters.pagina, 10);
+};
+"""
+
+
+class TestTypeInference(unittest.TestCase):
+    """Evidencia de tipo y formato por campo."""
+
+    def test_python_parsers_follow_aliases(self):
+        types = infer_field_types(PYTHON_HANDLER, use_cache=False)
+        self.assertEqual([(e.kind, e.value) for e in types['fecha'].evidence], [('strptime', '%Y-%m-%d')])
+        self.assertEqual({e.kind for e in types['horaTurno'].evidence}, {'regex', 'string'})
+        self.assertEqual(types['cantidad'].types, ['integer'])
+        self.assertTrue(types['valorConsulta'].stored)
+        self.assertFalse(types['valorConsulta'].decimal_safe)
+
+    def test_javascript_parsers_and_parameters(self):
+        types = infer_field_types(JAVASCRIPT_HANDLER, use_cache=False)
+        self.assertEqual(types['horaTurno'].parsers[0].value, r'^\d{2}:\d{2}$')
+        self.assertEqual(types['fechaTurno'].parsers[0].kind, 'js_date')
+        query = infer_field_types(JAVASCRIPT_HANDLER, 'queryStringParameters', use_cache=False)
+        self.assertEqual(query['pagina'].types, ['integer'])
+
+
+class TestTypeCheck(unittest.TestCase):
+    """Chequeo del schema de OpenAPI contra la evidencia."""
+
+    def test_format_time_with_seconds_is_rejected_by_hh_mm_regex(self):
+        inferred = infer_field_types(JAVASCRIPT_HANDLER, use_cache=False)['horaTurno']
+        issues = check_field_type('horaTurno', {'type': 'string', 'format': 'time', 'example': '10:00'}, inferred)
+        self.assertEqual({i.issue for i in issues}, {'format_mismatch'})
+        self.assertTrue(any("'09:00:00'" in i.detail for i in issues))
+        # Con el layout de la descripción el schema coincide con la Lambda
+        self.assertEqual(check_field_type(
+            'horaTurno', {'type': 'string', 'description': 'Hora (HH:MM)', 'example': '10:00'}, inferred), [])
+
+    def test_unvalidated_format_and_type_mismatches(self):
+        self.assertEqual(
+            [i.issue for i in check_field_type('fechaTurno', {'type': 'string', 'format': 'date'}, None)],
+            ['format_not_enforced']
+        )
+        types = infer_field_types(PYTHON_HANDLER, use_cache=False)
+        self.assertEqual(
+            [i.issue for i in check_field_type('cantidad', {'type': 'string', 'example': 'dos'}, types['cantidad'])],
+            ['type_mismatch']
+        )
+        self.assertEqual(
+            [i.issue for i in check_field_type('valorConsulta', {'type': 'number'}, types['valorConsulta'])],
+            ['decimal_required']
+        )
+
+    def test_consistency_report_includes_type_issues(self):
+        spec = {'paths': {'/turnos': {'post': {'requestBody': {'content': {'application/json': {'schema': {
+            'properties': {
+                'fechaTurno': {'type': 'string', 'format': 'date', 'example': '15/02/2025'},
+                'fecha': {'type': 'string'},
+                'horaTurno': {'type': 'string', 'description': 'Hora (HH:MM)'},
+                'cantidad': {'type': 'integer'},
+                'valorConsulta': {'type': 'number'},
+            }
+        }}}}}}}}
+        report = validate_openapi_lambda_consistency(spec, PYTHON_HANDLER, '/turnos', 'CreateTurno')
+        self.assertFalse(report.is_consistent)
+        self.assertEqual(report.type_mismatches, ['fechaTurno', 'valorConsulta'])
+        self.assertEqual(report.format_warnings, ['fecha'])
+        self.assertEqual(report.missing_in_lambda, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,732 @@
+"""
+Inferencia de tipo y formato de los campos que lee una Lambda.
+
+Los bugs recurrentes con fechaTurno/horaTurno no son campos faltantes sino
+formatos: OpenAPI documenta YYYY-MM-DD y HH:MM, el agente manda otra cosa y la
+Lambda la guarda o la rechaza según cómo use el valor. Este módulo sigue el
+valor de cada campo del evento hasta donde se usa y registra la evidencia:
+
+- Python (AST): datetime.strptime, date/datetime/time.fromisoformat,
+  re.match/fullmatch/search (también con patrones de re.compile), int(),
+  float(), Decimal(), isinstance(), comparaciones con True/False, métodos de
+  str y si el valor llega a una escritura de DynamoDB sin pasar por Decimal
+- JavaScript (tokens de js_analyzer): new Date(), Date.parse, parseInt,
+  parseFloat, Number(), regex.test(), .match(/re/), typeof y métodos de String
+
+check_field_type compara esa evidencia con el schema del campo en OpenAPI
+(type, format, pattern, example y layouts como "(HH:MM)" en la descripción)
+ejecutando los mismos parsers sobre valores de prueba derivados del schema.
+"""
+
+import ast
+import re
+import textwrap
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime, time as dt_time
+from decimal import Decimal, InvalidOperation
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from analysis_cache import get_analysis_cache
+from js_analyzer import _JavaScriptFieldExtractor, _unquote, tokenize
+from lambda_analyzer import _PythonFieldExtractor
+
+
+@dataclass
+class TypeEvidence:
+    """Un uso del valor de un campo que revela qué tipo o formato espera la Lambda"""
+    kind: str  # ver FORMAT_KINDS, CONVERSION_KINDS y GUARD_KINDS
+    line: int
+    value: Optional[str] = None  # formato de strptime, patrón, función usada, ...
+    mode: Optional[str] = None  # regex: 'match', 'fullmatch' o 'search'
+
+
+@dataclass
+class InferredFieldType:
+    """Tipo y formato que la Lambda espera para un campo"""
+    field_name: str
+    evidence: List[TypeEvidence] = field(default_factory=list)
+    # El valor llega a una escritura de DynamoDB (put_item, update_item, ...)
+    stored: bool = False
+    # El valor pasa por Decimal o el body se parsea con parse_float=Decimal
+    decimal_safe: bool = False
+
+    @property
+    def parsers(self) -> List[TypeEvidence]:
+        return [e for e in self.evidence if e.kind in FORMAT_KINDS]
+
+    @property
+    def types(self) -> List[str]:
+        return list(dict.fromkeys(EVIDENCE_TYPES.get(e.kind) or e.value for e in self.evidence))
+
+
+@dataclass
+class TypeCheckIssue:
+    """Diferencia entre el schema de OpenAPI y el uso del campo en la Lambda"""
+    field_name: str
+    issue: str  # ver TYPE_ISSUES
+    detail: str
+    expected_format: Optional[str] = None
+    lambda_type: Optional[str] = None
+    lambda_format: Optional[str] = None
+
+    @property
+    def severity(self) -> str:
+        return TYPE_ISSUES[self.issue][0]
+
+
+# Versión de la inferencia: forma parte de la clave del cache de análisis
+TYPE_INFERENCE_VERSION = '1'
+
+# Evidencia que valida el formato del valor
+FORMAT_KINDS = {'strptime', 'fromisoformat', 'regex', 'js_date'}
+# Conversiones y operaciones que fallan (o se comportan distinto) con otro tipo
+CONVERSION_KINDS = {'string', 'integer', 'number', 'decimal', 'boolean'}
+# Chequeos de tipo (isinstance/typeof): la Lambda contempla el tipo, no lo exige
+GUARD_KINDS = {'isinstance', 'typeof'}
+
+EVIDENCE_TYPES = {
+    'strptime': 'string', 'fromisoformat': 'string', 'regex': 'string', 'js_date': 'string',
+    'string': 'string', 'integer': 'integer', 'number': 'number', 'decimal': 'number', 'boolean': 'boolean'
+}
+
+# issue -> (severidad, descripción, recomendación)
+TYPE_ISSUES = {
+    'type_mismatch': ('error', 'El tipo declarado en OpenAPI no es el que usa la Lambda',
+                      'Alinear el type del schema con la conversión que hace la Lambda'),
+    'format_mismatch': ('error', 'La Lambda rechaza valores con el formato declarado en OpenAPI',
+                        'Alinear format/pattern/example del schema con el parser de la Lambda'),
+    'decimal_required': ('error', 'Número guardado en DynamoDB sin convertir a Decimal',
+                         "Convertir con Decimal(str(valor)) o parsear el body con parse_float=Decimal"),
+    'format_not_enforced': ('warning', 'OpenAPI declara un formato que la Lambda no valida',
+                            'Validar el formato en la Lambda antes de guardar el valor'),
+    'format_undocumented': ('warning', 'La Lambda exige un formato que OpenAPI no declara',
+                            'Declarar format, pattern o example en el schema del campo'),
+}
+
+# Formatos de OpenAPI con semántica de fecha/hora: (layout, regex, valor de prueba)
+OPENAPI_FORMATS = {
+    'date': ('YYYY-MM-DD', r'^\d{4}-\d{2}-\d{2}$', '2025-02-15'),
+    'date-time': ('YYYY-MM-DDTHH:MM:SSZ',
+                  r'^\d{4}-\d{2}-\d{2}[Tt]\d{2}:\d{2}:\d{2}(\.\d+)?([Zz]|[+-]\d{2}:\d{2})$',
+                  '2025-02-15T09:00:00Z'),
+    'time': ('HH:MM:SS', r'^\d{2}:\d{2}:\d{2}(\.\d+)?([Zz]|[+-]\d{2}:\d{2})?$', '09:00:00'),
+}
+
+# Valores de prueba por type de OpenAPI (number usa decimales a propósito: es
+# el caso que rompe boto3)
+TYPE_SAMPLES = {'string': 'texto', 'integer': 1, 'number': 1.5, 'boolean': True, 'object': {}, 'array': []}
+
+# Layouts en descripciones: "Fecha del turno (YYYY-MM-DD)", "Hora (HH:MM)"
+_LAYOUT_TOKEN = r'(?:YYYY|YY|MM|DD|HH|SS)'
+_LAYOUT_RE = re.compile(rf'(?<![A-Za-z])({_LAYOUT_TOKEN}(?:[-/:. T]{_LAYOUT_TOKEN})+)(?![A-Za-z])')
+_LAYOUT_SAMPLES = {'YYYY': '2025', 'YY': '25', 'MM': '02', 'DD': '15', 'HH': '09', 'SS': '00'}
+
+# Directivas de strptime -> layout legible
+_STRPTIME_LAYOUT = {'%Y': 'YYYY', '%y': 'YY', '%m': 'MM', '%d': 'DD', '%H': 'HH', '%M': 'MM', '%S': 'SS',
+                    '%f': 'ffffff', '%z': '±HHMM', '%b': 'Mon', '%p': 'AM'}
+
+# Lo que new Date() parsea igual en todos los runtimes (ISO 8601)
+_JS_DATE_RE = re.compile(r'^\d{4}-\d{2}(-\d{2}([Tt ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?([Zz]|[+-]\d{2}:?\d{2})?)?)?$')
+_JS_NUMBER_RE = re.compile(r'^\s*[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?\s*$')
+
+_PY_STRING_METHODS = {'split', 'rsplit', 'strip', 'lstrip', 'rstrip', 'lower', 'upper', 'title', 'startswith',
+                      'endswith', 'replace', 'isdigit', 'isnumeric', 'zfill', 'encode', 'partition'}
+# Métodos cuyo resultado sigue siendo el valor del campo a efectos del formato
+_PY_PASSTHROUGH_METHODS = {'strip', 'lstrip', 'rstrip', 'lower', 'upper', 'title'}
+_PY_ISINSTANCE_TYPES = {'str': 'string', 'int': 'integer', 'float': 'number', 'Decimal': 'number',
+                        'bool': 'boolean', 'dict': 'object', 'list': 'array'}
+_DYNAMO_WRITES = {'put_item', 'update_item', 'batch_write_item', 'transact_write_items'}
+
+_JS_STRING_METHODS = {'split', 'trim', 'trimStart', 'trimEnd', 'toLowerCase', 'toUpperCase', 'startsWith',
+                      'endsWith', 'replace', 'replaceAll', 'padStart', 'padEnd', 'substring', 'charAt',
+                      'localeCompare', 'normalize', 'match'}
+_JS_PASSTHROUGH_METHODS = {'trim', 'trimStart', 'trimEnd', 'toLowerCase', 'toUpperCase'}
+_JS_NUMBER_FUNCTIONS = {'parseInt': 'integer', 'parseFloat': 'number', 'Number': 'number'}
+
+
+def _dotted(node: ast.AST) -> Optional[str]:
+    """'datetime.datetime.strptime' para una cadena de atributos sobre un nombre."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(node.id)
+    return '.'.join(reversed(parts))
+
+
+class _FieldEvidence:
+    """Evidencia acumulada por campo (sin repetir tipo/valor)."""
+
+    def __init__(self):
+        self.evidence: Dict[str, List[TypeEvidence]] = {}
+        self.stored: Set[str] = set()
+        self.decimal_safe: Set[str] = set()
+
+    def add(self, fields: Set[str], kind: str, line: int, value: Optional[str] = None, mode: Optional[str] = None):
+        for name in fields:
+            items = self.evidence.setdefault(name, [])
+            if not any(e.kind == kind and e.value == value and e.mode == mode for e in items):
+                items.append(TypeEvidence(kind, line, value, mode))
+
+    def result(self) -> Dict[str, InferredFieldType]:
+        names = list(self.evidence) + [name for name in sorted(self.stored) if name not in self.evidence]
+        return {
+            name: InferredFieldType(
+                field_name=name,
+                evidence=self.evidence.get(name, []),
+                stored=name in self.stored,
+                decimal_safe=name in self.decimal_safe
+            )
+            for name in names
+        }
+
+
+class _PythonTypeInference:
+    """
+    Sigue el valor de los campos por variables (fecha = body.get('fechaTurno')
+    or body.get('fecha')) y registra cómo se usa. Reusa los alias del body y
+    las constantes que resuelve _PythonFieldExtractor.
+    """
+
+    def __init__(self, tree: ast.AST, source: str):
+        self.tree = tree
+        self.extractor = _PythonFieldExtractor(source)
+        self.extractor.run(tree)
+        # variable -> campos cuyo valor puede contener
+        self.values: Dict[str, Set[str]] = {}
+        # variable -> patrones de re.compile
+        self.patterns: Dict[str, List[str]] = {}
+        self.found = _FieldEvidence()
+        self.sinks: Set[str] = set()
+        self.writes = False
+        self.parse_float_decimal = False
+
+    def run(self) -> Dict[str, InferredFieldType]:
+        assignments, nodes = [], []
+        for node in ast.walk(self.tree):
+            if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None:
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                assignments.extend((target, node.value) for target in targets)
+            if isinstance(node, (ast.Call, ast.Compare, ast.Dict)):
+                nodes.append(node)
+
+        # Valores de campos hasta punto fijo (hora = body.get('hora'); h = hora.strip())
+        changed = True
+        while changed:
+            changed = False
+            for target, value in assignments:
+                if not isinstance(target, ast.Name):
+                    continue
+                refs = self._refs(value)
+                known = self.values.setdefault(target.id, set())
+                if refs - known:
+                    known |= refs
+                    changed = True
+
+        for target, value in assignments:
+            if isinstance(target, ast.Name) and isinstance(value, ast.Call) and _dotted(value.func) == 're.compile' \
+                    and value.args:
+                self.patterns.setdefault(target.id, []).extend(self.extractor._string_values(value.args[0]))
+            elif isinstance(target, ast.Subscript):
+                # expression_values[':fechaTurno'] = fecha
+                self.sinks |= self._refs(value)
+
+        nodes.sort(key=lambda n: (n.lineno, n.col_offset))
+        for node in nodes:
+            if isinstance(node, ast.Call):
+                self._call(node)
+            elif isinstance(node, ast.Compare):
+                self._compare(node)
+            else:
+                for value in node.values:
+                    self.sinks |= self._refs(value)
+
+        if self.writes:
+            self.found.stored = self.sinks
+        if self.parse_float_decimal:
+            self.found.decimal_safe = set(self.found.evidence) | self.found.stored
+        else:
+            self.found.decimal_safe = {
+                name for name, items in self.found.evidence.items() if any(e.kind == 'decimal' for e in items)
+            }
+        return self.found.result()
+
+    def _refs(self, node: ast.AST) -> Set[str]:
+        """Campos cuyo valor (sin convertir) produce la expresión."""
+        extractor = self.extractor
+        if isinstance(node, ast.Name):
+            return set(self.values.get(node.id, ()))
+        if isinstance(node, ast.Subscript) and extractor._is_alias(node.value):
+            return set(extractor._string_values(node.slice))
+        if isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Attribute):
+                if func.attr in ('get', 'pop') and node.args and extractor._is_alias(func.value):
+                    return set(extractor._string_values(node.args[0]))
+                if func.attr in _PY_PASSTHROUGH_METHODS:
+                    return self._refs(func.value)
+            if isinstance(func, ast.Name) and func.id == 'str' and node.args:
+                return self._refs(node.args[0])
+            return set()
+        if isinstance(node, ast.BoolOp):
+            return set().union(*(self._refs(value) for value in node.values))
+        if isinstance(node, ast.IfExp):
+            return self._refs(node.body) | self._refs(node.orelse)
+        return set()
+
+    def _call(self, node: ast.Call):
+        name = _dotted(node.func) or ''
+        last = node.func.attr if isinstance(node.func, ast.Attribute) else name
+        args, line = node.args, node.lineno
+        strings = self.extractor._string_values
+        add = self.found.add
+
+        if last == 'strptime' and len(args) >= 2:
+            for layout in strings(args[1]):
+                add(self._refs(args[0]), 'strptime', line, layout)
+        elif last == 'fromisoformat' and args:
+            owner = name.rsplit('.', 2)[-2] if '.' in name else 'datetime'
+            if owner in ('date', 'datetime', 'time'):
+                add(self._refs(args[0]), 'fromisoformat', line, owner)
+        elif name in ('re.match', 're.fullmatch', 're.search') and len(args) >= 2:
+            for pattern in strings(args[0]):
+                add(self._refs(args[1]), 'regex', line, pattern, last)
+        elif isinstance(node.func, ast.Attribute) and last in ('match', 'fullmatch', 'search') and args \
+                and isinstance(node.func.value, ast.Name) and node.func.value.id in self.patterns:
+            for pattern in self.patterns[node.func.value.id]:
+                add(self._refs(args[0]), 'regex', line, pattern, last)
+        elif name in ('int', 'float') and args:
+            add(self._refs(args[0]), 'integer' if name == 'int' else 'number', line, name)
+        elif last == 'Decimal' and args:
+            add(self._refs(args[0]), 'decimal', line, 'Decimal')
+        elif name == 'isinstance' and len(args) == 2:
+            classes = args[1].elts if isinstance(args[1], ast.Tuple) else [args[1]]
+            kinds = {_PY_ISINSTANCE_TYPES.get((_dotted(c) or '').rsplit('.', 1)[-1]) for c in classes} - {None}
+            if {'integer', 'number'} <= kinds:
+                kinds.discard('integer')
+            if kinds:
+                add(self._refs(args[0]), 'isinstance', line, '|'.join(sorted(kinds)))
+        elif isinstance(node.func, ast.Attribute) and last in _PY_STRING_METHODS:
+            add(self._refs(node.func.value), 'string', line, last)
+
+        if last == 'loads':
+            for keyword in node.keywords:
+                if keyword.arg == 'parse_float' and (_dotted(keyword.value) or '').endswith('Decimal'):
+                    self.parse_float_decimal = True
+        if last in _DYNAMO_WRITES:
+            self.writes = True
+            for keyword in node.keywords:
+                self.sinks |= self._refs(keyword.value)
+
+    def _compare(self, node: ast.Compare):
+        # valor is True / valor == False
+        operands = [node.left] + list(node.comparators)
+        for op, left, right in zip(node.ops, operands, operands[1:]):
+            if not isinstance(op, (ast.Is, ast.IsNot, ast.Eq, ast.NotEq)):
+                continue
+            for value, constant in ((left, right), (right, left)):
+                if isinstance(constant, ast.Constant) and isinstance(constant.value, bool):
+                    self.found.add(self._refs(value), 'boolean', node.lineno, repr(constant.value))
+
+
+def _js_regex(token_value: str) -> str:
+    """Patrón de un regex literal de JavaScript en sintaxis de re."""
+    closing = token_value.rindex('/')
+    flags = token_value[closing + 1:]
+    return ('(?i)' if 'i' in flags else '') + token_value[1:closing]
+
+
+class _JavaScriptTypeInference:
+    """Lo mismo que _PythonTypeInference sobre los tokens de js_analyzer."""
+
+    def __init__(self, lambda_code: str, source: str):
+        self.x = _JavaScriptFieldExtractor(tokenize(lambda_code), source)
+        self.x.collect()
+        self.x.resolve_aliases()
+        self.tokens = self.x.tokens
+        self.values: Dict[str, Set[str]] = {}
+        self.regexes: Dict[str, List[str]] = {}
+        self.found = _FieldEvidence()
+
+    def _access(self, i: int) -> Tuple[Set[str], int]:
+        """Campos leídos por la expresión que empieza en i y su fin (exclusivo)."""
+        tokens, x, n = self.tokens, self.x, len(self.tokens)
+        token = tokens[i]
+        if token.kind != 'name' or x._is(i - 1, '.', '?.'):
+            return set(), i
+        if token.value in x.aliases:
+            k = i
+        elif x.source != 'body' and token.value == 'event' and x._is(i + 1, '.', '?.') and \
+                i + 2 < n and tokens[i + 2].value == x.source:
+            k = i + 2
+        elif token.value in self.values:
+            # { fechaTurno: ... } es una clave, no un uso
+            if x._is(i + 1, ':') and x._is(i - 1, '{', ','):
+                return set(), i
+            return set(self.values[token.value]), i + 1
+        else:
+            return set(), i
+        if x._is(k + 1, '.', '?.') and k + 2 < n and tokens[k + 2].kind == 'name' and not x._is(k + 3, '('):
+            return {tokens[k + 2].value}, k + 3
+        bracket = k + 2 if x._is(k + 1, '?.') else k + 1
+        if x._is(bracket, '[') and bracket + 2 < n and tokens[bracket + 1].kind == 'string' and \
+                x._is(bracket + 2, ']'):
+            return {_unquote(tokens[bracket + 1].value)}, bracket + 3
+        return set(), i
+
+    def _split_fallbacks(self, start: int, end: int) -> List[Tuple[int, int]]:
+        """Divide [start, end) en los operandos de || y ?? de primer nivel."""
+        parts, part_start, i = [], start, start
+        while i < end:
+            if self.x._is(i, '(', '[', '{'):
+                i = self.x.matching.get(i, end - 1) + 1
+                continue
+            if self.x._is(i, '||', '??'):
+                parts.append((part_start, i))
+                part_start = i + 1
+            i += 1
+        parts.append((part_start, end))
+        return parts
+
+    def _value_refs(self, start: int, end: int) -> Set[str]:
+        """Campos de un valor como `body.fechaTurno || body.fecha || ''`."""
+        tokens, x = self.tokens, self.x
+        refs = set()
+        for part_start, part_end in self._split_fallbacks(start, end):
+            if part_end - part_start == 1 and (tokens[part_start].kind in ('string', 'number') or
+                                               tokens[part_start].value in ('null', 'undefined')):
+                continue
+            found, i = self._access(part_start)
+            if not found and tokens[part_start].value == 'String' and x._is(part_start + 1, '('):
+                found, i = self._access(part_start + 2)
+                if not x._is(i, ')'):
+                    return set()
+                i += 1
+            while found and x._is(i, '.', '?.') and i + 2 < part_end and \
+                    tokens[i + 1].value in _JS_PASSTHROUGH_METHODS and x._is(i + 2, '('):
+                i = x.matching.get(i + 2, part_end) + 1
+            if not found or i != part_end:
+                return set()
+            refs |= found
+        return refs
+
+    def run(self) -> Dict[str, InferredFieldType]:
+        tokens, x = self.tokens, self.x
+        for opener, (start, end) in x.destructurings:
+            if not x._is_body_source(start, end):
+                continue
+            for item_start, item_end in x._split_commas(opener + 1, x.matching.get(opener, opener)):
+                key = x._property_key(item_start, item_end)
+                if key is None:
+                    continue
+                local = key
+                if x._is(item_start + 1, ':') and tokens[item_start + 2].kind == 'name':
+                    local = tokens[item_start + 2].value
+                self.values.setdefault(local, set()).add(key)
+
+        changed = True
+        while changed:
+            changed = False
+            for name, slices in x.declarations.items():
+                for start, end in slices:
+                    refs = self._value_refs(start, end)
+                    known = self.values.setdefault(name, set())
+                    if refs - known:
+                        known |= refs
+                        changed = True
+
+        for name, slices in x.declarations.items():
+            for start, end in slices:
+                if end - start == 1 and tokens[start].kind == 'regex':
+                    self.regexes.setdefault(name, []).append(_js_regex(tokens[start].value))
+                elif tokens[start].value == 'new' and end - start >= 4 and tokens[start + 1].value == 'RegExp' \
+                        and tokens[start + 3].kind == 'string':
+                    self.regexes.setdefault(name, []).append(_unquote(tokens[start + 3].value))
+
+        for i in range(len(tokens)):
+            refs, end = self._access(i)
+            if refs:
+                self._use(i, end, refs)
+        return self.found.result()
+
+    def _value(self, index: int) -> Optional[str]:
+        return self.tokens[index].value if 0 <= index < len(self.tokens) else None
+
+    def _use(self, i: int, end: int, refs: Set[str]):
+        x, add, line = self.x, self.found.add, self.tokens[i].line
+        if x._is(i - 1, '(') and x._is(end, ')', ','):
+            callee = self._value(i - 2)
+            if callee == 'Date' and self._value(i - 3) == 'new':
+                add(refs, 'js_date', line, 'new Date')
+            elif callee == 'parse' and self._value(i - 3) == '.' and self._value(i - 4) == 'Date':
+                add(refs, 'js_date', line, 'Date.parse')
+            elif callee in _JS_NUMBER_FUNCTIONS and not x._is(i - 3, '.', '?.'):
+                add(refs, _JS_NUMBER_FUNCTIONS[callee], line, callee)
+            elif callee == 'test' and self._value(i - 3) == '.' and i >= 4:
+                holder = self.tokens[i - 4]
+                if holder.kind == 'regex':
+                    add(refs, 'regex', line, _js_regex(holder.value), 'search')
+                for pattern in self.regexes.get(holder.value, []) if holder.kind == 'name' else []:
+                    add(refs, 'regex', line, pattern, 'search')
+        if self._value(i - 1) == 'typeof' and x._is(end, '===', '==', '!==', '!=') and \
+                end + 1 < len(self.tokens) and self.tokens[end + 1].kind == 'string':
+            add(refs, 'typeof', line, _unquote(self.tokens[end + 1].value))
+        if x._is(end, '.', '?.') and self._value(end + 1) in _JS_STRING_METHODS and x._is(end + 2, '('):
+            method = self._value(end + 1)
+            add(refs, 'string', line, method)
+            if method == 'match' and end + 3 < len(self.tokens) and self.tokens[end + 3].kind == 'regex':
+                add(refs, 'regex', line, _js_regex(self.tokens[end + 3].value), 'search')
+        if x._is(end, '===', '!==', '==', '!=') and self._value(end + 1) in ('true', 'false'):
+            add(refs, 'boolean', line, self._value(end + 1))
+
+
+def _infer_uncached(lambda_code: str, source: str) -> Dict[str, InferredFieldType]:
+    try:
+        tree = ast.parse(textwrap.dedent(lambda_code))
+    except (SyntaxError, ValueError):
+        return _JavaScriptTypeInference(lambda_code, source).run()
+    return _PythonTypeInference(tree, source).run()
+
+
+def infer_field_types(lambda_code: str, source: str = 'body',
+                      use_cache: bool = True) -> Dict[str, InferredFieldType]:
+    """
+    Infiere qué tipo y formato espera la Lambda para cada campo que lee.
+
+    Solo aparecen los campos con evidencia (un parser, una conversión, un
+    chequeo de tipo) o que llegan a una escritura de DynamoDB. El resultado se
+    cachea por hash del código (ver analysis_cache).
+
+    Args:
+        lambda_code: Código fuente de la función Lambda (Python o JavaScript)
+        source: Parte del evento ('body', 'queryStringParameters' o 'pathParameters')
+        use_cache: Si es False se analiza siempre el código
+
+    Returns:
+        Diccionario campo -> InferredFieldType
+    """
+    if not use_cache:
+        return _infer_uncached(lambda_code, source)
+    cached = get_analysis_cache().get_or_compute(
+        f'types:{source}', TYPE_INFERENCE_VERSION, lambda_code,
+        lambda: [asdict(inferred) for inferred in _infer_uncached(lambda_code, source).values()]
+    )
+    return {
+        item['field_name']: InferredFieldType(
+            field_name=item['field_name'],
+            evidence=[TypeEvidence(**e) for e in item['evidence']],
+            stored=item['stored'],
+            decimal_safe=item['decimal_safe']
+        )
+        for item in cached
+    }
+
+
+# --- chequeo contra OpenAPI ---------------------------------------------------
+
+@dataclass
+class _DeclaredFormat:
+    label: str
+    pattern: str
+    sample: Optional[str]
+
+
+def _layout_regex(layout: str) -> str:
+    parts = re.split(f'({_LAYOUT_TOKEN})', layout)
+    return '^' + ''.join(
+        (r'\d{4}' if part == 'YYYY' else r'\d{2}') if re.fullmatch(_LAYOUT_TOKEN, part) else re.escape(part)
+        for part in parts if part
+    ) + '$'
+
+
+def _layout_sample(layout: str) -> str:
+    return re.sub(_LAYOUT_TOKEN, lambda m: _LAYOUT_SAMPLES[m.group(0)], layout)
+
+
+def declared_formats(openapi_field: Dict[str, Any]) -> List[_DeclaredFormat]:
+    """
+    Formatos que OpenAPI declara para un campo: format de fecha/hora, pattern y
+    layouts en la descripción ("Hora del turno (HH:MM)").
+
+    Args:
+        openapi_field: Info del campo (ver extract_request_fields)
+
+    Returns:
+        Lista de formatos declarados
+    """
+    formats = []
+    spec_format = OPENAPI_FORMATS.get(openapi_field.get('format') or '')
+    if spec_format:
+        layout, pattern, sample = spec_format
+        formats.append(_DeclaredFormat(f"format: {openapi_field['format']} ({layout})", pattern, sample))
+    if openapi_field.get('pattern'):
+        formats.append(_DeclaredFormat(f"pattern: {openapi_field['pattern']}", openapi_field['pattern'], None))
+    for layout in _LAYOUT_RE.findall(openapi_field.get('description') or ''):
+        if not any(layout in declared.label for declared in formats):
+            formats.append(_DeclaredFormat(layout, _layout_regex(layout), _layout_sample(layout)))
+    return formats
+
+
+def _normalize_example(example: Any) -> Any:
+    # YAML convierte 2025-02-15 sin comillas en date
+    if isinstance(example, (date, datetime, dt_time)):
+        return example.isoformat()
+    return example
+
+
+def _as_parameter(value: Any) -> str:
+    """Los parámetros de query y path llegan siempre como string."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def describe_evidence(evidence: TypeEvidence) -> str:
+    """Descripción corta de un uso ('strptime %Y-%m-%d (YYYY-MM-DD)', 'int()', ...)."""
+    if evidence.kind == 'strptime':
+        layout = re.sub(r'%[a-zA-Z]', lambda m: _STRPTIME_LAYOUT.get(m.group(0), m.group(0)), evidence.value or '')
+        return f"strptime '{evidence.value}' ({layout})"
+    if evidence.kind == 'fromisoformat':
+        return f'{evidence.value}.fromisoformat (ISO 8601)'
+    if evidence.kind == 'regex':
+        return f"regex /{evidence.value}/ ({evidence.mode})"
+    if evidence.kind == 'js_date':
+        return f'{evidence.value} (ISO 8601)'
+    if evidence.kind == 'string':
+        return f'.{evidence.value}()'
+    if evidence.kind == 'boolean':
+        return f'comparación con {evidence.value}'
+    return f'{evidence.value}()'
+
+
+def evidence_accepts(evidence: TypeEvidence, value: Any) -> bool:
+    """
+    Ejecuta el parser o la conversión de la Lambda sobre un valor de prueba.
+
+    Args:
+        evidence: Uso del campo en la Lambda
+        value: Valor tal como llega al handler (después de json.loads)
+
+    Returns:
+        True si la Lambda acepta el valor (los chequeos de tipo siempre aceptan)
+    """
+    kind = evidence.kind
+    try:
+        if kind == 'strptime':
+            return isinstance(value, str) and bool(datetime.strptime(value, evidence.value))
+        if kind == 'fromisoformat':
+            parser = {'date': date, 'datetime': datetime, 'time': dt_time}[evidence.value]
+            return isinstance(value, str) and parser.fromisoformat(value) is not None
+        if kind == 'regex':
+            try:
+                compiled = re.compile(evidence.value)
+            except re.error:
+                return True  # Patrón que re no entiende: no se puede juzgar
+            return isinstance(value, str) and getattr(compiled, evidence.mode or 'match')(value) is not None
+        if kind == 'js_date':
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return True
+            return isinstance(value, str) and bool(_JS_DATE_RE.match(value))
+        if kind == 'string':
+            return isinstance(value, str)
+        if kind == 'boolean':
+            return isinstance(value, bool)
+        if kind in ('integer', 'number'):
+            if isinstance(value, (dict, list)) or value is None:
+                return False
+            if evidence.value == 'int':
+                int(value)
+            elif evidence.value == 'float':
+                float(value)
+            elif evidence.value == 'parseInt':
+                return bool(re.match(r'\s*[+-]?\d', _as_parameter(value)))
+            else:
+                return isinstance(value, (int, float)) or bool(_JS_NUMBER_RE.match(_as_parameter(value)))
+            return True
+        if kind == 'decimal':
+            if isinstance(value, (dict, list)) or value is None:
+                return False
+            Decimal(value)
+            return True
+    except (ValueError, TypeError, ArithmeticError, InvalidOperation):
+        return False
+    return True
+
+
+def check_field_type(field_name: str, openapi_field: Dict[str, Any], inferred: Optional[InferredFieldType],
+                     location: str = 'body') -> List[TypeCheckIssue]:
+    """
+    Compara el schema de un campo con lo que la Lambda hace con su valor.
+
+    Los parsers de la Lambda se ejecutan sobre el ejemplo y sobre valores de
+    prueba generados del format y de los layouts de la descripción: si
+    ninguno acepta alguno de esos valores es un format_mismatch. Las
+    conversiones (int(), .split(), comparación con True, ...) se prueban
+    además con un valor del type declarado.
+
+    Args:
+        field_name: Nombre del campo
+        openapi_field: Info del campo en OpenAPI (type, format, pattern, example, description)
+        inferred: Resultado de infer_field_types para el campo (None si la
+            Lambda lo lee pero no hay evidencia de cómo lo usa)
+        location: 'body', 'query' o 'path'
+
+    Returns:
+        Lista de TypeCheckIssue (vacía si el campo es consistente)
+    """
+    issues = []
+    evidence = inferred.evidence if inferred else []
+    parsers = [e for e in evidence if e.kind in FORMAT_KINDS]
+    conversions = [e for e in evidence if e.kind in CONVERSION_KINDS]
+    lambda_type = ', '.join(inferred.types) if inferred and inferred.types else None
+    lambda_format = ' | '.join(describe_evidence(e) for e in parsers) or None
+    openapi_type = openapi_field.get('type')
+    formats = declared_formats(openapi_field)
+    expected_format = ' | '.join(f.label for f in formats) or None
+    example = _normalize_example(openapi_field.get('example'))
+    if location != 'body' and example is not None:
+        example = _as_parameter(example)
+
+    def issue(kind: str, detail: str):
+        issues.append(TypeCheckIssue(field_name, kind, detail, expected_format, lambda_type, lambda_format))
+
+    # El ejemplo tiene que cumplir lo que el propio schema declara
+    if isinstance(example, str):
+        for declared in formats:
+            if not re.search(declared.pattern, example):
+                issue('format_mismatch', f"El ejemplo '{example}' no cumple {declared.label}")
+
+    # Valores de prueba para los parsers de la Lambda
+    samples = [(example, 'ejemplo')] if isinstance(example, str) else []
+    samples += [(declared.sample, declared.label) for declared in formats if declared.sample]
+    if parsers:
+        if not formats:
+            issue('format_undocumented', f"La Lambda exige {lambda_format} pero OpenAPI no declara format ni pattern")
+        seen = set()
+        for sample, origin in samples:
+            if sample in seen:
+                continue
+            seen.add(sample)
+            if not any(evidence_accepts(parser, sample) for parser in parsers):
+                issue('format_mismatch', f"La Lambda rechaza '{sample}' ({origin}): espera {lambda_format}")
+    elif formats:
+        issue('format_not_enforced', f"OpenAPI declara {expected_format} pero la Lambda usa el valor sin validarlo")
+
+    # Conversiones: ejemplo y valor del type declarado
+    type_samples = [example] if example is not None else []
+    if openapi_type in TYPE_SAMPLES:
+        type_sample = next((d.sample for d in formats if d.sample), None) if openapi_type == 'string' else None
+        type_sample = type_sample if type_sample is not None else TYPE_SAMPLES[openapi_type]
+        type_samples.append(type_sample if location == 'body' else _as_parameter(type_sample))
+    for conversion in conversions:
+        rejected = next((s for s in type_samples if not evidence_accepts(conversion, s)), None)
+        if rejected is not None:
+            issue('type_mismatch', f"La Lambda aplica {describe_evidence(conversion)} (línea {conversion.line}) "
+                                   f"pero OpenAPI declara type: {openapi_type} (valor de prueba {rejected!r})")
+
+    if location == 'body' and openapi_type == 'number' and inferred and inferred.stored and not inferred.decimal_safe:
+        issue('decimal_required', 'El valor se guarda en DynamoDB sin convertirlo a Decimal y boto3 rechaza '
+                                  "los float ('Float types are not supported')")
+    return issues